@@ -6,6 +6,7 @@ from .campaigns import get_campaigns, get_campaign_details, create_campaign
 from .adsets import get_adsets, get_adset_details, update_adset
 from .ads import get_ads, get_ad_details, get_creative_details, get_ad_creatives, get_ad_image, update_ad
 from .insights import get_insights
+from .stored_results import get_result_slice
 from . import authentication  # Import module to register conditional auth tools
 from .server import login_cli, main
 from .auth import login
@@ -33,6 +34,7 @@ __all__ = [
     'get_ad_image',
     'update_ad',
     'get_insights',
+    'get_result_slice',
     # Note: 'get_login_link' is registered conditionally by the authentication module
     'login_cli',
     'login',
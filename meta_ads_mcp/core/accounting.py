@@ -0,0 +1,142 @@
+"""Per-tool-call accounting of Graph API cost.
+
+meta_api_tool opens a CallCost for every tool invocation and stores it in a
+contextvar; make_api_request charges each Graph request it sends to that
+CallCost: the HTTP round trip with its status, bytes in/out and wall time,
+any retries, cache hits and the latest rate-limit usage Meta reported. Tasks
+spawned by the tool (asyncio.gather, the ?ids= batcher) inherit the context
+and charge the same CallCost.
+
+When the tool returns, one structured log line is written:
+
+    tool_cost tool=get_account_pages {"graph_calls": 10, "graph_ms": 2140.5, ...}
+
+Set META_ADS_COST_IN_RESULT=1 to also return the summary under
+"_meta.graph_cost" in each tool's JSON result.
+"""
+
+import contextvars
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .serialization import dumps, loads
+from .utils import logger, get_env_bool
+
+COST_IN_RESULT = get_env_bool("META_ADS_COST_IN_RESULT")
+
+# Per-request detail kept for one tool call; the totals keep counting past it.
+MAX_RECORDED_CALLS = 50
+
+_current_cost: contextvars.ContextVar[Optional["CallCost"]] = contextvars.ContextVar(
+    "meta_ads_call_cost", default=None
+)
+
+
+class CallCost:
+    """Graph API cost of one tool invocation."""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.graph_calls = 0
+        self.retries = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.rate_limited = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.graph_seconds = 0.0
+        self.usage: Dict[str, Any] = {}
+        self.calls: List[Dict[str, Any]] = []
+
+    def record_call(
+        self,
+        method: str,
+        endpoint: str,
+        status: Optional[int],
+        seconds: float,
+        bytes_out: int = 0,
+        bytes_in: int = 0,
+        retry: bool = False,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.graph_calls += 1
+        self.graph_seconds += seconds
+        self.bytes_out += bytes_out
+        self.bytes_in += bytes_in
+        if retry:
+            self.retries += 1
+        if status is None or status >= 400:
+            self.errors += 1
+        if usage:
+            self.usage = usage
+        if len(self.calls) < MAX_RECORDED_CALLS:
+            self.calls.append({
+                "method": method,
+                "endpoint": endpoint.split("?", 1)[0] or "/",
+                "status": status,
+                "ms": round(seconds * 1000, 1),
+                "bytes_in": bytes_in,
+                "bytes_out": bytes_out,
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        summary: Dict[str, Any] = {
+            "graph_calls": self.graph_calls,
+            "retries": self.retries,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "rate_limited": self.rate_limited,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "graph_ms": round(self.graph_seconds * 1000, 1),
+            "wall_ms": round((end - self.started_at) * 1000, 1),
+        }
+        if self.usage:
+            summary["usage"] = self.usage
+        if self.calls:
+            summary["calls"] = self.calls
+        return summary
+
+
+def current_cost() -> Optional[CallCost]:
+    """The CallCost of the tool call being executed, if any."""
+    return _current_cost.get()
+
+
+@contextmanager
+def track_tool_call(tool: str) -> Iterator[CallCost]:
+    """Charge Graph requests made inside the block to a new CallCost and log it at the end."""
+    cost = CallCost(tool)
+    token = _current_cost.set(cost)
+    try:
+        yield cost
+    finally:
+        _current_cost.reset(token)
+        cost.finished_at = time.monotonic()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("tool_cost tool=%s %s", tool, json.dumps(cost.summary(), default=str))
+
+
+def attach_cost(result: Any, cost: CallCost) -> Any:
+    """Add the cost summary under _meta.graph_cost of a JSON-object tool result."""
+    if isinstance(result, dict):
+        meta = result.get("_meta")
+        if not isinstance(meta, dict):
+            meta = {}
+        result["_meta"] = dict(meta, graph_cost=cost.summary())
+        return result
+    if isinstance(result, str):
+        try:
+            decoded = loads(result)
+        except ValueError:
+            return result
+        if isinstance(decoded, dict):
+            # Re-encoded in the call's output format (serialization.py)
+            return dumps(attach_cost(decoded, cost))
+    return result
@@ -2,7 +2,7 @@
 
 import json
 from typing import Optional, Dict, Any
-from .api import meta_api_tool, make_api_request, ensure_act_prefix
+from .api import meta_api_tool, make_api_request, collect_edge, ensure_act_prefix
 from .server import mcp_server
 
 # Currencies that have no sub-units (i.e., are not denominated in cents).
@@ -41,7 +41,9 @@ def _normalize_account_monetary_fields(account: dict) -> dict:
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_ad_accounts(access_token: Optional[str] = None, user_id: str = "me", limit: int = 200) -> str:
+async def get_ad_accounts(access_token: Optional[str] = None, user_id: str = "me", limit: int = 200, max_age: Optional[int] = None,
+                          max_items: Optional[int] = None, fetch_all: bool = False,
+                          output_format: Optional[str] = None) -> Dict[str, Any]:
     """
     Get ad accounts accessible by a user.
 
@@ -52,6 +54,14 @@ async def get_ad_accounts(access_token: Optional[str] = None, user_id: str = "me
         access_token: Meta API access token (optional - will use cached token if not provided)
         user_id: Meta user ID or "me" for the current user
         limit: Maximum number of accounts to return (default: 200)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
+        max_items: Follow pagination cursors and return up to this many accounts in one call
+                   (fetched in pages of the larger of `limit` and META_ADS_EDGE_PAGE_SIZE,
+                   default 100; capped at 5000)
+        fetch_all: Follow pagination cursors and return all accounts (up to 5000)
+        output_format: "compact" returns JSON without indentation (smaller responses); "pretty"
+                       returns indented JSON (default: the server's setting, normally "pretty")
     """
     endpoint = f"{user_id}/adaccounts"
     params = {
@@ -59,12 +69,15 @@ async def get_ad_accounts(access_token: Optional[str] = None, user_id: str = "me
         "limit": limit
     }
 
-    data = await make_api_request(endpoint, access_token, params)
+    if max_items or fetch_all:
+        data = await collect_edge(endpoint, access_token, params, max_items=max_items)
+    else:
+        data = await make_api_request(endpoint, access_token, params)
 
     if "data" in data:
         data["data"] = [_normalize_account_monetary_fields(acc) for acc in data["data"]]
 
-    return json.dumps(data, indent=2)
+    return data
 
 
 _DEFAULT_ACCOUNT_INFO_FIELDS = (
@@ -76,7 +89,7 @@ _DEFAULT_ACCOUNT_INFO_FIELDS = (
 @mcp_server.tool()
 @meta_api_tool
 async def get_account_info(account_id: str, access_token: Optional[str] = None,
-                           fields: str = "") -> str:
+                           fields: str = "", max_age: Optional[int] = None) -> str:
     """
     Get detailed information about a specific ad account.
 
@@ -93,6 +106,8 @@ async def get_account_info(account_id: str, access_token: Optional[str] = None,
                 Business Manager "available balance" is the sum of funding_source_details
                 STORED_BALANCE entries plus coupons — the `balance` field alone is the
                 amount due to be billed, not the available pre-paid funds.
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     """
     if not account_id:
         return {
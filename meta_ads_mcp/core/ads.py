@@ -12,8 +12,9 @@ import time
 
 logger = logging.getLogger(__name__)
 
-from .api import meta_api_tool, make_api_request, ensure_act_prefix
+from .api import meta_api_tool, make_api_request, collect_edge, ensure_act_prefix
 from .accounts import get_ad_accounts
+from .tracing import tracer
 
 # ---------------------------------------------------------------------------
 # Placement asset customization helpers
@@ -444,7 +445,9 @@ ENABLE_SAVE_AD_IMAGE_LOCALLY = bool(os.environ.get("META_ADS_ENABLE_SAVE_AD_IMAG
 @mcp_server.tool()
 @meta_api_tool
 async def get_ads(account_id: str, access_token: Optional[str] = None, limit: int = 10, 
-                 campaign_id: str = "", adset_id: str = "") -> str:
+                 campaign_id: str = "", adset_id: str = "", max_age: Optional[int] = None,
+                 max_items: Optional[int] = None, fetch_all: bool = False,
+                 output_format: Optional[str] = None) -> Union[str, Dict[str, Any]]:
     """
     Get ads for a Meta Ads account with optional filtering.
     
@@ -454,6 +457,17 @@ async def get_ads(account_id: str, access_token: Optional[str] = None, limit: in
         limit: Maximum number of ads to return (default: 10)
         campaign_id: Optional campaign ID to filter by
         adset_id: Optional ad set ID to filter by
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
+        max_items: Follow pagination cursors and return up to this many ads in one call
+                   (fetched in pages of the larger of `limit` and META_ADS_EDGE_PAGE_SIZE,
+                   default 100; capped at 5000)
+        fetch_all: Follow pagination cursors and return all ads (up to 5000)
+        output_format: "table" returns {"columns": [...], "rows": [[...]]} with nested fields
+                       flattened, actions/action_values pivoted into one column per action_type
+                       and empty fields dropped (3-5x smaller for many rows); "compact" returns
+                       JSON without indentation; "pretty" returns indented JSON (default: the
+                       server's setting, normally "pretty")
     """
     # Require explicit account_id
     if not account_id:
@@ -481,20 +495,25 @@ async def get_ads(account_id: str, access_token: Optional[str] = None, limit: in
             "limit": limit
         }
 
-    data = await make_api_request(endpoint, access_token, params)
+    if max_items or fetch_all:
+        data = await collect_edge(endpoint, access_token, params, max_items=max_items)
+    else:
+        data = await make_api_request(endpoint, access_token, params)
     
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_ad_details(ad_id: str, access_token: Optional[str] = None) -> str:
+async def get_ad_details(ad_id: str, access_token: Optional[str] = None, max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Get detailed information about a specific ad.
     
     Args:
         ad_id: Meta Ads ad ID
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     """
     if not ad_id:
         return json.dumps({"error": "No ad ID provided"}, indent=2)
@@ -506,17 +525,20 @@ async def get_ad_details(ad_id: str, access_token: Optional[str] = None) -> str:
     
     data = await make_api_request(endpoint, access_token, params)
     
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_creative_details(creative_id: str, access_token: Optional[str] = None) -> str:
+async def get_creative_details(creative_id: str, access_token: Optional[str] = None,
+                               max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """Get detailed information about a specific ad creative by its ID.
 
     Args:
         creative_id: Meta Ads creative ID (required)
         access_token: Meta API access token (optional)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     """
     if not creative_id:
         return json.dumps({"error": "No creative ID provided"}, indent=2)
@@ -558,7 +580,7 @@ async def get_creative_details(creative_id: str, access_token: Optional[str] = N
 
     _strip_deprecated_standard_enhancements(data)
 
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
@@ -572,7 +594,7 @@ async def create_ad(
     bid_amount: Optional[int] = None,
     tracking_specs: Optional[List[Dict[str, Any]]] = None,
     access_token: Optional[str] = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Create a new ad with an existing creative.
     
@@ -623,7 +645,7 @@ async def create_ad(
     
     try:
         data = await make_api_request(endpoint, access_token, params, method="POST")
-        return json.dumps(data, indent=2)
+        return data
     except Exception as e:
         error_msg = str(e)
         return json.dumps({
@@ -635,17 +657,31 @@ async def create_ad(
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_ad_creatives(ad_id: str, access_token: Optional[str] = None) -> str:
+async def get_ad_creatives(ad_id: str, access_token: Optional[str] = None, max_age: Optional[int] = None,
+                           output_format: Optional[str] = None) -> str:
     """
     Get creative details for a specific ad. Requires an ad_id (not account_id). Use get_ads first to find ad IDs.
     
     Args:
         ad_id: Meta Ads ad ID (required)
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
+        output_format: "compact" returns JSON without indentation (smaller responses); "pretty"
+                       returns indented JSON (default: the server's setting, normally "pretty")
     """
     if not ad_id:
         return json.dumps({"error": "No ad ID provided"}, indent=2)
-        
+
+    return await _fetch_ad_creatives(ad_id, access_token)
+
+
+async def _fetch_ad_creatives(ad_id: str, access_token: Optional[str]) -> Dict[str, Any]:
+    """Creatives of an ad with image URLs and catalog info resolved (get_ad_creatives core).
+
+    Tools that need an ad's creatives call this directly instead of decoding
+    get_ad_creatives' JSON output.
+    """
     endpoint = f"{ad_id}/adcreatives"
     params = {
         "fields": "id,name,status,thumbnail_url,image_url,image_hash,object_story_spec,object_type,body,title,effective_object_story_id,asset_feed_spec,url_tags,image_urls_for_viewing,product_set_id,degrees_of_freedom_spec"
@@ -710,12 +746,28 @@ async def get_ad_creatives(ad_id: str, access_token: Optional[str] = None) -> st
         for creative in data['data']:
             _strip_deprecated_standard_enhancements(creative)
 
-    return json.dumps(data, indent=2)
+    return data
+
+
+def _image_bytes_to_jpeg(image_bytes: bytes) -> bytes:
+    """Re-encode downloaded image bytes as RGB JPEG for the Image result."""
+    with tracer.span("image.to_jpeg", {"image.bytes_in": len(image_bytes)}) as span:
+        img = PILImage.open(io.BytesIO(image_bytes))
+        span.set_attribute("image.format", img.format)
+        span.set_attribute("image.width", img.width)
+        span.set_attribute("image.height", img.height)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        byte_arr = io.BytesIO()
+        img.save(byte_arr, format="JPEG")
+        jpeg = byte_arr.getvalue()
+        span.set_attribute("image.bytes_out", len(jpeg))
+        return jpeg
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_ad_image(ad_id: str, access_token: Optional[str] = None) -> Image:
+async def get_ad_image(ad_id: str, access_token: Optional[str] = None, max_age: Optional[int] = None) -> Image:
     """
     Get, download, and visualize the image attached to an existing Meta ad.
 
@@ -725,6 +777,8 @@ async def get_ad_image(ad_id: str, access_token: Optional[str] = None) -> Image:
     Args:
         ad_id: Meta Ads ad ID
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
 
     Returns:
         The ad image ready for direct visual analysis
@@ -783,8 +837,7 @@ async def get_ad_image(ad_id: str, access_token: Optional[str] = None) -> Image:
     if not image_hashes:
         # If no hashes found, try to extract from the first creative we found in the API
         # and also check for direct URLs as fallback
-        creative_json = await get_ad_creatives(access_token=access_token, ad_id=ad_id)
-        creative_data = json.loads(creative_json)
+        creative_data = await _fetch_ad_creatives(ad_id=ad_id, access_token=access_token)
         
         # Try to extract hash from data array
         if "data" in creative_data and creative_data["data"]:
@@ -843,20 +896,8 @@ async def get_ad_image(ad_id: str, access_token: Optional[str] = None) -> Image:
                 return "Error: Failed to download image from direct URL"
             
             try:
-                # Convert bytes to PIL Image
-                img = PILImage.open(io.BytesIO(image_bytes))
-                
-                # Convert to RGB if needed
-                if img.mode != "RGB":
-                    img = img.convert("RGB")
-                    
-                # Create a byte stream of the image data
-                byte_arr = io.BytesIO()
-                img.save(byte_arr, format="JPEG")
-                img_bytes = byte_arr.getvalue()
-                
                 # Return as an Image object that LLM can directly analyze
-                return Image(data=img_bytes, format="jpeg")
+                return Image(data=_image_bytes_to_jpeg(image_bytes), format="jpeg")
                 
             except Exception as e:
                 return f"Error processing image from direct URL: {str(e)}"
@@ -872,6 +913,7 @@ async def get_image_by_hash(
     account_id: str,
     image_hash: str,
     access_token: Optional[str] = None,
+    max_age: Optional[int] = None,
 ) -> Image:
     """
     Get, download, and visualize a Meta ad image by its hash.
@@ -886,6 +928,8 @@ async def get_image_by_hash(
         account_id: Meta Ads account ID (act_XXXXXXXXX or bare numeric — both accepted)
         image_hash: Meta image hash
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
 
     Returns:
         The image ready for direct visual analysis
@@ -939,19 +983,15 @@ async def _fetch_image_by_hash(
         return "Error: Failed to download image"
 
     try:
-        img = PILImage.open(io.BytesIO(image_bytes))
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-        byte_arr = io.BytesIO()
-        img.save(byte_arr, format="JPEG")
-        return Image(data=byte_arr.getvalue(), format="jpeg")
+        return Image(data=_image_bytes_to_jpeg(image_bytes), format="jpeg")
     except Exception as e:
         return f"Error processing image: {str(e)}"
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_ad_video(ad_id: str = "", video_id: str = "", account_id: str = "", access_token: Optional[str] = None) -> str:
+async def get_ad_video(ad_id: str = "", video_id: str = "", account_id: str = "", access_token: Optional[str] = None,
+                       max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Get video details and source URL for a Meta ad video creative. Returns the video source URL
     (direct download link), thumbnail URL, processing status, and metadata (title, description,
@@ -973,14 +1013,15 @@ async def get_ad_video(ad_id: str = "", video_id: str = "", account_id: str = ""
         video_id: Meta video ID (use this if you already have it from get_ad_creatives)
         account_id: Ad account ID (e.g. "act_123" or "123"). Enables advideos edge lookup.
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     """
     if not ad_id and not video_id:
         return json.dumps({"error": "Provide either ad_id or video_id"}, indent=2)
 
     # If only ad_id provided, extract video_id from the creative
     if not video_id:
-        creative_json = await get_ad_creatives(access_token=access_token, ad_id=ad_id)
-        creative_data = json.loads(creative_json)
+        creative_data = await _fetch_ad_creatives(ad_id=ad_id, access_token=access_token)
 
         if "error" in creative_data:
             return json.dumps({"error": f"Could not get creatives for ad {ad_id}", "details": creative_data}, indent=2)
@@ -1094,7 +1135,7 @@ async def get_ad_video(ad_id: str = "", video_id: str = "", account_id: str = ""
             "may be a generic placeholder until processing completes."
         )
 
-    return json.dumps(result, indent=2)
+    return result
 
 
 if ENABLE_SAVE_AD_IMAGE_LOCALLY:
@@ -1157,8 +1198,7 @@ if ENABLE_SAVE_AD_IMAGE_LOCALLY:
         
         if not image_hashes:
             # Fallback attempt (as in get_ad_image)
-            creative_json = await get_ad_creatives(ad_id=ad_id, access_token=access_token) # Ensure ad_id is passed correctly
-            creative_data_list = json.loads(creative_json)
+            creative_data_list = await _fetch_ad_creatives(ad_id=ad_id, access_token=access_token)
             if 'data' in creative_data_list and creative_data_list['data']:
                  first_creative = creative_data_list['data'][0]
                  if 'object_story_spec' in first_creative and 'link_data' in first_creative['object_story_spec'] and 'image_hash' in first_creative['object_story_spec']['link_data']:
@@ -1234,7 +1274,7 @@ async def update_ad(
     tracking_specs: Optional[List[Dict[str, Any]]] = None,
     creative_id: Optional[Union[str, int]] = None,
     access_token: Optional[str] = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Update an ad with new settings.
 
@@ -1308,7 +1348,7 @@ async def update_ad(
                     "creative_id": creative_id
                 }, indent=2)
 
-        return json.dumps(data, indent=2)
+        return data
     except Exception as e:
         return json.dumps({"error": f"Failed to update ad: {str(e)}"}, indent=2)
 
@@ -1321,7 +1361,7 @@ async def upload_ad_image(
     file: Optional[str] = None,
     image_url: Optional[str] = None,
     name: Optional[str] = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Upload an image to use in Meta Ads creatives.
 
@@ -1473,7 +1513,7 @@ async def upload_ad_image(
                 "images_count": len(images_list),
                 "images": images_list
             }
-            return json.dumps(result, indent=2)
+            return result
 
         # If the API returned an error-like structure, surface it consistently
         if isinstance(data, dict) and "error" in data:
@@ -1745,7 +1785,7 @@ async def create_ad_creative(
     images: Optional[List[Dict[str, Any]]] = None,
     facebook_branded_content: Optional[Dict[str, Any]] = None,
     instagram_branded_content: Optional[Dict[str, Any]] = None,
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Create a new ad creative using an uploaded image hash, video ID, or an existing post.
 
@@ -2897,9 +2937,9 @@ async def create_ad_creative(
                 )
             if warnings_:
                 result["warning"] = warnings_[0] if len(warnings_) == 1 else warnings_
-            return json.dumps(result, indent=2)
+            return result
 
-        return json.dumps(data, indent=2)
+        return data
 
     except Exception as e:
         logger.exception("create_ad_creative failed")
@@ -2927,7 +2967,7 @@ async def update_ad_creative(
     lead_gen_form_id: Optional[Union[str, int]] = None,
     ad_formats: Optional[List[str]] = None,
     creative_features_spec: Optional[Dict[str, Any]] = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Update an existing ad creative's name or optimization settings.
 
@@ -3126,7 +3166,7 @@ async def update_ad_creative(
                 "attempted_updates": update_data
             }, indent=2)
 
-        return json.dumps(data, indent=2)
+        return data
 
     except Exception as e:
         return json.dumps({
@@ -3298,7 +3338,8 @@ async def _search_pages_by_name_core(access_token: str, account_id: str, search_
 
 @mcp_server.tool()
 @meta_api_tool
-async def search_pages_by_name(account_id: str, access_token: Optional[str] = None, search_term: Optional[str] = None) -> str:
+async def search_pages_by_name(account_id: str, access_token: Optional[str] = None, search_term: Optional[str] = None,
+                               max_age: Optional[int] = None) -> str:
     """
     Search for pages by name within an account.
     
@@ -3306,6 +3347,8 @@ async def search_pages_by_name(account_id: str, access_token: Optional[str] = No
         account_id: Meta Ads account ID (format: act_XXXXXXXXX)
         access_token: Meta API access token (optional - will use cached token if not provided)
         search_term: Search term to find pages by name (optional - returns all pages if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     
     Returns:
         JSON response with matching pages
@@ -3321,13 +3364,15 @@ async def search_pages_by_name(account_id: str, access_token: Optional[str] = No
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_account_pages(account_id: str, access_token: Optional[str] = None) -> str:
+async def get_account_pages(account_id: str, access_token: Optional[str] = None, max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Get pages associated with a Meta Ads account.
     
     Args:
         account_id: Meta Ads account ID (format: act_XXXXXXXXX)
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     
     Returns:
         JSON response with pages associated with the account
@@ -3345,7 +3390,7 @@ async def get_account_pages(account_id: str, access_token: Optional[str] = None)
             }
             
             user_pages_data = await make_api_request(endpoint, access_token, params)
-            return json.dumps(user_pages_data, indent=2)
+            return user_pages_data
         except Exception as e:
             return json.dumps({
                 "error": "Failed to get user pages",
@@ -3512,7 +3557,7 @@ async def get_account_pages(account_id: str, access_token: Optional[str] = None)
                     })
             
             if page_details["data"]:
-                return json.dumps(page_details, indent=2)
+                return page_details
         
         # If all approaches failed, return empty data with a message
         return json.dumps({
@@ -2,7 +2,7 @@
 
 import json
 import os
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from .api import meta_api_tool, make_api_request
 from .server import mcp_server
 
@@ -20,7 +20,7 @@ if not DISABLE_ADS_LIBRARY:
         ad_type: str = "ALL",
         limit: int = 25,  # Default limit, adjust as needed
         fields: str = "ad_creation_time,ad_creative_body,ad_creative_link_caption,ad_creative_link_description,ad_creative_link_title,ad_delivery_start_time,ad_delivery_stop_time,ad_snapshot_url,currency,demographic_distribution,funding_entity,impressions,page_id,page_name,publisher_platform,region_distribution,spend"
-    ) -> str:
+    ) -> Union[str, Dict[str, Any]]:
         """
         Search the Facebook Ads Library archive.
 
@@ -62,7 +62,7 @@ if not DISABLE_ADS_LIBRARY:
 
         try:
             data = await make_api_request(endpoint, access_token, params, method="GET")
-            return json.dumps(data, indent=2)
+            return data
         except Exception as e:
             error_msg = str(e)
             # Consider logging the full error for debugging
@@ -1,15 +1,17 @@
 """Ad Set-related functionality for Meta Ads API."""
 
 import json
-from typing import Optional, Dict, Any, List
-from .api import meta_api_tool, make_api_request, ensure_act_prefix
+from typing import Optional, Dict, Any, List, Union
+from .api import meta_api_tool, make_api_request, collect_edge, ensure_act_prefix
 from .accounts import get_ad_accounts
 from .server import mcp_server
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_adsets(account_id: str, access_token: Optional[str] = None, limit: int = 10, campaign_id: str = "") -> str:
+async def get_adsets(account_id: str, access_token: Optional[str] = None, limit: int = 10, campaign_id: str = "",
+                     max_age: Optional[int] = None, max_items: Optional[int] = None, fetch_all: bool = False,
+                     output_format: Optional[str] = None) -> Union[str, Dict[str, Any]]:
     """
     Get ad sets for a Meta Ads account with optional filtering by campaign.
     
@@ -18,6 +20,17 @@ async def get_adsets(account_id: str, access_token: Optional[str] = None, limit:
         access_token: Meta API access token (optional - will use cached token if not provided)
         limit: Maximum number of ad sets to return (default: 10)
         campaign_id: Optional campaign ID to filter by
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
+        max_items: Follow pagination cursors and return up to this many ad sets in one call
+                   (fetched in pages of the larger of `limit` and META_ADS_EDGE_PAGE_SIZE,
+                   default 100; capped at 5000)
+        fetch_all: Follow pagination cursors and return all ad sets (up to 5000)
+        output_format: "table" returns {"columns": [...], "rows": [[...]]} with nested fields
+                       flattened, actions/action_values pivoted into one column per action_type
+                       and empty fields dropped (3-5x smaller for many rows); "compact" returns
+                       JSON without indentation; "pretty" returns indented JSON (default: the
+                       server's setting, normally "pretty")
     """
     # Require explicit account_id
     if not account_id:
@@ -42,20 +55,25 @@ async def get_adsets(account_id: str, access_token: Optional[str] = None, limit:
         # Note: Removed the attempt to add campaign_id to params for the account endpoint case, 
         # as it was ineffective and the logic now uses the correct endpoint for campaign filtering.
 
-    data = await make_api_request(endpoint, access_token, params)
+    if max_items or fetch_all:
+        data = await collect_edge(endpoint, access_token, params, max_items=max_items)
+    else:
+        data = await make_api_request(endpoint, access_token, params)
     
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_adset_details(adset_id: str, access_token: Optional[str] = None) -> str:
+async def get_adset_details(adset_id: str, access_token: Optional[str] = None, max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Get detailed information about a specific ad set.
     
     Args:
         adset_id: Meta Ads ad set ID
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     
     Example:
         To call this function through MCP, pass the adset_id as the first argument:
@@ -80,7 +98,7 @@ async def get_adset_details(adset_id: str, access_token: Optional[str] = None) -
             'note': 'No frequency_control_specs field was returned by the API. This means either no frequency caps are set or the API did not include this field in the response.'
         }
     
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
@@ -112,7 +130,7 @@ async def create_adset(
     regional_regulation_identities: Optional[Dict[str, Any]] = None,
     attribution_spec: Optional[List[Dict[str, Any]]] = None,
     access_token: Optional[str] = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Create a new ad set in a Meta Ads account.
 
@@ -459,7 +477,7 @@ async def create_adset(
 
     try:
         data = await make_api_request(endpoint, access_token, params, method="POST")
-        return json.dumps(data, indent=2)
+        return data
     except Exception as e:
         error_msg = str(e)
 
@@ -510,7 +528,7 @@ async def update_adset(adset_id: str, frequency_control_specs: Optional[List[Dic
                         regional_regulated_categories: Optional[List[str]] = None,
                         regional_regulation_identities: Optional[Dict[str, Any]] = None,
                         attribution_spec: Optional[List[Dict[str, Any]]] = None,
-                        access_token: Optional[str] = None) -> str:
+                        access_token: Optional[str] = None) -> Union[str, Dict[str, Any]]:
     """
     Update an ad set with new settings including frequency caps and budgets.
 
@@ -686,7 +704,7 @@ async def update_adset(adset_id: str, frequency_control_specs: Optional[List[Dic
     try:
         # Use POST method for updates as per Meta API documentation
         data = await make_api_request(endpoint, access_token, params, method="POST")
-        return json.dumps(data, indent=2)
+        return data
     except Exception as e:
         error_msg = str(e)
         # Include adset_id in error for better context
@@ -1,17 +1,33 @@
 """Core API functionality for Meta Ads API."""
 
-from typing import Any, Dict, Optional, Callable
+from typing import Any, AsyncIterator, Dict, List, Optional, Callable, Union, get_args, get_origin
+import copy
 import json
+import logging
+import re
 import hmac
 import hashlib
+import inspect
 import httpx
 import asyncio
 import functools
 import os
+import time
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from . import auth
 from .auth import needs_authentication, auth_manager, start_callback_server, shutdown_callback_server
-from .utils import logger
+from .utils import logger, get_env_int, get_env_float, get_env_bool, LogPreview
+from .rate_limiter import rate_limiter
+from .cache import response_cache, cache_max_age, current_max_age
+from .disk_cache import disk_cache
+from .loader import IdBatchLoader
+from .accounting import COST_IN_RESULT, attach_cost, current_cost, track_tool_call
+from .metrics import metrics, endpoint_family
+from .tracing import tracer
+from .cassette import cassette
+from .serialization import COMPACT, OUTPUT_FORMATS, TABLE, current_output_format, dumps, loads, output_format, to_table
+from .resources import spill_result
+from .retry import retry_policy, is_retryable_failure, is_transient_exception, regain_access_seconds
 
 
 # Query-string params that must never leak to the caller in error payloads.
@@ -62,15 +78,134 @@ def ensure_act_prefix(account_id: str) -> str:
 
 # Constants
 META_GRAPH_API_VERSION = "v24.0"
-META_GRAPH_API_BASE = f"https://graph.facebook.com/{META_GRAPH_API_VERSION}"
+# META_GRAPH_API_BASE can point the server at a local stand-in such as
+# graph_emulator (e.g. http://127.0.0.1:8765/v24.0) to run without the network.
+META_GRAPH_API_BASE = (os.environ.get("META_GRAPH_API_BASE", "").strip().rstrip("/")
+                       or f"https://graph.facebook.com/{META_GRAPH_API_VERSION}")
 USER_AGENT = "meta-ads-mcp/1.0"
 
 # Log key environment and configuration at startup
 logger.info("Core API module initialized")
 logger.info(f"Graph API Version: {META_GRAPH_API_VERSION}")
+logger.info(f"Graph API base URL: {META_GRAPH_API_BASE}")
 logger.info(f"META_APP_ID env var present: {'Yes' if os.environ.get('META_APP_ID') else 'No'}")
 logger.info(f"META_APP_SECRET env var present (appsecret_proof will be {'enabled' if os.environ.get('META_APP_SECRET') else 'disabled'})")
 
+
+# Shared Graph API client.
+#
+# Opening an httpx.AsyncClient per call paid DNS + TCP + TLS setup to
+# graph.facebook.com on every request, and chained tools (get_account_pages,
+# get_ad_image, ...) make 3-10 requests each. One keep-alive pool is shared
+# by the whole process instead. httpx clients are bound to the event loop
+# they first run on, so a fresh client is created whenever the running loop
+# changes (repeated asyncio.run() calls, per-test loops).
+GRAPH_HTTP_TIMEOUT = get_env_float("META_ADS_HTTP_TIMEOUT", 30.0)
+GRAPH_HTTP_MAX_CONNECTIONS = get_env_int("META_ADS_HTTP_MAX_CONNECTIONS", 100)
+GRAPH_HTTP_MAX_KEEPALIVE_CONNECTIONS = get_env_int("META_ADS_HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+GRAPH_HTTP_KEEPALIVE_EXPIRY = get_env_float("META_ADS_HTTP_KEEPALIVE_EXPIRY", 30.0)
+
+# Opt-in HTTP/2 (META_ADS_HTTP2=1 or --http2). Concurrent tool calls then
+# multiplex over a single connection to graph.facebook.com instead of
+# opening a pool of HTTP/1.1 sockets. Needs the optional 'h2' package
+# (pip install 'meta-ads-mcp[http2]'); HTTP/2 is negotiated via TLS ALPN,
+# so Meta can still answer over HTTP/1.1.
+GRAPH_HTTP2 = False
+
+_graph_client: Optional[httpx.AsyncClient] = None
+_graph_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_graph_client_http2 = False
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def set_graph_http2(enabled: bool) -> bool:
+    """Enable or disable HTTP/2 for Graph API traffic.
+
+    Returns the effective setting, which stays False when the 'h2' package
+    is not installed.
+    """
+    global GRAPH_HTTP2
+    if enabled and not _http2_available():
+        logger.warning(
+            "HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1. "
+            "Install it with: pip install 'meta-ads-mcp[http2]'"
+        )
+        enabled = False
+    GRAPH_HTTP2 = enabled
+    logger.info(f"Graph API HTTP/2: {'enabled' if enabled else 'disabled'}")
+    return enabled
+
+
+if get_env_bool("META_ADS_HTTP2"):
+    set_graph_http2(True)
+
+
+def build_graph_client(http2: bool = False, **client_kwargs: Any) -> httpx.AsyncClient:
+    """Create an httpx client with the Graph API pool settings.
+
+    Extra keyword arguments are passed through to httpx.AsyncClient.
+    """
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=GRAPH_HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=GRAPH_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=GRAPH_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=GRAPH_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        **client_kwargs,
+    )
+
+
+def get_graph_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client for Graph API requests.
+
+    Must be called from inside a running event loop.
+    """
+    global _graph_client, _graph_client_loop, _graph_client_http2
+    loop = asyncio.get_running_loop()
+    if (
+        _graph_client is None
+        or _graph_client.is_closed
+        or _graph_client_loop is not loop
+        or _graph_client_http2 != GRAPH_HTTP2
+    ):
+        _graph_client = build_graph_client(http2=GRAPH_HTTP2)
+        _graph_client_loop = loop
+        _graph_client_http2 = GRAPH_HTTP2
+        logger.debug(
+            "Created shared Graph API client (http2=%s, max_connections=%s, max_keepalive=%s, keepalive_expiry=%ss)",
+            GRAPH_HTTP2, GRAPH_HTTP_MAX_CONNECTIONS, GRAPH_HTTP_MAX_KEEPALIVE_CONNECTIONS, GRAPH_HTTP_KEEPALIVE_EXPIRY,
+        )
+    return _graph_client
+
+
+async def aclose_graph_client() -> None:
+    """Close the shared Graph API client and release its pooled connections."""
+    global _graph_client, _graph_client_loop
+    client, client_loop = _graph_client, _graph_client_loop
+    _graph_client = None
+    _graph_client_loop = None
+    if client is None or client.is_closed:
+        return
+    if client_loop is not asyncio.get_running_loop():
+        # Connections belong to a loop that is gone; nothing can be awaited on them.
+        logger.debug("Dropping shared Graph API client created on a different event loop")
+        return
+    try:
+        await client.aclose()
+        logger.info("Shared Graph API client closed")
+    except Exception as e:
+        logger.warning(f"Error closing shared Graph API client: {e}")
+
+
 def _is_account_disabled_error(error_code: Any, error_subcode: Any) -> bool:
     """Return True when a Graph error indicates the ad account / action is
     blocked by Meta policy rather than the token being invalid.
@@ -93,63 +228,82 @@ def _is_account_disabled_error(error_code: Any, error_subcode: Any) -> bool:
     return False
 
 
+def _handle_graph_error(error_data: Dict[str, Any]) -> None:
+    """Log a Graph API error object and invalidate the token on auth errors."""
+    message = error_data.get('message', 'Unknown Graph API error')
+    logger.error(f"Graph API Error: {message}")
+    logger.debug("Error details: %s", LogPreview(error_data))
+
+    code = error_data.get("code")
+    subcode = error_data.get("error_subcode")
+
+    # Check if this is an auth error (code 4 is rate limiting, NOT auth)
+    if code in [190, 102]:
+        if _is_account_disabled_error(code, subcode):
+            logger.warning(
+                f"Account/action policy block (code={code}, subcode={subcode}). "
+                f"Token is still valid — NOT invalidating."
+            )
+        else:
+            logger.warning(f"Auth error detected (code: {code}). Invalidating token.")
+            auth_manager.invalidate_token()
+    elif code == 368:
+        logger.warning(
+            f"Action disallowed (code=368, subcode={subcode}). "
+            f"Token is still valid — NOT invalidating."
+        )
+    elif code == 4:
+        logger.warning(f"Rate limit error detected (code: 4, subcode: {error_data.get('error_subcode', 'N/A')}). Token is still valid — NOT invalidating.")
+
+
 class GraphAPIError(Exception):
     """Exception raised for errors from the Graph API."""
     def __init__(self, error_data: Dict[str, Any]):
         self.error_data = error_data
         self.message = error_data.get('message', 'Unknown Graph API error')
         super().__init__(self.message)
+        _handle_graph_error(error_data)
 
-        # Log error details
-        logger.error(f"Graph API Error: {self.message}")
-        logger.debug(f"Error details: {error_data}")
-
-        code = error_data.get("code")
-        subcode = error_data.get("error_subcode")
 
-        # Check if this is an auth error (code 4 is rate limiting, NOT auth)
-        if code in [190, 102]:
-            if _is_account_disabled_error(code, subcode):
-                logger.warning(
-                    f"Account/action policy block (code={code}, subcode={subcode}). "
-                    f"Token is still valid — NOT invalidating."
-                )
-            else:
-                logger.warning(f"Auth error detected (code: {code}). Invalidating token.")
-                auth_manager.invalidate_token()
-        elif code == 368:
-            logger.warning(
-                f"Action disallowed (code=368, subcode={subcode}). "
-                f"Token is still valid — NOT invalidating."
-            )
-        elif code == 4:
-            logger.warning(f"Rate limit error detected (code: 4, subcode: {error_data.get('error_subcode', 'N/A')}). Token is still valid — NOT invalidating.")
+def _graph_error_code(error_info: Any) -> Optional[Any]:
+    """Return the Graph error code from a decoded error body, if any."""
+    if isinstance(error_info, dict):
+        error_obj = error_info.get("error")
+        if isinstance(error_obj, dict):
+            return error_obj.get("code")
+    return None
 
 
-def _log_meta_rate_limit_headers(headers: dict, endpoint: str) -> None:
-    """Log Meta's rate limit headers for observability (X-App-Usage, X-Business-Use-Case-Usage)."""
+def _parse_meta_rate_limit_headers(headers: dict) -> Dict[str, Any]:
+    """Parse Meta's rate limit headers (X-App-Usage, X-Business-Use-Case-Usage, X-Ad-Account-Usage)."""
     app_usage = headers.get("x-app-usage")
     biz_usage = headers.get("x-business-use-case-usage")
     ad_account_usage = headers.get("x-ad-account-usage")
 
-    if app_usage or biz_usage or ad_account_usage:
-        usage_data = {}
-        if app_usage:
-            try:
-                usage_data["app_usage"] = json.loads(app_usage)
-            except (json.JSONDecodeError, TypeError):
-                usage_data["app_usage_raw"] = str(app_usage)
-        if biz_usage:
-            try:
-                usage_data["business_use_case_usage"] = json.loads(biz_usage)
-            except (json.JSONDecodeError, TypeError):
-                usage_data["business_use_case_usage_raw"] = str(biz_usage)
-        if ad_account_usage:
-            try:
-                usage_data["ad_account_usage"] = json.loads(ad_account_usage)
-            except (json.JSONDecodeError, TypeError):
-                usage_data["ad_account_usage_raw"] = str(ad_account_usage)
+    usage_data: Dict[str, Any] = {}
+    if app_usage:
+        try:
+            usage_data["app_usage"] = json.loads(app_usage)
+        except (json.JSONDecodeError, TypeError):
+            usage_data["app_usage_raw"] = str(app_usage)
+    if biz_usage:
+        try:
+            usage_data["business_use_case_usage"] = json.loads(biz_usage)
+        except (json.JSONDecodeError, TypeError):
+            usage_data["business_use_case_usage_raw"] = str(biz_usage)
+    if ad_account_usage:
+        try:
+            usage_data["ad_account_usage"] = json.loads(ad_account_usage)
+        except (json.JSONDecodeError, TypeError):
+            usage_data["ad_account_usage_raw"] = str(ad_account_usage)
+    return usage_data
+
+
+def _log_meta_rate_limit_headers(headers: dict, endpoint: str) -> Dict[str, Any]:
+    """Log Meta's rate limit headers for observability and return the parsed usage."""
+    usage_data = _parse_meta_rate_limit_headers(headers)
 
+    if usage_data and logger.isEnabledFor(logging.WARNING):
         # Warn at high usage levels (any field >= 80%)
         is_high = False
         for key, val in usage_data.items():
@@ -159,15 +313,21 @@ def _log_meta_rate_limit_headers(headers: dict, endpoint: str) -> None:
                         is_high = True
                         break
 
-        log_fn = logger.warning if is_high else logger.info
-        log_fn(f"meta_rate_limit_usage endpoint={endpoint} {json.dumps(usage_data)}")
+        level = logging.WARNING if is_high else logging.INFO
+        # Only serialize the usage when the line will be emitted
+        if logger.isEnabledFor(level):
+            logger.log(level, "meta_rate_limit_usage endpoint=%s %s", endpoint, json.dumps(usage_data))
+
+    return usage_data
 
 
 async def make_api_request(
     endpoint: str,
     access_token: str,
     params: Optional[Dict[str, Any]] = None,
-    method: str = "GET"
+    method: str = "GET",
+    retry: Optional[bool] = None,
+    max_age: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Make a request to the Meta Graph API.
@@ -177,10 +337,121 @@ async def make_api_request(
         access_token: Meta API access token
         params: Additional query parameters
         method: HTTP method (GET, POST, DELETE)
+        retry: Retry throttled/transient failures. None (default) retries
+            GETs only; pass True to retry an idempotent write.
+        max_age: For GETs, only accept a cached response younger than this
+            many seconds (0 always fetches). Defaults to the max_age of the
+            calling tool, if any, else the endpoint's cache TTL.
     
     Returns:
         API response as a dictionary
     """
+    with tracer.span(f"graph {method} {endpoint_family(endpoint)}",
+                     {"http.method": method, "graph.endpoint": endpoint.split("?", 1)[0]}) as span:
+        if method == "GET" and access_token:
+            if max_age is None:
+                max_age = current_max_age()
+            cached = response_cache.get(endpoint, access_token, params, max_age)
+            if cached is None and disk_cache.enabled:
+                cached = await disk_cache.aget(endpoint, access_token, params, max_age)
+            if cached is not None:
+                span.set_attribute("meta_ads.cache_hit", True)
+                cost = current_cost()
+                if cost is not None:
+                    cost.cache_hits += 1
+                return cached
+            if GRAPH_SINGLE_FLIGHT:
+                return await _single_flight_get(endpoint, access_token, params, retry)
+            return await _graph_get(endpoint, access_token, params, retry)
+
+        result = await _make_api_request(endpoint, access_token, params, method, retry)
+        response_cache.invalidate_for_write(endpoint, params)
+        if disk_cache.enabled:
+            await asyncio.to_thread(disk_cache.invalidate_for_write, endpoint)
+        return result
+
+
+async def _graph_get(
+    endpoint: str,
+    access_token: str,
+    params: Optional[Dict[str, Any]],
+    retry: Optional[bool],
+) -> Dict[str, Any]:
+    """GET, routing single-object lookups through the ?ids= batcher, and cache the result."""
+    if id_loader.accepts(endpoint, params):
+        result = await id_loader.load(endpoint, access_token, params, retry)
+    else:
+        result = await _make_api_request(endpoint, access_token, params, "GET", retry)
+    response_cache.put(endpoint, access_token, params, result)
+    if disk_cache.enabled:
+        await disk_cache.aput(endpoint, access_token, params, result)
+    return result
+
+
+# Single-flight GETs.
+#
+# Parallel tool calls often read the same object at the same moment (e.g.
+# get_ad_creatives, get_ad_image and get_ad_video all fetch
+# {ad_id}?fields=account_id). Identical GETs that are already in flight are
+# joined instead of sent again. Requests are keyed on endpoint, canonical
+# params and a hash of the access token, so different users never share a
+# result. Only in-flight requests are shared; nothing is cached afterwards.
+GRAPH_SINGLE_FLIGHT = not get_env_bool("META_ADS_DISABLE_SINGLE_FLIGHT")
+
+class _InflightGet:
+    """An in-flight GET and how many callers joined it."""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.joined = 0
+
+
+_inflight_gets: Dict[tuple, _InflightGet] = {}
+
+
+def _single_flight_key(endpoint: str, access_token: str, params: Optional[Dict[str, Any]], retry: Optional[bool]) -> tuple:
+    canonical_params = json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+    token_hash = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+    return (endpoint.lstrip("/"), canonical_params, token_hash, retry)
+
+
+async def _single_flight_get(
+    endpoint: str,
+    access_token: str,
+    params: Optional[Dict[str, Any]],
+    retry: Optional[bool],
+) -> Dict[str, Any]:
+    """Run a GET, or wait for an identical one that is already in flight."""
+    key = _single_flight_key(endpoint, access_token, params, retry)
+    loop = asyncio.get_running_loop()
+    inflight = _inflight_gets.get(key)
+    if inflight is None or inflight.task.get_loop() is not loop:
+        inflight = _InflightGet(loop.create_task(_graph_get(endpoint, access_token, params, retry)))
+        _inflight_gets[key] = inflight
+
+        def _forget(done: "asyncio.Task", key: tuple = key) -> None:
+            current = _inflight_gets.get(key)
+            if current is not None and current.task is done:
+                del _inflight_gets[key]
+
+        inflight.task.add_done_callback(_forget)
+    else:
+        inflight.joined += 1
+        logger.debug("Joining in-flight GET %s (%d waiting)", endpoint, inflight.joined)
+
+    # shield: a cancelled caller must not cancel the request others are waiting on
+    result = await asyncio.shield(inflight.task)
+    # A shared result is copied so each caller can modify its own.
+    return copy.deepcopy(result) if inflight.joined else result
+
+
+async def _make_api_request(
+    endpoint: str,
+    access_token: str,
+    params: Optional[Dict[str, Any]],
+    method: str,
+    retry: Optional[bool],
+) -> Dict[str, Any]:
     # Validate access token before proceeding
     if not access_token:
         logger.error("API request attempted with blank access token")
@@ -220,177 +491,674 @@ async def make_api_request(
 
     # Logging the request (masking token for security)
     masked_params = {k: "***MASKED***" if k in ("access_token", "appsecret_proof") else v for k, v in request_params.items()}
-    logger.debug(f"API Request: {method} {url}")
-    logger.debug(f"Request params: {masked_params}")
+    logger.debug("API Request: %s %s", method, url)
+    logger.debug("Request params: %s", LogPreview(masked_params))
     
     # Check for app_id in params
     app_id = auth_manager.app_id
-    logger.debug(f"Current app_id from auth_manager: {app_id}")
+    logger.debug("Current app_id from auth_manager: %s", app_id)
     
-    async with httpx.AsyncClient() as client:
+    # Retry throttling and transient failures (GETs only by default) after
+    # backing off, instead of handing every 503 or code 17 back to the LLM.
+    scopes = rate_limiter.scopes_for_endpoint(endpoint, access_token)
+    can_retry = retry_policy.allows(method, retry)
+    attempt = 0
+    while True:
+        attempt += 1
+
+        # Pace (or refuse) the request when Meta reports the app or ad account
+        # is close to its throttle, instead of waiting to be locked out.
+        retry_after = await rate_limiter.acquire(scopes)
+        if retry_after is not None:
+            cost = current_cost()
+            if cost is not None:
+                cost.rate_limited += 1
+            return {
+                "error": {
+                    "message": (
+                        "Meta API rate limit protection: usage for this app or ad account is at "
+                        f"its limit. Retry in about {int(retry_after) + 1} seconds."
+                    ),
+                    "is_rate_limited": True,
+                    "retry_after_seconds": round(retry_after, 1),
+                }
+            }
+
+        outcome: Dict[str, Any] = {}
+        started = time.monotonic()
+        metrics.graph_in_flight.inc()
         try:
-            if method == "GET":
-                # For GET, JSON-encode dict/list params (e.g., targeting_spec) to proper strings
-                encoded_params = {}
-                for key, value in request_params.items():
-                    if isinstance(value, (dict, list)):
-                        encoded_params[key] = json.dumps(value)
-                    else:
-                        encoded_params[key] = value
-                response = await client.get(url, params=encoded_params, headers=headers, timeout=30.0)
-            elif method == "POST":
-                # For Meta API, POST requests need data, not JSON
-                if 'targeting' in request_params and isinstance(request_params['targeting'], dict):
-                    # Convert targeting dict to string for the API
-                    request_params['targeting'] = json.dumps(request_params['targeting'])
-                
-                # Convert lists and dicts to JSON strings    
-                for key, value in request_params.items():
-                    if isinstance(value, (list, dict)):
-                        request_params[key] = json.dumps(value)
-                
-                logger.debug(f"POST params (prepared): {masked_params}")
-                response = await client.post(url, data=request_params, headers=headers, timeout=30.0)
-            elif method == "PUT":
-                # PUT for updates that Meta requires via PUT (e.g., creative_features_spec).
-                # Meta expects access_token as a query param, not in the body.
-                query_params = {}
-                body_params = {}
-                for key, value in request_params.items():
-                    if key in ("access_token", "appsecret_proof"):
-                        query_params[key] = value
-                    elif isinstance(value, (list, dict)):
-                        body_params[key] = json.dumps(value)
-                    else:
-                        body_params[key] = value
-                response = await client.put(url, params=query_params, data=body_params, headers=headers, timeout=30.0)
-            elif method == "DELETE":
-                response = await client.delete(url, params=request_params, headers=headers, timeout=30.0)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            with tracer.span(f"http {method}", {"http.method": method, "meta_ads.attempt": attempt}) as span:
+                result = await _send_graph_request(method, url, endpoint, request_params, headers, masked_params, app_id, outcome)
+                span.set_attribute("http.status_code", outcome.get("status"))
+                span.set_attribute("http.request.body.size", outcome.get("bytes_out"))
+                span.set_attribute("http.response.body.size", outcome.get("bytes_in"))
+                if outcome.get("usage"):
+                    span.set_attribute("meta_ads.rate_limit_usage", json.dumps(outcome["usage"]))
+                if isinstance(result, dict) and "error" in result:
+                    span.set_error(outcome.get("reason") or "Graph API error")
+        finally:
+            metrics.graph_in_flight.dec()
+        elapsed = time.monotonic() - started
+        metrics.observe_graph_request(method, endpoint, outcome.get("status"), elapsed,
+                                      retry=attempt > 1, usage=outcome.get("usage"))
+        cost = current_cost()
+        if cost is not None:
+            cost.record_call(method, endpoint, outcome.get("status"), elapsed,
+                             bytes_out=outcome.get("bytes_out", 0), bytes_in=outcome.get("bytes_in", 0),
+                             retry=attempt > 1, usage=outcome.get("usage"))
+        if not outcome.get("retryable") or not can_retry:
+            if attempt > 1:
+                logger.info(f"Graph {method} {endpoint} finished after {attempt - 1} retries "
+                            f"({'failed' if 'error' in result else 'succeeded'})")
+            return result
+
+        regain_after = max(
+            regain_access_seconds(outcome.get("usage") or {}),
+            rate_limiter.retry_after(scopes),
+        )
+        delay = retry_policy.delay_for(attempt, regain_after)
+        if delay is None:
+            logger.warning(f"Graph {method} {endpoint} giving up after {attempt - 1} retries: {outcome.get('reason')}")
+            return result
+        logger.warning(f"Graph {method} {endpoint} retry {attempt}/{retry_policy.max_attempts - 1} "
+                       f"in {delay:.2f}s: {outcome.get('reason')}")
+        await asyncio.sleep(delay)
+
+
+def _record_transfer(outcome: Dict[str, Any], response: httpx.Response) -> None:
+    """Store the status and approximate bytes sent/received in `outcome`."""
+    outcome["status"] = response.status_code
+    outcome["bytes_in"] = len(response.content)
+    try:
+        request = response.request
+        outcome["bytes_out"] = len(request.url.raw_path) + len(request.content)
+    except (RuntimeError, httpx.RequestNotRead):
+        outcome["bytes_out"] = 0
+
+
+async def _send_graph_request(
+    method: str,
+    url: str,
+    endpoint: str,
+    request_params: Dict[str, Any],
+    headers: Dict[str, str],
+    masked_params: Dict[str, Any],
+    app_id: Any,
+    outcome: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Send one Graph API request and turn the response into a result dict.
+
+    Fills `outcome` with what the retry loop needs: whether the failure is
+    retryable, a short reason for the logs and the parsed usage headers, plus
+    the status and byte counts for cost accounting.
+    """
+    client = get_graph_client()
+    if cassette.enabled:
+        client = cassette.bind(client)
+    try:
+        if method == "GET":
+            # For GET, JSON-encode dict/list params (e.g., targeting_spec) to proper strings
+            encoded_params = {}
+            for key, value in request_params.items():
+                if isinstance(value, (dict, list)):
+                    encoded_params[key] = json.dumps(value)
+                else:
+                    encoded_params[key] = value
+            response = await client.get(url, params=encoded_params, headers=headers)
+        elif method == "POST":
+            # For Meta API, POST requests need data, not JSON
+            if 'targeting' in request_params and isinstance(request_params['targeting'], dict):
+                # Convert targeting dict to string for the API
+                request_params['targeting'] = json.dumps(request_params['targeting'])
             
-            response.raise_for_status()
-            logger.debug(f"API Response status: {response.status_code}")
-
-            # Log Meta rate limit headers for observability
-            _log_meta_rate_limit_headers(response.headers, endpoint)
-
-            # Ensure the response is JSON and return it as a dictionary
-            try:
-                return response.json()
-            except json.JSONDecodeError:
-                # If not JSON, return text content in a structured format
-                return {
-                    "text_response": response.text,
-                    "status_code": response.status_code
-                }
-        
-        except httpx.HTTPStatusError as e:
-            error_info = {}
-            try:
-                error_info = e.response.json()
-            except:
-                error_info = {"status_code": e.response.status_code, "text": e.response.text}
+            # Convert lists and dicts to JSON strings    
+            for key, value in request_params.items():
+                if isinstance(value, (list, dict)):
+                    request_params[key] = json.dumps(value)
             
-            logger.error(f"HTTP Error: {e.response.status_code} - {error_info}")
-
-            # Log Meta rate limit headers even on errors
-            _log_meta_rate_limit_headers(e.response.headers, endpoint)
-
-            # Check for rate limit errors vs authentication errors.
-            # Code 4 is a rate limit (NOT auth) — do NOT invalidate token.
-            error_code = None
-            error_subcode = None
-            is_account_disabled = False
-            if "error" in error_info:
-                error_obj = error_info.get("error", {})
-                if isinstance(error_obj, dict):
-                    error_code = error_obj.get("code")
-                    error_subcode = error_obj.get("error_subcode")
-
-                if error_code == 4:
-                    # Application-level rate limit — token is still valid
-                    logger.warning(
-                        f"Facebook API rate limit (code=4, subcode={error_subcode}, "
-                        f"msg={error_obj.get('error_user_msg', error_obj.get('message', 'N/A'))}). "
-                        f"Token is still valid — NOT invalidating."
-                    )
-                elif _is_account_disabled_error(error_code, error_subcode):
-                    # Policy-side block (account or action). Token is still
-                    # valid; surface a distinct flag so callers can branch
-                    # without treating this as a stale-token reconnect.
-                    is_account_disabled = True
-                    logger.warning(
-                        f"Account/action policy block (code={error_code}, subcode={error_subcode}). "
-                        f"Token is still valid — NOT invalidating."
-                    )
-                elif error_code in [190, 102, 200, 10]:
-                    logger.warning(f"Detected Facebook API auth error: {error_code}")
-                    if error_code == 200 and "Provide valid app ID" in error_obj.get("message", ""):
-                        logger.error("Meta API authentication configuration issue")
-                        logger.error(f"Current app_id: {app_id}")
-                        return {
-                            "error": {
-                                "message": "Meta API authentication configuration issue. Please check your app credentials.",
-                                "original_error": error_obj.get("message"),
-                                "code": error_code
-                            }
+            logger.debug("POST params (prepared): %s", LogPreview(masked_params))
+            response = await client.post(url, data=request_params, headers=headers)
+        elif method == "PUT":
+            # PUT for updates that Meta requires via PUT (e.g., creative_features_spec).
+            # Meta expects access_token as a query param, not in the body.
+            query_params = {}
+            body_params = {}
+            for key, value in request_params.items():
+                if key in ("access_token", "appsecret_proof"):
+                    query_params[key] = value
+                elif isinstance(value, (list, dict)):
+                    body_params[key] = json.dumps(value)
+                else:
+                    body_params[key] = value
+            response = await client.put(url, params=query_params, data=body_params, headers=headers)
+        elif method == "DELETE":
+            response = await client.delete(url, params=request_params, headers=headers)
+        else:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        _record_transfer(outcome, response)
+        response.raise_for_status()
+        logger.debug("API Response status: %s (%s)", response.status_code, response.http_version)
+
+        # Log Meta rate limit headers and feed them to the rate limiter
+        usage = _log_meta_rate_limit_headers(response.headers, endpoint)
+        rate_limiter.observe(usage, endpoint, access_token=request_params.get("access_token"))
+        outcome["usage"] = usage
+
+        # Ensure the response is JSON and return it as a dictionary
+        try:
+            return loads(response.content)
+        except json.JSONDecodeError:
+            # If not JSON, return text content in a structured format
+            return {
+                "text_response": response.text,
+                "status_code": response.status_code
+            }
+    
+    except httpx.HTTPStatusError as e:
+        error_info = {}
+        try:
+            error_info = loads(e.response.content)
+        except:
+            error_info = {"status_code": e.response.status_code, "text": e.response.text}
+        
+        logger.error("HTTP Error: %s - %s", e.response.status_code, LogPreview(error_info))
+
+        # Log Meta rate limit headers even on errors; throttling codes pause the limiter
+        usage = _log_meta_rate_limit_headers(e.response.headers, endpoint)
+        graph_error_code = _graph_error_code(error_info)
+        rate_limiter.observe(usage, endpoint, error_code=graph_error_code,
+                             access_token=request_params.get("access_token"))
+        outcome["usage"] = usage
+        outcome["retryable"] = is_retryable_failure(e.response.status_code, graph_error_code)
+        outcome["reason"] = f"HTTP {e.response.status_code}, code {graph_error_code}"
+
+        # Check for rate limit errors vs authentication errors.
+        # Code 4 is a rate limit (NOT auth) — do NOT invalidate token.
+        error_code = None
+        error_subcode = None
+        is_account_disabled = False
+        if "error" in error_info:
+            error_obj = error_info.get("error", {})
+            if isinstance(error_obj, dict):
+                error_code = error_obj.get("code")
+                error_subcode = error_obj.get("error_subcode")
+
+            if error_code == 4:
+                # Application-level rate limit — token is still valid
+                logger.warning(
+                    f"Facebook API rate limit (code=4, subcode={error_subcode}, "
+                    f"msg={error_obj.get('error_user_msg', error_obj.get('message', 'N/A'))}). "
+                    f"Token is still valid — NOT invalidating."
+                )
+            elif _is_account_disabled_error(error_code, error_subcode):
+                # Policy-side block (account or action). Token is still
+                # valid; surface a distinct flag so callers can branch
+                # without treating this as a stale-token reconnect.
+                is_account_disabled = True
+                logger.warning(
+                    f"Account/action policy block (code={error_code}, subcode={error_subcode}). "
+                    f"Token is still valid — NOT invalidating."
+                )
+            elif error_code in [190, 102, 200, 10]:
+                logger.warning(f"Detected Facebook API auth error: {error_code}")
+                if error_code == 200 and "Provide valid app ID" in error_obj.get("message", ""):
+                    logger.error("Meta API authentication configuration issue")
+                    logger.error(f"Current app_id: {app_id}")
+                    return {
+                        "error": {
+                            "message": "Meta API authentication configuration issue. Please check your app credentials.",
+                            "original_error": error_obj.get("message"),
+                            "code": error_code
                         }
-                    auth_manager.invalidate_token()
-                elif e.response.status_code in [401, 403]:
-                    logger.warning(f"Detected authentication error ({e.response.status_code})")
-                    auth_manager.invalidate_token()
+                    }
+                auth_manager.invalidate_token()
             elif e.response.status_code in [401, 403]:
                 logger.warning(f"Detected authentication error ({e.response.status_code})")
                 auth_manager.invalidate_token()
+        elif e.response.status_code in [401, 403]:
+            logger.warning(f"Detected authentication error ({e.response.status_code})")
+            auth_manager.invalidate_token()
+
+        # Include full details for technical users. URLs are scrubbed of
+        # access_token/appsecret_proof — see GHSA-9gw6-46qc-99vr.
+        full_response = {
+            "headers": dict(e.response.headers),
+            "status_code": e.response.status_code,
+            "url": _redact_url(str(e.response.url)),
+            "reason": getattr(e.response, "reason_phrase", "Unknown reason"),
+            "request_method": e.request.method,
+            "request_url": _redact_url(str(e.request.url))
+        }
+
+        # Return a properly structured error object
+        error_payload: Dict[str, Any] = {
+            "message": f"HTTP Error: {e.response.status_code}",
+            "details": error_info,
+            "full_response": full_response,
+        }
+        if is_account_disabled:
+            error_payload["is_account_disabled"] = True
+            if error_code is not None:
+                error_payload["error_code"] = error_code
+            if error_subcode is not None:
+                error_payload["error_subcode"] = error_subcode
+        return {"error": error_payload}
+    
+    except Exception as e:
+        logger.error(f"Request Error: {str(e)}")
+        outcome["retryable"] = is_transient_exception(e)
+        outcome["reason"] = f"{type(e).__name__}: {e}"
+        return {"error": {"message": str(e)}}
+
+
+# Concurrent single-object GETs with the same fields are merged into one
+# GET /?ids=a,b,c request (see loader.py).
+id_loader = IdBatchLoader.from_env(
+    lambda endpoint, access_token, params, retry: _make_api_request(endpoint, access_token, params, "GET", retry)
+)
+
+
+# Graph Batch API: up to 50 sub-requests per POST to the root node.
+# See https://developers.facebook.com/docs/graph-api/batch-requests/
+GRAPH_BATCH_MAX_SIZE = 50
+
+_BATCH_RESULT_REF_RE = re.compile(r"\{result=([^:}]+):")
+
+
+def _encode_graph_params(params: Dict[str, Any]) -> str:
+    """URL-encode params the way make_api_request sends them (dicts/lists as JSON)."""
+    encoded = {}
+    for key, value in params.items():
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        elif isinstance(value, bool):
+            value = "true" if value else "false"
+        encoded[key] = value
+    return urlencode(encoded)
+
+
+def _batch_item(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert one sub-request into the Batch API wire format.
+
+    Accepts Meta's own keys (relative_url, body, name, depends_on,
+    omit_response_on_success) or make_api_request style endpoint + params.
+    """
+    method = str(request.get("method", "GET")).upper()
+    item: Dict[str, Any] = {"method": method}
+    relative_url = request.get("relative_url")
+    if relative_url is None:
+        endpoint = request.get("endpoint")
+        if not endpoint:
+            raise ValueError("Batch sub-request needs 'relative_url' or 'endpoint'")
+        relative_url = endpoint
+        params = request.get("params") or {}
+        if params and method in ("GET", "DELETE"):
+            relative_url = f"{endpoint}?{_encode_graph_params(params)}"
+        elif params:
+            item["body"] = _encode_graph_params(params)
+    item["relative_url"] = str(relative_url).lstrip("/")
+    body = request.get("body")
+    if isinstance(body, dict):
+        item["body"] = _encode_graph_params(body)
+    elif body is not None:
+        item["body"] = body
+    for key in ("name", "depends_on", "omit_response_on_success"):
+        if key in request:
+            item[key] = request[key]
+    return item
 
-            # Include full details for technical users. URLs are scrubbed of
-            # access_token/appsecret_proof — see GHSA-9gw6-46qc-99vr.
-            full_response = {
-                "headers": dict(e.response.headers),
-                "status_code": e.response.status_code,
-                "url": _redact_url(str(e.response.url)),
-                "reason": getattr(e.response, "reason_phrase", "Unknown reason"),
-                "request_method": e.request.method,
-                "request_url": _redact_url(str(e.request.url))
-            }
 
-            # Return a properly structured error object
-            error_payload: Dict[str, Any] = {
-                "message": f"HTTP Error: {e.response.status_code}",
-                "details": error_info,
-                "full_response": full_response,
+def _chunk_batch(items: List[Dict[str, Any]]) -> List[List[int]]:
+    """Split sub-request indexes into batches of at most GRAPH_BATCH_MAX_SIZE.
+
+    depends_on and {result=name:$.path} references only resolve inside one
+    batch, so a batch boundary is never placed between a named request and
+    anything that refers to it.
+    """
+    names: Dict[str, int] = {}
+    earliest_ref = []
+    for index, item in enumerate(items):
+        refs = set(_BATCH_RESULT_REF_RE.findall(item["relative_url"] + str(item.get("body", ""))))
+        if item.get("depends_on"):
+            refs.add(item["depends_on"])
+        earliest_ref.append(min([names[ref] for ref in refs if ref in names] + [index]))
+        if item.get("name"):
+            names[item["name"]] = index
+
+    # A boundary before index k is allowed when nothing at or after k
+    # references a request before k.
+    count = len(items)
+    allowed = [True] * (count + 1)
+    suffix_min = count
+    for k in range(count - 1, 0, -1):
+        suffix_min = min(suffix_min, earliest_ref[k])
+        allowed[k] = suffix_min >= k
+
+    chunks = []
+    start = 0
+    while start < count:
+        end = min(start + GRAPH_BATCH_MAX_SIZE, count)
+        while end > start and not allowed[end]:
+            end -= 1
+        if end == start:
+            raise ValueError(
+                f"Dependent batch sub-requests starting at index {start} span more than "
+                f"{GRAPH_BATCH_MAX_SIZE} items and cannot be split across batches"
+            )
+        chunks.append(list(range(start, end)))
+        start = end
+    return chunks
+
+
+def _decode_batch_response(item: Any, sub_request: Dict[str, Any],
+                           access_token: Optional[str] = None) -> Dict[str, Any]:
+    """Decode one entry of a batch response into a make_api_request style dict."""
+    if item is None:
+        # Meta returns null for sub-requests that did not finish in time and
+        # for omit_response_on_success requests that succeeded.
+        return {
+            "error": {
+                "message": "No response for batch sub-request (timed out or omitted on success)",
+                "relative_url": _redact_url(sub_request["relative_url"]),
             }
-            if is_account_disabled:
-                error_payload["is_account_disabled"] = True
-                if error_code is not None:
-                    error_payload["error_code"] = error_code
-                if error_subcode is not None:
-                    error_payload["error_subcode"] = error_subcode
-            return {"error": error_payload}
-        
-        except Exception as e:
-            logger.error(f"Request Error: {str(e)}")
-            return {"error": {"message": str(e)}}
+        }
+
+    status = item.get("code")
+    body = item.get("body")
+    try:
+        decoded = json.loads(body) if isinstance(body, str) else body
+    except json.JSONDecodeError:
+        decoded = {"text_response": body, "status_code": status}
+
+    if isinstance(status, int) and status < 400:
+        return decoded if isinstance(decoded, dict) else {"result": decoded}
+
+    error_obj = decoded.get("error") if isinstance(decoded, dict) else None
+    error_code = error_subcode = None
+    if isinstance(error_obj, dict):
+        # Same logging / token invalidation rules as single requests
+        _handle_graph_error(error_obj)
+        error_code = error_obj.get("code")
+        error_subcode = error_obj.get("error_subcode")
+        rate_limiter.observe({}, sub_request["relative_url"], error_code=error_code,
+                             access_token=access_token)
+
+    error_payload: Dict[str, Any] = {
+        "message": f"HTTP Error: {status}",
+        "details": decoded,
+        "relative_url": _redact_url(sub_request["relative_url"]),
+    }
+    if _is_account_disabled_error(error_code, error_subcode):
+        error_payload["is_account_disabled"] = True
+        error_payload["error_code"] = error_code
+        if error_subcode is not None:
+            error_payload["error_subcode"] = error_subcode
+    return {"error": error_payload}
+
+
+async def make_batch_request(
+    requests: List[Dict[str, Any]],
+    access_token: str,
+) -> List[Dict[str, Any]]:
+    """
+    Send many Graph API requests through the Batch API.
+
+    Sub-requests are chunked into batches of up to 50 (one round trip each)
+    and the batches are sent concurrently.
+
+    Args:
+        requests: Sub-requests, each either
+            {"method": "GET", "relative_url": "123?fields=id,name"} or
+            {"method": "POST", "endpoint": "123", "params": {...}}.
+            "name", "depends_on" and {result=name:$.jsonpath} references are
+            passed through; dependent requests are kept in the same batch.
+        access_token: Meta API access token
+
+    Returns:
+        One dict per sub-request, in input order: the decoded body on
+        success, or {"error": {...}} shaped like make_api_request errors.
+    """
+    items = [_batch_item(request) for request in requests]
+    if not items:
+        return []
+    chunks = _chunk_batch(items)
+
+    async def send(chunk: List[int]) -> List[Dict[str, Any]]:
+        batch = [items[index] for index in chunk]
+        # A batch made only of GETs is safe to send again.
+        idempotent = all(item["method"] == "GET" for item in batch)
+        response = await make_api_request(
+            "",
+            access_token,
+            {"batch": batch, "include_headers": "false"},
+            method="POST",
+            retry=True if idempotent else None,
+        )
+        if isinstance(response, dict) and "error" in response:
+            return [response for _ in batch]
+        if not isinstance(response, list) or len(response) != len(batch):
+            logger.error(f"Unexpected batch response shape for {len(batch)} sub-requests")
+            return [{"error": {"message": "Unexpected batch response from Meta API", "details": response}}
+                    for _ in batch]
+        return [_decode_batch_response(item, sub, access_token) for item, sub in zip(response, batch)]
+
+    logger.debug("Batch request: %d sub-requests in %d batches", len(items), len(chunks))
+    chunk_results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+    for item in items:
+        if item["method"] != "GET":
+            response_cache.invalidate_for_write(item["relative_url"], dict(parse_qsl(item.get("body") or "")))
+    return [result for results in chunk_results for result in results]
+
+
+# Edge pagination.
+#
+# List tools used to return one page and leave the caller to walk
+# paging.cursors.after one tool call at a time. iterate_edge follows the
+# cursors itself, holding one page in memory at a time; collect_edge gathers
+# up to max_items into a single Graph-shaped response.
+GRAPH_EDGE_PAGE_SIZE = get_env_int("META_ADS_EDGE_PAGE_SIZE", 100)
+GRAPH_EDGE_MAX_ITEMS = get_env_int("META_ADS_EDGE_MAX_ITEMS", 5000)
+
+
+class EdgePageError(Exception):
+    """A page of an edge could not be fetched.
+
+    `response` is the error dict returned by make_api_request and `params`
+    the request params of the failed page (including its `after` cursor), so
+    the caller can resume from there.
+    """
+    def __init__(self, response: Dict[str, Any], params: Dict[str, Any]):
+        self.response = response
+        self.params = params
+        super().__init__(str(response.get("error")))
+
+
+def _next_page_params(page: Dict[str, Any], params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Params for the page after `page`, or None when it was the last one."""
+    paging = page.get("paging")
+    if not isinstance(paging, dict) or not paging.get("next"):
+        return None
+    next_params = dict(params)
+    after = (paging.get("cursors") or {}).get("after")
+    if after:
+        next_params["after"] = after
+        return next_params
+    # Offset-paginated edges only give a next URL.
+    query = dict(parse_qsl(urlsplit(paging["next"]).query))
+    if "offset" not in query and "after" not in query:
+        return None
+    for name in ("offset", "after"):
+        if name in query:
+            next_params[name] = query[name]
+    return next_params
+
+
+async def iterate_edge(
+    endpoint: str,
+    access_token: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_items: Optional[int] = None,
+    page_size: Optional[int] = None,
+    on_page: Optional[Callable[[Dict[str, Any], Optional[Dict[str, Any]]], None]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield the items of a Graph edge, following paging cursors.
+
+    Args:
+        endpoint: Edge path, e.g. "act_123/ads"
+        access_token: Meta API access token
+        params: Query params of the first page ("after" resumes from a cursor)
+        max_items: Stop after this many items. The last page is requested
+            with a smaller limit so the edge is never cut mid-page.
+        page_size: Items per request (default: the larger of params["limit"]
+            and META_ADS_EDGE_PAGE_SIZE)
+        on_page: Called with each page (without its data) and the params of
+            the next page, or None after the last one.
+
+    Raises:
+        EdgePageError: when Meta returns an error for a page.
+    """
+    params = dict(params or {})
+    if page_size is None:
+        page_size = max(int(params.get("limit") or 0), GRAPH_EDGE_PAGE_SIZE)
+    remaining = max_items
+    while True:
+        if remaining is not None:
+            params["limit"] = min(page_size, remaining)
+        else:
+            params["limit"] = page_size
+        page = await make_api_request(endpoint, access_token, params)
+        if not isinstance(page, dict) or "error" in page:
+            raise EdgePageError(page if isinstance(page, dict) else {"error": {"message": str(page)}}, params)
+        items = page.pop("data", None) or []
+        if remaining is not None:
+            items = items[:remaining]
+            remaining -= len(items)
+        next_params = _next_page_params(page, params) if items else None
+        if on_page is not None:
+            on_page(page, next_params)
+        for item in items:
+            yield item
+        if next_params is None or remaining == 0:
+            return
+        params = next_params
+
+
+async def collect_edge(
+    endpoint: str,
+    access_token: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_items: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch up to max_items items of an edge into one response.
+
+    max_items defaults to, and is capped at, META_ADS_EDGE_MAX_ITEMS. The
+    result looks like a single Graph page: {"data": [...]} plus "paging"
+    with the cursor to continue from when more items remain. A failure on
+    the first page returns Meta's error as-is; a later failure returns the
+    items collected so far with the error under "pagination_error".
+    """
+    limit = GRAPH_EDGE_MAX_ITEMS if not max_items or max_items <= 0 else min(max_items, GRAPH_EDGE_MAX_ITEMS)
+    items: List[Dict[str, Any]] = []
+    state: Dict[str, Any] = {"first": None, "next": None}
+
+    def on_page(page: Dict[str, Any], next_params: Optional[Dict[str, Any]]) -> None:
+        if state["first"] is None:
+            state["first"] = page
+        state["next"] = next_params
+
+    try:
+        async for item in iterate_edge(endpoint, access_token, params, max_items=limit, on_page=on_page):
+            items.append(item)
+    except EdgePageError as e:
+        if state["first"] is None:
+            return e.response
+        logger.warning(f"Stopped paging {endpoint} after {len(items)} items: {e}")
+        result = {key: value for key, value in state["first"].items() if key != "paging"}
+        result["data"] = items
+        result["paging"] = {"cursors": {"after": e.params.get("after")}}
+        result["pagination_error"] = e.response.get("error")
+        return result
+
+    result = {key: value for key, value in (state["first"] or {}).items() if key != "paging"}
+    result["data"] = items
+    if state["next"] is not None and state["next"].get("after"):
+        result["paging"] = {"cursors": {"after": state["next"]["after"]}}
+    logger.debug("Collected %d items from %s", len(items), endpoint)
+    return result
+
+
+def _serialized_annotation(annotation: Any) -> Any:
+    """A tool's return annotation with dict results replaced by the text meta_api_tool returns."""
+    if get_origin(annotation) is dict:
+        return str
+    if get_origin(annotation) is Union:
+        return Union[tuple(str if get_origin(arg) is dict else arg for arg in get_args(annotation))]
+    return annotation
 
 
 # Generic wrapper for all Meta API tools
+def _app_id_error_response(error_obj: Dict[str, Any], app_id: str, fmt: Optional[str] = None) -> Optional[str]:
+    """A friendlier response for Meta's "Provide valid app ID" error, else None."""
+    if error_obj.get("code") == 200 and "Provide valid app ID" in error_obj.get("message", ""):
+        logger.error("Meta API authentication configuration issue")
+        logger.error(f"Current app_id: {app_id}")
+        # Replace the confusing error with a more user-friendly one
+        return dumps({
+            "error": {
+                "message": "Meta API Configuration Issue",
+                "details": {
+                    "description": "Your Meta API app is not properly configured",
+                    "action_required": "Check your META_APP_ID environment variable",
+                    "current_app_id": app_id,
+                    "original_error": error_obj.get("message")
+                }
+            }
+        }, fmt)
+    return None
+
+
 def meta_api_tool(func):
-    """Decorator for Meta API tools that handles authentication and error handling."""
+    """Decorator for Meta API tools that handles authentication and error handling.
+
+    Tools may return a dict instead of JSON text; it is checked for errors as
+    a dict and serialized once here, at the MCP boundary. The wrapper itself
+    always returns text, and its signature says so.
+    """
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
+        started = time.monotonic()
+        outcome = "ok"
+        fmt = None
+        metrics.tools_in_flight.inc()
         try:
             # Log function call
-            logger.debug(f"Function call: {func.__name__}")
-            logger.debug(f"Args: {args}")
-            # Log kwargs without sensitive info
-            safe_kwargs = {k: ('***TOKEN***' if k == 'access_token' else v) for k, v in kwargs.items()}
-            logger.debug(f"Kwargs: {safe_kwargs}")
+            logger.debug("Function call: %s", func.__name__)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Args: %s", LogPreview(args))
+                # Log kwargs without sensitive info
+                safe_kwargs = {k: ('***TOKEN***' if k == 'access_token' else v) for k, v in kwargs.items()}
+                logger.debug("Kwargs: %s", LogPreview(safe_kwargs))
             
+            # Reject an unknown output_format instead of silently using pretty
+            requested_format = kwargs.get("output_format")
+            if requested_format and requested_format not in OUTPUT_FORMATS:
+                outcome = "error"
+                return dumps({
+                    "error": {
+                        "message": f"Invalid output_format: {requested_format!r}",
+                        "valid_values": list(OUTPUT_FORMATS),
+                    }
+                })
+            fmt = requested_format or current_output_format()
+
             # Log app ID information
             app_id = auth_manager.app_id
-            logger.debug(f"Current app_id: {app_id}")
-            logger.debug(f"META_APP_ID env var: {os.environ.get('META_APP_ID')}")
+            logger.debug("Current app_id: %s", app_id)
+            logger.debug("META_APP_ID env var: %s", os.environ.get('META_APP_ID'))
             
             # If access_token is not in kwargs or not kwargs['access_token'], try to get it from auth_manager
             if 'access_token' not in kwargs or not kwargs['access_token']:
@@ -418,6 +1186,7 @@ def meta_api_tool(func):
             
             # Final validation - if we still don't have a valid token, return authentication required
             if 'access_token' not in kwargs or not kwargs['access_token']:
+                outcome = "error"
                 logger.warning("No access token available, authentication needed")
                 
                 # Add more specific troubleshooting information
@@ -441,7 +1210,7 @@ def meta_api_tool(func):
                 
                 # Provide different guidance based on authentication method
                 if using_pipeboard:
-                    return json.dumps({
+                    return dumps({
                         "error": {
                             "message": "Pipeboard Authentication Required",
                             "details": {
@@ -458,9 +1227,9 @@ def meta_api_tool(func):
                                 "token_link": "[Get a new Pipeboard API token](https://pipeboard.co/api-tokens)"
                             }
                         }
-                    }, indent=2)
+                    }, fmt)
                 else:
-                    return json.dumps({
+                    return dumps({
                         "error": {
                             "message": "Authentication Required",
                             "details": {
@@ -475,48 +1244,82 @@ def meta_api_tool(func):
                                 "markdown_link": f"[Click here to authenticate with Meta Ads API]({auth_url})"
                             }
                         }
-                    }, indent=2)
+                    }, fmt)
                 
-            # Call the original function
-            result = await func(*args, **kwargs)
-            
-            # If the result is a string (JSON), try to parse it to check for errors
-            if isinstance(result, str):
+            # Call the original function. A max_age argument applies to
+            # every cached Graph read the tool makes, and every Graph request
+            # it sends is charged to this call's cost record (accounting.py).
+            # An output_format argument picks pretty, compact or table output
+            # for the result (serialization.py).
+            with cache_max_age(kwargs.get("max_age")), output_format(fmt), \
+                    track_tool_call(func.__name__) as cost, \
+                    tracer.span(f"tool {func.__name__}", {"mcp.tool.name": func.__name__}):
+                result = await func(*args, **kwargs)
+
+            reencode = fmt in (COMPACT, TABLE)
+            if (reencode or COST_IN_RESULT) and isinstance(result, str) and result.startswith(("{", "[")):
+                # Tools that build their own indented JSON text are re-encoded
+                # (and given their cost) by the structured path below
+                try:
+                    decoded = loads(result)
+                except ValueError:
+                    decoded = None
+                if isinstance(decoded, list) and reencode:
+                    return dumps(decoded, fmt)
+                if isinstance(decoded, dict):
+                    result = decoded
+
+            if isinstance(result, dict):
+                # Structured result: check it as-is and serialize exactly once
+                if COST_IN_RESULT:
+                    result = attach_cost(result, cost)
+                if "error" in result:
+                    outcome = "error"
+                    logger.error("Error in API response: %s", LogPreview(result["error"]))
+                    details = result.get("details")
+                    if isinstance(details, dict) and isinstance(details.get("error"), dict):
+                        replacement = _app_id_error_response(details["error"], app_id, fmt)
+                        if replacement is not None:
+                            return replacement
+                tabulate = fmt == TABLE and isinstance(result.get("data"), list)
+                text = dumps(to_table(result) if tabulate else result, fmt)
+                # Results too large to return inline are kept as a resource (resources.py)
+                summary = spill_result(func.__name__, kwargs.get("access_token"), result, text)
+                if summary is not None:
+                    return dumps(summary, fmt)
+                return text
+
+            # If the result is a string (JSON), parse it to check for errors.
+            # JSON text that doesn't mention "error" anywhere can't have the
+            # key, so it is passed through without decoding.
+            if isinstance(result, str) and not (result.startswith(("{", "[")) and '"error"' not in result):
                 try:
                     result_dict = json.loads(result)
                     if "error" in result_dict:
-                        logger.error(f"Error in API response: {result_dict['error']}")
+                        outcome = "error"
+                        logger.error("Error in API response: %s", LogPreview(result_dict["error"]))
                         # If this is an app ID error, log more details
                         if isinstance(result_dict.get("details", {}).get("error", {}), dict):
-                            error_obj = result_dict["details"]["error"]
-                            if error_obj.get("code") == 200 and "Provide valid app ID" in error_obj.get("message", ""):
-                                logger.error("Meta API authentication configuration issue")
-                                logger.error(f"Current app_id: {app_id}")
-                                # Replace the confusing error with a more user-friendly one
-                                return json.dumps({
-                                    "error": {
-                                        "message": "Meta API Configuration Issue",
-                                        "details": {
-                                            "description": "Your Meta API app is not properly configured",
-                                            "action_required": "Check your META_APP_ID environment variable",
-                                            "current_app_id": app_id,
-                                            "original_error": error_obj.get("message")
-                                        }
-                                    }
-                                }, indent=2)
+                            replacement = _app_id_error_response(result_dict["details"]["error"], app_id, fmt)
+                            if replacement is not None:
+                                return replacement
                 except Exception:
                     # Not JSON or other parsing error, wrap it in a dictionary
-                    return json.dumps({"data": result}, indent=2)
-            
-            # If result is already a dictionary, ensure it's properly serialized
-            if isinstance(result, dict):
-                return json.dumps(result, indent=2)
+                    return dumps({"data": result}, fmt)
             
             return result
         except McpToolError:
+            outcome = "error"
             raise  # Let FastMCP set isError: true and refund the usage credit
         except Exception as e:
+            outcome = "exception"
             logger.error(f"Error in {func.__name__}: {str(e)}")
-            return json.dumps({"error": str(e)}, indent=2)
+            return dumps({"error": str(e)}, fmt)
+        finally:
+            metrics.tools_in_flight.dec()
+            metrics.observe_tool_call(func.__name__, time.monotonic() - started, outcome)
 
+    # MCP derives the tool's output schema from the return annotation
+    signature = inspect.signature(func)
+    wrapper.__signature__ = signature.replace(return_annotation=_serialized_annotation(signature.return_annotation))
     return wrapper 
\ No newline at end of file
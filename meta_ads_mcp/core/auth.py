@@ -291,6 +291,17 @@ class AuthManager:
             return None
         
         return self.token_info.access_token
+
+    async def aget_access_token(self) -> Optional[str]:
+        """
+        Async get_access_token: a Pipeboard token refresh runs off the event loop
+        
+        Returns:
+            Access token if available, None otherwise
+        """
+        if self.use_pipeboard:
+            return await pipeboard_auth_manager.aget_access_token()
+        return self.get_access_token()
         
     def invalidate_token(self) -> None:
         """Invalidate the current token, usually because it has expired or is invalid"""
@@ -471,7 +482,7 @@ async def get_current_access_token() -> Optional[str]:
     
     # Attempt to get access token
     try:
-        token = auth_manager.get_access_token()
+        token = await auth_manager.aget_access_token()
         
         if token:
             # Add basic token validation - check if it looks like a valid token
@@ -73,7 +73,7 @@ async def get_login_link(access_token: Optional[str] = None) -> str:
                 }, indent=2)
             
             # Check if Pipeboard token is working
-            token = pipeboard_auth_manager.get_access_token()
+            token = await pipeboard_auth_manager.aget_access_token()
             if token:
                 return json.dumps({
                     "message": "✅ Already Authenticated",
@@ -1,7 +1,7 @@
 """Budget Schedule-related functionality for Meta Ads API."""
 
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 
 from .api import meta_api_tool, make_api_request
 from .server import mcp_server
@@ -17,7 +17,7 @@ async def create_budget_schedule(
     time_start: int,
     time_end: int,
     access_token: Optional[str] = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Create a budget schedule for a Meta Ads campaign.
 
@@ -59,7 +59,7 @@ async def create_budget_schedule(
 
     try:
         data = await make_api_request(endpoint, access_token, params, method="POST")
-        return json.dumps(data, indent=2)
+        return data
     except Exception as e:
         error_msg = str(e)
         # Include details about the error and the parameters sent for easier debugging
@@ -0,0 +1,276 @@
+"""In-memory TTL + LRU cache for read-only Graph API responses.
+
+An LLM often asks the same question twice in one turn (list the accounts,
+then list them again to pick one), and every call used to go back to Meta.
+GET responses are now cached per (endpoint, canonical params, token hash):
+
+- each endpoint family has its own TTL (targeting catalogs for an hour,
+  account settings for minutes, insights for a minute);
+- the cache is bounded by entry count and approximate size, evicting the
+  least recently used entries first;
+- "not found" / permission errors are cached briefly (negative caching) so a
+  bad ID is not retried against Meta in a tight loop;
+- writes (POST/PUT/DELETE) drop every entry that mentions the written object
+  or the parent objects named in the write, e.g. creating a campaign under
+  act_1 drops the cached act_1/campaigns listing, and pausing ad 42 drops both
+  /42 and any cached listing that contained ad 42.
+
+Callers can ask for fresher data with max_age (seconds): 0 always fetches
+from Meta, a positive value only accepts entries younger than that.
+"""
+
+import contextvars
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Set, Tuple
+
+from .utils import logger, get_env_bool, get_env_float, get_env_int
+
+# First matching pattern wins; the endpoint has no leading slash or query.
+DEFAULT_TTL_RULES: Sequence[Tuple[str, float]] = (
+    # Targeting catalogs (interests, behaviors, demographics, geo locations)
+    (r"^search$", 3600.0),
+    (r"^act_\d+/(reachestimate|delivery_estimate)$", 600.0),
+    # Account lists and account settings
+    (r"^[^/]+/adaccounts$", 300.0),
+    (r"^act_\d+$", 300.0),
+    # Delivery numbers keep moving during the day
+    (r"/insights$", 60.0),
+)
+DEFAULT_TTL = 60.0
+NEGATIVE_TTL = 30.0
+
+# Graph error codes that mean "does not exist / not allowed" and will not
+# change on an immediate retry: 10 and 200 are permission errors, 803 is an
+# unknown alias, and 100 with subcode 33 is a missing or inaccessible object.
+_NEGATIVE_ERROR_CODES = frozenset({10, 200, 803})
+
+# Params whose values name the parent of a written object (campaign_id on a
+# new ad set, adset_id on a new ad, ...).
+_PARENT_PARAM_RE = re.compile(r"^[a-z_]*_id$")
+
+_max_age_override: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "meta_ads_cache_max_age", default=None
+)
+
+
+@contextmanager
+def cache_max_age(max_age: Optional[float]) -> Iterator[None]:
+    """Apply `max_age` to every cached Graph read made inside the block."""
+    token = _max_age_override.set(max_age)
+    try:
+        yield
+    finally:
+        _max_age_override.reset(token)
+
+
+def current_max_age() -> Optional[float]:
+    """The max_age set by the enclosing tool call, if any."""
+    return _max_age_override.get()
+
+
+def _endpoint_path(endpoint: str) -> str:
+    return (endpoint or "").split("?", 1)[0].strip("/")
+
+
+def _is_negative_cacheable(result: Dict[str, Any]) -> bool:
+    error = result.get("error")
+    if not isinstance(error, dict):
+        return False
+    full_response = error.get("full_response")
+    if isinstance(full_response, dict) and full_response.get("status_code") == 404:
+        return True
+    details = error.get("details")
+    graph_error = details.get("error") if isinstance(details, dict) else None
+    if not isinstance(graph_error, dict):
+        return False
+    code = graph_error.get("code")
+    return code in _NEGATIVE_ERROR_CODES or (code == 100 and graph_error.get("error_subcode") == 33)
+
+
+def _object_ids(endpoint: str, params: Optional[Dict[str, Any]], result: Any) -> Set[str]:
+    """Graph object IDs a cached response depends on, used for invalidation."""
+    ids: Set[str] = set()
+    root = _endpoint_path(endpoint).split("/", 1)[0]
+    if root:
+        ids.add(root)
+    if params and params.get("ids"):
+        ids.update(str(params["ids"]).split(","))
+    if isinstance(result, dict):
+        if "id" in result:
+            ids.add(str(result["id"]))
+        data = result.get("data")
+        if isinstance(data, list):
+            ids.update(str(item["id"]) for item in data if isinstance(item, dict) and "id" in item)
+    return ids
+
+
+class _Entry:
+    __slots__ = ("value", "size", "stored_at", "expires_at", "tags")
+
+    def __init__(self, value: str, stored_at: float, expires_at: float, tags: Set[str]):
+        self.value = value
+        self.size = len(value)
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.tags = tags
+
+
+class ResponseCache:
+    """TTL + LRU cache of Graph GET responses with write invalidation."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 2000,
+        max_bytes: int = 32 * 1024 * 1024,
+        default_ttl: float = DEFAULT_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        ttl_rules: Sequence[Tuple[str, float]] = DEFAULT_TTL_RULES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in ttl_rules]
+        self._clock = clock
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._by_object: Dict[str, Set[tuple]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(
+            enabled=not get_env_bool("META_ADS_DISABLE_CACHE"),
+            max_entries=get_env_int("META_ADS_CACHE_MAX_ENTRIES", 2000),
+            max_bytes=int(get_env_float("META_ADS_CACHE_MAX_MB", 32.0) * 1024 * 1024),
+            default_ttl=get_env_float("META_ADS_CACHE_DEFAULT_TTL", DEFAULT_TTL),
+        )
+
+    @staticmethod
+    def key(endpoint: str, access_token: str, params: Optional[Dict[str, Any]]) -> tuple:
+        canonical_params = json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+        token_hash = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+        return (_endpoint_path(endpoint), canonical_params, token_hash)
+
+    def ttl_for(self, endpoint: str) -> float:
+        path = _endpoint_path(endpoint)
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    def get(
+        self,
+        endpoint: str,
+        access_token: str,
+        params: Optional[Dict[str, Any]],
+        max_age: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of the cached response, or None on a miss."""
+        if not self.enabled or max_age == 0:
+            return None
+        key = self.key(endpoint, access_token, params)
+        entry = self._entries.get(key)
+        now = self._clock()
+        if entry is not None and now >= entry.expires_at:
+            self._remove(key)
+            entry = None
+        if entry is None or (max_age is not None and now - entry.stored_at > max_age):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.debug(f"Cache hit for GET {key[0]} (age {now - entry.stored_at:.1f}s)")
+        return json.loads(entry.value)
+
+    def put(
+        self,
+        endpoint: str,
+        access_token: str,
+        params: Optional[Dict[str, Any]],
+        result: Any,
+    ) -> None:
+        """Store a GET response if it is a success or a cacheable 'not found'."""
+        if not self.enabled or not isinstance(result, dict):
+            return
+        if "error" in result:
+            if not _is_negative_cacheable(result):
+                return
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+        try:
+            value = json.dumps(result, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return
+        if len(value) > self.max_bytes:
+            return
+
+        key = self.key(endpoint, access_token, params)
+        if key in self._entries:
+            self._remove(key)
+        now = self._clock()
+        entry = _Entry(value, now, now + ttl, _object_ids(endpoint, params, result))
+        self._entries[key] = entry
+        self._bytes += entry.size
+        for object_id in entry.tags:
+            self._by_object.setdefault(object_id, set()).add(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, object_id: str) -> int:
+        """Drop every entry that depends on `object_id`; returns how many."""
+        keys = list(self._by_object.get(str(object_id), ()))
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def invalidate_for_write(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Drop entries made stale by a write to `endpoint` with `params`."""
+        if not self._entries:
+            return 0
+        object_ids = {_endpoint_path(endpoint).split("/", 1)[0]}
+        for name, value in (params or {}).items():
+            if _PARENT_PARAM_RE.match(str(name)) and isinstance(value, (str, int)):
+                object_ids.add(str(value))
+        dropped = sum(self.invalidate(object_id) for object_id in object_ids if object_id)
+        if dropped:
+            logger.debug(f"Write to {endpoint} invalidated {dropped} cached responses")
+        return dropped
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_object.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for object_id in entry.tags:
+            keys = self._by_object.get(object_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_object[object_id]
+
+
+# Process-wide cache shared by all make_api_request calls
+response_cache = ResponseCache.from_env()
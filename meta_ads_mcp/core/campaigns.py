@@ -2,7 +2,7 @@
 
 import json
 from typing import List, Optional, Dict, Any, Union
-from .api import meta_api_tool, make_api_request, ensure_act_prefix
+from .api import meta_api_tool, make_api_request, collect_edge, ensure_act_prefix
 from .accounts import get_ad_accounts
 from .server import mcp_server
 
@@ -15,8 +15,12 @@ async def get_campaigns(
     limit: int = 10, 
     status_filter: str = "", 
     objective_filter: Union[str, List[str]] = "", 
-    after: str = ""
-) -> str:
+    after: str = "",
+    max_age: Optional[int] = None,
+    max_items: Optional[int] = None,
+    fetch_all: bool = False,
+    output_format: Optional[str] = None
+) -> Union[str, Dict[str, Any]]:
     """
     Get campaigns for a Meta Ads account with optional filtering.
     
@@ -39,6 +43,17 @@ async def get_campaigns(
                          Examples: 'OUTCOME_LEADS' or ['OUTCOME_LEADS', 'OUTCOME_SALES'].
                          Leave empty for all objectives.
         after: Pagination cursor to get the next set of results
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
+        max_items: Follow pagination cursors and return up to this many campaigns in one call
+                   (fetched in pages of the larger of `limit` and META_ADS_EDGE_PAGE_SIZE,
+                   default 100; capped at 5000)
+        fetch_all: Follow pagination cursors and return all campaigns (up to 5000)
+        output_format: "table" returns {"columns": [...], "rows": [[...]]} with nested fields
+                       flattened, actions/action_values pivoted into one column per action_type
+                       and empty fields dropped (3-5x smaller for many rows); "compact" returns
+                       JSON without indentation; "pretty" returns indented JSON (default: the
+                       server's setting, normally "pretty")
     """
     # Require explicit account_id
     if not account_id:
@@ -80,14 +95,18 @@ async def get_campaigns(
     if after:
         params["after"] = after
     
-    data = await make_api_request(endpoint, access_token, params)
+    if max_items or fetch_all:
+        data = await collect_edge(endpoint, access_token, params, max_items=max_items)
+    else:
+        data = await make_api_request(endpoint, access_token, params)
     
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_campaign_details(campaign_id: str, access_token: Optional[str] = None) -> str:
+async def get_campaign_details(campaign_id: str, access_token: Optional[str] = None,
+                               max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Get detailed information about a specific campaign.
 
@@ -98,6 +117,8 @@ async def get_campaign_details(campaign_id: str, access_token: Optional[str] = N
     Args:
         campaign_id: Meta Ads campaign ID
         access_token: Meta API access token (optional - will use cached token if not provided)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     """
     if not campaign_id:
         return json.dumps({"error": "No campaign ID provided"}, indent=2)
@@ -109,7 +130,7 @@ async def get_campaign_details(campaign_id: str, access_token: Optional[str] = N
     
     data = await make_api_request(endpoint, access_token, params)
     
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
@@ -130,7 +151,7 @@ async def create_campaign(
     campaign_budget_optimization: Optional[bool] = None,
     ab_test_control_setups: Optional[List[Dict[str, Any]]] = None,
     use_adset_level_budgets: bool = False
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Create a new Facebook or Instagram ad campaign in a Meta Ads account. Use this to start
     a new campaign with an ODAX objective (OUTCOME_LEADS, OUTCOME_SALES, OUTCOME_AWARENESS,
@@ -250,7 +271,7 @@ async def create_campaign(
         if compliance_warning:
             data["compliance_warning"] = compliance_warning
         
-        return json.dumps(data, indent=2)
+        return data
     except Exception as e:
         error_msg = str(e)
         return json.dumps({
@@ -277,7 +298,7 @@ async def update_campaign(
     objective: Optional[str] = None,  # Add objective if it's updatable
     use_adset_level_budgets: Optional[bool] = None,  # Add other updatable fields as needed based on API docs
     adset_budgets: Optional[List[Dict[str, Any]]] = None,
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Update an existing campaign in a Meta Ads account.
 
@@ -407,7 +428,7 @@ async def update_campaign(
                 "call update_campaign with adset_budgets=[{adset_id, daily_budget}, ...]."
             )
 
-        return json.dumps(data, indent=2)
+        return data
     except Exception as e:
         error_msg = str(e)
         # Include campaign_id in error for better context
@@ -0,0 +1,226 @@
+"""Record Graph API traffic to a cassette file and replay it offline.
+
+A slow agent session against a real account could not be reproduced locally,
+so the effect of caching or batching changes on it could not be measured.
+With a cassette configured, every HTTP request make_api_request sends (pages,
+?ids= lookups, batches and retries included) goes through it:
+
+- record: requests are sent to Meta as usual, and each request and response
+  is appended to the cassette with the time the response took;
+- replay: nothing is sent; responses are served from the cassette.
+
+    META_ADS_CASSETTE=~/session.jsonl.gz    cassette file (.gz is gzip-compressed)
+    META_ADS_CASSETTE_MODE=record|replay    default replay
+    META_ADS_CASSETTE_TIMING=1.0            replay: wait this multiple of the
+                                            recorded latency (default 0, no wait)
+
+A cassette is JSON lines, one interaction per line. Tokens never reach it:
+access_token and appsecret_proof are scrubbed from URLs and form bodies the
+same way error payloads are (_redact_url), and from URLs inside response
+bodies (paging next/previous links carry the token), and only the
+content-type and rate-limit usage response headers are kept. Replay matches requests on
+method, path, sorted query and body, ignoring the host and the token, so a
+cassette recorded with one token replays with any other. Identical requests
+get the recorded responses in order; once those run out the last one is
+repeated. A request that was never recorded gets a 404 Graph error.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+from .utils import logger, get_env_float
+
+RECORD = "record"
+REPLAY = "replay"
+
+_KEPT_HEADERS = ("content-type", "x-app-usage", "x-business-use-case-usage", "x-ad-account-usage")
+
+# A credential query value inside response text, e.g. a paging link's access_token=...
+_BODY_CREDENTIAL_RE = re.compile(r"((?:access_token|appsecret_proof)=)[^&\"\\\s#]+")
+
+
+def _scrub_query(query: str) -> str:
+    """Sorted query or form string with credentials redacted."""
+    from .api import _redact_url
+
+    if not query:
+        return ""
+    redacted = _redact_url(f"?{query}").lstrip("?")
+    return urlencode(sorted(parse_qsl(redacted, keep_blank_values=True)))
+
+
+def _scrub_body(text: str) -> str:
+    """Response text with the credential values of any URLs in it redacted."""
+    return _BODY_CREDENTIAL_RE.sub(r"\1REDACTED", text)
+
+
+def interaction_key(request: httpx.Request) -> str:
+    """How a request is matched against the cassette: method, path, query and body."""
+    query = _scrub_query(request.url.query.decode("ascii"))
+    key = f"{request.method} {request.url.path}"
+    if query:
+        key += f"?{query}"
+    body = _scrub_query(request.content.decode("utf-8", "replace")) if request.content else ""
+    if body:
+        key += f" {body}"
+    return key
+
+
+class Cassette:
+    """Records Graph responses to, or replays them from, a JSON lines file."""
+
+    def __init__(self, path: Optional[str] = None, mode: str = REPLAY, timing: float = 0.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Cassette mode must be {RECORD!r} or {REPLAY!r}, not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._interactions: Optional[Dict[str, Deque[Dict[str, Any]]]] = None
+        self._last: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_env(cls) -> "Cassette":
+        path = os.environ.get("META_ADS_CASSETTE", "").strip()
+        mode = os.environ.get("META_ADS_CASSETTE_MODE", REPLAY).strip().lower() or REPLAY
+        if mode not in (RECORD, REPLAY):
+            logger.warning("Ignoring invalid META_ADS_CASSETTE_MODE %r (using %s)", mode, REPLAY)
+            mode = REPLAY
+        if path:
+            path = os.path.expanduser(path)
+            logger.info("Graph API cassette: %s %s", mode, path)
+        return cls(path or None, mode, get_env_float("META_ADS_CASSETTE_TIMING", 0.0))
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def bind(self, client: httpx.AsyncClient) -> "CassetteClient":
+        """Wrap a Graph client so its requests go through this cassette."""
+        return CassetteClient(self, client)
+
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+
+    # Recording
+
+    def record(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        interaction = {
+            "request": interaction_key(request),
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers},
+            "elapsed": round(elapsed, 4),
+            "body": _scrub_body(response.text),
+        }
+        line = json.dumps(interaction, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                # A recording session starts a new cassette
+                self._file = self._open("w")
+            self._file.write(line)
+            self._file.flush()
+            self.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # Replay
+
+    def load(self) -> int:
+        """Read the cassette file; returns the number of interactions."""
+        interactions: Dict[str, Deque[Dict[str, Any]]] = {}
+        count = 0
+        try:
+            with self._open("r") as f:
+                for line in f:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        interactions.setdefault(interaction["request"], deque()).append(interaction)
+                        count += 1
+        except FileNotFoundError:
+            logger.warning("Cassette %s does not exist; every request will miss", self.path)
+        self._interactions = interactions
+        self._last = {}
+        return count
+
+    def lookup(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        """The next recorded interaction for a request, if any."""
+        if self._interactions is None:
+            self.load()
+        key = interaction_key(request)
+        queue = self._interactions.get(key)
+        if queue:
+            self._last[key] = queue.popleft()
+        return self._last.get(key)
+
+    async def replay(self, request: httpx.Request) -> httpx.Response:
+        interaction = self.lookup(request)
+        if interaction is None:
+            self.misses += 1
+            logger.warning("Cassette miss: %s", interaction_key(request))
+            return httpx.Response(404, request=request, json={"error": {
+                "message": f"No recorded response in cassette for {request.method} {request.url.path}",
+                "type": "CassetteMiss",
+                "code": 100,
+            }})
+        self.replayed += 1
+        if self.timing > 0:
+            await asyncio.sleep(interaction["elapsed"] * self.timing)
+        return httpx.Response(interaction["status"], headers=interaction["headers"],
+                              content=interaction["body"].encode("utf-8"), request=request)
+
+    def interactions(self) -> List[Dict[str, Any]]:
+        """All interactions in the cassette file, in recorded order."""
+        with self._open("r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+class CassetteClient:
+    """The subset of httpx.AsyncClient used for Graph requests, routed through a Cassette."""
+
+    def __init__(self, cassette: Cassette, client: httpx.AsyncClient):
+        self.cassette = cassette
+        self.client = client
+
+    async def get(self, url: str, params: Any = None, headers: Any = None) -> httpx.Response:
+        return await self._send(self.client.build_request("GET", url, params=params, headers=headers))
+
+    async def post(self, url: str, data: Any = None, headers: Any = None) -> httpx.Response:
+        return await self._send(self.client.build_request("POST", url, data=data, headers=headers))
+
+    async def put(self, url: str, params: Any = None, data: Any = None, headers: Any = None) -> httpx.Response:
+        return await self._send(self.client.build_request("PUT", url, params=params, data=data, headers=headers))
+
+    async def delete(self, url: str, params: Any = None, headers: Any = None) -> httpx.Response:
+        return await self._send(self.client.build_request("DELETE", url, params=params, headers=headers))
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        if self.cassette.mode == REPLAY:
+            return await self.cassette.replay(request)
+        started = time.monotonic()
+        response = await self.client.send(request)
+        self.cassette.record(request, response, time.monotonic() - started)
+        return response
+
+
+# Process-wide cassette (off unless META_ADS_CASSETTE is set)
+cassette = Cassette.from_env()
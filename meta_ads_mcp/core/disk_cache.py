@@ -0,0 +1,261 @@
+"""Persistent SQLite cache for slow-changing Graph metadata.
+
+Targeting catalogs (interests, behaviors, demographics), geo lookups, an
+account's currency and timezone, and page lists almost never change. They
+were still fetched from Meta again every time the process started, and stdio
+servers start once per client session. With META_ADS_DISK_CACHE=1 those
+responses are also kept in an SQLite database next to the token cache
+(~/.config/meta-ads-mcp/graph_cache.sqlite3 on Linux) so a cold session starts
+warm.
+
+- WAL journal mode, so concurrent server processes can read while one writes;
+- zlib-compressed JSON values;
+- one TTL per namespace (targeting, geo, account, pages);
+- a total size cap, enforced by dropping expired rows and then the least
+  recently read ones.
+
+Only successful responses are stored. Keys hash the endpoint, params and
+access token, so no token or request URL is written to disk. SQLite calls
+run in a worker thread to keep the event loop free. Any SQLite error disables
+the disk cache for the rest of the process instead of failing requests.
+"""
+
+import asyncio
+import json
+import hashlib
+import os
+import pathlib
+import platform
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from .cache import ResponseCache
+from .utils import logger, get_env_bool, get_env_float
+
+NAMESPACE_TTLS: Dict[str, float] = {
+    "targeting": 24 * 3600.0,
+    "geo": 30 * 24 * 3600.0,
+    "account": 24 * 3600.0,
+    "pages": 6 * 3600.0,
+}
+
+# Account fields that only change when someone edits the account settings.
+SLOW_ACCOUNT_FIELDS = frozenset({
+    "id", "account_id", "name", "currency", "timezone_id", "timezone_name",
+    "timezone_offset_hours_utc", "business_name", "business_city",
+    "business_country_code", "created_time", "owner",
+})
+
+_ACCOUNT_RE = re.compile(r"^act_\d+$")
+_PAGES_RE = re.compile(r"^[^/]+/(accounts|owned_pages|client_pages|assigned_pages|promote_pages)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    object_id TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_object_id ON entries (object_id);
+"""
+
+
+def default_cache_path() -> pathlib.Path:
+    """Platform-specific location, alongside the token cache and debug log."""
+    if platform.system() == "Windows":
+        base_path = pathlib.Path(os.environ.get("APPDATA", ""))
+    elif platform.system() == "Darwin":  # macOS
+        base_path = pathlib.Path.home() / "Library" / "Application Support"
+    else:  # Assume Linux/Unix
+        base_path = pathlib.Path.home() / ".config"
+    return base_path / "meta-ads-mcp" / "graph_cache.sqlite3"
+
+
+def namespace_for(endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Namespace of a GET worth persisting, or None for volatile data."""
+    path = (endpoint or "").split("?", 1)[0].strip("/")
+    params = params or {}
+    if path == "search":
+        return "geo" if params.get("type") == "adgeolocation" else "targeting"
+    if _ACCOUNT_RE.match(path):
+        fields = {f.strip() for f in str(params.get("fields", "")).split(",") if f.strip()}
+        if fields and fields <= SLOW_ACCOUNT_FIELDS and set(params) <= {"fields"}:
+            return "account"
+        return None
+    if _PAGES_RE.match(path):
+        return "pages"
+    return None
+
+
+class DiskCache:
+    """SQLite-backed cache of slow-changing Graph responses."""
+
+    def __init__(
+        self,
+        path: Optional[pathlib.Path] = None,
+        enabled: bool = True,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = pathlib.Path(path) if path else default_cache_path()
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttls = dict(NAMESPACE_TTLS, **(ttls or {}))
+        self._clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "DiskCache":
+        ttls = {}
+        for namespace, default in NAMESPACE_TTLS.items():
+            ttls[namespace] = get_env_float(f"META_ADS_DISK_CACHE_TTL_{namespace.upper()}", default)
+        path = os.environ.get("META_ADS_DISK_CACHE_PATH", "").strip()
+        return cls(
+            path=pathlib.Path(path).expanduser() if path else None,
+            enabled=get_env_bool("META_ADS_DISK_CACHE"),
+            max_bytes=int(get_env_float("META_ADS_DISK_CACHE_MAX_MB", 64.0) * 1024 * 1024),
+            ttls=ttls,
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            logger.info(f"Disk cache opened at {self.path}")
+        return self._conn
+
+    def _disable(self, error: Exception) -> None:
+        logger.warning(f"Disabling disk cache after SQLite error: {error}")
+        self.enabled = False
+        self.close()
+
+    @staticmethod
+    def _key(endpoint: str, access_token: str, params: Optional[Dict[str, Any]]) -> str:
+        return hashlib.sha256(json.dumps(ResponseCache.key(endpoint, access_token, params)).encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        endpoint: str,
+        access_token: str,
+        params: Optional[Dict[str, Any]],
+        max_age: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the stored response, or None when missing, expired or older than max_age."""
+        if not self.enabled or max_age == 0 or namespace_for(endpoint, params) is None:
+            return None
+        key = self._key(endpoint, access_token, params)
+        now = self._clock()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, stored_at FROM entries WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is None or (max_age is not None and now - row[1] > max_age):
+                    return None
+                with conn:
+                    conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(zlib.decompress(row[0]))
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            self._disable(e)
+            return None
+
+    def put(self, endpoint: str, access_token: str, params: Optional[Dict[str, Any]], result: Any) -> None:
+        """Persist a successful response if its endpoint belongs to a namespace."""
+        if not self.enabled or not isinstance(result, dict) or "error" in result:
+            return
+        namespace = namespace_for(endpoint, params)
+        if namespace is None or self.ttls.get(namespace, 0) <= 0:
+            return
+        value = zlib.compress(json.dumps(result, separators=(",", ":")).encode("utf-8"))
+        if len(value) > self.max_bytes:
+            return
+        now = self._clock()
+        object_id = (endpoint or "").split("?", 1)[0].strip("/").split("/", 1)[0]
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(key, namespace, object_id, value, size, stored_at, expires_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (self._key(endpoint, access_token, params), namespace, object_id, value,
+                         len(value), now, now + self.ttls[namespace], now),
+                    )
+                    self._enforce_size(conn, now)
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def _enforce_size(self, conn: sqlite3.Connection, now: float) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        while total > self.max_bytes:
+            row = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            total -= row[1]
+
+    def invalidate_for_write(self, endpoint: str) -> None:
+        """Drop stored responses for the object a write targets."""
+        if not self.enabled:
+            return
+        object_id = (endpoint or "").split("?", 1)[0].strip("/").split("/", 1)[0]
+        if not object_id:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM entries WHERE object_id = ?", (object_id,))
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute("DELETE FROM entries")
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def aget(self, *args: Any, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """get() in a worker thread."""
+        return await asyncio.to_thread(self.get, *args, **kwargs)
+
+    async def aput(self, *args: Any) -> None:
+        """put() in a worker thread."""
+        await asyncio.to_thread(self.put, *args)
+
+
+# Process-wide disk cache (off unless META_ADS_DISK_CACHE=1)
+disk_cache = DiskCache.from_env()
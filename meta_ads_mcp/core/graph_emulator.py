@@ -0,0 +1,1141 @@
+"""Local stand-in for graph.facebook.com and the Pipeboard token endpoints.
+
+The unit tests mock make_api_request per test and the e2e tests need a real
+token, so nothing exercised the whole request path (pooling, retries, the
+rate limiter, paging, batching) without the network. GraphEmulator is a plain
+ASGI app that answers Graph API requests from seeded synthetic data:
+
+- ad accounts with campaigns, ad sets, ads and ad creatives (me/adaccounts,
+  act_<id>/campaigns|adsets|ads|adcreatives|insights, <id>/<edge>, <id> and
+  ?ids= lookups), with `fields`, `effective_status` and `filtering` support;
+- insights computed deterministically per ad and day, aggregated to the
+  requested level, time_increment and breakdowns, with actions,
+  action_values and cost_per_action_type listing conversions under Meta's
+  roll-up action types (omni_purchase, offsite_conversion.fb_pixel_purchase,
+  ...) as well as the canonical one;
+- cursor pagination (paging.cursors plus a `next` URL);
+- the Batch API (POST / with batch=[...]; JSONPath references between
+  sub-requests are not resolved);
+- creates (POST act_<id>/campaigns, ...), updates and deletes;
+- X-App-Usage, X-Business-Use-Case-Usage and X-Ad-Account-Usage headers
+  computed from the calls made in a sliding window, and throttling errors
+  (code 17 / 80004) once a configured call limit is exceeded;
+- injectable latency and faults (see Fault);
+- GET /api/meta/token and POST /api/meta/auth as served by pipeboard.co/api.
+
+Run it as a server and point the MCP server at it:
+
+    python -m meta_ads_mcp.core.graph_emulator --port 8765 --latency 0.05
+
+    META_GRAPH_API_BASE=http://127.0.0.1:8765/v24.0 \\
+    PIPEBOARD_API_BASE=http://127.0.0.1:8765/api \\
+    META_ACCESS_TOKEN=emulator-token python -m meta_ads_mcp --transport streamable-http
+
+The data scales to large advertisers: EmulatorData.scaled(20000) (or
+--total-ads 20000) is one account with 20,000 ads, and GraphEmulator.pages()
+returns the Graph pages of an edge or insights query without HTTP, for
+fixtures and benchmarks.
+
+A running emulator is controlled over HTTP: GET /_emulator/stats, POST
+/_emulator/faults (a JSON Fault spec), DELETE /_emulator/faults and POST
+/_emulator/reset. In-process, hand it to httpx directly:
+
+    emulator = GraphEmulator(seed=7)
+    httpx.AsyncClient(transport=httpx.ASGITransport(app=emulator))
+"""
+
+import argparse
+import asyncio
+import base64
+import datetime
+import itertools
+import json
+import random
+import re
+import secrets
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from .metrics import endpoint_family
+
+EMULATOR_ACCESS_TOKEN = "emulator-token"
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 500
+MAX_BATCH_SIZE = 50
+
+_VERSION_RE = re.compile(r"^v\d+\.\d+$")
+_ACCOUNT_RE = re.compile(r"^act_\d+$")
+
+OBJECTIVES = ("OUTCOME_SALES", "OUTCOME_TRAFFIC", "OUTCOME_LEADS", "OUTCOME_AWARENESS", "OUTCOME_ENGAGEMENT")
+OPTIMIZATION_GOALS = {
+    "OUTCOME_SALES": "OFFSITE_CONVERSIONS",
+    "OUTCOME_TRAFFIC": "LINK_CLICKS",
+    "OUTCOME_LEADS": "LEAD_GENERATION",
+    "OUTCOME_AWARENESS": "REACH",
+    "OUTCOME_ENGAGEMENT": "POST_ENGAGEMENT",
+}
+
+# Share of each day's delivery that falls into each breakdown value.
+BREAKDOWN_SHARES: Dict[str, Sequence[Tuple[str, float]]] = {
+    "age": (("18-24", 0.18), ("25-34", 0.31), ("35-44", 0.24), ("45-54", 0.15), ("55-64", 0.08), ("65+", 0.04)),
+    "gender": (("female", 0.52), ("male", 0.45), ("unknown", 0.03)),
+    "country": (("US", 0.58), ("GB", 0.14), ("CA", 0.11), ("DE", 0.10), ("FR", 0.07)),
+    "publisher_platform": (("facebook", 0.54), ("instagram", 0.38), ("audience_network", 0.04), ("messenger", 0.04)),
+    "platform_position": (("feed", 0.61), ("story", 0.22), ("reels", 0.12), ("search", 0.05)),
+    "device_platform": (("mobile", 0.86), ("desktop", 0.14)),
+}
+
+# Edges served for each object type.
+_EDGES = {
+    "account": ("campaigns", "adsets", "ads", "adcreatives", "insights"),
+    "campaign": ("adsets", "ads", "insights"),
+    "adset": ("ads", "insights"),
+    "ad": ("adcreatives", "insights"),
+    "creative": (),
+}
+_CREATE_EDGES = {"campaigns": "campaign", "adsets": "adset", "ads": "ad", "adcreatives": "creative"}
+_LEVELS = ("account", "campaign", "adset", "ad")
+
+_DATE_PRESETS = {
+    "today": (0, 0),
+    "yesterday": (1, 1),
+    "last_3d": (3, 1),
+    "last_7d": (7, 1),
+    "last_14d": (14, 1),
+    "last_28d": (28, 1),
+    "last_30d": (30, 1),
+    "last_90d": (90, 1),
+}
+
+# Conversions are also reported under these roll-up action types, as Meta does
+ROLLUP_ACTION_PREFIXES = ("omni_", "onsite_web_", "onsite_web_app_", "offsite_conversion.fb_pixel_")
+_ENGAGEMENT_ACTIONS = ("link_click", "landing_page_view", "post_engagement", "page_engagement", "video_view")
+_CONVERSION_ACTIONS = ("add_to_cart", "initiate_checkout", "purchase")
+_INSIGHTS_CACHE_SIZE = 8
+
+_METRICS = ("impressions", "reach", "clicks", "spend", "ctr", "cpc", "cpm", "frequency",
+            "actions", "action_values", "cost_per_action_type", "purchase_roas")
+_DEFAULT_INSIGHT_FIELDS = ("impressions", "spend")
+
+
+class GraphError(Exception):
+    """A Graph API error response (raised inside handlers, answered as JSON)."""
+
+    def __init__(self, message: str, code: int, status: int = 400, subcode: Optional[int] = None,
+                 error_type: str = "OAuthException", is_transient: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.body: Dict[str, Any] = {
+            "message": message,
+            "type": error_type,
+            "code": code,
+            "fbtrace_id": secrets.token_hex(8),
+        }
+        if subcode is not None:
+            self.body["error_subcode"] = subcode
+        if is_transient:
+            self.body["is_transient"] = True
+
+
+def _unsupported(method: str, object_id: str) -> GraphError:
+    return GraphError(
+        f"Unsupported {method.lower()} request. Object with ID '{object_id}' does not exist, cannot be "
+        "loaded due to missing permissions, or does not support this operation.",
+        code=100, subcode=33, error_type="GraphMethodException",
+    )
+
+
+class Fault:
+    """An injected failure or delay for requests whose path matches.
+
+    Args:
+        path: regular expression searched in the Graph path (no version
+            prefix, e.g. "act_\\d+/insights"); None matches every request
+        method: only match this HTTP method
+        status: HTTP status of the error response; None only adds latency
+        code, subcode, message: the Graph error
+        times: stop matching after this many hits (None: no limit)
+        probability: chance that a matching request is hit
+        latency: extra seconds before answering a hit request
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        method: Optional[str] = None,
+        status: Optional[int] = 500,
+        code: int = 2,
+        subcode: Optional[int] = None,
+        message: str = "An unexpected error has occurred. Please retry your request later.",
+        times: Optional[int] = None,
+        probability: float = 1.0,
+        latency: float = 0.0,
+    ):
+        self.path = path
+        self.pattern = re.compile(path) if path else None
+        self.method = method.upper() if method else None
+        self.status = status
+        self.code = code
+        self.subcode = subcode
+        self.message = message
+        self.times = times
+        self.probability = probability
+        self.latency = latency
+        self.hits = 0
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "Fault":
+        allowed = ("path", "method", "status", "code", "subcode", "message", "times", "probability", "latency")
+        unknown = set(spec) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unknown fault fields: {', '.join(sorted(unknown))}")
+        return cls(**spec)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "method": self.method, "status": self.status, "code": self.code,
+                "subcode": self.subcode, "message": self.message, "times": self.times,
+                "probability": self.probability, "latency": self.latency, "hits": self.hits}
+
+    def matches(self, method: str, path: str, rng: random.Random) -> bool:
+        if self.times is not None and self.hits >= self.times:
+            return False
+        if self.method is not None and self.method != method:
+            return False
+        if self.pattern is not None and not self.pattern.search(path):
+            return False
+        if self.probability < 1.0 and rng.random() >= self.probability:
+            return False
+        self.hits += 1
+        return True
+
+    def error(self) -> GraphError:
+        return GraphError(self.message, code=self.code, status=self.status, subcode=self.subcode,
+                          is_transient=self.status >= 500)
+
+
+class EmulatorData:
+    """Seeded synthetic ad accounts: campaigns, ad sets, ads, creatives and insights.
+
+    The same seed always produces the same objects and the same metrics, so
+    results can be compared across runs.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        accounts: int = 2,
+        campaigns_per_account: int = 3,
+        adsets_per_campaign: int = 2,
+        ads_per_adset: int = 2,
+        today: Optional[datetime.date] = None,
+    ):
+        self.seed = seed
+        self.today = today or datetime.date.today()
+        self.user = {"id": "100000000000001", "name": "Emulator User"}
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.types: Dict[str, str] = {}
+        self.edges: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        self._rng = random.Random(seed)
+        self._next_id = 120200000000000
+        self._counts: Counter = Counter()
+        for index in range(accounts):
+            account_id = self.add_account(f"Emulator Account {index + 1}")
+            for _ in range(campaigns_per_account):
+                campaign_id = self.create("campaign", account_id, {})
+                for _ in range(adsets_per_campaign):
+                    adset_id = self.create("adset", account_id, {"campaign_id": campaign_id})
+                    for _ in range(ads_per_adset):
+                        self.create("ad", account_id, {"adset_id": adset_id})
+
+    @classmethod
+    def scaled(cls, ads: int, seed: int = 0, adsets_per_campaign: int = 10, ads_per_adset: int = 10,
+               today: Optional[datetime.date] = None) -> "EmulatorData":
+        """One ad account with exactly `ads` ads, e.g. scaled(20000) for a large advertiser."""
+        data = cls(seed=seed, accounts=0, today=today)
+        account_id = data.add_account("Emulator Account 1")
+        remaining = ads
+        while remaining > 0:
+            campaign_id = data.create("campaign", account_id, {})
+            for _ in range(adsets_per_campaign):
+                if remaining <= 0:
+                    break
+                adset_id = data.create("adset", account_id, {"campaign_id": campaign_id})
+                for _ in range(min(ads_per_adset, remaining)):
+                    data.create("ad", account_id, {"adset_id": adset_id})
+                    remaining -= 1
+        return data
+
+    def _new_id(self) -> str:
+        self._next_id += 1
+        return str(self._next_id)
+
+    def _add(self, kind: str, obj: Dict[str, Any], parents: Iterable[str]) -> str:
+        object_id = obj["id"]
+        self.objects[object_id] = obj
+        self.types[object_id] = kind
+        self._counts[kind] += 1
+        edge = {"campaign": "campaigns", "adset": "adsets", "ad": "ads", "creative": "adcreatives"}.get(kind)
+        for parent in parents:
+            self.edges[(parent, edge)].append(object_id)
+        return object_id
+
+    def add_account(self, name: str) -> str:
+        number = str(10_000_000_000_000 + len(self.accounts()) + 1)
+        return self._add("account", {
+            "id": f"act_{number}",
+            "account_id": number,
+            "name": name,
+            "account_status": 1,
+            "currency": "USD",
+            "timezone_name": "America/Los_Angeles",
+            "amount_spent": str(self._rng.randint(100_000, 50_000_000)),
+            "balance": "0",
+            "business": {"id": "200000000000001", "name": "Emulator Business"},
+        }, ())
+
+    def accounts(self) -> List[str]:
+        return [object_id for object_id, kind in self.types.items() if kind == "account"]
+
+    def create(self, kind: str, account_id: str, fields: Dict[str, Any]) -> str:
+        """Create a campaign, ad set, ad or creative under `account_id`.
+
+        Missing fields are filled in with synthetic values; ad sets need a
+        campaign_id and ads an adset_id.
+        """
+        rng = self._rng
+        object_id = self._new_id()
+        number = self._counts[kind] + 1
+        obj: Dict[str, Any] = {"id": object_id, "account_id": self.objects[account_id]["account_id"]}
+        status = fields.get("status") or ("PAUSED" if rng.random() < 0.2 else "ACTIVE")
+        created = datetime.datetime.combine(self.today - datetime.timedelta(days=rng.randint(30, 400)),
+                                            datetime.time(rng.randint(0, 23), rng.randint(0, 59)))
+        obj["created_time"] = created.strftime("%Y-%m-%dT%H:%M:%S+0000")
+        parents = [account_id]
+
+        if kind == "campaign":
+            objective = fields.get("objective") or rng.choice(OBJECTIVES)
+            obj.update({
+                "name": f"Campaign {number} - {objective.split('_', 1)[-1].title()}",
+                "objective": objective,
+                "status": status,
+                "effective_status": status,
+                "buying_type": "AUCTION",
+                "daily_budget": str(rng.choice((2000, 5000, 10000, 25000))),
+                "special_ad_categories": [],
+            })
+        elif kind == "adset":
+            campaign = self._parent(fields, "campaign_id", "campaign")
+            obj.update({
+                "name": f"Ad Set {number}",
+                "campaign_id": campaign["id"],
+                "status": status,
+                "effective_status": status if campaign["effective_status"] == "ACTIVE" else "CAMPAIGN_PAUSED",
+                "optimization_goal": OPTIMIZATION_GOALS.get(campaign["objective"], "LINK_CLICKS"),
+                "billing_event": "IMPRESSIONS",
+                "bid_strategy": "LOWEST_COST_WITHOUT_CAP",
+                "targeting": {"geo_locations": {"countries": ["US"]}, "age_min": 18, "age_max": 65},
+            })
+            parents.append(campaign["id"])
+        elif kind == "ad":
+            adset = self._parent(fields, "adset_id", "adset")
+            creative = fields.get("creative")
+            creative_id = str(creative.get("creative_id")) if isinstance(creative, dict) else None
+            if self.types.get(creative_id) != "creative":
+                creative_id = self.create("creative", account_id, {})
+            if adset["effective_status"] != "ACTIVE":
+                effective = adset["effective_status"] if adset["effective_status"] == "CAMPAIGN_PAUSED" else "ADSET_PAUSED"
+            else:
+                effective = status
+            obj.update({
+                "name": f"Ad {number}",
+                "adset_id": adset["id"],
+                "campaign_id": adset["campaign_id"],
+                "status": status,
+                "effective_status": effective,
+                "creative": {"id": creative_id},
+            })
+            parents.extend([adset["campaign_id"], adset["id"]])
+            # Daily delivery profile used for insights
+            obj["_profile"] = (rng.randint(500, 20000), rng.uniform(0.004, 0.03),
+                               rng.uniform(4.0, 18.0), rng.uniform(0.01, 0.06))
+        elif kind == "creative":
+            obj.update({
+                "name": f"Creative {number}",
+                "title": f"Headline {number}",
+                "body": f"Primary text for creative {number}.",
+                "image_hash": f"{rng.getrandbits(128):032x}",
+                "image_url": f"https://scontent.example.com/emulator/{object_id}.jpg",
+                "thumbnail_url": f"https://scontent.example.com/emulator/{object_id}_t.jpg",
+                "object_type": "SHARE",
+            })
+        else:
+            raise ValueError(f"Cannot create objects of type {kind}")
+
+        obj.update({key: value for key, value in fields.items() if key not in ("campaign_id", "adset_id", "creative")})
+        self._add(kind, obj, parents)
+        if kind == "ad":
+            self.edges[(object_id, "adcreatives")].append(obj["creative"]["id"])
+        return object_id
+
+    def _parent(self, fields: Dict[str, Any], key: str, kind: str) -> Dict[str, Any]:
+        parent_id = str(fields.get(key) or "")
+        if self.types.get(parent_id) != kind:
+            raise GraphError(f"(#100) Param {key} must be a valid {kind} ID", code=100)
+        return self.objects[parent_id]
+
+    def account_of(self, object_id: str) -> Optional[str]:
+        """The act_<id> an object belongs to, if known."""
+        obj = self.objects.get(object_id)
+        if obj is None:
+            return None
+        return f"act_{obj['account_id']}"
+
+    def ads_under(self, object_id: str) -> List[str]:
+        if self.types.get(object_id) == "ad":
+            return [object_id]
+        return list(self.edges.get((object_id, "ads"), ()))
+
+    def ad_day(self, ad_id: str, day: datetime.date) -> Dict[str, float]:
+        """Synthetic delivery of one ad on one day (the same for every call)."""
+        impressions_mean, ctr, cpm, cvr = self.objects[ad_id]["_profile"]
+        rng = random.Random(f"{self.seed}:{ad_id}:{day.isoformat()}")
+        impressions = int(impressions_mean * rng.uniform(0.6, 1.4))
+        clicks = int(impressions * ctr * rng.uniform(0.8, 1.2))
+        purchases = int(clicks * cvr * rng.uniform(0.5, 1.5))
+        delivery = {
+            "impressions": impressions,
+            "reach": int(impressions / rng.uniform(1.1, 1.8)),
+            "clicks": clicks,
+            "link_click": int(clicks * 0.8),
+            "purchase": purchases,
+            "purchase_value": round(purchases * rng.uniform(30.0, 90.0), 2),
+            "spend": round(impressions / 1000.0 * cpm, 2),
+        }
+        # Drawn after the metrics above so those stay the same for a seed
+        average_value = delivery["purchase_value"] / purchases if purchases else rng.uniform(30.0, 90.0)
+        delivery["landing_page_view"] = int(delivery["link_click"] * rng.uniform(0.6, 0.9))
+        delivery["post_engagement"] = int(clicks * rng.uniform(1.2, 2.0))
+        delivery["page_engagement"] = delivery["post_engagement"] + int(clicks * rng.uniform(0.0, 0.1))
+        delivery["video_view"] = int(impressions * rng.uniform(0.05, 0.2))
+        delivery["initiate_checkout"] = int(purchases * rng.uniform(1.2, 2.0))
+        delivery["add_to_cart"] = int(delivery["initiate_checkout"] * rng.uniform(1.5, 3.0))
+        delivery["initiate_checkout_value"] = round(delivery["initiate_checkout"] * average_value, 2)
+        delivery["add_to_cart_value"] = round(delivery["add_to_cart"] * average_value, 2)
+        return delivery
+
+
+def _cursor(index: int) -> str:
+    return base64.urlsafe_b64encode(f"i:{index}".encode()).decode().rstrip("=")
+
+
+def _cursor_index(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        if raw.startswith("i:"):
+            return int(raw[2:])
+    except (ValueError, UnicodeDecodeError):
+        pass
+    raise GraphError("(#100) Invalid cursor", code=100)
+
+
+def _split_fields(spec: str) -> Dict[str, Optional[str]]:
+    """Top-level names of a `fields` spec, mapped to their {sub-fields} if any."""
+    fields: Dict[str, Optional[str]] = {}
+    depth = 0
+    current = ""
+    for char in spec + ",":
+        if char in "{(":
+            depth += 1
+        elif char in "})":
+            depth -= 1
+        if char == "," and depth == 0:
+            current = current.strip()
+            if current:
+                name = re.split(r"[{.(]", current, 1)[0]
+                sub = re.search(r"\{(.*)\}$", current)
+                fields[name] = sub.group(1) if sub else None
+            current = ""
+        else:
+            current += char
+    return fields
+
+
+def _json_param(value: Any) -> Any:
+    """Decode a JSON-encoded object or array parameter; other values are returned as they are."""
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _format_metric(value: float) -> str:
+    """Graph returns metric values as strings, ratios with up to 6 decimals."""
+    return f"{value:.6f}".rstrip("0").rstrip(".") or "0"
+
+
+class _UsageWindow:
+    """Calls made in the last `window` seconds."""
+
+    def __init__(self, window: float):
+        self.window = window
+        self.calls: Deque[float] = deque()
+
+    def _trim(self, now: float) -> None:
+        while self.calls and self.calls[0] <= now - self.window:
+            self.calls.popleft()
+
+    def hit(self, now: float) -> int:
+        self._trim(now)
+        self.calls.append(now)
+        return len(self.calls)
+
+    def count(self, now: float) -> int:
+        self._trim(now)
+        return len(self.calls)
+
+    def reset_seconds(self, now: float) -> float:
+        self._trim(now)
+        return max(0.0, self.calls[0] + self.window - now) if self.calls else 0.0
+
+
+class GraphEmulator:
+    """ASGI app answering Graph API and Pipeboard token requests from EmulatorData.
+
+    Args:
+        data: objects to serve (default: EmulatorData(seed))
+        seed: seed for the default data and for fault probabilities and jitter
+        latency: seconds to wait before answering each HTTP request
+        jitter: up to this many extra seconds, drawn uniformly per request
+        app_call_limit: calls per usage window after which every request is
+            throttled with code 17 (X-App-Usage call_count reaches 100)
+        account_call_limit: calls per ad account and window after which that
+            account is throttled with code 80004
+        usage_window: length of the sliding usage window in seconds
+        access_tokens: accept only these tokens (default: any non-empty token)
+    """
+
+    def __init__(
+        self,
+        data: Optional[EmulatorData] = None,
+        seed: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        app_call_limit: int = 10000,
+        account_call_limit: int = 2000,
+        usage_window: float = 300.0,
+        access_tokens: Optional[Iterable[str]] = None,
+    ):
+        self.data = data or EmulatorData(seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.app_call_limit = app_call_limit
+        self.account_call_limit = account_call_limit
+        self.usage_window = usage_window
+        self.access_tokens = set(access_tokens) if access_tokens is not None else None
+        self.pipeboard_token = EMULATOR_ACCESS_TOKEN
+        self.faults: List[Fault] = []
+        self._rng = random.Random(seed)
+        self._insights_cache: "OrderedDict[Tuple[Any, ...], List[Dict[str, Any]]]" = OrderedDict()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget usage windows, statistics and faults (the data is kept)."""
+        self._app_usage = _UsageWindow(self.usage_window)
+        self._account_usage: Dict[str, _UsageWindow] = {}
+        self.faults.clear()
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "graph_calls": 0,
+            "batches": 0,
+            "throttled": 0,
+            "faults": 0,
+            "by_family": Counter(),
+        }
+
+    def inject(self, **spec: Any) -> Fault:
+        """Add a Fault (see its arguments) and return it."""
+        fault = Fault(**spec)
+        self.faults.append(fault)
+        return fault
+
+    # ASGI
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        status, payload, extra_headers = await self._dispatch(
+            scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1"), body, headers, scope)
+
+        content = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        response_headers = [(b"content-type", b"application/json; charset=UTF-8"),
+                            (b"content-length", str(len(content)).encode())]
+        response_headers.extend((name.encode(), value.encode()) for name, value in extra_headers.items())
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": content})
+
+    async def _dispatch(self, method: str, path: str, query: str, body: bytes, headers: Dict[str, str],
+                        scope: Dict[str, Any]) -> Tuple[int, Any, Dict[str, str]]:
+        if path.startswith("/_emulator/"):
+            return self._control(method, path[len("/_emulator/"):], body)
+
+        self.stats["requests"] += 1
+        delay = self.latency + (self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        origin = f"{scope.get('scheme', 'http')}://{headers.get('host', 'localhost')}"
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        if body and "json" not in headers.get("content-type", ""):
+            params.update(parse_qsl(body.decode("utf-8"), keep_blank_values=True))
+
+        if path.startswith("/api/"):
+            return self._pipeboard(method, path[len("/api/"):], params, origin)
+
+        parts = [part for part in path.split("/") if part]
+        version = ""
+        if parts and _VERSION_RE.match(parts[0]):
+            version = parts.pop(0)
+        base = origin + (f"/{version}" if version else "")
+
+        token = params.pop("access_token", None)
+        if not token and headers.get("authorization", "").lower().startswith("bearer "):
+            token = headers["authorization"][7:].strip()
+        params.pop("appsecret_proof", None)
+
+        graph_path = "/".join(parts)
+        if method == "POST" and not graph_path and "batch" in params:
+            return await self._batch(params, token, base)
+        return await self._graph_call(method, graph_path, params, token, base)
+
+    async def _graph_call(self, method: str, path: str, params: Dict[str, str], token: Optional[str],
+                          base: str) -> Tuple[int, Any, Dict[str, str]]:
+        """Usage accounting, throttling, faults and the request itself."""
+        self.stats["graph_calls"] += 1
+        self.stats["by_family"][endpoint_family(path)] += 1
+        now = time.monotonic()
+        account_id = self._account_for(path, params)
+        app_calls = self._app_usage.hit(now)
+        account_calls = None
+        if account_id is not None:
+            window = self._account_usage.setdefault(account_id, _UsageWindow(self.usage_window))
+            account_calls = window.hit(now)
+        headers = self._usage_headers(account_id, now)
+
+        try:
+            if app_calls > self.app_call_limit:
+                self.stats["throttled"] += 1
+                raise GraphError("(#17) User request limit reached", code=17, is_transient=True)
+            if account_calls is not None and account_calls > self.account_call_limit:
+                self.stats["throttled"] += 1
+                raise GraphError("(#80004) There have been too many calls to this ad-account. Wait a bit and try again.",
+                                 code=80004, subcode=2446079)
+            for fault in self.faults:
+                if fault.matches(method, path, self._rng):
+                    if fault.latency:
+                        await asyncio.sleep(fault.latency)
+                    if fault.status is not None:
+                        self.stats["faults"] += 1
+                        raise fault.error()
+            if not token:
+                raise GraphError("An active access token must be used to query information about the current user.",
+                                 code=2500)
+            if self.access_tokens is not None and token not in self.access_tokens:
+                raise GraphError("Invalid OAuth access token - Cannot parse access token", code=190)
+            return 200, self._handle(method, path, params, base), headers
+        except GraphError as e:
+            return e.status, {"error": e.body}, headers
+
+    def _account_for(self, path: str, params: Dict[str, str]) -> Optional[str]:
+        first = path.split("/", 1)[0]
+        if _ACCOUNT_RE.match(first):
+            return first
+        if not first and params.get("ids"):
+            first = params["ids"].split(",", 1)[0]
+        return self.data.account_of(first)
+
+    def _usage_headers(self, account_id: Optional[str], now: float) -> Dict[str, str]:
+        app_pct = min(100, self._app_usage.count(now) * 100 // max(1, self.app_call_limit))
+        headers = {
+            "x-app-usage": json.dumps({"call_count": app_pct, "total_time": app_pct // 2,
+                                       "total_cputime": app_pct // 2}),
+            "x-fb-trace-id": secrets.token_hex(6),
+        }
+        if account_id is None:
+            return headers
+        window = self._account_usage[account_id]
+        account_pct = min(100, window.count(now) * 100 // max(1, self.account_call_limit))
+        reset = window.reset_seconds(now) if account_pct >= 100 else 0.0
+        headers["x-business-use-case-usage"] = json.dumps({account_id[len("act_"):]: [{
+            "type": "ads_management",
+            "call_count": account_pct,
+            "total_cputime": account_pct // 2,
+            "total_time": account_pct // 2,
+            "estimated_time_to_regain_access": int(-(-reset // 60)),
+        }]})
+        headers["x-ad-account-usage"] = json.dumps({"acc_id_util_pct": account_pct,
+                                                    "reset_time_duration": int(reset)})
+        return headers
+
+    # Graph requests
+
+    def _handle(self, method: str, path: str, params: Dict[str, str], base: str) -> Any:
+        parts = path.split("/") if path else []
+        if len(parts) > 2:
+            raise GraphError(f"Unknown path components: /{'/'.join(parts[2:])}", code=2500)
+        data = self.data
+        if method == "GET":
+            if not parts:
+                if not params.get("ids"):
+                    raise GraphError("(#100) Missing required parameter: ids", code=100)
+                return self._ids(params)
+            if parts[0] == "me":
+                if len(parts) == 1:
+                    return self._select(data.user, params.get("fields"))
+                if parts[1] == "adaccounts":
+                    accounts = self._filter([data.objects[i] for i in data.accounts()], params)
+                    return self._page(accounts, params, base, path)
+                raise _unsupported(method, "me")
+            obj = data.objects.get(parts[0])
+            if obj is None:
+                raise _unsupported(method, parts[0])
+            if len(parts) == 1:
+                return self._select(obj, params.get("fields"))
+            kind = data.types[parts[0]]
+            edge = parts[1]
+            if edge not in _EDGES[kind]:
+                raise GraphError(f"(#100) Tried accessing nonexisting field ({edge}) on node type "
+                                 f"({kind.title()})", code=100)
+            if edge == "insights":
+                return self._page(self._cached_insights(parts[0], params), params, base, path, select=False)
+            items = self._filter([data.objects[i] for i in data.edges.get((parts[0], edge), ())], params)
+            return self._page(items, params, base, path)
+
+        values = {key: _json_param(value) for key, value in params.items()}
+        self._insights_cache.clear()
+        if method == "POST":
+            if not parts:
+                raise _unsupported(method, "")
+            kind = data.types.get(parts[0])
+            if len(parts) == 2:
+                if kind != "account" or parts[1] not in _CREATE_EDGES:
+                    raise _unsupported(method, parts[0])
+                return {"id": data.create(_CREATE_EDGES[parts[1]], parts[0], values)}
+            if kind is None or kind == "account":
+                raise _unsupported(method, parts[0])
+            values.pop("id", None)
+            data.objects[parts[0]].update(values)
+            if "status" in values:
+                data.objects[parts[0]]["effective_status"] = values["status"]
+            return {"success": True}
+        if method == "DELETE" and len(parts) == 1 and data.types.get(parts[0]) not in (None, "account"):
+            data.objects[parts[0]].update({"status": "DELETED", "effective_status": "DELETED"})
+            return {"success": True}
+        raise _unsupported(method, path)
+
+    def _ids(self, params: Dict[str, str]) -> Dict[str, Any]:
+        results = {}
+        for object_id in params["ids"].split(","):
+            obj = self.data.objects.get(object_id)
+            if obj is None:
+                raise _unsupported("GET", object_id)
+            results[object_id] = self._select(obj, params.get("fields"))
+        return results
+
+    def _select(self, obj: Dict[str, Any], spec: Optional[str]) -> Dict[str, Any]:
+        """The requested fields of an object; nested {sub-fields} expand referenced objects."""
+        requested = _split_fields(spec) if spec else {"id": None, "name": None}
+        selected: Dict[str, Any] = {}
+        for name, sub in requested.items():
+            if name.startswith("_") or name not in obj:
+                continue
+            value = obj[name]
+            if isinstance(value, dict) and value.get("id") in self.data.objects:
+                value = self._select(self.data.objects[value["id"]], sub) if sub else {"id": value["id"]}
+            selected[name] = value
+        selected["id"] = obj["id"]
+        return selected
+
+    def _filter(self, items: List[Dict[str, Any]], params: Dict[str, str]) -> List[Dict[str, Any]]:
+        statuses = _json_param(params.get("effective_status"))
+        if statuses:
+            items = [obj for obj in items if obj.get("effective_status") in statuses]
+        for rule in _json_param(params.get("filtering")) or []:
+            field = rule.get("field", "")
+            operator = str(rule.get("operator", "EQUAL")).upper()
+            items = [obj for obj in items
+                     if _compare(obj.get(field, obj.get(field.replace(".", "_"))), operator, rule.get("value"))]
+        return items
+
+    def _page(self, items: List[Dict[str, Any]], params: Dict[str, str], base: str, path: str,
+              select: bool = True) -> Dict[str, Any]:
+        try:
+            limit = max(1, min(int(params.get("limit") or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+        except ValueError:
+            raise GraphError("(#100) Param limit must be a number", code=100)
+        start = _cursor_index(params["after"]) + 1 if params.get("after") else 0
+        page = items[start:start + limit]
+        if select:
+            page = [self._select(obj, params.get("fields")) for obj in page]
+        result: Dict[str, Any] = {"data": page}
+        if page:
+            paging: Dict[str, Any] = {"cursors": {"before": _cursor(start), "after": _cursor(start + len(page) - 1)}}
+            if start + len(page) < len(items):
+                query = {key: value for key, value in params.items() if key != "before"}
+                query.update({"limit": limit, "after": paging["cursors"]["after"]})
+                paging["next"] = f"{base}/{path}?{urlencode(query)}"
+            result["paging"] = paging
+        return result
+
+    def pages(self, path: str, params: Optional[Dict[str, Any]] = None,
+              base: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every page of a GET request on an edge or insights, following cursors like a client.
+
+        No usage accounting, faults or latency: this builds Graph-shaped
+        payloads for fixtures and benchmarks.
+        """
+        if base is None:
+            from .api import META_GRAPH_API_VERSION
+
+            base = f"https://graph.facebook.com/{META_GRAPH_API_VERSION}"
+        params = dict(params or {})
+        pages = []
+        try:
+            while True:
+                page = self._handle("GET", path, params, base)
+                pages.append(page)
+                paging = page.get("paging") or {}
+                if not paging.get("next"):
+                    return pages
+                params["after"] = paging["cursors"]["after"]
+        finally:
+            # The pages share rows with the cache; callers may modify them
+            self._insights_cache.clear()
+
+    # Insights
+
+    def _cached_insights(self, object_id: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """insights() for a query, computed once for all of its pages."""
+        key = (object_id,) + tuple(sorted((name, json.dumps(value, sort_keys=True)) for name, value in params.items()
+                                          if name not in ("after", "before", "limit")))
+        rows = self._insights_cache.get(key)
+        if rows is None:
+            rows = self._insights_cache[key] = self.insights(object_id, params)
+            if len(self._insights_cache) > _INSIGHTS_CACHE_SIZE:
+                self._insights_cache.popitem(last=False)
+        else:
+            self._insights_cache.move_to_end(key)
+        return rows
+
+    def insights(self, object_id: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """All insights rows of an object for Graph-style params (level, fields, time_range, ...)."""
+        data = self.data
+        kind = data.types[object_id]
+        level = params.get("level") or kind
+        if level not in _LEVELS or _LEVELS.index(level) < _LEVELS.index(kind):
+            raise GraphError(f"(#100) level must be one of {', '.join(_LEVELS[_LEVELS.index(kind):])}", code=100)
+        since, until = self._date_range(params)
+        increment = str(params.get("time_increment") or "all_days")
+        breakdowns = _json_param(params.get("breakdowns") or [])
+        if isinstance(breakdowns, str):
+            breakdowns = [name for name in breakdowns.split(",") if name]
+        for name in breakdowns:
+            if name not in BREAKDOWN_SHARES:
+                raise GraphError(f"(#100) breakdowns[0] must be one of the following values: "
+                                 f"{', '.join(BREAKDOWN_SHARES)}", code=100)
+        fields = list(_split_fields(params.get("fields") or "")) or list(_DEFAULT_INSIGHT_FIELDS)
+        combos = list(itertools.product(*(BREAKDOWN_SHARES[name] for name in breakdowns)))
+        days = [since + datetime.timedelta(days=offset) for offset in range((until - since).days + 1)]
+        buckets = {day: _bucket(day, since, until, increment) for day in days}
+
+        groups: Dict[Tuple[Any, ...], Dict[str, float]] = {}
+        names: Dict[str, Dict[str, str]] = {}
+        for ad_id in data.ads_under(object_id):
+            ad = data.objects[ad_id]
+            path = {"account": f"act_{ad['account_id']}", "campaign": ad["campaign_id"],
+                    "adset": ad["adset_id"], "ad": ad_id}
+            group_id = path[level]
+            if group_id not in names:
+                names[group_id] = self._insight_ids(path, level)
+            for day in days:
+                delivery = data.ad_day(ad_id, day)
+                for combo in combos:
+                    share = 1.0
+                    for _, value_share in combo:
+                        share *= value_share
+                    key = (group_id, buckets[day], tuple(value for value, _ in combo))
+                    totals = groups.setdefault(key, dict.fromkeys(delivery, 0.0))
+                    for metric, value in delivery.items():
+                        totals[metric] += value * share
+
+        rows = []
+        for (group_id, (start, stop), values), totals in groups.items():
+            row: Dict[str, Any] = {name: value for name, value in names[group_id].items() if name in fields}
+            row.update(_insight_metrics(totals, fields))
+            row["date_start"] = start.isoformat()
+            row["date_stop"] = stop.isoformat()
+            row.update(zip(breakdowns, values))
+            rows.append(row)
+        return rows
+
+    def _insight_ids(self, path: Dict[str, str], level: str) -> Dict[str, str]:
+        ids: Dict[str, str] = {}
+        for name in _LEVELS[:_LEVELS.index(level) + 1]:
+            obj = self.data.objects[path[name]]
+            ids[f"{name}_id"] = obj["account_id"] if name == "account" else obj["id"]
+            ids[f"{name}_name"] = obj["name"]
+        return ids
+
+    def _date_range(self, params: Dict[str, str]) -> Tuple[datetime.date, datetime.date]:
+        today = self.data.today
+        time_range = _json_param(params.get("time_range"))
+        if isinstance(time_range, dict):
+            try:
+                since = datetime.date.fromisoformat(time_range["since"])
+                until = datetime.date.fromisoformat(time_range["until"])
+            except (KeyError, TypeError, ValueError):
+                raise GraphError("(#100) time_range must contain since and until dates (YYYY-MM-DD)", code=100)
+            if since > until:
+                raise GraphError("(#100) time_range since must not be after until", code=100)
+            return since, until
+        preset = params.get("date_preset") or "last_30d"
+        if preset in _DATE_PRESETS:
+            first, last = _DATE_PRESETS[preset]
+            return today - datetime.timedelta(days=first), today - datetime.timedelta(days=last)
+        if preset == "this_month":
+            return today.replace(day=1), today
+        if preset == "last_month":
+            last = today.replace(day=1) - datetime.timedelta(days=1)
+            return last.replace(day=1), last
+        if preset == "maximum":
+            return today - datetime.timedelta(days=365), today
+        raise GraphError(f"(#100) date_preset must be one of {', '.join(list(_DATE_PRESETS) + ['this_month', 'last_month', 'maximum'])}",
+                         code=100)
+
+    # Batch API
+
+    async def _batch(self, params: Dict[str, str], token: Optional[str], base: str) -> Tuple[int, Any, Dict[str, str]]:
+        self.stats["batches"] += 1
+        headers = self._usage_headers(None, time.monotonic())
+        requests = _json_param(params["batch"])
+        if not isinstance(requests, list):
+            error = GraphError("(#100) The parameter batch must be a JSON array", code=100)
+            return error.status, {"error": error.body}, headers
+        if len(requests) > MAX_BATCH_SIZE:
+            error = GraphError(f"(#1) Too many requests in batch message. Maximum batch size is {MAX_BATCH_SIZE}",
+                               code=1)
+            return error.status, {"error": error.body}, headers
+
+        include_headers = params.get("include_headers", "true") != "false"
+        responses: List[Optional[Dict[str, Any]]] = []
+        for item in requests:
+            relative_url, _, query = str(item.get("relative_url", "")).lstrip("/").partition("?")
+            parts = relative_url.split("/")
+            if parts and _VERSION_RE.match(parts[0]):
+                parts.pop(0)
+            sub_params = dict(parse_qsl(query, keep_blank_values=True))
+            if item.get("body"):
+                sub_params.update(parse_qsl(str(item["body"]), keep_blank_values=True))
+            sub_token = sub_params.pop("access_token", None) or token
+            status, payload, sub_headers = await self._graph_call(
+                str(item.get("method", "GET")).upper(), "/".join(parts), sub_params, sub_token, base)
+            if status < 400 and item.get("omit_response_on_success"):
+                responses.append(None)
+                continue
+            entry: Dict[str, Any] = {"code": status, "body": json.dumps(payload, separators=(",", ":"))}
+            if include_headers:
+                entry["headers"] = [{"name": "Content-Type", "value": "application/json; charset=UTF-8"}] + [
+                    {"name": name, "value": value} for name, value in sub_headers.items()]
+            responses.append(entry)
+        return 200, responses, headers
+
+    # Pipeboard and control endpoints
+
+    def _pipeboard(self, method: str, path: str, params: Dict[str, str],
+                   base: str) -> Tuple[int, Any, Dict[str, str]]:
+        if not params.get("api_token"):
+            return 401, {"error": "Missing api_token"}, {}
+        if path == "meta/token" and method == "GET":
+            return 200, {"access_token": self.pipeboard_token, "expires_at": int(time.time()) + 3600,
+                         "token_type": "bearer"}, {}
+        if path == "meta/auth" and method == "POST":
+            return 200, {"loginUrl": f"{base}/api/meta/login", "status": "pending"}, {}
+        return 404, {"error": "Not found"}, {}
+
+    def _control(self, method: str, name: str, body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        if name == "stats" and method == "GET":
+            return 200, self.snapshot(), {}
+        if name == "reset" and method == "POST":
+            self.reset()
+            return 200, {"success": True}, {}
+        if name == "faults":
+            if method == "GET":
+                return 200, [fault.to_dict() for fault in self.faults], {}
+            if method == "DELETE":
+                self.faults.clear()
+                return 200, {"success": True}, {}
+            if method == "POST":
+                try:
+                    fault = Fault.from_dict(json.loads(body or b"{}"))
+                except (ValueError, TypeError, re.error) as e:
+                    return 400, {"error": str(e)}, {}
+                self.faults.append(fault)
+                return 200, fault.to_dict(), {}
+        return 404, {"error": "Not found"}, {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Request statistics, faults and object counts as plain JSON values."""
+        stats = dict(self.stats)
+        stats["by_family"] = dict(self.stats["by_family"])
+        stats["faults_configured"] = [fault.to_dict() for fault in self.faults]
+        stats["objects"] = dict(Counter(self.data.types.values()))
+        return stats
+
+
+def _compare(actual: Any, operator: str, expected: Any) -> bool:
+    if operator == "EQUAL":
+        return str(actual) == str(expected)
+    if operator == "NOT_EQUAL":
+        return str(actual) != str(expected)
+    if operator in ("IN", "NOT_IN"):
+        found = str(actual) in {str(value) for value in (expected or [])}
+        return found if operator == "IN" else not found
+    if operator in ("CONTAIN", "NOT_CONTAIN"):
+        found = str(expected).lower() in str(actual or "").lower()
+        return found if operator == "CONTAIN" else not found
+    if operator in ("GREATER_THAN", "LESS_THAN"):
+        try:
+            difference = float(actual) - float(expected)
+        except (TypeError, ValueError):
+            return False
+        return difference > 0 if operator == "GREATER_THAN" else difference < 0
+    raise GraphError(f"(#100) Filtering operator {operator} is not supported", code=100)
+
+
+def _bucket(day: datetime.date, since: datetime.date, until: datetime.date,
+            increment: str) -> Tuple[datetime.date, datetime.date]:
+    """The (date_start, date_stop) row a day is reported in for a time_increment."""
+    if increment == "all_days":
+        return since, until
+    if increment == "monthly":
+        first = day.replace(day=1)
+        next_month = (first + datetime.timedelta(days=32)).replace(day=1)
+        return max(first, since), min(next_month - datetime.timedelta(days=1), until)
+    try:
+        size = int(increment)
+    except ValueError:
+        raise GraphError("(#100) time_increment must be all_days, monthly or a number of days", code=100)
+    if not 1 <= size <= 90:
+        raise GraphError("(#100) time_increment must be between 1 and 90", code=100)
+    start = since + datetime.timedelta(days=(day - since).days // size * size)
+    return start, min(start + datetime.timedelta(days=size - 1), until)
+
+
+def _action_list(values: Dict[str, str]) -> List[Dict[str, str]]:
+    """Graph action entries, conversions repeated under each roll-up action type."""
+    entries = []
+    for action, value in values.items():
+        entries.append({"action_type": action, "value": value})
+        if action in _CONVERSION_ACTIONS:
+            entries.extend({"action_type": prefix + action, "value": value} for prefix in ROLLUP_ACTION_PREFIXES)
+    return entries
+
+
+def _insight_metrics(totals: Dict[str, float], fields: Sequence[str]) -> Dict[str, Any]:
+    """Requested metrics for aggregated delivery, formatted the way Graph returns them."""
+    impressions = int(round(totals["impressions"]))
+    reach = int(round(totals["reach"]))
+    clicks = int(round(totals["clicks"]))
+    spend = totals["spend"]
+    counts = {action: int(round(totals[action])) for action in _ENGAGEMENT_ACTIONS + _CONVERSION_ACTIONS}
+    values: Dict[str, Any] = {
+        "impressions": str(impressions),
+        "reach": str(reach),
+        "clicks": str(clicks),
+        "spend": f"{spend:.2f}",
+        "actions": _action_list({action: str(count) for action, count in counts.items() if count}),
+        "action_values": _action_list({action: f"{totals[action + '_value']:.2f}" for action in _CONVERSION_ACTIONS
+                                       if totals[action + "_value"]}),
+    }
+    if impressions:
+        values["ctr"] = _format_metric(clicks * 100.0 / impressions)
+        values["cpm"] = _format_metric(spend * 1000.0 / impressions)
+    if clicks:
+        values["cpc"] = _format_metric(spend / clicks)
+    if reach:
+        values["frequency"] = _format_metric(impressions / reach)
+    cost_per_action = _action_list({action: _format_metric(spend / count) for action, count in counts.items()
+                                    if count and action in ("link_click", "landing_page_view") + _CONVERSION_ACTIONS})
+    if cost_per_action:
+        values["cost_per_action_type"] = cost_per_action
+    if spend:
+        values["purchase_roas"] = [{"action_type": "omni_purchase",
+                                    "value": _format_metric(totals["purchase_value"] / spend)}]
+    return {name: values[name] for name in fields if name in values}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Serve the emulator over HTTP with uvicorn."""
+    import uvicorn
+
+    from .api import META_GRAPH_API_VERSION
+
+    parser = argparse.ArgumentParser(description="Local Graph API emulator for meta-ads-mcp")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--accounts", type=int, default=2)
+    parser.add_argument("--campaigns", type=int, default=3, help="campaigns per account")
+    parser.add_argument("--adsets", type=int, default=2, help="ad sets per campaign")
+    parser.add_argument("--ads", type=int, default=2, help="ads per ad set")
+    parser.add_argument("--total-ads", type=int,
+                        help="one account with this many ads instead (10 per ad set, 10 ad sets per campaign)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of Graph calls answered with a transient 500 (code 2)")
+    parser.add_argument("--app-call-limit", type=int, default=10000)
+    parser.add_argument("--account-call-limit", type=int, default=2000)
+    parser.add_argument("--usage-window", type=float, default=300.0, help="seconds")
+    args = parser.parse_args(argv)
+
+    if args.total_ads:
+        data = EmulatorData.scaled(args.total_ads, seed=args.seed)
+    else:
+        data = EmulatorData(seed=args.seed, accounts=args.accounts, campaigns_per_account=args.campaigns,
+                            adsets_per_campaign=args.adsets, ads_per_adset=args.ads)
+    emulator = GraphEmulator(data, seed=args.seed, latency=args.latency, jitter=args.jitter,
+                             app_call_limit=args.app_call_limit, account_call_limit=args.account_call_limit,
+                             usage_window=args.usage_window)
+    if args.error_rate:
+        emulator.inject(probability=args.error_rate)
+
+    print(f"Graph API emulator on http://{args.host}:{args.port} "
+          f"({len(data.objects)} objects). Point the server at it with:")
+    print(f"  META_GRAPH_API_BASE=http://{args.host}:{args.port}/{META_GRAPH_API_VERSION}")
+    print(f"  PIPEBOARD_API_BASE=http://{args.host}:{args.port}/api")
+    print(f"  META_ACCESS_TOKEN={EMULATOR_ACCESS_TOKEN}")
+    uvicorn.run(emulator, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
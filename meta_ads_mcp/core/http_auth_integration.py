@@ -222,6 +222,7 @@ def setup_fastmcp_http_auth(mcp_server):
                 logger.debug(f"Original {method_name} returned app: {type(app)}. Adding AuthInjectionMiddleware.")
                 # Now, add our middleware to this specific app instance
                 setup_starlette_middleware(app) 
+                setup_metrics_route(app)
             else:
                 logger.error(f"Original {method_name} returned None or a non-app object.")
             return app
@@ -245,13 +246,23 @@ def setup_fastmcp_http_auth(mcp_server):
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
+from starlette.routing import Route
+import hmac
+import os
 import json # Ensure json is imported if not already at the top
+from .metrics import metrics, METRICS_ENABLED, METRICS_PATH, CONTENT_TYPE as METRICS_CONTENT_TYPE
 
 class AuthInjectionMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         logger.debug(f"HTTP Auth Middleware: Processing request to {request.url.path}")
         logger.debug(f"HTTP Auth Middleware: Request headers: {list(request.headers.keys())}")
 
+        if (METRICS_ENABLED and request.url.path == METRICS_PATH and request.method == "GET"
+                and os.environ.get("META_ADS_METRICS_TOKEN")):
+            # Scrapers carry no Meta credentials; the route checks
+            # META_ADS_METRICS_TOKEN itself and reaches no tool handler.
+            return await call_next(request)
+
         # Extract both types of tokens for dual-header authentication
         auth_token = FastMCPAuthIntegration.extract_token_from_headers(dict(request.headers))
         pipeboard_token = FastMCPAuthIntegration.extract_pipeboard_token_from_headers(dict(request.headers))
@@ -329,4 +340,34 @@ def setup_starlette_middleware(app):
         except Exception as e:
             logger.error(f"Failed to add AuthInjectionMiddleware to Starlette app: {e}", exc_info=True)
     else:
-        logger.debug("AuthInjectionMiddleware already present in Starlette app's middleware stack.") 
\ No newline at end of file
+        logger.debug("AuthInjectionMiddleware already present in Starlette app's middleware stack.") 
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve Prometheus metrics behind META_ADS_METRICS_TOKEN."""
+    expected = os.environ.get("META_ADS_METRICS_TOKEN", "")
+    provided = request.headers.get("authorization", "")
+    if not expected or not hmac.compare_digest(provided.encode("utf-8"), f"Bearer {expected}".encode("utf-8")):
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+def setup_metrics_route(app):
+    """Mount GET /metrics on the Starlette app when META_ADS_METRICS_TOKEN is set.
+
+    The route shares the public port with the MCP endpoint, so it is not
+    served without a scrape token.
+
+    Args:
+        app: Starlette app instance
+    """
+    if not app or not METRICS_ENABLED:
+        return
+    if not os.environ.get("META_ADS_METRICS_TOKEN"):
+        logger.info(f"Prometheus metrics not served: set META_ADS_METRICS_TOKEN to enable {METRICS_PATH}")
+        return
+    if any(getattr(route, "path", None) == METRICS_PATH for route in app.router.routes):
+        return
+    # Insert first so a catch-all mount cannot shadow it.
+    app.router.routes.insert(0, Route(METRICS_PATH, endpoint=metrics_endpoint, methods=["GET"]))
+    logger.info(f"Prometheus metrics available at {METRICS_PATH}")
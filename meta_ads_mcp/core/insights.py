@@ -1,8 +1,8 @@
 """Insights and Reporting functionality for Meta Ads API."""
 
 import json
-from typing import Optional, Union, Dict, List
-from .api import meta_api_tool, make_api_request
+from typing import Any, Optional, Union, Dict, List
+from .api import meta_api_tool, make_api_request, collect_edge
 from .utils import download_image, try_multiple_download_methods, ad_creative_images, create_resource_from_image
 from .server import mcp_server
 import base64
@@ -62,7 +62,9 @@ async def get_insights(object_id: str = "", access_token: Optional[str] = None,
                       action_breakdowns: Optional[List[str]] = None,
                       compact: bool = False,
                       account_id: str = "", campaign_id: str = "",
-                      adset_id: str = "", ad_id: str = "") -> str:
+                      adset_id: str = "", ad_id: str = "", max_age: Optional[int] = None,
+                      max_items: Optional[int] = None, fetch_all: bool = False,
+                      output_format: Optional[str] = None) -> Union[str, Dict[str, Any]]:
     """
     Get performance insights for a campaign, ad set, ad or account.
 
@@ -128,6 +130,18 @@ async def get_insights(object_id: str = "", access_token: Optional[str] = None,
                  (omni_*, onsite_web_*, offsite_conversion.fb_pixel_*, etc.) to reduce
                  payload size by ~60%. The canonical action types (purchase, add_to_cart,
                  view_content, etc.) are always preserved. Default: False.
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
+        max_items: Follow pagination cursors and return up to this many rows in one call
+                   (fetched in pages of the larger of `limit` and META_ADS_EDGE_PAGE_SIZE,
+                   default 100; capped at 5000)
+        fetch_all: Follow pagination cursors and return all rows (up to 5000). Combine with
+                   compact=True for large ad-level reports.
+        output_format: "table" returns {"columns": [...], "rows": [[...]]} with nested fields
+                       flattened, actions/action_values pivoted into one column per action_type
+                       and empty fields dropped (3-5x smaller for many rows); "compact" returns
+                       JSON without indentation; "pretty" returns indented JSON (default: the
+                       server's setting, normally "pretty")
 
     Note on response size: This tool always returns a fixed set of fields (impressions, clicks,
     spend, cpc, cpm, ctr, reach, actions, action_values, etc.) and cannot filter to a subset.
@@ -136,6 +150,9 @@ async def get_insights(object_id: str = "", access_token: Optional[str] = None,
     bulk_get_insights with compact=true and the fields parameter:
         bulk_get_insights(level="ad", account_ids=[...], compact=true, fields=["spend", "impressions"])
     bulk_get_insights supports level="ad", "adset", "campaign", and "account".
+    If the server sets an inline size limit (META_ADS_SPILL_CHARS), larger responses are stored
+    server-side instead: you get a summary with result_id, row_count, columns and preview rows,
+    and read the rows with get_result_slice.
     """
     # Accept common aliases for object_id (LLMs frequently use these instead)
     if not object_id:
@@ -205,7 +222,10 @@ async def get_insights(object_id: str = "", access_token: Optional[str] = None,
         # Meta API expects single-quote format: ['1d_click','7d_click']
         params["action_attribution_windows"] = "[" + ",".join(f"'{w}'" for w in action_attribution_windows) + "]"
 
-    data = await make_api_request(endpoint, access_token, params)
+    if max_items or fetch_all:
+        data = await collect_edge(endpoint, access_token, params, max_items=max_items)
+    else:
+        data = await make_api_request(endpoint, access_token, params)
 
     # In compact mode, strip redundant action-type duplicates to reduce response size.
     if compact and isinstance(data, dict):
@@ -213,7 +233,7 @@ async def get_insights(object_id: str = "", access_token: Optional[str] = None,
             if isinstance(row, dict):
                 _strip_redundant_actions(row)
 
-    return json.dumps(data, indent=2)
+    return data
 
 
 
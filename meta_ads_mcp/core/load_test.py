@@ -0,0 +1,514 @@
+"""Load generator for the streamable-http transport.
+
+The HTTP transport runs behind nginx in production, but nothing measured how
+much traffic one server process sustains or where it stops scaling. This
+drives concurrent JSON-RPC tools/call requests with Bearer auth against a
+server, ramping concurrency in stages, and reports per stage:
+
+- throughput (completed calls per second);
+- p50 / p95 / p99 latency of a tools/call round trip;
+- errors by kind (HTTP status, JSON-RPC error, tool error, transport error);
+- the server's event-loop lag, from meta_ads_event_loop_lag_seconds on its
+  /metrics endpoint (see metrics.py), and the load generator's own lag, which
+  shows when the generator rather than the server is the bottleneck.
+
+Scenarios are JSON files: the stages, the weighted mix of tool calls, and the
+Graph emulator settings to run them against. Tool arguments may contain
+{account_id}, {campaign_id}, {adset_id}, {ad_id} and {creative_id}, filled
+per call with a random object discovered from the Graph backend. Bundled
+scenarios live in load_scenarios/ (read-heavy, insights-heavy,
+creative-heavy); any other path to a JSON file works too.
+
+By default the whole stack runs locally: a GraphEmulator and an MCP server
+(python -m meta_ads_mcp --transport streamable-http) pointed at it are
+started as subprocesses and stopped afterwards.
+
+    python -m meta_ads_mcp.core.load_test --scenario read-heavy
+    python -m meta_ads_mcp.core.load_test --scenario insights-heavy --json 1.0.118.json
+    python -m meta_ads_mcp.core.load_test --scenario insights-heavy --compare 1.0.118.json
+
+To load an already running server instead, pass --url (and --graph-url for
+the Graph backend it uses, to discover object IDs, plus --token). Its
+event-loop lag is only reported with --metrics-token (default
+$META_ADS_METRICS_TOKEN), since /metrics requires it; the local server is
+started with a generated one.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import pathlib
+import random
+import re
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .graph_emulator import EMULATOR_ACCESS_TOKEN
+
+SCENARIO_DIR = pathlib.Path(__file__).with_name("load_scenarios")
+LAG_METRIC = "meta_ads_event_loop_lag_seconds"
+TARGET_KINDS = ("account_id", "campaign_id", "adset_id", "ad_id", "creative_id")
+OK = "ok"
+
+_PLACEHOLDER_RE = re.compile(r"\{(" + "|".join(TARGET_KINDS) + r")\}")
+_TOOL_ERROR_RE = re.compile(r'^\s*\{\s*"error"\s*:')
+_BUCKET_RE = re.compile(LAG_METRIC + r'_bucket\{le="([^"]+)"\} (\S+)')
+# Graph edges listed to find objects for each placeholder
+_DISCOVERY_EDGES = {"campaign_id": "campaigns", "adset_id": "adsets", "ad_id": "ads", "creative_id": "adcreatives"}
+# Emulator command-line options a scenario may set
+_EMULATOR_OPTIONS = ("seed", "accounts", "campaigns", "adsets", "ads", "latency", "jitter", "error_rate",
+                     "app_call_limit", "account_call_limit", "usage_window")
+
+
+class ToolCall:
+    """One entry of a scenario's call mix."""
+
+    def __init__(self, tool: str, arguments: Optional[Dict[str, Any]] = None, weight: float = 1.0):
+        self.tool = tool
+        self.arguments = arguments or {}
+        self.weight = weight
+
+    def render(self, targets: Dict[str, List[str]], rng: random.Random) -> Dict[str, Any]:
+        """The arguments with placeholders replaced by one random object of each kind."""
+        chosen: Dict[str, str] = {}
+
+        def substitute(match: "re.Match[str]") -> str:
+            kind = match.group(1)
+            if kind not in chosen:
+                if not targets.get(kind):
+                    raise ValueError(f"No {kind} found on the Graph backend for {self.tool}")
+                chosen[kind] = rng.choice(targets[kind])
+            return chosen[kind]
+
+        def render_value(value: Any) -> Any:
+            if isinstance(value, str):
+                return _PLACEHOLDER_RE.sub(substitute, value)
+            if isinstance(value, list):
+                return [render_value(item) for item in value]
+            if isinstance(value, dict):
+                return {key: render_value(item) for key, item in value.items()}
+            return value
+
+        return render_value(self.arguments)
+
+
+class Scenario:
+    """Stages of concurrency, a weighted mix of tool calls and the emulator to run them against."""
+
+    def __init__(self, name: str, calls: List[ToolCall], stages: List[Tuple[int, float]],
+                 description: str = "", emulator: Optional[Dict[str, Any]] = None):
+        if not calls:
+            raise ValueError(f"Scenario {name!r} has no calls")
+        if not stages:
+            raise ValueError(f"Scenario {name!r} has no stages")
+        for concurrency, duration in stages:
+            if concurrency < 1 or duration <= 0:
+                raise ValueError(f"Scenario {name!r}: stages need concurrency >= 1 and duration > 0")
+        unknown = set(emulator or {}) - set(_EMULATOR_OPTIONS)
+        if unknown:
+            raise ValueError(f"Scenario {name!r}: unknown emulator settings {', '.join(sorted(unknown))}")
+        self.name = name
+        self.calls = calls
+        self.stages = stages
+        self.description = description
+        self.emulator = emulator or {}
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any], name: str = "") -> "Scenario":
+        try:
+            calls = [ToolCall(call["tool"], call.get("arguments"), float(call.get("weight", 1.0)))
+                     for call in spec["calls"]]
+            stages = [(int(stage["concurrency"]), float(stage["duration"])) for stage in spec["stages"]]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid scenario {spec.get('name') or name!r}: {e!r}") from e
+        return cls(spec.get("name") or name, calls, stages, spec.get("description", ""), spec.get("emulator"))
+
+    @classmethod
+    def load(cls, name_or_path: str) -> "Scenario":
+        """A bundled scenario by name, or a scenario JSON file."""
+        path = pathlib.Path(name_or_path)
+        if not path.suffix:
+            path = SCENARIO_DIR / f"{name_or_path}.json"
+        try:
+            spec = json.loads(path.read_text())
+        except FileNotFoundError:
+            raise ValueError(f"No scenario {name_or_path!r} (bundled: {', '.join(available_scenarios())})")
+        return cls.from_dict(spec, path.stem)
+
+    def pick(self, rng: random.Random) -> ToolCall:
+        return rng.choices(self.calls, weights=[call.weight for call in self.calls])[0]
+
+
+def available_scenarios() -> List[str]:
+    return sorted(path.stem for path in SCENARIO_DIR.glob("*.json"))
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+class StageResult:
+    """What one stage of constant concurrency measured."""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.elapsed = 0.0
+        self.latencies: List[float] = []
+        self.outcomes: Counter = Counter()
+        self.by_tool: Counter = Counter()
+        self.server_lag: Optional[Dict[str, float]] = None
+        self.client_lag_max = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(self.outcomes.values())
+
+    @property
+    def errors(self) -> int:
+        return self.requests - self.outcomes[OK]
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def latency(self, q: float) -> float:
+        return percentile(sorted(self.latencies), q)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "elapsed": round(self.elapsed, 3),
+            "requests": self.requests,
+            "throughput": round(self.throughput, 2),
+            "latency": {f"p{q}": round(self.latency(q), 4) for q in (50, 95, 99)},
+            "error_rate": round(self.error_rate, 4),
+            "outcomes": dict(self.outcomes),
+            "by_tool": dict(self.by_tool),
+            "server_loop_lag": self.server_lag,
+            "client_loop_lag_max": round(self.client_lag_max, 4),
+        }
+
+
+def parse_lag_histogram(text: str) -> Optional[Dict[str, Any]]:
+    """Cumulative buckets, sum and count of the event-loop lag histogram in a /metrics page."""
+    buckets = [(float(le), float(count)) for le, count in _BUCKET_RE.findall(text)]
+    if not buckets:
+        return None
+    totals = {}
+    for suffix in ("sum", "count"):
+        match = re.search(rf"^{LAG_METRIC}_{suffix} (\S+)$", text, re.MULTILINE)
+        totals[suffix] = float(match.group(1)) if match else 0.0
+    return {"buckets": buckets, **totals}
+
+
+def lag_between(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+    """Mean and p99 (bucket upper bound) of the lag observed between two scrapes."""
+    if after is None:
+        return None
+    previous = dict(before["buckets"]) if before else {}
+    count = after["count"] - (before["count"] if before else 0.0)
+    if count <= 0:
+        return None
+    mean = (after["sum"] - (before["sum"] if before else 0.0)) / count
+    p99 = float("inf")
+    for le, cumulative in after["buckets"]:
+        if cumulative - previous.get(le, 0.0) >= 0.99 * count:
+            p99 = le
+            break
+    return {"samples": int(count), "mean": round(mean, 4), "p99": p99 if p99 != float("inf") else None}
+
+
+def classify(response: httpx.Response) -> str:
+    """Outcome of one tools/call: ok, http_<status>, rpc_error or tool_error.
+
+    Raises ValueError if the body is not a JSON-RPC message.
+    """
+    if response.status_code != 200:
+        return f"http_{response.status_code}"
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        data = [line[5:].strip() for line in response.text.splitlines() if line.startswith("data:")]
+        message = json.loads(data[-1]) if data else {}
+    else:
+        message = response.json()
+    if "error" in message:
+        return "rpc_error"
+    result = message.get("result") or {}
+    if result.get("isError"):
+        return "tool_error"
+    for content in result.get("content", []):
+        if content.get("type") == "text" and _TOOL_ERROR_RE.match(content.get("text", "")[:100]):
+            return "tool_error"
+    return OK
+
+
+class LoadTester:
+    """Runs a scenario's stages against an MCP server over streamable HTTP."""
+
+    def __init__(self, url: str, scenario: Scenario, token: str = EMULATOR_ACCESS_TOKEN,
+                 graph_url: Optional[str] = None, seed: int = 0, timeout: float = 60.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None, metrics_token: Optional[str] = None):
+        self.url = url.rstrip("/")
+        self.endpoint = f"{self.url}/mcp"
+        self.scenario = scenario
+        self.token = token
+        self.metrics_token = metrics_token
+        self.graph_url = graph_url.rstrip("/") if graph_url else None
+        self.rng = random.Random(seed)
+        self.targets: Dict[str, List[str]] = {}
+        self._timeout = timeout
+        self._transport = transport
+        self._next_id = 0
+
+    def _client(self, connections: int) -> httpx.AsyncClient:
+        limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        return httpx.AsyncClient(timeout=self._timeout, limits=limits, transport=self._transport)
+
+    async def discover(self, client: httpx.AsyncClient) -> Dict[str, List[str]]:
+        """Object IDs for the placeholders, from the first accounts on the Graph backend."""
+        if not self.graph_url:
+            return {}
+
+        async def ids(path: str) -> List[str]:
+            response = await client.get(f"{self.graph_url}/{path}",
+                                        params={"fields": "id", "limit": 200, "access_token": self.token})
+            response.raise_for_status()
+            return [item["id"] for item in response.json().get("data", [])]
+
+        accounts = (await ids("me/adaccounts"))[:5]
+        targets: Dict[str, List[str]] = {"account_id": accounts}
+        for kind, edge in _DISCOVERY_EDGES.items():
+            targets[kind] = [object_id for account in accounts for object_id in await ids(f"{account}/{edge}")]
+        return targets
+
+    async def call(self, client: httpx.AsyncClient, call: ToolCall) -> Tuple[str, float]:
+        """Send one tools/call; returns its outcome and latency in seconds."""
+        self._next_id += 1
+        payload = {"jsonrpc": "2.0", "id": self._next_id, "method": "tools/call",
+                   "params": {"name": call.tool, "arguments": call.render(self.targets, self.rng)}}
+        headers = {"Authorization": f"Bearer {self.token}", "Accept": "application/json, text/event-stream"}
+        started = time.perf_counter()
+        try:
+            response = await client.post(self.endpoint, json=payload, headers=headers)
+            outcome = classify(response)
+        except httpx.HTTPError:
+            outcome = "transport_error"
+        except ValueError:
+            outcome = "invalid_response"
+        return outcome, time.perf_counter() - started
+
+    async def scrape_lag(self, client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+        if not self.metrics_token:
+            return None
+        try:
+            response = await client.get(f"{self.url}/metrics",
+                                        headers={"Authorization": f"Bearer {self.metrics_token}"})
+        except httpx.HTTPError:
+            return None
+        return parse_lag_histogram(response.text) if response.status_code == 200 else None
+
+    async def run_stage(self, client: httpx.AsyncClient, concurrency: int, duration: float) -> StageResult:
+        result = StageResult(concurrency)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+
+        async def worker() -> None:
+            while loop.time() < deadline:
+                call = self.scenario.pick(self.rng)
+                outcome, seconds = await self.call(client, call)
+                result.outcomes[outcome] += 1
+                result.by_tool[call.tool] += 1
+                result.latencies.append(seconds)
+
+        async def watch_own_lag() -> None:
+            while True:
+                scheduled = loop.time() + 0.05
+                await asyncio.sleep(0.05)
+                result.client_lag_max = max(result.client_lag_max, loop.time() - scheduled)
+
+        before = await self.scrape_lag(client)
+        watcher = asyncio.create_task(watch_own_lag())
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            watcher.cancel()
+        result.elapsed = time.perf_counter() - started
+        result.server_lag = lag_between(before, await self.scrape_lag(client))
+        return result
+
+    async def run(self, progress: Optional[Any] = None) -> List[StageResult]:
+        """Run every stage in order; `progress(result)` is called after each one."""
+        highest = max(concurrency for concurrency, _ in self.scenario.stages)
+        results = []
+        async with self._client(highest + 2) as client:
+            self.targets = await self.discover(client)
+            for concurrency, duration in self.scenario.stages:
+                result = await self.run_stage(client, concurrency, duration)
+                results.append(result)
+                if progress:
+                    progress(result)
+        return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with status {process.returncode}")
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return
+        time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout:.0f}s")
+
+
+@contextlib.contextmanager
+def local_stack(scenario: Scenario, server_args: Sequence[str] = (),
+                metrics_token: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """Start a Graph emulator and an MCP server using it; yields (server URL, Graph URL)."""
+    from .api import META_GRAPH_API_VERSION
+
+    graph_port, server_port = _free_port(), _free_port()
+    emulator_args = []
+    for option, value in scenario.emulator.items():
+        emulator_args += [f"--{option.replace('_', '-')}", str(value)]
+    graph_url = f"http://127.0.0.1:{graph_port}/{META_GRAPH_API_VERSION}"
+    env = dict(os.environ, META_GRAPH_API_BASE=graph_url, PIPEBOARD_API_BASE=f"http://127.0.0.1:{graph_port}/api",
+               META_ACCESS_TOKEN=EMULATOR_ACCESS_TOKEN)
+    env.pop("PIPEBOARD_API_TOKEN", None)
+    if metrics_token:
+        env["META_ADS_METRICS_TOKEN"] = metrics_token
+    processes = []
+    try:
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "meta_ads_mcp.core.graph_emulator", "--port", str(graph_port), *emulator_args],
+            stdout=subprocess.DEVNULL))
+        _wait_for_port(graph_port, processes[-1])
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "meta_ads_mcp", "--transport", "streamable-http", "--host", "127.0.0.1",
+             "--port", str(server_port), *server_args],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        _wait_for_port(server_port, processes[-1])
+        yield f"http://127.0.0.1:{server_port}", graph_url
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return f"{seconds * 1000:.1f}ms" if seconds is not None else "-"
+
+
+def format_stage(result: StageResult) -> str:
+    lag = result.server_lag or {}
+    errors = ", ".join(f"{kind}={count}" for kind, count in sorted(result.outcomes.items()) if kind != OK)
+    return (f"{result.concurrency:>11} {result.requests:>9} {result.throughput:>9.1f} "
+            f"{_ms(result.latency(50)):>9} {_ms(result.latency(95)):>9} {_ms(result.latency(99)):>9} "
+            f"{result.error_rate:>7.1%} {_ms(lag.get('mean')):>9} {_ms(lag.get('p99')):>9} "
+            f"{_ms(result.client_lag_max):>9}  {errors}")
+
+
+STAGE_HEADER = (f"{'concurrency':>11} {'requests':>9} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} "
+                f"{'errors':>7} {'lag mean':>9} {'lag p99':>9} {'own lag':>9}")
+
+
+def report(scenario: Scenario, url: str, results: List[StageResult]) -> Dict[str, Any]:
+    from .. import __version__
+
+    return {"scenario": scenario.name, "version": __version__, "url": url,
+            "stages": [result.to_dict() for result in results]}
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]) -> str:
+    """Throughput and p95 latency per concurrency level, relative to an earlier report."""
+    earlier = {stage["concurrency"]: stage for stage in previous.get("stages", [])}
+    lines = [f"Compared with {previous.get('scenario')} on {previous.get('version')}:",
+             f"{'concurrency':>11} {'req/s':>17} {'p95':>21}"]
+    for stage in current["stages"]:
+        old = earlier.get(stage["concurrency"])
+        if not old:
+            continue
+        throughput = (f"{old['throughput']:.1f} -> {stage['throughput']:.1f}")
+        p95 = f"{old['latency']['p95'] * 1000:.0f} -> {stage['latency']['p95'] * 1000:.0f}ms"
+        lines.append(f"{stage['concurrency']:>11} {throughput:>17} {p95:>21}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the meta-ads-mcp streamable-http transport")
+    parser.add_argument("--scenario", default="read-heavy",
+                        help=f"bundled scenario ({', '.join(available_scenarios())}) or path to a JSON file")
+    parser.add_argument("--url", help="MCP server to load (default: start a local server and emulator)")
+    parser.add_argument("--graph-url", help="Graph API base the server uses, to discover object IDs")
+    parser.add_argument("--token", default=EMULATOR_ACCESS_TOKEN, help="Bearer token sent with every call")
+    parser.add_argument("--metrics-token", default=os.environ.get("META_ADS_METRICS_TOKEN"),
+                        help="token for the server's /metrics, to report its event-loop lag")
+    parser.add_argument("--duration", type=float, help="override every stage's duration (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sse-response", action="store_true", help="start the local server with --sse-response")
+    parser.add_argument("--json", dest="json_path", help="write the report to this file")
+    parser.add_argument("--compare", help="earlier JSON report to compare with")
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = Scenario.load(args.scenario)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.duration:
+        scenario.stages = [(concurrency, args.duration) for concurrency, _ in scenario.stages]
+
+    def progress(result: StageResult) -> None:
+        print(format_stage(result), flush=True)
+
+    async def run(url: str, graph_url: Optional[str], metrics_token: Optional[str]) -> List[StageResult]:
+        print(f"Scenario {scenario.name}: {scenario.description}")
+        print(STAGE_HEADER)
+        tester = LoadTester(url, scenario, token=args.token, graph_url=graph_url, seed=args.seed,
+                            metrics_token=metrics_token)
+        return await tester.run(progress)
+
+    if args.url:
+        url = args.url
+        results = asyncio.run(run(url, args.graph_url, args.metrics_token))
+    else:
+        metrics_token = args.metrics_token or secrets.token_urlsafe(16)
+        with local_stack(scenario, ["--sse-response"] if args.sse_response else [],
+                         metrics_token=metrics_token) as (url, graph_url):
+            results = asyncio.run(run(url, graph_url, metrics_token))
+
+    current = report(scenario, url, results)
+    if args.json_path:
+        pathlib.Path(args.json_path).write_text(json.dumps(current, indent=2) + "\n")
+    if args.compare:
+        print(compare(json.loads(pathlib.Path(args.compare).read_text()), current))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
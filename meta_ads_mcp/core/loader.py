@@ -0,0 +1,157 @@
+"""Batch concurrent single-object Graph lookups into one ?ids= request.
+
+Parallel tool calls such as get_campaign_details, get_adset_details,
+get_ad_details and get_creative_details each GET a single object. The Graph
+API can return many objects in one call:
+
+    GET /?ids=120201,120202,120203&fields=id,name,status
+    -> {"120201": {...}, "120202": {...}, "120203": {...}}
+
+IdBatchLoader collects single-object GETs that use the same fields (and
+token) for a few milliseconds, sends one ?ids= request for the lot, and hands
+each caller its own object, in the style of DataLoader. If Meta rejects the
+combined request (one bad ID fails the whole call), or leaves an ID out, the
+affected IDs are fetched on their own so one caller's mistake never becomes
+another caller's error.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .utils import logger, get_env_bool, get_env_float, get_env_int
+
+# Graph allows up to 50 IDs per ?ids= request.
+MAX_IDS_PER_REQUEST = 50
+
+_OBJECT_ID_RE = re.compile(r"(act_)?\d+")
+
+# Params a batched lookup may carry; anything else (limit, time_range, ...)
+# changes the request and is sent as-is.
+_BATCHABLE_PARAMS = frozenset({"fields"})
+
+Fetch = Callable[[str, str, Dict[str, Any], Optional[bool]], Awaitable[Dict[str, Any]]]
+
+
+class _PendingBatch:
+    """IDs collected during one window, with the futures waiting on each."""
+
+    def __init__(self, access_token: str, params: Dict[str, Any], retry: Optional[bool]):
+        self.access_token = access_token
+        self.params = params
+        self.retry = retry
+        self.waiters: Dict[str, List[asyncio.Future]] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class IdBatchLoader:
+    """Coalesces single-object GETs with identical params into ?ids= requests."""
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        enabled: bool = True,
+        window: float = 0.005,
+        max_batch: int = MAX_IDS_PER_REQUEST,
+    ):
+        self._fetch = fetch
+        self.enabled = enabled
+        self.window = window
+        self.max_batch = max(1, min(max_batch, MAX_IDS_PER_REQUEST))
+        self._pending: Dict[tuple, _PendingBatch] = {}
+
+    @classmethod
+    def from_env(cls, fetch: Fetch) -> "IdBatchLoader":
+        return cls(
+            fetch,
+            enabled=not get_env_bool("META_ADS_DISABLE_ID_BATCHING"),
+            window=get_env_float("META_ADS_ID_BATCH_WINDOW_MS", 5.0) / 1000.0,
+            max_batch=get_env_int("META_ADS_ID_BATCH_MAX", MAX_IDS_PER_REQUEST),
+        )
+
+    def accepts(self, endpoint: str, params: Optional[Dict[str, Any]]) -> bool:
+        """True for a bare object lookup such as GET /120201?fields=id,name."""
+        if not self.enabled:
+            return False
+        if not _OBJECT_ID_RE.fullmatch(endpoint or ""):
+            return False
+        return set(params or {}) <= _BATCHABLE_PARAMS
+
+    async def load(
+        self,
+        object_id: str,
+        access_token: str,
+        params: Optional[Dict[str, Any]] = None,
+        retry: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Fetch one object, sharing a ?ids= request with concurrent lookups."""
+        params = dict(params or {})
+        loop = asyncio.get_running_loop()
+        key = (
+            loop,
+            hashlib.sha256(access_token.encode("utf-8")).hexdigest(),
+            json.dumps(params, sort_keys=True, default=str),
+            retry,
+        )
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch(access_token, params, retry)
+            batch.timer = loop.call_later(self.window, self._flush, key, batch)
+
+        future = loop.create_future()
+        batch.waiters.setdefault(object_id, []).append(future)
+        if len(batch.waiters) >= self.max_batch:
+            batch.timer.cancel()
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key: tuple, batch: _PendingBatch) -> None:
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        asyncio.get_running_loop().create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch: _PendingBatch) -> None:
+        ids = list(batch.waiters)
+        try:
+            if len(ids) == 1:
+                results = {ids[0]: await self._fetch_one(batch, ids[0])}
+            else:
+                results = await self._fetch_many(batch, ids)
+        except Exception as e:
+            for futures in batch.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for object_id, futures in batch.waiters.items():
+            result = results[object_id]
+            for index, future in enumerate(futures):
+                if not future.done():
+                    # Duplicate IDs in one window each get their own copy.
+                    future.set_result(result if index == 0 else copy.deepcopy(result))
+
+    async def _fetch_one(self, batch: _PendingBatch, object_id: str) -> Dict[str, Any]:
+        return await self._fetch(object_id, batch.access_token, batch.params, batch.retry)
+
+    async def _fetch_many(self, batch: _PendingBatch, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        logger.debug(f"Batching {len(ids)} object lookups into one ?ids= request")
+        combined = await self._fetch("", batch.access_token, {**batch.params, "ids": ",".join(ids)}, batch.retry)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        if isinstance(combined, dict) and "error" not in combined:
+            for object_id in ids:
+                item = combined.get(object_id)
+                if isinstance(item, dict):
+                    results[object_id] = item
+        else:
+            logger.info(f"Batched ?ids= lookup failed; fetching {len(ids)} objects individually")
+
+        missing = [object_id for object_id in ids if object_id not in results]
+        if missing:
+            singles = await asyncio.gather(*(self._fetch_one(batch, object_id) for object_id in missing))
+            results.update(zip(missing, singles))
+        return results
@@ -0,0 +1,323 @@
+"""Prometheus metrics for the streamable-http transport.
+
+The HTTP server mounts GET /metrics next to the MCP app (see
+http_auth_integration.py) and serves these metrics in the Prometheus text
+exposition format:
+
+    meta_ads_tool_duration_seconds{tool}                  histogram
+    meta_ads_tool_calls_total{tool,outcome}               counter (ok / error / exception)
+    meta_ads_tools_in_flight                              gauge
+    meta_ads_graph_requests_total{family,method,status}   counter
+    meta_ads_graph_request_duration_seconds{family}       histogram
+    meta_ads_graph_retries_total{family}                  counter
+    meta_ads_graph_requests_in_flight                     gauge
+    meta_ads_rate_limit_usage_percent{source,type,metric} gauge, latest Meta usage headers
+    meta_ads_cache_{hits,misses}_total                    counter, response cache lookups
+    meta_ads_cache_hit_ratio                              gauge
+    meta_ads_event_loop_lag_seconds                       histogram, how late a periodic timer fires
+
+Endpoints are grouped into families (act_123/insights -> act/insights,
+120200/ads -> node/ads) so label cardinality stays bounded.
+
+Everything is kept in memory with no extra dependency. The route is only
+mounted when META_ADS_METRICS_TOKEN is set, and scrapers must send
+"Authorization: Bearer <token>"; META_ADS_DISABLE_METRICS=1 turns it off
+altogether. The event loop is sampled
+every META_ADS_LOOP_LAG_INTERVAL seconds (default 0.1, 0 disables): blocking
+work on the loop (JSON encoding of large results, CPU-heavy post-processing)
+shows up as lag that delays every other in-flight request.
+"""
+
+import asyncio
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .utils import logger, get_env_bool, get_env_float
+
+METRICS_ENABLED = not get_env_bool("META_ADS_DISABLE_METRICS")
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+TOOL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+GRAPH_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LOOP_LAG_INTERVAL = get_env_float("META_ADS_LOOP_LAG_INTERVAL", 0.1)
+
+_ACT_RE = re.compile(r"^act_\d+$")
+_NODE_RE = re.compile(r"^\d+(_\d+)?$")
+
+LabelValues = Tuple[str, ...]
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Low-cardinality name for a Graph endpoint, e.g. act_123/insights -> act/insights."""
+    path = (endpoint or "").split("?", 1)[0].strip("/")
+    if not path:
+        return "root"
+    parts = []
+    for part in path.split("/")[:2]:
+        if _ACT_RE.match(part):
+            part = "act"
+        elif _NODE_RE.match(part):
+            part = "node"
+        parts.append(part)
+    return "/".join(parts)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def set_total(self, *labels: str, value: float) -> None:
+        """Mirror a running total that is counted elsewhere (read at scrape time)."""
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = GRAPH_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[LabelValues, List[float]] = {}  # bucket counts..., sum
+
+    def observe(self, *labels: str, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 1)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = self.header()
+        for labels, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {_format_value(cumulative)}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """The server's metrics plus callbacks that refresh gauges at scrape time."""
+
+    def __init__(self):
+        self.tool_duration = Histogram(
+            "meta_ads_tool_duration_seconds", "Wall time of MCP tool calls.", ("tool",), TOOL_BUCKETS)
+        self.tool_calls = Counter(
+            "meta_ads_tool_calls_total", "MCP tool calls by outcome.", ("tool", "outcome"))
+        self.tools_in_flight = Gauge(
+            "meta_ads_tools_in_flight", "MCP tool calls currently executing.")
+        self.graph_requests = Counter(
+            "meta_ads_graph_requests_total", "Graph API HTTP requests by endpoint family and status.",
+            ("family", "method", "status"))
+        self.graph_duration = Histogram(
+            "meta_ads_graph_request_duration_seconds", "Graph API HTTP round-trip time.", ("family",), GRAPH_BUCKETS)
+        self.graph_retries = Counter(
+            "meta_ads_graph_retries_total", "Graph API requests that were retries.", ("family",))
+        self.graph_in_flight = Gauge(
+            "meta_ads_graph_requests_in_flight", "Graph API HTTP requests currently in flight.")
+        self.rate_limit_usage = Gauge(
+            "meta_ads_rate_limit_usage_percent", "Latest usage reported in Meta rate-limit headers.",
+            ("source", "type", "metric"))
+        self.cache_hits = Counter("meta_ads_cache_hits_total", "Response cache hits since start.")
+        self.cache_misses = Counter("meta_ads_cache_misses_total", "Response cache misses since start.")
+        self.cache_hit_ratio = Gauge("meta_ads_cache_hit_ratio", "Response cache hits / lookups since start.")
+        self.event_loop_lag = Histogram(
+            "meta_ads_event_loop_lag_seconds", "How late a periodic timer on the event loop fired.",
+            buckets=LOOP_LAG_BUCKETS)
+        self._metrics = [
+            self.tool_duration, self.tool_calls, self.tools_in_flight,
+            self.graph_requests, self.graph_duration, self.graph_retries, self.graph_in_flight,
+            self.rate_limit_usage, self.cache_hits, self.cache_misses, self.cache_hit_ratio,
+            self.event_loop_lag,
+        ]
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Run `collector(registry)` before each scrape to refresh gauges."""
+        self._collectors.append(collector)
+
+    def observe_tool_call(self, tool: str, seconds: float, outcome: str) -> None:
+        self.tool_duration.observe(tool, value=seconds)
+        self.tool_calls.inc(tool, outcome)
+
+    def observe_graph_request(
+        self,
+        method: str,
+        endpoint: str,
+        status: Optional[int],
+        seconds: float,
+        retry: bool = False,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        family = endpoint_family(endpoint)
+        self.graph_requests.inc(family, method, str(status) if status is not None else "error")
+        self.graph_duration.observe(family, value=seconds)
+        if retry:
+            self.graph_retries.inc(family)
+        if usage:
+            self.observe_usage(usage)
+
+    def observe_usage(self, usage: Dict[str, Any]) -> None:
+        """Record the parsed Meta usage headers (see api._parse_meta_rate_limit_headers)."""
+        for source, types in _usage_values(usage):
+            for type_, values in types:
+                for metric, value in values.items():
+                    self.rate_limit_usage.set(source, type_, metric, value=value)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+
+async def monitor_event_loop_lag(registry: "MetricsRegistry", interval: float = LOOP_LAG_INTERVAL) -> None:
+    """Observe how late a timer fires every `interval` seconds, until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        registry.event_loop_lag.observe(value=max(0.0, loop.time() - scheduled))
+
+
+def _numeric(values: Any, keys: Iterable[str]) -> Dict[str, float]:
+    if not isinstance(values, dict):
+        return {}
+    return {key: float(values[key]) for key in keys if isinstance(values.get(key), (int, float))}
+
+
+def _usage_values(usage: Dict[str, Any]) -> List[Tuple[str, List[Tuple[str, Dict[str, float]]]]]:
+    """(source, [(type, {metric: pct})]) from parsed usage headers."""
+    result = []
+    app = _numeric(usage.get("app_usage"), ("call_count", "total_time", "total_cputime"))
+    if app:
+        result.append(("app", [("app", app)]))
+    account = _numeric(usage.get("ad_account_usage"), ("acc_id_util_pct",))
+    if account:
+        result.append(("ad_account", [("ad_account", account)]))
+    buc = usage.get("business_use_case_usage")
+    if isinstance(buc, dict):
+        # Keep the highest value per use-case type across businesses/accounts.
+        by_type: Dict[str, Dict[str, float]] = {}
+        for entries in buc.values():
+            for entry in entries if isinstance(entries, list) else []:
+                if not isinstance(entry, dict):
+                    continue
+                values = _numeric(entry, ("call_count", "total_time", "total_cputime"))
+                merged = by_type.setdefault(str(entry.get("type", "unknown")), {})
+                for key, value in values.items():
+                    merged[key] = max(merged.get(key, 0.0), value)
+        if by_type:
+            result.append(("business_use_case", sorted(by_type.items())))
+    return result
+
+
+def _collect_cache_stats(registry: MetricsRegistry) -> None:
+    from .cache import response_cache
+
+    stats = response_cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    registry.cache_hits.set_total(value=stats["hits"])
+    registry.cache_misses.set_total(value=stats["misses"])
+    registry.cache_hit_ratio.set(value=stats["hits"] / lookups if lookups else 0.0)
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+metrics.add_collector(_collect_cache_stats)
@@ -10,7 +10,7 @@ and fetchable records for ChatGPT Deep Research analysis.
 
 import json
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from .api import meta_api_tool, make_api_request, ensure_act_prefix
 from .server import mcp_server
 from .utils import logger
@@ -310,7 +310,7 @@ _data_manager = MetaAdsDataManager()
 async def search(
     query: str,
     access_token: Optional[str] = None
-) -> str:
+) -> Union[str, Dict[str, Any]]:
     """
     Search through Meta Ads data and return matching record IDs.
     It searches across ad accounts, campaigns, ads, pages, and businesses to find relevant records
@@ -347,7 +347,7 @@ async def search(
         }
         
         logger.info(f"Search successful. Query: '{query}', Results: {len(matching_ids)}")
-        return json.dumps(response, indent=2)
+        return response
         
     except Exception as e:
         error_msg = str(e)
@@ -3,22 +3,34 @@
 import os
 import json
 import time
+import asyncio
 import requests
 from pathlib import Path
 import platform
+import re
 from typing import Optional, Dict, Any
-from .utils import logger
+from .utils import logger, get_env_float
 
-# Enable more detailed logging
-import logging
-logger.setLevel(logging.DEBUG)
-
-# Base URL for pipeboard API
-PIPEBOARD_API_BASE = "https://pipeboard.co/api"
+# Base URL for pipeboard API (PIPEBOARD_API_BASE overrides it, e.g. for graph_emulator)
+PIPEBOARD_API_BASE = os.environ.get("PIPEBOARD_API_BASE", "").strip().rstrip("/") or "https://pipeboard.co/api"
 
 # Debug message about API base URL
 logger.info(f"Pipeboard API base URL: {PIPEBOARD_API_BASE}")
 
+# A cached Pipeboard token is reused for this many seconds, then refreshed in
+# the background. Keep it short so a reconnect on pipeboard.co is picked up.
+PIPEBOARD_TOKEN_TTL = get_env_float("META_ADS_PIPEBOARD_TOKEN_TTL", 300.0)
+# Tokens this close to expires_at are never handed out from the cache.
+PIPEBOARD_TOKEN_EXPIRY_MARGIN = 60.0
+
+# Fractional seconds of an ISO 8601 time, e.g. ".5" in "12:00:00.5+00:00"
+_FRACTION_RE = re.compile(r"\.(\d+)")
+
+
+class PipeboardUnavailableError(Exception):
+    """Pipeboard could not be reached or answered with a server error"""
+    pass
+
 class TokenInfo:
     """Stores token information including expiration"""
     def __init__(self, access_token: str, expires_at: Optional[str] = None, token_type: Optional[str] = None):
@@ -28,62 +40,51 @@ class TokenInfo:
         self.created_at = int(time.time())
         logger.debug(f"TokenInfo created. Expires at: {expires_at if expires_at else 'Not specified'}")
     
-    def is_expired(self) -> bool:
-        """Check if the token is expired"""
+    def expiry_timestamp(self) -> Optional[float]:
+        """Return expires_at as a Unix timestamp, or None if unset or unparseable"""
         if not self.expires_at:
-            logger.debug("No expiration date set for token, assuming not expired")
-            return False  # If no expiration is set, assume it's not expired
-        
-        # Parse ISO 8601 date format to timestamp
+            return None
+        from datetime import datetime, timezone
         try:
-            # Convert the expires_at string to a timestamp
-            # Format is like "2023-12-31T23:59:59.999Z" or "2023-12-31T23:59:59.999+00:00"
-            from datetime import datetime
-            
-            # Remove the Z suffix if present and handle +00:00 format
-            expires_at_str = self.expires_at
-            if expires_at_str.endswith('Z'):
-                expires_at_str = expires_at_str[:-1]  # Remove Z
-                
-            # Handle microseconds if present
-            if '.' in expires_at_str:
-                datetime_format = "%Y-%m-%dT%H:%M:%S.%f"
-            else:
-                datetime_format = "%Y-%m-%dT%H:%M:%S"
-                
-            # Handle timezone offset
-            timezone_offset = "+00:00"
-            if "+" in expires_at_str:
-                expires_at_str, timezone_offset = expires_at_str.split("+")
-                timezone_offset = "+" + timezone_offset
-            
-            # Parse the datetime without timezone info
-            expires_datetime = datetime.strptime(expires_at_str, datetime_format)
-            
-            # Convert to timestamp (assume UTC)
-            expires_timestamp = expires_datetime.timestamp()
-            current_time = time.time()
-            
-            # Check if token is expired and log result
-            is_expired = current_time > expires_timestamp
-            time_diff = expires_timestamp - current_time
-            if is_expired:
-                logger.debug(f"Token is expired! Current time: {datetime.fromtimestamp(current_time)}, " 
-                             f"Expires at: {datetime.fromtimestamp(expires_timestamp)}, "
-                             f"Expired {abs(time_diff):.0f} seconds ago")
-            else:
-                logger.debug(f"Token is still valid. Expires at: {datetime.fromtimestamp(expires_timestamp)}, "
-                             f"Time remaining: {time_diff:.0f} seconds")
-            
-            return is_expired
+            # Format is like "2023-12-31T23:59:59.999Z" or "2023-12-31T23:59:59.999+00:00".
+            # Python 3.10's fromisoformat only takes 3 or 6 fractional digits, so pad or cut to 6.
+            value = _FRACTION_RE.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"),
+                                     self.expires_at.strip().replace("Z", "+00:00"), count=1)
+            expires_at = datetime.fromisoformat(value)
+            if expires_at.tzinfo is None:
+                # Pipeboard times without an offset are UTC
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            return expires_at.timestamp()
         except Exception as e:
             logger.error(f"Error parsing expiration date: {e}")
             # Log the actual value to help diagnose format issues
             logger.error(f"Invalid expires_at value: '{self.expires_at}'")
-            # Log detailed error information
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            return None
+
+    def is_expired(self) -> bool:
+        """Check if the token is expired"""
+        if not self.expires_at:
+            logger.debug("No expiration date set for token, assuming not expired")
+            return False  # If no expiration is set, assume it's not expired
+
+        expires_timestamp = self.expiry_timestamp()
+        if expires_timestamp is None:
             return False  # If we can't parse the date, assume it's not expired
+
+        from datetime import datetime
+        current_time = time.time()
+
+        # Check if token is expired and log result
+        is_expired = current_time > expires_timestamp
+        time_diff = expires_timestamp - current_time
+        if is_expired:
+            logger.debug(f"Token is expired! Current time: {datetime.fromtimestamp(current_time)}, " 
+                         f"Expires at: {datetime.fromtimestamp(expires_timestamp)}, "
+                         f"Expired {abs(time_diff):.0f} seconds ago")
+        else:
+            logger.debug(f"Token is still valid. Expires at: {datetime.fromtimestamp(expires_timestamp)}, "
+                         f"Time remaining: {time_diff:.0f} seconds")
+        return is_expired
     
     def serialize(self) -> Dict[str, Any]:
         """Convert to a dictionary for storage"""
@@ -120,7 +121,9 @@ class PipeboardAuthManager:
         else:
             logger.info("Pipeboard authentication not enabled. Set PIPEBOARD_API_TOKEN environment variable to enable.")
         self.token_info = None
-        # Note: Token caching is disabled to always fetch fresh tokens from Pipeboard
+        # Tokens are kept in memory only; see PIPEBOARD_TOKEN_TTL
+        self._fetched_at = 0.0
+        self._refresh_task: Optional["asyncio.Task[Optional[str]]"] = None
     
     def _get_token_cache_path(self) -> Path:
         """Get the platform-specific path for token cache file"""
@@ -304,54 +307,70 @@ class PipeboardAuthManager:
             logger.error(f"Unexpected error initiating auth flow: {e}")
             raise
     
-    def get_access_token(self, force_refresh: bool = False) -> Optional[str]:
+    def _token_age(self) -> float:
+        return time.monotonic() - self._fetched_at
+
+    def _usable_token(self, margin: float) -> Optional[str]:
+        """The cached token if it does not expire within `margin` seconds"""
+        if not self.token_info or not self.token_info.access_token:
+            return None
+        expires_at = self.token_info.expiry_timestamp()
+        if expires_at is not None and expires_at - time.time() <= margin:
+            return None
+        return self.token_info.access_token
+
+    def _fresh_token(self) -> Optional[str]:
+        """The cached token if it can be used without asking Pipeboard"""
+        if self._token_age() >= PIPEBOARD_TOKEN_TTL:
+            return None
+        return self._usable_token(PIPEBOARD_TOKEN_EXPIRY_MARGIN)
+
+    def _fallback_token(self) -> Optional[str]:
+        """Last good token, used while Pipeboard is unreachable"""
+        token = self._usable_token(0)
+        if token:
+            logger.warning("Pipeboard unavailable, using the last good access token")
+        return token
+
+    def _fetch_token(self) -> Optional[TokenInfo]:
         """
-        Get the current access token, refreshing if necessary or if forced
-        
-        Args:
-            force_refresh: Force token refresh even if cached token exists
-            
+        Request a token from Pipeboard (blocking)
+
         Returns:
-            Access token if available, None otherwise
+            TokenInfo on success, None when Pipeboard has no token for us
+
+        Raises:
+            PipeboardUnavailableError: on timeouts, connection errors and 5xx
         """
-        # First check if API token is configured
-        if not self.api_token:
-            logger.error("TOKEN VALIDATION FAILED: No Pipeboard API token configured")
-            logger.error("Please set PIPEBOARD_API_TOKEN environment variable")
-            return None
-            
-        logger.info("Getting fresh token from Pipeboard (caching disabled)")
-        
-        # If force refresh or no token/expired token, get a new one from Pipeboard
+        # Make a request to get the token, using the same URL format as initiate_auth_flow
+        url = f"{PIPEBOARD_API_BASE}/meta/token?api_token={self.api_token}"
+        headers = {
+            "Content-Type": "application/json"
+        }
+
+        logger.info(f"Requesting token from {PIPEBOARD_API_BASE}/meta/token")
+
         try:
-            # Make a request to get the token, using the same URL format as initiate_auth_flow
-            url = f"{PIPEBOARD_API_BASE}/meta/token?api_token={self.api_token}"
-            headers = {
-                "Content-Type": "application/json"
-            }
-            
-            logger.info(f"Requesting token from {url}")
-            
             # Add timeout for better error messages
             try:
                 response = requests.get(url, headers=headers, timeout=10)
             except requests.exceptions.Timeout:
                 logger.error("TOKEN VALIDATION FAILED: Timeout while connecting to Pipeboard API")
                 logger.error(f"Could not connect to {PIPEBOARD_API_BASE} within 10 seconds")
-                return None
+                raise PipeboardUnavailableError("timeout")
             except requests.exceptions.ConnectionError:
                 logger.error("TOKEN VALIDATION FAILED: Connection error with Pipeboard API")
                 logger.error(f"Could not connect to {PIPEBOARD_API_BASE} - check if service is running")
-                return None
-                
+                raise PipeboardUnavailableError("connection error")
+
             logger.info(f"Token request response status: {response.status_code}")
-            
+
             # Better error handling with response content
             if response.status_code != 200:
                 logger.error(f"TOKEN VALIDATION FAILED: HTTP error {response.status_code}")
                 error_text = response.text if response.text else "No response content"
                 logger.error(f"Response content: {error_text}")
-                
+
                 # Add more specific error messages for common status codes
                 if response.status_code == 401:
                     logger.error("Authentication failed: Invalid Pipeboard API token")
@@ -359,9 +378,11 @@ class PipeboardAuthManager:
                     logger.error("Endpoint not found: Check if Pipeboard API service is running correctly")
                 elif response.status_code == 400:
                     logger.error("Bad request: The request to Pipeboard API was malformed")
-                    
+                elif response.status_code == 429 or response.status_code >= 500:
+                    raise PipeboardUnavailableError(f"HTTP {response.status_code}")
+
                 response.raise_for_status()
-                
+
             try:
                 data = response.json()
                 logger.info(f"Received token response with keys: {', '.join(data.keys())}")
@@ -369,7 +390,7 @@ class PipeboardAuthManager:
                 logger.error("TOKEN VALIDATION FAILED: Invalid JSON response from Pipeboard API")
                 logger.error(f"Response content (first 100 chars): {response.text[:100]}")
                 return None
-            
+
             # Validate response data
             if "access_token" not in data:
                 logger.error("TOKEN VALIDATION FAILED: No access_token in Pipeboard API response")
@@ -379,29 +400,25 @@ class PipeboardAuthManager:
                 else:
                     logger.error("No error information available in response")
                 return None
-                
-            # Create new token info
-            self.token_info = TokenInfo(
+
+            token_info = TokenInfo(
                 access_token=data.get("access_token"),
                 expires_at=data.get("expires_at"),
                 token_type=data.get("token_type", "bearer")
             )
-            
-            # Note: Token caching is disabled
-            
-            masked_token = self.token_info.access_token[:10] + "..." + self.token_info.access_token[-5:] if self.token_info.access_token else "None"
+            masked_token = token_info.access_token[:10] + "..." + token_info.access_token[-5:] if token_info.access_token else "None"
             logger.info(f"Successfully retrieved access token: {masked_token}")
-            return self.token_info.access_token
+            return token_info
+        except PipeboardUnavailableError:
+            raise
         except requests.RequestException as e:
-            status_code = e.response.status_code if hasattr(e, 'response') and e.response else None
-            response_text = e.response.text if hasattr(e, 'response') and e.response else "No response"
-            
+            status_code = e.response.status_code if hasattr(e, 'response') and e.response is not None else None
+            response_text = e.response.text if hasattr(e, 'response') and e.response is not None else "No response"
+
             if status_code == 401:
                 logger.error(f"Unauthorized: Check your PIPEBOARD_API_TOKEN. Response: {response_text}")
             elif status_code == 404:
                 logger.error(f"No token available: You might need to complete authorization first. Response: {response_text}")
-                # Return None so caller can handle the auth flow
-                return None
             else:
                 logger.error(f"Error getting access token (status {status_code}): {e}")
                 logger.error(f"Response content: {response_text}")
@@ -409,6 +426,95 @@ class PipeboardAuthManager:
         except Exception as e:
             logger.error(f"Unexpected error getting access token: {e}")
             return None
+
+    def _store_token(self, token_info: Optional[TokenInfo]) -> Optional[str]:
+        if token_info is None:
+            self.token_info = None
+            return None
+        self.token_info = token_info
+        self._fetched_at = time.monotonic()
+        return token_info.access_token
+
+    def get_access_token(self, force_refresh: bool = False) -> Optional[str]:
+        """
+        Get the current access token, refreshing if necessary or if forced
+
+        Blocks while Pipeboard is contacted; async code should use
+        aget_access_token instead.
+
+        Args:
+            force_refresh: Force token refresh even if cached token exists
+            
+        Returns:
+            Access token if available, None otherwise
+        """
+        # First check if API token is configured
+        if not self.api_token:
+            logger.error("TOKEN VALIDATION FAILED: No Pipeboard API token configured")
+            logger.error("Please set PIPEBOARD_API_TOKEN environment variable")
+            return None
+
+        if not force_refresh:
+            token = self._fresh_token()
+            if token:
+                return token
+
+        try:
+            return self._store_token(self._fetch_token())
+        except PipeboardUnavailableError:
+            return self._fallback_token()
+
+    async def aget_access_token(self, force_refresh: bool = False) -> Optional[str]:
+        """
+        Get the current access token without blocking the event loop
+
+        A cached token is returned immediately. Once it is older than
+        META_ADS_PIPEBOARD_TOKEN_TTL it is still returned while a background
+        refresh runs; only a missing token or one about to expire makes the
+        caller wait. Concurrent callers share one Pipeboard request, and the
+        last good token is used if Pipeboard is temporarily unreachable.
+
+        Args:
+            force_refresh: Wait for a new token even if a cached one exists
+
+        Returns:
+            Access token if available, None otherwise
+        """
+        if not self.api_token:
+            logger.error("TOKEN VALIDATION FAILED: No Pipeboard API token configured")
+            logger.error("Please set PIPEBOARD_API_TOKEN environment variable")
+            return None
+
+        if not force_refresh:
+            token = self._fresh_token()
+            if token:
+                return token
+            token = self._usable_token(PIPEBOARD_TOKEN_EXPIRY_MARGIN)
+            if token:
+                self._refresh_in_background()
+                return token
+
+        return await asyncio.shield(self._refresh())
+
+    def _refresh(self) -> "asyncio.Task[Optional[str]]":
+        """Start a token refresh, or join the one already in flight"""
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.get_running_loop().create_task(self._do_refresh())
+            self._refresh_task = task
+        return task
+
+    def _refresh_in_background(self) -> None:
+        task = self._refresh()
+        # Consume the result so a failed background refresh is not reported as never retrieved.
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _do_refresh(self) -> Optional[str]:
+        try:
+            token_info = await asyncio.to_thread(self._fetch_token)
+        except PipeboardUnavailableError:
+            return self._fallback_token()
+        return self._store_token(token_info)
         
     def invalidate_token(self) -> None:
         """Invalidate the current token, usually because it has expired or is invalid"""
@@ -0,0 +1,279 @@
+"""Adaptive client-side rate limiting for Meta Graph API requests.
+
+Meta reports how close the app and each ad account are to being throttled on
+every Graph response:
+
+    X-App-Usage                 {"call_count": 28, "total_time": 25, "total_cputime": 25}
+    X-Ad-Account-Usage          {"acc_id_util_pct": 9.67, "reset_time_duration": 0}
+    X-Business-Use-Case-Usage   {"<account id>": [{"type": "ads_management", "call_count": 95,
+                                                   "estimated_time_to_regain_access": 0, ...}]}
+
+Usage values are percentages of the limit. estimated_time_to_regain_access is
+in minutes and reset_time_duration in seconds.
+
+The limiter keeps a token bucket per scope ("app", one per ad account such
+as "act_123", and one per access token for user-level limits). Below the
+soft threshold nothing is paced. Above it the bucket's refill rate shrinks
+as reported usage climbs, and at 100% (or after a throttling error) the
+scope is blocked until Meta says access returns. An agent fanning out across
+an account therefore slows down before Meta answers with code 4 / 17 / 80004
+and locks the account out for an hour.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .utils import logger, get_env_bool, get_env_float
+
+APP_SCOPE = "app"
+
+# Graph error codes that mean "throttled". 4 is the app-level limit, 17 and 32
+# the user and page level limits (scoped to the access token, so one user of a
+# multi-tenant server being throttled does not pause everyone); 613 and the
+# 80000 series are per ad account / business use case.
+APP_THROTTLE_CODES = frozenset({4})
+USER_THROTTLE_CODES = frozenset({17, 32})
+ACCOUNT_THROTTLE_CODES = frozenset({613})
+
+
+def is_throttle_error_code(code: Any) -> bool:
+    """Return True for Graph error codes that signal rate limiting."""
+    if not isinstance(code, int):
+        return False
+    return (code in APP_THROTTLE_CODES or code in USER_THROTTLE_CODES or code in ACCOUNT_THROTTLE_CODES
+            or 80000 <= code <= 80099)
+
+
+_ACCOUNT_ENDPOINT_RE = re.compile(r"^/?(act_\d+)")
+
+
+def token_scope(access_token: Optional[str]) -> Optional[str]:
+    """Scope for user-level limits of `access_token` (a digest, never the token itself)."""
+    if not access_token:
+        return None
+    return "user:" + hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:16]
+
+
+def _max_pct(values: Dict[str, Any], keys: Iterable[str]) -> float:
+    pct = 0.0
+    for key in keys:
+        value = values.get(key)
+        if isinstance(value, (int, float)):
+            pct = max(pct, float(value))
+    return pct
+
+
+_USAGE_KEYS = ("call_count", "total_time", "total_cputime")
+
+
+class _ScopeState:
+    """Token bucket whose refill rate follows the latest reported usage."""
+
+    def __init__(self, now: float):
+        self.usage_pct = 0.0
+        self.observed_at = now
+        self.blocked_until = 0.0
+        self.tokens = float("inf")
+        self.refilled_at = now
+
+
+class AdaptiveRateLimiter:
+    """Per-app and per-ad-account pacing driven by Meta's usage headers."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_rps: float = 10.0,
+        min_rps: float = 0.2,
+        soft_threshold: float = 75.0,
+        max_wait: float = 20.0,
+        cooldown: float = 60.0,
+        usage_ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = enabled
+        self.max_rps = max_rps
+        self.min_rps = min_rps
+        self.soft_threshold = soft_threshold
+        self.max_wait = max_wait
+        self.cooldown = cooldown
+        self.usage_ttl = usage_ttl
+        self._clock = clock
+        self._scopes: Dict[str, _ScopeState] = {}
+
+    @classmethod
+    def from_env(cls) -> "AdaptiveRateLimiter":
+        return cls(
+            enabled=not get_env_bool("META_ADS_DISABLE_RATE_LIMITER"),
+            max_rps=get_env_float("META_ADS_RATE_LIMIT_MAX_RPS", 10.0),
+            min_rps=get_env_float("META_ADS_RATE_LIMIT_MIN_RPS", 0.2),
+            soft_threshold=get_env_float("META_ADS_RATE_LIMIT_SOFT_PCT", 75.0),
+            max_wait=get_env_float("META_ADS_RATE_LIMIT_MAX_WAIT", 20.0),
+            cooldown=get_env_float("META_ADS_RATE_LIMIT_COOLDOWN", 60.0),
+        )
+
+    def reset(self) -> None:
+        """Forget all observed usage (used by tests)."""
+        self._scopes.clear()
+
+    @staticmethod
+    def scopes_for_endpoint(endpoint: str, access_token: Optional[str] = None) -> List[str]:
+        """Scopes a request to `endpoint` draws from: always the app, plus its ad account and token."""
+        scopes = [APP_SCOPE]
+        match = _ACCOUNT_ENDPOINT_RE.match(endpoint or "")
+        if match:
+            scopes.append(match.group(1))
+        user_scope = token_scope(access_token)
+        if user_scope:
+            scopes.append(user_scope)
+        return scopes
+
+    def _state(self, scope: str, now: float) -> _ScopeState:
+        state = self._scopes.get(scope)
+        if state is None:
+            state = self._scopes[scope] = _ScopeState(now)
+        return state
+
+    def _rate(self, state: _ScopeState, now: float) -> Optional[float]:
+        """Current refill rate in requests/second, or None when unpaced."""
+        if now - state.observed_at > self.usage_ttl or state.usage_pct < self.soft_threshold:
+            return None
+        span = max(100.0 - self.soft_threshold, 1e-9)
+        headroom = max(0.0, 1.0 - (state.usage_pct - self.soft_threshold) / span)
+        return max(self.min_rps, self.max_rps * headroom)
+
+    def _refill(self, state: _ScopeState, rate: float, now: float) -> None:
+        capacity = max(1.0, rate)
+        state.tokens = min(capacity, state.tokens + (now - state.refilled_at) * rate)
+        state.refilled_at = now
+
+    def _wait_for(self, state: _ScopeState, now: float, consume: bool) -> float:
+        wait = max(0.0, state.blocked_until - now)
+        rate = self._rate(state, now)
+        if rate is None:
+            # Unpaced: keep the bucket full so pacing starts with a full burst.
+            state.tokens = float("inf")
+            state.refilled_at = now
+            return wait
+        self._refill(state, rate, now)
+        tokens_after = state.tokens - 1.0
+        if consume:
+            state.tokens = tokens_after
+        if tokens_after < -1e-9:
+            wait = max(wait, -tokens_after / rate)
+        return wait
+
+    def retry_after(self, scopes: Iterable[str]) -> float:
+        """Seconds until a request on `scopes` would be admitted (no token is taken)."""
+        if not self.enabled:
+            return 0.0
+        now = self._clock()
+        return max(self._wait_for(self._state(s, now), now, consume=False) for s in scopes)
+
+    async def acquire(self, scopes: List[str]) -> Optional[float]:
+        """Wait for permission to send a request on `scopes`.
+
+        Returns None once the request may proceed. If the required wait is
+        longer than max_wait, returns the wait in seconds without taking a
+        token so the caller can fail fast instead of hanging the tool call.
+        """
+        if not self.enabled:
+            return None
+        wait = self.retry_after(scopes)
+        if wait > self.max_wait:
+            logger.warning("Rate limiter refusing request on %s: %.1fs until access returns", scopes, wait)
+            return wait
+        now = self._clock()
+        wait = max(self._wait_for(self._state(s, now), now, consume=True) for s in scopes)
+        if wait > 0:
+            logger.info("Rate limiter pacing request on %s for %.2fs", scopes, wait)
+            await asyncio.sleep(wait)
+        return None
+
+    def _record(self, scope: str, pct: float, block_seconds: float, now: float) -> None:
+        state = self._state(scope, now)
+        state.usage_pct = pct
+        state.observed_at = now
+        if pct >= 100.0 and block_seconds <= 0:
+            block_seconds = self.cooldown
+        if block_seconds > 0:
+            state.blocked_until = max(state.blocked_until, now + block_seconds)
+
+    def observe(self, usage: Dict[str, Any], endpoint: str, error_code: Any = None,
+                access_token: Optional[str] = None) -> None:
+        """Feed parsed usage headers (and any throttling error code) into the buckets.
+
+        `usage` is the dict built by api._parse_meta_rate_limit_headers;
+        `access_token` is the token of the request, for user-level throttles.
+        """
+        if not self.enabled:
+            return
+        now = self._clock()
+        match = _ACCOUNT_ENDPOINT_RE.match(endpoint or "")
+        account_scope = match.group(1) if match else None
+
+        app_usage = usage.get("app_usage")
+        if isinstance(app_usage, dict):
+            self._record(APP_SCOPE, _max_pct(app_usage, _USAGE_KEYS), 0.0, now)
+
+        # Meta's own estimate of when access returns, for a throttling error below
+        regain_seconds = 0.0
+
+        ad_account_usage = usage.get("ad_account_usage")
+        if isinstance(ad_account_usage, dict) and account_scope:
+            pct = _max_pct(ad_account_usage, ("acc_id_util_pct",))
+            reset = ad_account_usage.get("reset_time_duration")
+            reset = float(reset) if isinstance(reset, (int, float)) else 0.0
+            regain_seconds = max(regain_seconds, reset)
+            self._record(account_scope, pct, reset if pct >= 100.0 else 0.0, now)
+
+        buc_usage = usage.get("business_use_case_usage")
+        if isinstance(buc_usage, dict):
+            for key, entries in buc_usage.items():
+                if not isinstance(entries, list):
+                    continue
+                scope = key if str(key).startswith("act_") else f"act_{key}"
+                pct, regain_minutes = 0.0, 0.0
+                for entry in entries:
+                    if not isinstance(entry, dict):
+                        continue
+                    pct = max(pct, _max_pct(entry, _USAGE_KEYS))
+                    eta = entry.get("estimated_time_to_regain_access")
+                    if isinstance(eta, (int, float)):
+                        regain_minutes = max(regain_minutes, float(eta))
+                regain_seconds = max(regain_seconds, regain_minutes * 60.0)
+                self._record(scope, pct, regain_minutes * 60.0, now)
+
+        if is_throttle_error_code(error_code):
+            if error_code in USER_THROTTLE_CODES:
+                scope = token_scope(access_token) or account_scope or APP_SCOPE
+            elif error_code in APP_THROTTLE_CODES or not account_scope:
+                scope = APP_SCOPE
+            else:
+                scope = account_scope
+            state = self._state(scope, now)
+            state.usage_pct = max(state.usage_pct, 100.0)
+            state.observed_at = now
+            block_seconds = regain_seconds if regain_seconds > 0 else self.cooldown
+            state.blocked_until = max(state.blocked_until, now + block_seconds)
+            logger.warning("Graph throttling error %s on %s; pausing scope %s for %.0fs",
+                           error_code, endpoint, scope, block_seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Latest usage and block state per scope, for diagnostics."""
+        now = self._clock()
+        return {
+            scope: {
+                "usage_pct": state.usage_pct,
+                "blocked_for_seconds": max(0.0, state.blocked_until - now),
+                "age_seconds": now - state.observed_at,
+            }
+            for scope, state in self._scopes.items()
+        }
+
+
+# Process-wide limiter shared by all make_api_request calls
+rate_limiter = AdaptiveRateLimiter.from_env()
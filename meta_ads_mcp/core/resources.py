@@ -1,8 +1,20 @@
-"""Resource handling for Meta Ads API."""
+"""Resource handling for Meta Ads API.
 
-from typing import Dict, Any
+Besides ad creative images (meta-ads://images/{id}), tool results that are
+too large to return inline are kept here (meta-ads://results/{id}): the tool
+returns a summary with the row count, column schema and a few preview rows,
+and get_result_slice pages through the stored rows without asking Meta again.
+"""
+
+from typing import Dict, Any, List, Optional
 import base64
-from .utils import ad_creative_images
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from .utils import ad_creative_images, logger, get_env_int
+from .serialization import dumps, flatten_row
 
 
 async def list_resources() -> Dict[str, Any]:
@@ -43,4 +55,178 @@ async def get_resource(resource_id: str) -> Dict[str, Any]:
         }
     
     # Resource not found
-    return {"error": f"Resource not found: {resource_id}"} 
\ No newline at end of file
+    return {"error": f"Resource not found: {resource_id}"} 
+
+
+# Results larger than this many characters of JSON are stored instead of
+# returned inline. Off (0) by default: clients that do not call
+# get_result_slice would only see the summary, so spilling is opt-in.
+SPILL_CHARS = get_env_int("META_ADS_SPILL_CHARS", 0)
+
+# Rows shown inline in a spilled result's summary
+SPILL_PREVIEW_ROWS = 5
+
+RESULT_URI_PREFIX = "meta-ads://results/"
+
+# Tools whose output is already a bounded slice of a stored result
+UNSPILLED_TOOLS = {"get_result_slice"}
+
+
+def _owner(access_token: Optional[str]) -> str:
+    """Stored results are only readable with the token that produced them."""
+    return hashlib.sha256((access_token or "").encode("utf-8")).hexdigest()
+
+
+class StoredResult:
+    """A tool result kept server-side."""
+
+    __slots__ = ("result_id", "tool", "owner", "created_at", "result", "size")
+
+    def __init__(self, result_id: str, tool: str, owner: str, result: Dict[str, Any], size: int):
+        self.result_id = result_id
+        self.tool = tool
+        self.owner = owner
+        self.created_at = time.monotonic()
+        self.result = result
+        self.size = size
+
+    @property
+    def rows(self) -> List[Any]:
+        return self.result["data"]
+
+    @property
+    def uri(self) -> str:
+        return RESULT_URI_PREFIX + self.result_id
+
+
+class ResultStore:
+    """In-memory store of large tool results, bounded by total size and age."""
+
+    def __init__(self, max_chars: int = 20_000_000, ttl: float = 3600.0):
+        self.max_chars = max_chars
+        self.ttl = ttl
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResultStore":
+        return cls(
+            max_chars=get_env_int("META_ADS_RESULT_STORE_CHARS", 20_000_000),
+            ttl=get_env_int("META_ADS_RESULT_TTL", 3600),
+        )
+
+    def put(self, tool: str, access_token: Optional[str], result: Dict[str, Any], size: int) -> StoredResult:
+        stored = StoredResult(secrets.token_urlsafe(12), tool, _owner(access_token), result, size)
+        with self._lock:
+            self._results[stored.result_id] = stored
+            self._total += size
+            self._evict()
+        return stored
+
+    def get(self, result_id: str, access_token: Optional[str]) -> Optional[StoredResult]:
+        with self._lock:
+            self._evict()
+            stored = self._results.get(result_id)
+            if stored is None or not secrets.compare_digest(stored.owner, _owner(access_token)):
+                return None
+            self._results.move_to_end(result_id)
+            return stored
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._total = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._results:
+            result_id, oldest = next(iter(self._results.items()))
+            expired = now - oldest.created_at > self.ttl
+            # Always keep the newest result, even if it alone exceeds the budget
+            over_budget = self._total > self.max_chars and len(self._results) > 1
+            if not (expired or over_budget):
+                break
+            del self._results[result_id]
+            self._total -= oldest.size
+
+
+def _schema(rows: List[Any]) -> Dict[str, str]:
+    """Column name -> JSON type of the first non-empty value, over flattened rows."""
+    schema: Dict[str, str] = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        for column, value in flatten_row(row).items():
+            if column not in schema:
+                schema[column] = _json_type(value)
+    return schema
+
+
+def _json_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def spill_result(tool: str, access_token: Optional[str], result: Dict[str, Any], text: str) -> Optional[Dict[str, Any]]:
+    """Store a list result whose JSON text exceeds SPILL_CHARS; returns the inline summary.
+
+    Returns None (return the result as-is) when spilling is disabled, the
+    text is within budget, or the result has no list of rows to slice.
+    """
+    if not SPILL_CHARS or len(text) <= SPILL_CHARS or not isinstance(result.get("data"), list):
+        return None
+    if tool in UNSPILLED_TOOLS:
+        return None
+    stored = result_store.put(tool, access_token, result, len(text))
+    logger.info("Stored %s result %s (%d rows, %d chars) instead of returning it inline",
+                tool, stored.result_id, len(stored.rows), len(text))
+    summary: Dict[str, Any] = {
+        "result_id": stored.result_id,
+        "resource_uri": stored.uri,
+        "row_count": len(stored.rows),
+        "size_chars": len(text),
+        "columns": _schema(stored.rows),
+        "preview": stored.rows[:SPILL_PREVIEW_ROWS],
+        "note": (
+            f"The full result is {len(text)} characters, above the {SPILL_CHARS}-character inline limit. "
+            f"Use get_result_slice(result_id=\"{stored.result_id}\", offset=..., limit=..., columns=[...]) "
+            "to read rows, or read the resource URI."
+        ),
+    }
+    for key, value in result.items():
+        if key != "data":
+            summary[key] = value
+    return summary
+
+
+async def get_result_resource(result_id: str) -> str:
+    """
+    Get a stored tool result (meta-ads://results/{result_id}) as JSON
+
+    Args:
+        result_id: ID returned in a spilled tool result
+
+    Returns:
+        The full result as JSON text
+    """
+    from . import auth
+
+    stored = result_store.get(result_id, await auth.get_current_access_token())
+    if stored is None:
+        return dumps({"error": f"Result not found or expired: {result_id}"})
+    return dumps(stored.result)
+
+
+# Process-wide store of spilled results
+result_store = ResultStore.from_env()
@@ -0,0 +1,138 @@
+"""Retry policy for throttled and transient Graph API failures.
+
+Without retries a single code 17 or 503 from Meta went straight back to the
+LLM, which either retried immediately (making the throttle worse) or gave up.
+make_api_request now retries those failures itself:
+
+- throttling errors (codes 4 / 17 / 32 / 613 / 80000-series) wait until Meta
+  says access returns (estimated_time_to_regain_access from the
+  X-Business-Use-Case-Usage header, reset_time_duration from
+  X-Ad-Account-Usage, or the rate limiter's cooldown), plus a little jitter;
+- 5xx responses, Graph's transient codes 1 / 2, timeouts and dropped
+  connections back off exponentially with full jitter.
+
+Only idempotent GETs are retried by default. A throttle that will last longer
+than max_delay (15s by default, well under the limiter's 60s cooldown and
+MCP client timeouts) is returned to the caller right away rather than holding
+the tool call open.
+"""
+
+import random
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import httpx
+
+from .rate_limiter import is_throttle_error_code
+from .utils import get_env_bool, get_env_float, get_env_int
+
+# Graph codes documented as temporary ("An unknown error occurred",
+# "Service temporarily unavailable").
+TRANSIENT_ERROR_CODES = frozenset({1, 2})
+
+# Network failures where the request may simply be sent again. Bound at import
+# time so tests that swap out api.httpx do not affect the check.
+TRANSIENT_TRANSPORT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+def is_transient_exception(exc: BaseException) -> bool:
+    """Return True for transport errors that are worth retrying."""
+    return isinstance(exc, TRANSIENT_TRANSPORT_ERRORS)
+
+
+def is_retryable_failure(status_code: Optional[int], error_code: Any) -> bool:
+    """Return True when a failed Graph response is throttling or transient."""
+    if is_throttle_error_code(error_code):
+        return True
+    if isinstance(error_code, int) and error_code in TRANSIENT_ERROR_CODES:
+        return True
+    return status_code is not None and status_code >= 500
+
+
+def regain_access_seconds(usage: Dict[str, Any]) -> float:
+    """Seconds until Meta says a throttled app or ad account regains access.
+
+    `usage` is the dict built by api._parse_meta_rate_limit_headers. Returns 0
+    when the headers carry no hint.
+    """
+    seconds = 0.0
+    buc_usage = usage.get("business_use_case_usage")
+    if isinstance(buc_usage, dict):
+        for entries in buc_usage.values():
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                eta = entry.get("estimated_time_to_regain_access") if isinstance(entry, dict) else None
+                if isinstance(eta, (int, float)):
+                    seconds = max(seconds, float(eta) * 60.0)
+    ad_account_usage = usage.get("ad_account_usage")
+    if isinstance(ad_account_usage, dict):
+        reset = ad_account_usage.get("reset_time_duration")
+        if isinstance(reset, (int, float)):
+            seconds = max(seconds, float(reset))
+    return seconds
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter for make_api_request."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 15.0,
+        retry_methods: Iterable[str] = ("GET",),
+        rng: Callable[[], float] = random.random,
+    ):
+        self.enabled = enabled
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self._rng = rng
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            enabled=not get_env_bool("META_ADS_DISABLE_RETRIES"),
+            max_attempts=get_env_int("META_ADS_RETRY_MAX_ATTEMPTS", 3),
+            base_delay=get_env_float("META_ADS_RETRY_BASE_DELAY", 0.5),
+            max_delay=get_env_float("META_ADS_RETRY_MAX_DELAY", 15.0),
+        )
+
+    def allows(self, method: str, override: Optional[bool] = None) -> bool:
+        """Whether a request with `method` may be retried.
+
+        `override` lets a caller opt a non-idempotent request in (True) or a
+        GET out (False); None applies the policy's method list.
+        """
+        if not self.enabled:
+            return False
+        if override is not None:
+            return override
+        return method.upper() in self.retry_methods
+
+    def backoff(self, retry_number: int) -> float:
+        """Full-jitter exponential backoff for the Nth retry (1-based)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        return cap * self._rng()
+
+    def delay_for(self, attempt: int, regain_after: float = 0.0) -> Optional[float]:
+        """Seconds to wait before retrying after failed attempt `attempt`.
+
+        Returns None when attempts are exhausted or Meta's regain-access hint
+        is longer than max_delay.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if regain_after > 0:
+            if regain_after > self.max_delay:
+                return None
+            # Spread clients that were throttled together so they do not all
+            # come back in the same instant.
+            return regain_after + self.base_delay * self._rng()
+        return self.backoff(attempt)
+
+
+# Process-wide policy used by make_api_request
+retry_policy = RetryPolicy.from_env()
@@ -0,0 +1,149 @@
+"""JSON encoding of tool output and decoding of Graph responses.
+
+Tool results used to be json.dumps(..., indent=2) everywhere. For large
+insights or creative payloads the indentation alone is 20-35% of the bytes
+sent over streamable-http and put into the model's context. Three output
+formats are available:
+
+- "pretty" (default): indented JSON, as before;
+- "compact": no whitespace between tokens;
+- "table": list results ({"data": [rows...]}) become one header plus rows of
+  values (see to_table), encoded compactly. Results without a list of rows
+  are encoded as in "compact".
+
+Set the server-wide default with META_ADS_OUTPUT_FORMAT=compact; tools that
+take an `output_format` argument can override it per call (meta_api_tool
+applies it to everything the tool returns).
+
+orjson is used for encoding and decoding when installed (pip install
+meta-ads-mcp[fast-json]); otherwise the standard library json module is.
+"""
+
+import contextvars
+import json
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .utils import logger
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+PRETTY = "pretty"
+COMPACT = "compact"
+TABLE = "table"
+OUTPUT_FORMATS = (PRETTY, COMPACT, TABLE)
+
+
+def _default_output_format() -> str:
+    raw = os.environ.get("META_ADS_OUTPUT_FORMAT", "").strip().lower()
+    if not raw:
+        return PRETTY
+    if raw not in OUTPUT_FORMATS:
+        logger.warning("Ignoring invalid META_ADS_OUTPUT_FORMAT %r (using %s)", raw, PRETTY)
+        return PRETTY
+    return raw
+
+
+DEFAULT_OUTPUT_FORMAT = _default_output_format()
+
+_output_format: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "meta_ads_output_format", default=None
+)
+
+
+@contextmanager
+def output_format(fmt: Optional[str]) -> Iterator[None]:
+    """Encode tool output inside the block in `fmt` (None keeps the server default)."""
+    token = _output_format.set(fmt)
+    try:
+        yield
+    finally:
+        _output_format.reset(token)
+
+
+def current_output_format() -> str:
+    """The output format for the tool call being executed."""
+    return _output_format.get() or DEFAULT_OUTPUT_FORMAT
+
+
+def dumps(value: Any, fmt: Optional[str] = None) -> str:
+    """Encode a tool result in `fmt`, defaulting to the current output format."""
+    compact = (fmt or current_output_format()) in (COMPACT, TABLE)
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS
+            if not compact:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(value, default=str, option=option).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib handles them
+    if compact:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+    return json.dumps(value, indent=2, default=str)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text (e.g. a Graph API response body)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _flatten(row: Dict[str, Any], prefix: str, out: Dict[str, Any]) -> None:
+    for key, value in row.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            _flatten(value, f"{name}.", out)
+        elif isinstance(value, list) and value and all(
+                isinstance(item, dict) and "action_type" in item for item in value):
+            # actions, action_values, cost_per_action_type, ...: one column per action type
+            for item in value:
+                column = f"{name}.{item['action_type']}"
+                for field, field_value in item.items():
+                    if field == "value":
+                        out[column] = field_value
+                    elif field != "action_type":
+                        out[f"{column}.{field}"] = field_value
+        else:
+            out[name] = value
+
+
+def flatten_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """One Graph row as {column: value}: nested objects become dotted columns and
+    action lists are pivoted by action_type (actions.link_click, ...). Empty
+    values are dropped."""
+    out: Dict[str, Any] = {}
+    _flatten(row, "", out)
+    return {column: value for column, value in out.items() if not _is_empty(value)}
+
+
+def to_table(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn {"data": [rows...], ...} into {"columns": [...], "rows": [[...]], ...}.
+
+    Columns are in first-seen order and only exist if some row has a value
+    for them; missing cells are null. Keys next to "data" (paging, summary)
+    are kept as they are.
+    """
+    flat_rows = [flatten_row(row) if isinstance(row, dict) else {"value": row} for row in result["data"]]
+    columns: Dict[str, None] = {}
+    for row in flat_rows:
+        for column in row:
+            columns.setdefault(column)
+    names: List[str] = list(columns)
+    table: Dict[str, Any] = {
+        "columns": names,
+        "rows": [[row.get(name) for name in names] for row in flat_rows],
+        "row_count": len(flat_rows),
+    }
+    for key, value in result.items():
+        if key != "data":
+            table[key] = value
+    return table
@@ -2,13 +2,14 @@
 
 from mcp.server.fastmcp import FastMCP
 import argparse
+import asyncio
 import os
 import sys
 import webbrowser
 import json
 from typing import Dict, Any, Optional
 from .auth import login as login_auth
-from .resources import list_resources, get_resource
+from .resources import list_resources, get_resource, get_result_resource
 from .utils import logger
 from .pipeboard_auth import pipeboard_auth_manager
 import time
@@ -19,6 +20,7 @@ mcp_server = FastMCP("meta-ads")
 # Register resource URIs
 mcp_server.resource(uri="meta-ads://resources")(list_resources)
 mcp_server.resource(uri="meta-ads://images/{resource_id}")(get_resource)
+mcp_server.resource(uri="meta-ads://results/{result_id}", mime_type="application/json")(get_result_resource)
 
 
 class StreamableHTTPHandler:
@@ -199,6 +201,44 @@ def login_cli():
     login_auth()
 
 
+def install_graph_client_shutdown(server: FastMCP) -> None:
+    """Close the shared Graph API client when the server's event loop winds down.
+
+    FastMCP's lifespan runs once per request in stateless HTTP mode, so the
+    pooled client is tied to the transport runners instead.
+    """
+    from .api import aclose_graph_client
+
+    for method_name in ("run_stdio_async", "run_streamable_http_async"):
+        original_runner = getattr(server, method_name)
+
+        async def run_then_close_client(_original_runner=original_runner):
+            try:
+                await _original_runner()
+            finally:
+                await aclose_graph_client()
+
+        setattr(server, method_name, run_then_close_client)
+
+
+def install_event_loop_monitor(server: FastMCP) -> None:
+    """Sample event-loop lag into the metrics while the HTTP transport runs."""
+    from .metrics import LOOP_LAG_INTERVAL, METRICS_ENABLED, metrics, monitor_event_loop_lag
+
+    if not METRICS_ENABLED or LOOP_LAG_INTERVAL <= 0:
+        return
+    original_runner = server.run_streamable_http_async
+
+    async def run_with_monitor():
+        monitor = asyncio.create_task(monitor_event_loop_lag(metrics))
+        try:
+            await original_runner()
+        finally:
+            monitor.cancel()
+
+    server.run_streamable_http_async = run_with_monitor
+
+
 def main():
     """Main entry point for the package"""
     # Log startup information
@@ -225,6 +265,8 @@ def main():
                        help="Host for Streamable HTTP transport (default: localhost, only used with --transport streamable-http)")
     parser.add_argument("--sse-response", action="store_true", 
                        help="Use SSE response format instead of JSON (default: JSON, only used with --transport streamable-http)")
+    parser.add_argument("--http2", action="store_true",
+                       help="Use HTTP/2 for Graph API requests (requires the 'h2' package; also enabled by META_ADS_HTTP2=1)")
     
     args = parser.parse_args()
     logger.debug(f"Parsed args: login={args.login}, app_id={args.app_id}, version={args.version}")
@@ -318,6 +360,14 @@ def main():
             print(f"✅ Valid Pipeboard access token found")
             print(f"   Token preview: {token[:10]}...{token[-5:]}")
     
+    if args.http2:
+        from .api import set_graph_http2
+        if not set_graph_http2(True):
+            print("Warning: --http2 ignored because the 'h2' package is not installed")
+
+    # Release pooled Graph API connections on shutdown (both transports)
+    install_graph_client_shutdown(mcp_server)
+
     # Transport-specific server initialization and startup
     if args.transport == "streamable-http":
         logger.info(f"Starting MCP server with Streamable HTTP transport on {args.host}:{args.port}")
@@ -346,6 +396,7 @@ def main():
         # regression). The protection is irrelevant for a loopback-only
         # service that no external client can reach.
         mcp_server.settings.transport_security.enable_dns_rebinding_protection = False
+        install_event_loop_monitor(mcp_server)
 
         # Import all tool modules to ensure they are registered
         logger.info("Ensuring all tools are registered for HTTP transport")
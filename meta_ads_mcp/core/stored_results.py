@@ -0,0 +1,72 @@
+"""Reading tool results that were too large to return inline (see resources.py)."""
+
+from typing import Any, Dict, List, Optional
+
+from .api import meta_api_tool
+from .resources import result_store
+from .serialization import flatten_row
+from .server import mcp_server
+
+
+def _matches(row: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    return all(str(row.get(column)) == str(value) for column, value in filters.items())
+
+
+@mcp_server.tool()
+@meta_api_tool
+async def get_result_slice(
+    result_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    access_token: Optional[str] = None,
+    output_format: Optional[str] = None
+) -> str:
+    """
+    Read rows from a large tool result that was stored server-side instead of returned inline.
+
+    Tools such as get_insights return a summary with a result_id, row_count, column schema
+    and a few preview rows when their full output is too large. Use this tool to page through
+    the stored rows without querying Meta again.
+
+    Args:
+        result_id: The result_id from the summary
+        offset: Index of the first row to return (default: 0)
+        limit: Maximum number of rows to return (default: 100)
+        columns: Only return these columns, using the names from the summary's column schema
+                 (nested fields are dotted, e.g. "actions.purchase"). Default: full rows.
+        filters: Only return rows whose columns equal these values, e.g. {"campaign_name": "Spring sale"}
+        access_token: Meta API access token (optional - will use cached token if not provided)
+        output_format: "table", "compact" or "pretty" (see get_insights)
+    """
+    stored = result_store.get(result_id, access_token)
+    if stored is None:
+        return {
+            "error": f"Result not found or expired: {result_id}",
+            "hint": "Stored results expire after a while; run the original tool again."
+        }
+    if offset < 0 or limit < 1:
+        return {"error": "offset must be >= 0 and limit >= 1"}
+
+    rows = stored.rows
+    if filters or columns:
+        flat_rows = [flatten_row(row) if isinstance(row, dict) else {"value": row} for row in rows]
+        if filters:
+            flat_rows = [row for row in flat_rows if _matches(row, filters)]
+        if columns:
+            flat_rows = [{column: row.get(column) for column in columns} for row in flat_rows]
+        rows = flat_rows
+
+    page = rows[offset:offset + limit]
+    result: Dict[str, Any] = {
+        "result_id": result_id,
+        "tool": stored.tool,
+        "total_rows": len(stored.rows),
+        "matched_rows": len(rows),
+        "offset": offset,
+        "data": page,
+    }
+    if offset + len(page) < len(rows):
+        result["next_offset"] = offset + len(page)
+    return result
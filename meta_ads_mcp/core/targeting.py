@@ -9,7 +9,7 @@ from .server import mcp_server
 
 @mcp_server.tool()
 @meta_api_tool
-async def search_interests(query: str, access_token: Optional[str] = None, limit: int = 25) -> str:
+async def search_interests(query: str, access_token: Optional[str] = None, limit: int = 25, max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Search for interest targeting options by keyword.
 
@@ -17,6 +17,8 @@ async def search_interests(query: str, access_token: Optional[str] = None, limit
         query: Search term for interests (e.g., "baseball", "cooking", "travel")
         access_token: Meta API access token (optional - will use cached token if not provided)
         limit: Maximum number of results to return (default: 25)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
 
     Returns:
         JSON string containing interest data with id, name, audience_size, and path fields
@@ -33,12 +35,12 @@ async def search_interests(query: str, access_token: Optional[str] = None, limit
 
     data = await make_api_request(endpoint, access_token, params)
 
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def get_interest_suggestions(interest_list: List[str], access_token: Optional[str] = None, limit: int = 25) -> str:
+async def get_interest_suggestions(interest_list: List[str], access_token: Optional[str] = None, limit: int = 25, max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Get interest suggestions based on existing interests.
 
@@ -46,6 +48,8 @@ async def get_interest_suggestions(interest_list: List[str], access_token: Optio
         interest_list: List of interest names to get suggestions for (e.g., ["Basketball", "Soccer"])
         access_token: Meta API access token (optional - will use cached token if not provided)
         limit: Maximum number of suggestions to return (default: 25)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
 
     Returns:
         JSON string containing suggested interests with id, name, audience_size, and description fields
@@ -62,7 +66,7 @@ async def get_interest_suggestions(interest_list: List[str], access_token: Optio
 
     data = await make_api_request(endpoint, access_token, params)
 
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
@@ -74,8 +78,9 @@ async def estimate_audience_size(
     optimization_goal: str = "REACH",
     # Backwards compatibility for simple interest validation
     interest_list: Optional[List[str]] = None,
-    interest_fbid_list: Optional[List[str]] = None
-) -> str:
+    interest_fbid_list: Optional[List[str]] = None,
+    max_age: Optional[int] = None
+) -> Union[str, Dict[str, Any]]:
     """
     Estimate audience size for targeting specifications using Meta's delivery_estimate API.
     
@@ -100,6 +105,8 @@ async def estimate_audience_size(
                           Options: "REACH", "LINK_CLICKS", "IMPRESSIONS", "CONVERSIONS", etc.
         interest_list: [DEPRECATED - for backwards compatibility] List of interest names to validate
         interest_fbid_list: [DEPRECATED - for backwards compatibility] List of interest IDs to validate
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     
     Returns:
         JSON string with audience estimation results including estimated_audience_size,
@@ -130,7 +137,7 @@ async def estimate_audience_size(
         
         data = await make_api_request(endpoint, access_token, params)
         
-        return json.dumps(data, indent=2)
+        return data
     
     # Comprehensive audience estimation using delivery_estimate API
     if not account_id:
@@ -274,7 +281,7 @@ async def estimate_audience_size(
                         "raw_response": fallback_data,
                         "fallback_endpoint_used": "delivery_estimate"
                     }
-                    return json.dumps(formatted_response, indent=2)
+                    return formatted_response
                 
                 # Fallback returned but not in expected format
                 return json.dumps({
@@ -319,7 +326,7 @@ async def estimate_audience_size(
                     },
                     "raw_response": data
                 }
-                return json.dumps(formatted_response, indent=2)
+                return formatted_response
             # Case 1b: explicit handling for empty list responses
             if isinstance(response_data, list) and len(response_data) == 0:
                 return json.dumps({
@@ -355,7 +362,7 @@ async def estimate_audience_size(
                     },
                     "raw_response": data
                 }
-                return json.dumps(formatted_response, indent=2)
+                return formatted_response
         else:
             return json.dumps({
                 "error": "No estimation data returned from Meta API",
@@ -397,7 +404,7 @@ async def estimate_audience_size(
                         "raw_response": fallback_data,
                         "fallback_endpoint_used": "delivery_estimate"
                     }
-                    return json.dumps(formatted_response, indent=2)
+                    return formatted_response
             except Exception as _fallback_exc:
                 # If fallback also fails, proceed to detailed error handling below
                 pass
@@ -460,13 +467,15 @@ async def estimate_audience_size(
 
 @mcp_server.tool()
 @meta_api_tool
-async def search_behaviors(access_token: Optional[str] = None, limit: int = 50) -> str:
+async def search_behaviors(access_token: Optional[str] = None, limit: int = 50, max_age: Optional[int] = None) -> Dict[str, Any]:
     """
     Get all available behavior targeting options.
 
     Args:
         access_token: Meta API access token (optional - will use cached token if not provided)
         limit: Maximum number of results to return (default: 50)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
 
     Returns:
         JSON string containing behavior targeting options with id, name, audience_size bounds, path, and description
@@ -480,12 +489,12 @@ async def search_behaviors(access_token: Optional[str] = None, limit: int = 50)
 
     data = await make_api_request(endpoint, access_token, params)
 
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
 @meta_api_tool
-async def search_demographics(access_token: Optional[str] = None, demographic_class: str = "demographics", limit: int = 50) -> str:
+async def search_demographics(access_token: Optional[str] = None, demographic_class: str = "demographics", limit: int = 50, max_age: Optional[int] = None) -> Dict[str, Any]:
     """
     Get demographic targeting options.
     
@@ -494,6 +503,8 @@ async def search_demographics(access_token: Optional[str] = None, demographic_cl
         demographic_class: Type of demographics to retrieve. Options: 'demographics', 'life_events', 
                           'industries', 'income', 'family_statuses', 'user_device', 'user_os' (default: 'demographics')
         limit: Maximum number of results to return (default: 50)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     
     Returns:
         JSON string containing demographic targeting options with id, name, audience_size bounds, path, and description
@@ -507,13 +518,13 @@ async def search_demographics(access_token: Optional[str] = None, demographic_cl
     
     data = await make_api_request(endpoint, access_token, params)
     
-    return json.dumps(data, indent=2)
+    return data
 
 
 @mcp_server.tool()
 @meta_api_tool
 async def search_geo_locations(query: str, access_token: Optional[str] = None, 
-                             location_types: Optional[List[str]] = None, limit: int = 25) -> str:
+                             location_types: Optional[List[str]] = None, limit: int = 25, max_age: Optional[int] = None) -> Union[str, Dict[str, Any]]:
     """
     Search for geographic targeting locations.
     
@@ -523,6 +534,8 @@ async def search_geo_locations(query: str, access_token: Optional[str] = None,
         location_types: Types of locations to search. Options: ['country', 'region', 'city', 'zip', 
                        'geo_market', 'electoral_district']. If not specified, searches all types.
         limit: Maximum number of results to return (default: 25)
+        max_age: Only use cached results younger than this many seconds; 0 always fetches fresh
+                 data from Meta (default: cache lifetime for this kind of data)
     
     Returns:
         JSON string containing location data with key, name, type, and geographic hierarchy information
@@ -542,4 +555,4 @@ async def search_geo_locations(query: str, access_token: Optional[str] = None,
     
     data = await make_api_request(endpoint, access_token, params)
     
-    return json.dumps(data, indent=2) 
\ No newline at end of file
+    return data 
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""Tracing spans for tool calls and the Graph requests they make.
+
+Flat log lines do not show where a chained tool spends its time (for example
+get_ad_image -> ad creatives -> adimages -> CDN download -> JPEG conversion).
+Spans do:
+
+    tool get_ad_image
+      graph GET node            (one per make_api_request, cache hits included)
+        http GET                (one per HTTP attempt, so retries are visible)
+      graph GET act/adimages
+        http GET
+      download_image
+      image.to_jpeg
+
+Tracing is off by default and costs one attribute check per span then.
+Enable it with either:
+
+- META_ADS_TRACE_FILE=/path/spans.jsonl: one JSON object per finished span
+  (traceId, spanId, parentSpanId, name, start/end time in ns, attributes,
+  status), in the style of OTLP/JSON;
+- META_ADS_TRACE_OTLP=1: export through the OpenTelemetry SDK to an OTLP/HTTP
+  collector (OTEL_EXPORTER_OTLP_ENDPOINT, default http://localhost:4318).
+  Requires the optional `tracing` extra: pip install meta-ads-mcp[tracing].
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .utils import logger, get_env_bool
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "meta_ads_current_span", default=None
+)
+
+
+class Span:
+    """A finished-or-running span recorded by the built-in tracer."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_span_id", "start_ns", "end_ns",
+                 "attributes", "status", "status_message")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Optional[Dict[str, Any]]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "UNSET"
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = "ERROR"
+        self.status_message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _NoopSpanContext:
+    def __enter__(self) -> _NoopSpan:
+        return _NOOP_SPAN
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        return False
+
+
+_NOOP_SPAN_CONTEXT = _NoopSpanContext()
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Optional[Dict[str, Any]]):
+        self.tracer = tracer
+        self.span = Span(name, _current_span.get(), attributes)
+        self.token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        if exc_type is not None:
+            self.span.set_error(f"{exc_type.__name__}: {exc}")
+        self.span.end_ns = time.time_ns()
+        _current_span.reset(self.token)
+        self.tracer._export(self.span)
+        return False
+
+
+class _OtelSpan:
+    """Adapter giving an OpenTelemetry span the Span interface used in this package."""
+
+    __slots__ = ("span",)
+
+    def __init__(self, span: Any):
+        self.span = span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.span.set_attribute(key, value)
+
+    def set_error(self, message: str) -> None:
+        from opentelemetry.trace import Status, StatusCode
+
+        self.span.set_status(Status(StatusCode.ERROR, message))
+
+
+class _OtelSpanContext:
+    __slots__ = ("manager",)
+
+    def __init__(self, otel_tracer: Any, name: str, attributes: Optional[Dict[str, Any]]):
+        self.manager = otel_tracer.start_as_current_span(
+            name, attributes={k: v for k, v in (attributes or {}).items() if v is not None})
+
+    def __enter__(self) -> _OtelSpan:
+        return _OtelSpan(self.manager.__enter__())
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> Any:
+        return self.manager.__exit__(exc_type, exc, tb)
+
+
+class JsonLinesExporter:
+    """Append finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class InMemoryExporter:
+    """Keep finished spans in a list (for tests and ad-hoc debugging)."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def close(self) -> None:
+        pass
+
+
+class Tracer:
+    """Creates spans through the built-in exporter, OpenTelemetry, or not at all."""
+
+    def __init__(self, exporter: Any = None, otel_tracer: Any = None):
+        self.exporter = exporter
+        self.otel_tracer = otel_tracer
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        if get_env_bool("META_ADS_TRACE_OTLP"):
+            otel_tracer = _configure_otlp()
+            if otel_tracer is not None:
+                return cls(otel_tracer=otel_tracer)
+        path = os.environ.get("META_ADS_TRACE_FILE", "").strip()
+        if path:
+            logger.info(f"Writing trace spans to {path}")
+            return cls(exporter=JsonLinesExporter(os.path.expanduser(path)))
+        return cls()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None or self.otel_tracer is not None
+
+    def set_exporter(self, exporter: Any) -> Any:
+        """Replace the built-in exporter (None disables tracing); returns the previous one."""
+        previous = self.exporter
+        self.exporter = exporter
+        return previous
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+        """Context manager for a child span of the current one; yields an object with set_attribute/set_error."""
+        if self.otel_tracer is not None:
+            return _OtelSpanContext(self.otel_tracer, name, attributes)
+        if self.exporter is None:
+            return _NOOP_SPAN_CONTEXT
+        return _SpanContext(self, name, attributes)
+
+    def _export(self, span: Span) -> None:
+        exporter = self.exporter
+        if exporter is None:
+            return
+        try:
+            exporter.export(span)
+        except Exception as e:
+            logger.warning(f"Dropping trace span {span.name}: {e}")
+
+
+def _configure_otlp() -> Any:
+    """Set up the OpenTelemetry SDK with an OTLP/HTTP exporter, if installed."""
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("META_ADS_TRACE_OTLP is set but OpenTelemetry is not installed; "
+                       "install meta-ads-mcp[tracing]. Tracing to OTLP is disabled.")
+        return None
+    provider = TracerProvider(resource=Resource.create({"service.name": "meta-ads-mcp"}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    logger.info("Exporting trace spans over OTLP")
+    return trace.get_tracer("meta-ads-mcp")
+
+
+# Process-wide tracer (off unless META_ADS_TRACE_FILE or META_ADS_TRACE_OTLP is set)
+tracer = Tracer.from_env()
@@ -9,7 +9,10 @@ import time
 import asyncio
 import os
 import json
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import pathlib
 import platform
 import ipaddress
@@ -35,9 +38,73 @@ if not using_pipeboard:
         print("NOTE: This is only needed for direct Meta authentication. Pipeboard authentication doesn't require this.")
         print("RECOMMENDED: Use Pipeboard authentication by setting PIPEBOARD_API_TOKEN instead.")
 
+# Logger shared by every module; setup_logging() below attaches its handlers.
+logger = logging.getLogger("meta-ads-mcp")
+
+
+def get_env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to `default`."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid integer for %s: %r (using %s)", name, raw, default)
+        return default
+
+
+def get_env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean flag ("1", "true", "yes", "on") from the environment."""
+    raw = os.environ.get(name, "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "on")
+
+
+def get_env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, falling back to `default`."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid number for %s: %r (using %s)", name, raw, default)
+        return default
+
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Longest string/bytes value shown in a logged payload (see LogPreview)
+LOG_PREVIEW_CHARS = get_env_int("META_ADS_LOG_PREVIEW_CHARS", 200)
+
+_log_listener: Optional[QueueListener] = None
+
+
+def get_log_level() -> int:
+    """Log level from META_ADS_LOG_LEVEL (DEBUG, INFO, WARNING, ...); INFO by default."""
+    raw = os.environ.get("META_ADS_LOG_LEVEL", "").strip().upper()
+    if not raw:
+        return logging.INFO
+    level = logging.getLevelName(raw)
+    if isinstance(level, int):
+        return level
+    print(f"WARNING: Ignoring invalid META_ADS_LOG_LEVEL {raw!r} (using INFO)")
+    return logging.INFO
+
+
 # Configure logging to file
 def setup_logging():
-    """Set up logging to file for troubleshooting."""
+    """Set up logging to file for troubleshooting.
+
+    Records are put on a queue by a QueueHandler and written to a rotating
+    file by a QueueListener thread, so callers on the event loop never wait
+    on disk I/O. META_ADS_LOG_LEVEL sets the level (default INFO);
+    META_ADS_LOG_MAX_BYTES and META_ADS_LOG_BACKUP_COUNT control rotation.
+    """
+    global _log_listener
+
     # Get platform-specific path for logs
     if platform.system() == "Windows":
         base_path = pathlib.Path(os.environ.get("APPDATA", ""))
@@ -51,26 +118,93 @@ def setup_logging():
     log_dir.mkdir(parents=True, exist_ok=True)
     
     log_file = log_dir / "meta_ads_debug.log"
-    
-    # Configure file logger
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        filename=str(log_file),
-        filemode='a'  # Append mode
-    )
-    
-    # Create a logger
-    logger = logging.getLogger("meta-ads-mcp")
-    logger.setLevel(logging.DEBUG)
+    level = get_log_level()
+
+    if _log_listener is None:
+        # Rotating file handler, driven by a background listener thread
+        file_handler = RotatingFileHandler(
+            str(log_file),
+            maxBytes=get_env_int("META_ADS_LOG_MAX_BYTES", 10 * 1024 * 1024),
+            backupCount=get_env_int("META_ADS_LOG_BACKUP_COUNT", 3),
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _log_listener = QueueListener(log_queue, file_handler)
+        _log_listener.start()
+        atexit.register(_stop_log_listener)
+        logging.getLogger().addHandler(QueueHandler(log_queue))
+
+    logging.getLogger().setLevel(level)
+    logger.setLevel(level)
     
     # Log startup information
-    logger.info(f"Logging initialized. Log file: {log_file}")
-    logger.info(f"Platform: {platform.system()} {platform.release()}")
-    logger.info(f"Using Pipeboard authentication: {using_pipeboard}")
+    logger.info("Logging initialized. Log file: %s (level %s)", log_file, logging.getLevelName(level))
+    logger.info("Platform: %s %s", platform.system(), platform.release())
+    logger.info("Using Pipeboard authentication: %s", using_pipeboard)
     
     return logger
 
+
+def _stop_log_listener() -> None:
+    """Flush queued records to the log file (registered with atexit)."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+class LogPreview:
+    """Size-bounded, lazily rendered view of a payload for %-style log calls.
+
+    logger.debug("Request params: %s", LogPreview(params)) costs nothing when
+    DEBUG is off, and long values such as base64 image bytes are cut to
+    LOG_PREVIEW_CHARS with their full length noted.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: Optional[int] = None):
+        self.value = value
+        self.limit = LOG_PREVIEW_CHARS if limit is None else limit
+
+    def __str__(self) -> str:
+        text = repr(_shorten(self.value, self.limit))
+        overall = self.limit * 10
+        if len(text) > overall:
+            text = f"{text[:overall]}... <{len(text)} chars>"
+        return text
+
+    __repr__ = __str__
+
+
+class _Elided:
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self) -> str:
+        return self.text
+
+
+def _shorten(value: Any, limit: int, depth: int = 0) -> Any:
+    if isinstance(value, (str, bytes, bytearray)):
+        if len(value) <= limit:
+            return value
+        unit = "chars" if isinstance(value, str) else "bytes"
+        return _Elided(f"{value[:limit]!r}... <{len(value)} {unit}>")
+    if depth >= 4:
+        return value
+    if isinstance(value, dict):
+        return {k: _shorten(v, limit, depth + 1) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        shortened = [_shorten(v, limit, depth + 1) for v in value]
+        return shortened if isinstance(value, list) else tuple(shortened)
+    return value
+
+
 # Create the logger instance to be imported by other modules
 logger = setup_logging()
 
@@ -256,6 +390,19 @@ async def download_image(url: str) -> Optional[bytes]:
     Returns:
         Image data as bytes if successful, None otherwise
     """
+    # Imported here: tracing itself imports this module.
+    from .tracing import tracer
+
+    with tracer.span("download_image", {"url.host": urlparse(url).hostname}) as span:
+        content = await _download_image(url)
+        if content is None:
+            span.set_error("download failed")
+        else:
+            span.set_attribute("http.response.body.size", len(content))
+        return content
+
+
+async def _download_image(url: str) -> Optional[bytes]:
     # SSRF guard: refuse non-public targets before opening any connection.
     try:
         validate_public_url(url)
@@ -0,0 +1,24 @@
+"""Fixtures for the benchmark suite (see harness.py)."""
+
+import pytest
+
+from .harness import SAVE, Baselines, Benchmark, format_results
+
+_baselines = Baselines()
+_results = []
+
+
+@pytest.fixture
+def benchmark(request):
+    """Measure a callable: benchmark(func, *args) or await benchmark.run_async(func, *args)."""
+    return Benchmark(request.node.name, _baselines, _results)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(format_results(_results))
+    if SAVE:
+        _baselines.save(_results)
+        terminalreporter.write_line(f"Saved {len(_results)} baselines to {_baselines.path}")
@@ -0,0 +1,256 @@
+"""Timing harness for the hot-path benchmarks, in the style of pytest-benchmark.
+
+    def test_something(benchmark):
+        result = benchmark(func, arg)                  # sync
+        result = await benchmark.run_async(coro_func)  # async, on the test's loop
+
+Each benchmark runs a warm-up call, then enough iterations per round for a
+round to take at least MIN_ROUND_SECONDS, for META_ADS_BENCH_ROUNDS rounds
+(default 15), with garbage collection run before and paused during each
+round as timeit does. Each round is followed by a round of a fixed
+calibration workload (JSON round trip and sort of 1000 small dicts), and
+what gets compared is the median over rounds of the benchmark's time in
+units of that workload: a single fast or slow round does not move it, and
+load that comes and goes during a run slows both halves of a round alike.
+The median and fastest rounds are reported in seconds, and so is the peak
+memory allocated during one more call traced with tracemalloc
+(benchmark.result.peak_memory, in bytes).
+
+Baselines live in baselines.json next to this file, in calibration units,
+which also makes them portable between machines. Baselines are kept per
+JSON backend (orjson or the standard library json, see serialization.py),
+since the encoding benchmarks differ several-fold between them. A benchmark
+fails when it is more than META_ADS_BENCH_THRESHOLD times its baseline
+(default 2.0), and also when it has no baseline for the current backend,
+so installing or removing orjson cannot silently turn the check off.
+
+Refresh the baselines after an intended change with:
+    META_ADS_BENCH_SAVE=1 python -m pytest -m benchmark tests/benchmarks -s
+"""
+
+import gc
+import json
+import os
+import pathlib
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from meta_ads_mcp.core import serialization
+
+BASELINES_PATH = pathlib.Path(__file__).with_name("baselines.json")
+MIN_ROUND_SECONDS = 0.02
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+ROUNDS = int(_env_float("META_ADS_BENCH_ROUNDS", 15))
+THRESHOLD = _env_float("META_ADS_BENCH_THRESHOLD", 2.0)
+SAVE = os.environ.get("META_ADS_BENCH_SAVE", "").lower() in ("1", "true", "yes")
+
+
+class BenchmarkResult:
+    """Per-iteration timings (seconds) of one benchmark."""
+
+    def __init__(self, name: str, iterations: int, times: List[float], calibrations: List[float]):
+        self.name = name
+        self.iterations = iterations
+        self.times = times
+        self.median = statistics.median(times)
+        self.minimum = min(times)
+        self.calibration = statistics.median(calibrations)
+        self.relative = statistics.median(t / c for t, c in zip(times, calibrations))
+        self.baseline_relative: Optional[float] = None
+        self.peak_memory: Optional[int] = None
+
+    @property
+    def baseline(self) -> Optional[float]:
+        """The baseline in seconds on this machine, if there is one."""
+        return self.baseline_relative * self.calibration if self.baseline_relative else None
+
+    @property
+    def ratio(self) -> Optional[float]:
+        return self.relative / self.baseline_relative if self.baseline_relative else None
+
+
+def _calibration_workload() -> None:
+    rows = [{"id": str(i), "spend": f"{i * 1.5:.2f}", "actions": [{"action_type": "link_click", "value": str(i)}]}
+            for i in range(1000)]
+    json.loads(json.dumps(rows))
+    sorted(rows, key=lambda row: row["spend"])
+
+
+_calibration_iterations: Optional[int] = None
+
+
+def _calibration_round() -> float:
+    """Per-iteration time of one round of the calibration workload."""
+    global _calibration_iterations
+    if _calibration_iterations is None:
+        _calibration_iterations = _iterations_for(_timed(_calibration_workload))
+    start = time.perf_counter()
+    for _ in range(_calibration_iterations):
+        _calibration_workload()
+    return (time.perf_counter() - start) / _calibration_iterations
+
+
+def json_backend() -> str:
+    """The JSON backend serialization.py is using, which baselines are kept per."""
+    return "orjson" if serialization.orjson is not None else "json"
+
+
+def _timed(func: Callable[[], Any]) -> Callable[[], float]:
+    def timed() -> float:
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+    return timed
+
+
+def _iterations_for(run_once: Callable[[], float]) -> int:
+    iterations = 1
+    while True:
+        if run_once() * iterations >= MIN_ROUND_SECONDS or iterations >= 1 << 20:
+            return iterations
+        iterations *= 2
+
+
+def _measure(func: Callable[[], Any], rounds: int = ROUNDS, name: str = "") -> BenchmarkResult:
+    iterations = _iterations_for(_timed(func))
+    times, calibrations = [], []
+    for _ in range(rounds):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            times.append((time.perf_counter() - start) / iterations)
+            calibrations.append(_calibration_round())
+        finally:
+            gc.enable()
+    return BenchmarkResult(name, iterations, times, calibrations)
+
+
+async def _measure_async(func: Callable[[], Any], rounds: int = ROUNDS, name: str = "") -> BenchmarkResult:
+    start = time.perf_counter()
+    await func()
+    once = time.perf_counter() - start
+    iterations = 1
+    while once * iterations < MIN_ROUND_SECONDS and iterations < 1 << 20:
+        iterations *= 2
+    times, calibrations = [], []
+    for _ in range(rounds):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await func()
+            times.append((time.perf_counter() - start) / iterations)
+            calibrations.append(_calibration_round())
+        finally:
+            gc.enable()
+    return BenchmarkResult(name, iterations, times, calibrations)
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def _peak_memory_async(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        await func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Baselines:
+    """Stored timings (median round) in calibration units, per JSON backend."""
+
+    def __init__(self, path: pathlib.Path = BASELINES_PATH, backend: Optional[str] = None):
+        self.path = path
+        self.backend = backend or json_backend()
+        try:
+            stored = json.loads(path.read_text())
+        except FileNotFoundError:
+            stored = {}
+        self.backends: Dict[str, Dict[str, float]] = dict(stored.get("backends", {}))
+        self.timings: Dict[str, float] = dict(self.backends.get(self.backend, {}))
+
+    def expected(self, name: str) -> Optional[float]:
+        """The baseline of a benchmark in calibration units, if there is one."""
+        return self.timings.get(name)
+
+    def save(self, results: List[BenchmarkResult]) -> None:
+        for result in results:
+            self.timings[result.name] = result.relative
+        self.backends[self.backend] = {name: round(timing, 3) for name, timing in sorted(self.timings.items())}
+        self.path.write_text(json.dumps({
+            "unit": "calibration workload",
+            "backends": dict(sorted(self.backends.items())),
+        }, indent=2) + "\n")
+
+
+class Benchmark:
+    """The `benchmark` fixture: measures a callable and checks it against its baseline."""
+
+    def __init__(self, name: str, baselines: Baselines, results: List[BenchmarkResult]):
+        self.name = name
+        self.baselines = baselines
+        self.results = results
+        self.result: Optional[BenchmarkResult] = None
+
+    def __call__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        value = func(*args, **kwargs)
+        result = _measure(lambda: func(*args, **kwargs), name=self.name)
+        result.peak_memory = _peak_memory(lambda: func(*args, **kwargs))
+        self._check(result)
+        return value
+
+    async def run_async(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        value = await func(*args, **kwargs)
+        result = await _measure_async(lambda: func(*args, **kwargs), name=self.name)
+        result.peak_memory = await _peak_memory_async(lambda: func(*args, **kwargs))
+        self._check(result)
+        return value
+
+    def _check(self, result: BenchmarkResult) -> None:
+        self.result = result
+        result.baseline_relative = self.baselines.expected(self.name)
+        self.results.append(result)
+        if SAVE:
+            return
+        assert result.baseline is not None, (
+            f"{self.name} has no baseline for the {self.baselines.backend} backend; record one with "
+            f"META_ADS_BENCH_SAVE=1"
+        )
+        assert result.ratio <= THRESHOLD, (
+            f"{self.name} regressed: {result.median * 1e6:.1f}us per call vs a baseline of "
+            f"{result.baseline * 1e6:.1f}us ({result.ratio:.2f}x, threshold {THRESHOLD:.2f}x, "
+            f"{self.baselines.backend} backend)"
+        )
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines = [f"{'benchmark':<44} {'median':>12} {'min':>12} {'baseline':>12} {'ratio':>7} {'peak mem':>10}"]
+    for result in results:
+        baseline = f"{result.baseline * 1e6:.1f}us" if result.baseline else "-"
+        ratio = f"{result.ratio:.2f}x" if result.ratio else "-"
+        memory = f"{result.peak_memory / 2 ** 20:.1f}MB" if result.peak_memory is not None else "-"
+        lines.append(f"{result.name:<44} {result.median * 1e6:>10.1f}us {result.minimum * 1e6:>10.1f}us "
+                     f"{baseline:>12} {ratio:>7} {memory:>10}")
+    return "\n".join(lines)
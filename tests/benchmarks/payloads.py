@@ -0,0 +1,89 @@
+"""Synthetic Graph payloads for the benchmarks, built from the Graph API emulator."""
+
+import datetime
+import functools
+import json
+from typing import Any, Dict
+
+from meta_ads_mcp.core.graph_emulator import EmulatorData, GraphEmulator
+
+INSIGHT_FIELDS = (
+    "account_id,account_name,campaign_id,campaign_name,adset_id,adset_name,ad_id,ad_name,"
+    "impressions,clicks,spend,cpc,cpm,ctr,reach,frequency,actions,action_values,cost_per_action_type"
+)
+
+TODAY = datetime.date(2026, 3, 31)
+
+
+def _daily(until: datetime.date, days: int) -> Dict[str, Any]:
+    return {"level": "ad", "fields": INSIGHT_FIELDS, "time_increment": 1,
+            "time_range": {"since": (until - datetime.timedelta(days=days - 1)).isoformat(), "until": until.isoformat()}}
+
+
+@functools.lru_cache(maxsize=None)
+def large_account(campaigns: int = 5, adsets_per_campaign: int = 4, ads_per_adset: int = 5) -> GraphEmulator:
+    data = EmulatorData(seed=1, accounts=1, campaigns_per_account=campaigns,
+                        adsets_per_campaign=adsets_per_campaign, ads_per_adset=ads_per_adset,
+                        today=TODAY)
+    return GraphEmulator(data)
+
+
+def insights_page(days: int = 20) -> Dict[str, Any]:
+    """Ad-level daily insights for a 100-ad account, with Meta's redundant action types (~6.5 MB of JSON)."""
+    emulator = large_account()
+    rows = emulator.insights(emulator.data.accounts()[0], _daily(emulator.data.today, days))
+    return {"data": rows, "paging": {"cursors": {"before": "MAZDZD", "after": "MjQZD"}}}
+
+
+@functools.lru_cache(maxsize=None)
+def scaled_account(ads: int) -> GraphEmulator:
+    return GraphEmulator(EmulatorData.scaled(ads, seed=1, today=TODAY))
+
+
+def scaled_insights(rows: int, days: int = 5) -> Dict[str, Any]:
+    """`rows` ad-level daily insights rows in one Graph response, from an account of rows / days ads."""
+    emulator = scaled_account(max(1, rows // days))
+    data = emulator.insights(emulator.data.accounts()[0], _daily(emulator.data.today, days))
+    return {"data": data, "paging": {"cursors": {"before": "MAZDZD", "after": "MjQZD"}}}
+
+
+def scaled_insights_pages(rows: int, page_size: int, days: int = 5) -> Dict[str, bytes]:
+    """`rows` ad-level daily insights rows as encoded Graph pages, keyed by the `after` cursor requesting them.
+
+    The first page is under "". Rows come from an account of rows / days ads.
+    """
+    emulator = scaled_account(max(1, rows // days))
+    account_id = emulator.data.accounts()[0]
+    pages = emulator.pages(f"{account_id}/insights", {**_daily(emulator.data.today, days), "limit": page_size})
+    encoded = {}
+    after = ""
+    for page in pages:
+        encoded[after] = json.dumps(page).encode()
+        after = page["paging"]["cursors"]["after"]
+    return encoded
+
+
+def creatives_page(count: int = 20) -> Dict[str, Any]:
+    """Ad creatives with link data and asset feed images, half of them without resolved URLs."""
+    creatives = []
+    for index in range(count):
+        creatives.append({
+            "id": str(120210000000000 + index),
+            "name": f"Creative {index}",
+            "status": "ACTIVE",
+            "thumbnail_url": f"https://scontent.example.com/t/{index}_p64x64.jpg",
+            "image_url": f"https://scontent.example.com/i/{index}.jpg",
+            "object_story_spec": {
+                "page_id": "100000000000001",
+                "link_data": {"picture": f"https://scontent.example.com/p/{index}.jpg",
+                              "link": "https://example.com/product", "message": "Primary text " * 10},
+            },
+            "asset_feed_spec": {
+                "images": [{"hash": f"hash{index}_{image}",
+                            **({"url": f"https://scontent.example.com/a/{index}_{image}.jpg"} if image % 2 else {})}
+                           for image in range(6)],
+                "bodies": [{"text": f"Body {variant}"} for variant in range(5)],
+                "titles": [{"text": f"Title {variant}"} for variant in range(5)],
+            },
+        })
+    return {"data": creatives}
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for tool hot paths, against mocked transports (no network).
+
+Covers make_api_request overhead, the meta_api_tool wrapper, get_insights
+post-processing (compact=True) on a ~6.5 MB synthetic report, get_ad_creatives
+enrichment, extract_creative_image_urls, and JSON encoding/decoding of
+multi-MB responses. Timings are compared with baselines.json (see
+harness.py); a benchmark fails when it is more than META_ADS_BENCH_THRESHOLD
+times slower than its baseline.
+
+Run with:
+    python -m pytest -m benchmark tests/benchmarks/test_hot_paths.py -s
+Refresh the baselines with META_ADS_BENCH_SAVE=1.
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.ads import get_ad_creatives
+from meta_ads_mcp.core.api import make_api_request, meta_api_tool
+from meta_ads_mcp.core.cache import response_cache
+from meta_ads_mcp.core.insights import get_insights
+from meta_ads_mcp.core.serialization import COMPACT, PRETTY, TABLE, dumps, loads, to_table
+from meta_ads_mcp.core.utils import extract_creative_image_urls
+
+from .payloads import creatives_page, insights_page
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def insights():
+    return insights_page()
+
+
+@pytest.fixture(scope="module")
+def insights_json(insights):
+    return json.dumps(insights).encode()
+
+
+class TestRequestPath:
+
+    @pytest.mark.asyncio
+    async def test_make_api_request_overhead(self, benchmark, mock_graph):
+        body = json.dumps({"data": [{"id": "120200", "name": "Launch"}]}).encode()
+        headers = {"content-type": "application/json", "x-app-usage": json.dumps({"call_count": 5})}
+        with mock_graph(lambda request: httpx.Response(200, content=body, headers=headers)):
+            result = await benchmark.run_async(make_api_request, "act_1/campaigns", "tok",
+                                               {"fields": "id,name"}, max_age=0)
+        assert result["data"][0]["name"] == "Launch"
+
+    @pytest.mark.asyncio
+    async def test_meta_api_tool_overhead(self, benchmark):
+        @meta_api_tool
+        async def benchmark_tool(access_token=None):
+            return {"data": [{"id": "120200", "name": "Launch", "status": "ACTIVE"}]}
+
+        result = await benchmark.run_async(benchmark_tool, access_token="tok")
+        assert json.loads(result)["data"][0]["id"] == "120200"
+
+
+class TestTools:
+
+    @pytest.mark.asyncio
+    async def test_get_insights_compact_large_report(self, benchmark, insights, insights_json, mock_graph):
+        with mock_graph(lambda request: httpx.Response(200, content=insights_json,
+                                                   headers={"content-type": "application/json"})):
+            result = await benchmark.run_async(get_insights, object_id="act_1", access_token="tok",
+                                               level="ad", limit=500, compact=True, max_age=0)
+        rows = json.loads(result)["data"]
+        assert len(rows) == len(insights["data"])
+        assert not any(action["action_type"].startswith("omni_") for row in rows for action in row["actions"])
+
+    @pytest.mark.asyncio
+    async def test_get_ad_creatives_enrichment(self, benchmark, mock_graph):
+        creatives = json.dumps(creatives_page()).encode()
+        images = json.dumps({"data": [{"hash": f"hash{i}_{j}", "url": f"https://scontent.example.com/r/{i}_{j}.jpg"}
+                                      for i in range(20) for j in range(6)]}).encode()
+
+        def handler(request):
+            path = request.url.path
+            if path.endswith("/adcreatives"):
+                return httpx.Response(200, content=creatives)
+            if path.endswith("/adimages"):
+                return httpx.Response(200, content=images)
+            return httpx.Response(200, json={"account_id": "1", "id": "120200"})
+
+        async def fetch():
+            response_cache.clear()
+            return await get_ad_creatives(ad_id="120200", access_token="tok")
+
+        with mock_graph(handler), patch.object(api_module.id_loader, "window", 0.0):
+            result = await benchmark.run_async(fetch)
+        creative = json.loads(result)["data"][0]
+        assert all("url" in image for image in creative["asset_feed_spec"]["images"])
+        assert creative["image_urls_for_viewing"][0] == "https://scontent.example.com/i/0.jpg"
+
+    def test_extract_creative_image_urls(self, benchmark):
+        creatives = creatives_page(500)["data"]
+        urls = benchmark(lambda: [extract_creative_image_urls(creative) for creative in creatives])
+        assert len(urls[0]) == 6
+
+
+class TestSerialization:
+
+    @pytest.mark.parametrize("fmt", [PRETTY, COMPACT, TABLE])
+    def test_dumps_multi_mb_response(self, benchmark, insights, fmt):
+        text = benchmark(lambda: dumps(to_table(insights) if fmt == TABLE else insights, fmt))
+        assert len(text) > 1_000_000
+
+    def test_loads_multi_mb_response(self, benchmark, insights, insights_json):
+        assert len(benchmark(loads, insights_json)["data"]) == len(insights["data"])
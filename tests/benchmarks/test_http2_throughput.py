@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTTP/1.1 vs HTTP/2 throughput for Graph API style traffic.
+
+Starts a local stand-in for graph.facebook.com (a tiny ASGI app served by
+hypercorn, which speaks both protocols) that answers every request after a
+fixed simulated latency, then fires the same burst of concurrent GETs through
+a client built with the shared Graph pool settings over each protocol.
+
+The local server has no TLS, so the HTTP/2 client uses prior knowledge (h2c)
+instead of ALPN negotiation. Against graph.facebook.com the protocol is
+negotiated over TLS.
+
+Run with:
+    python -m pytest -m benchmark tests/benchmarks/test_http2_throughput.py -s
+or directly:
+    python tests/benchmarks/test_http2_throughput.py
+"""
+
+import asyncio
+import json
+import socket
+import time
+
+import pytest
+
+from meta_ads_mcp.core.api import build_graph_client
+
+hypercorn = pytest.importorskip("hypercorn")
+pytest.importorskip("h2")
+
+from hypercorn.asyncio import serve  # noqa: E402
+from hypercorn.config import Config  # noqa: E402
+
+pytestmark = pytest.mark.benchmark
+
+SIMULATED_LATENCY = 0.02  # seconds per Graph response
+TOTAL_REQUESTS = 400
+CONCURRENCY = 50
+
+
+class StandInGraphServer:
+    """Minimal ASGI app that mimics a Graph node lookup and counts connections."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = set()
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        self.connections.add(tuple(scope.get("client") or ()))
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        body = json.dumps({"id": scope["path"].rsplit("/", 1)[-1], "name": "Stand-in object"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _drive(client, base_url: str, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    versions = set()
+
+    async def one(i):
+        async with semaphore:
+            response = await client.get(f"{base_url}/v24.0/{i}", params={"fields": "id,name"})
+            assert response.status_code == 200
+            versions.add(response.http_version)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start, versions
+
+
+async def run_benchmark(total: int = TOTAL_REQUESTS, concurrency: int = CONCURRENCY,
+                        latency: float = SIMULATED_LATENCY):
+    """Return {"HTTP/1.1": {...}, "HTTP/2": {...}} with throughput and socket counts."""
+    results = {}
+    for label, client_kwargs in (
+        ("HTTP/1.1", {"http2": False}),
+        ("HTTP/2", {"http2": True, "http1": False}),
+    ):
+        app = StandInGraphServer(latency)
+        port = _free_port()
+        config = Config()
+        config.bind = [f"127.0.0.1:{port}"]
+        config.loglevel = "WARNING"
+        shutdown = asyncio.Event()
+        server_task = asyncio.create_task(serve(app, config, shutdown_trigger=shutdown.wait))
+        await asyncio.sleep(0.2)
+        try:
+            async with build_graph_client(**client_kwargs) as client:
+                elapsed, versions = await _drive(client, f"http://127.0.0.1:{port}", total, concurrency)
+        finally:
+            shutdown.set()
+            await server_task
+        results[label] = {
+            "requests": app.requests,
+            "seconds": elapsed,
+            "requests_per_second": total / elapsed,
+            "connections": len(app.connections),
+            "negotiated": sorted(versions),
+        }
+    return results
+
+
+def _print_results(results):
+    print(f"\n{'protocol':<10} {'req/s':>10} {'seconds':>9} {'sockets':>8}")
+    for label, row in results.items():
+        print(f"{label:<10} {row['requests_per_second']:>10.1f} {row['seconds']:>9.2f} {row['connections']:>8}")
+
+
+@pytest.mark.asyncio
+async def test_http1_vs_http2_throughput():
+    results = await run_benchmark()
+    _print_results(results)
+
+    http1, http2 = results["HTTP/1.1"], results["HTTP/2"]
+    assert http1["requests"] == http2["requests"] == TOTAL_REQUESTS
+    assert http2["negotiated"] == ["HTTP/2"]
+    # The point of HTTP/2: the whole burst multiplexes over one socket.
+    assert http2["connections"] == 1
+    assert http1["connections"] > http2["connections"]
+
+
+if __name__ == "__main__":
+    _print_results(asyncio.run(run_benchmark()))
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmarks: insights post-processing and pagination as rows grow.
+
+The largest accounts have tens of thousands of ads and very large daily
+insights reports, while the other tests use a handful of rows. These
+benchmarks time and trace memory of the same work at 1x, 10x, 100x and
+1000x a base of BASE_ROWS ad-level daily rows, generated by the Graph API
+emulator (EmulatorData.scaled, GraphEmulator.pages) with Meta's full
+actions / action_values arrays and real paging cursors:
+
+- get_insights(compact=True) on one response of all the rows;
+- iterate_edge over the same rows in Graph pages of PAGE_SIZE, with the
+  response cache off (it would keep up to META_ADS_CACHE_MAX_MB of pages).
+
+Besides the per-benchmark baselines (harness.py), TestGrowth checks the
+shape of the curves: from 10x to 1000x, time and memory per row stay
+roughly flat, and peak memory while paging does not grow with the number of
+pages.
+
+Run with:
+    python -m pytest -m benchmark tests/benchmarks/test_scaling.py -s
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core.api import iterate_edge
+from meta_ads_mcp.core.cache import response_cache
+from meta_ads_mcp.core.insights import get_insights
+
+from .payloads import scaled_insights, scaled_insights_pages
+
+pytestmark = pytest.mark.benchmark
+
+BASE_ROWS = 10
+SCALES = (1, 10, 100, 1000)
+PAGE_SIZE = 100
+# Allowed growth of per-row cost from 10x to 1000x (constant overheads make 10x the costlier one)
+MAX_PER_ROW_GROWTH = 2.0
+
+_results = {}
+
+
+class TestInsightsPostProcessing:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scale", SCALES)
+    async def test_get_insights_compact_scaling(self, benchmark, scale, mock_graph):
+        rows = BASE_ROWS * scale
+        body = json.dumps(scaled_insights(rows)).encode()
+        with mock_graph(lambda request: httpx.Response(200, content=body, headers={"content-type": "application/json"})):
+            result = await benchmark.run_async(get_insights, object_id="act_1", access_token="tok",
+                                               level="ad", limit=rows, compact=True, max_age=0)
+        data = json.loads(result)["data"]
+        assert len(data) == rows
+        assert not any(action["action_type"].startswith("omni_") for row in data for action in row.get("actions", []))
+        _results[("insights", scale)] = benchmark.result
+
+
+class TestPagination:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("scale", SCALES)
+    async def test_iterate_insights_pages_scaling(self, benchmark, scale, mock_graph):
+        rows = BASE_ROWS * scale
+        pages = scaled_insights_pages(rows, page_size=PAGE_SIZE)
+
+        def handler(request):
+            return httpx.Response(200, content=pages[request.url.params.get("after", "")],
+                                  headers={"content-type": "application/json"})
+
+        async def walk():
+            count = 0
+            async for _ in iterate_edge("act_1/insights", "tok", {"level": "ad"}, page_size=PAGE_SIZE):
+                count += 1
+            return count
+
+        with mock_graph(handler), patch.object(response_cache, "enabled", False):
+            assert await benchmark.run_async(walk) == rows
+        _results[("pagination", scale)] = benchmark.result
+
+
+class TestGrowth:
+    """Shape of the curves measured above (skipped unless they ran in this session)."""
+
+    @staticmethod
+    def _pair(name, small_scale=10, large_scale=1000):
+        small, large = _results.get((name, small_scale)), _results.get((name, large_scale))
+        if small is None or large is None:
+            pytest.skip(f"{name} scaling benchmarks did not run")
+        return small, large
+
+    def test_post_processing_time_per_row_is_flat(self):
+        small, large = self._pair("insights")
+        growth = (large.median / 1000) / (small.median / 10)
+        assert growth <= MAX_PER_ROW_GROWTH, f"time per row grew {growth:.2f}x from 10x to 1000x rows"
+
+    def test_post_processing_memory_per_row_is_flat(self):
+        small, large = self._pair("insights")
+        growth = (large.peak_memory / 1000) / (small.peak_memory / 10)
+        assert growth <= MAX_PER_ROW_GROWTH, f"memory per row grew {growth:.2f}x from 10x to 1000x rows"
+
+    def test_pagination_time_per_row_is_flat(self):
+        small, large = self._pair("pagination")
+        growth = (large.median / 1000) / (small.median / 10)
+        assert growth <= MAX_PER_ROW_GROWTH, f"time per row grew {growth:.2f}x from 10x to 1000x rows"
+
+    def test_pagination_memory_does_not_grow_with_pages(self):
+        # 10 pages at 100x, 100 pages at 1000x: iterating holds one page at a time
+        small, large = self._pair("pagination", small_scale=100)
+        growth = large.peak_memory / small.peak_memory
+        assert growth <= MAX_PER_ROW_GROWTH, f"peak memory grew {growth:.2f}x from 10 to 100 pages"
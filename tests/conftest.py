@@ -59,4 +59,46 @@ def meta_app_auth_headers(test_headers):
     """Headers with Meta app ID authentication"""
     headers = test_headers.copy()
     headers["X-META-APP-ID"] = "123456789012345"
-    return headers 
\ No newline at end of file
+    return headers 
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Keep throttling state observed by one test from pacing the next."""
+    from meta_ads_mcp.core.rate_limiter import rate_limiter
+    rate_limiter.reset()
+    yield
+    rate_limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_response_cache():
+    """Keep Graph responses cached by one test from answering the next."""
+    from meta_ads_mcp.core.cache import response_cache
+    response_cache.clear()
+    yield
+    response_cache.clear()
+
+
+@pytest.fixture
+def mock_graph():
+    """Serve make_api_request's Graph requests in-process.
+
+    Returns a function: mock_graph(handler) answers requests with
+    httpx.MockTransport(handler), mock_graph(app=emulator) serves them from
+    an ASGI app such as the Graph emulator. Either way it returns the patch
+    as a context manager.
+    """
+    import httpx
+    from unittest.mock import patch
+    from meta_ads_mcp.core import api as api_module
+
+    real_async_client = httpx.AsyncClient
+
+    def install(handler=None, app=None):
+        def client(**kwargs):
+            transport = httpx.ASGITransport(app=app) if app is not None else httpx.MockTransport(handler)
+            return real_async_client(transport=transport, **kwargs)
+
+        return patch.object(api_module.httpx, "AsyncClient", side_effect=client)
+
+    return install
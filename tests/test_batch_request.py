@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for make_batch_request, the Graph Batch API client.
+
+Covers turning calls into batch items, splitting 500 reads into POSTs of 50
+sub-requests, keeping depends_on / {result=...} chains in one batch, and
+decoding per-item responses: Graph errors, auth errors that invalidate the
+token, null items, non-object bodies and a failure of the whole batch.
+"""
+
+import json
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.api import (
+    GRAPH_BATCH_MAX_SIZE,
+    _batch_item,
+    _chunk_batch,
+    make_batch_request,
+)
+
+
+def _batch_endpoint(calls, respond=None):
+    """A fake Graph batch endpoint, for mock_graph.
+
+    `respond(item)` returns the per-item response; by default echo the URL.
+    """
+    def default(item):
+        return {"code": 200, "headers": [], "body": json.dumps({"id": item["relative_url"].split("?")[0]})}
+
+    def handler(request):
+        form = parse_qs(request.content.decode())
+        batch = json.loads(form["batch"][0])
+        calls.append(batch)
+        return httpx.Response(200, json=[(respond or default)(item) for item in batch])
+
+    return handler
+
+
+class TestBatchItems:
+
+    def test_endpoint_and_params_become_relative_url(self):
+        item = _batch_item({"endpoint": "act_1/ads", "params": {"fields": "id,name", "filtering": [{"field": "x"}]}})
+        assert item["method"] == "GET"
+        assert item["relative_url"].startswith("act_1/ads?fields=id%2Cname&filtering=")
+        assert json.loads(parse_qs(item["relative_url"].split("?", 1)[1])["filtering"][0]) == [{"field": "x"}]
+
+    def test_post_params_become_body(self):
+        item = _batch_item({"method": "post", "endpoint": "123", "params": {"status": "PAUSED", "is_dynamic": False}})
+        assert item == {"method": "POST", "relative_url": "123", "body": "status=PAUSED&is_dynamic=false"}
+
+    def test_meta_keys_pass_through(self):
+        item = _batch_item({"relative_url": "/me/adaccounts", "name": "accts", "omit_response_on_success": False})
+        assert item == {"method": "GET", "relative_url": "me/adaccounts", "name": "accts",
+                        "omit_response_on_success": False}
+
+    def test_missing_url_is_rejected(self):
+        with pytest.raises(ValueError):
+            _batch_item({"method": "GET"})
+
+
+class TestChunking:
+
+    def test_splits_into_batches_of_50(self):
+        items = [_batch_item({"relative_url": str(i)}) for i in range(120)]
+        assert [len(c) for c in _chunk_batch(items)] == [50, 50, 20]
+
+    def test_dependent_requests_stay_together(self):
+        items = [_batch_item({"relative_url": str(i)}) for i in range(48)]
+        items.append(_batch_item({"relative_url": "act_1/campaigns?limit=5", "name": "camps"}))
+        items.append(_batch_item({"relative_url": "?ids={result=camps:$.data.*.id}"}))
+        items.append(_batch_item({"relative_url": "x", "depends_on": "camps"}))
+
+        chunks = _chunk_batch(items)
+        assert [len(c) for c in chunks] == [48, 3]
+
+    def test_oversized_dependency_chain_is_rejected(self):
+        items = [_batch_item({"relative_url": "root", "name": "root"})]
+        items += [_batch_item({"relative_url": "x", "depends_on": "root"}) for _ in range(GRAPH_BATCH_MAX_SIZE)]
+        with pytest.raises(ValueError):
+            _chunk_batch(items)
+
+
+class TestMakeBatchRequest:
+
+    @pytest.mark.asyncio
+    async def test_500_reads_take_10_round_trips(self, mock_graph):
+        calls = []
+        with mock_graph(_batch_endpoint(calls)):
+            results = await make_batch_request(
+                [{"endpoint": str(i), "params": {"fields": "id"}} for i in range(500)], "tok")
+
+        assert len(calls) == 10
+        assert all(len(batch) == 50 for batch in calls)
+        assert [r["id"] for r in results] == [str(i) for i in range(500)]
+
+    @pytest.mark.asyncio
+    async def test_per_item_errors_are_mapped(self, mock_graph):
+        def respond(item):
+            if item["relative_url"] == "bad":
+                return {"code": 400, "body": json.dumps({"error": {"message": "Unsupported get request",
+                                                                   "code": 100, "error_subcode": 33}})}
+            if item["relative_url"] == "blocked":
+                return {"code": 400, "body": json.dumps({"error": {"message": "Action blocked", "code": 368}})}
+            return {"code": 200, "body": json.dumps({"id": item["relative_url"]})}
+
+        calls = []
+        with mock_graph(_batch_endpoint(calls, respond)):
+            results = await make_batch_request(
+                [{"relative_url": "good"}, {"relative_url": "bad"}, {"relative_url": "blocked"}], "tok")
+
+        assert results[0] == {"id": "good"}
+        assert results[1]["error"]["message"] == "HTTP Error: 400"
+        assert results[1]["error"]["details"]["error"]["code"] == 100
+        assert results[2]["error"]["is_account_disabled"] is True
+
+    @pytest.mark.asyncio
+    async def test_auth_error_invalidates_token(self, mock_graph):
+        def respond(item):
+            return {"code": 400, "body": json.dumps({"error": {"message": "Session expired", "code": 190}})}
+
+        with mock_graph(_batch_endpoint([], respond)), \
+                patch.object(api_module.auth_manager, "invalidate_token") as invalidate:
+            await make_batch_request([{"relative_url": "me"}], "tok")
+
+        invalidate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_null_items_become_errors(self, mock_graph):
+        calls = []
+        with mock_graph(_batch_endpoint(calls, lambda item: None)):
+            results = await make_batch_request([{"relative_url": "slow"}], "tok")
+
+        assert "No response" in results[0]["error"]["message"]
+
+    @pytest.mark.asyncio
+    async def test_non_object_bodies_are_wrapped(self, mock_graph):
+        with mock_graph(_batch_endpoint([], lambda item: {"code": 200, "body": "true"})):
+            results = await make_batch_request([{"method": "DELETE", "relative_url": "123"}], "tok")
+
+        assert results == [{"result": True}]
+
+    @pytest.mark.asyncio
+    async def test_whole_batch_failure_is_reported_per_item(self, mock_graph):
+        def handler(request):
+            return httpx.Response(400, json={"error": {"message": "Invalid batch", "code": 100}})
+
+        with mock_graph(handler):
+            results = await make_batch_request([{"relative_url": "a"}, {"relative_url": "b"}], "tok")
+
+        assert len(results) == 2
+        assert all(r["error"]["message"] == "HTTP Error: 400" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_empty_input_makes_no_request(self, mock_graph):
+        calls = []
+        with mock_graph(_batch_endpoint(calls)):
+            assert await make_batch_request([], "tok") == []
+        assert calls == []
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for per-tool-call Graph cost accounting.
+
+Covers the CallCost that meta_api_tool opens per invocation: what
+make_api_request charges to it (calls, bytes, retries, cache hits, usage),
+isolation between concurrent calls, the one tool_cost log line per call,
+and the summary returned under _meta.graph_cost with META_ADS_COST_IN_RESULT.
+"""
+
+import asyncio
+import json
+import logging
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.accounting import CallCost, attach_cost, current_cost, track_tool_call
+from meta_ads_mcp.core.api import make_api_request, meta_api_tool
+from meta_ads_mcp.core.serialization import output_format
+
+USAGE_HEADER = json.dumps({"call_count": 12, "total_cputime": 3, "total_time": 4})
+
+
+@pytest.fixture
+def graph(mock_graph):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.url.path.endswith("/flaky") and len(calls) == 1:
+            return httpx.Response(503, json={"error": {"message": "Service unavailable", "code": 2}})
+        return httpx.Response(200, json={"data": [{"id": "1", "name": "x" * 100}]},
+                              headers={"x-app-usage": USAGE_HEADER})
+
+    with mock_graph(handler), \
+            patch.object(api_module.retry_policy, "base_delay", 0.0):
+        yield calls
+
+
+class TestCallCost:
+
+    @pytest.mark.asyncio
+    async def test_graph_requests_are_charged_to_the_current_call(self, graph):
+        with track_tool_call("some_tool") as cost:
+            await make_api_request("act_1/campaigns", "tok", {"limit": 1})
+            await make_api_request("act_1/adsets", "tok", {"limit": 1})
+
+        summary = cost.summary()
+        assert summary["graph_calls"] == 2
+        assert summary["bytes_in"] > 200
+        assert summary["bytes_out"] > 0
+        assert summary["usage"]["app_usage"]["call_count"] == 12
+        assert [c["endpoint"] for c in summary["calls"]] == ["act_1/campaigns", "act_1/adsets"]
+        assert all(c["status"] == 200 for c in summary["calls"])
+
+    @pytest.mark.asyncio
+    async def test_retries_and_cache_hits(self, graph):
+        with track_tool_call("some_tool") as cost:
+            await make_api_request("act_1/flaky", "tok")
+            await make_api_request("act_1/flaky", "tok")
+
+        summary = cost.summary()
+        assert summary["graph_calls"] == 2
+        assert summary["retries"] == 1
+        assert summary["errors"] == 1
+        assert summary["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tool_calls_are_kept_apart(self, graph):
+        async def tool(name, n):
+            with track_tool_call(name) as cost:
+                await asyncio.gather(*(make_api_request(f"act_{name}/ads", "tok", {"limit": i}) for i in range(n)))
+            return cost
+
+        first, second = await asyncio.gather(tool("1", 3), tool("2", 5))
+        assert first.graph_calls == 3
+        assert second.graph_calls == 5
+
+    @pytest.mark.asyncio
+    async def test_no_accounting_outside_a_tool_call(self, graph):
+        assert current_cost() is None
+        await make_api_request("act_1/campaigns", "tok")
+
+    def test_recorded_call_detail_is_bounded(self):
+        cost = CallCost("bulk")
+        for _ in range(500):
+            cost.record_call("GET", "act_1/ads", 200, 0.01, bytes_in=10)
+        assert cost.graph_calls == 500
+        assert cost.bytes_in == 5000
+        assert len(cost.summary()["calls"]) == 50
+
+
+class TestMetaApiTool:
+
+    @pytest.mark.asyncio
+    async def test_one_log_record_per_tool_call(self, graph, caplog):
+        @meta_api_tool
+        async def list_things(access_token=None):
+            await make_api_request("act_1/campaigns", access_token)
+            await make_api_request("act_1/ads", access_token)
+            return json.dumps({"ok": True})
+
+        with caplog.at_level(logging.INFO, logger="meta-ads-mcp"):
+            result = json.loads(await list_things(access_token="tok"))
+
+        assert "_meta" not in result
+        records = [r.getMessage() for r in caplog.records if r.getMessage().startswith("tool_cost ")]
+        assert len(records) == 1
+        assert records[0].startswith("tool_cost tool=list_things ")
+        assert json.loads(records[0].split(" ", 2)[2])["graph_calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_no_log_serialization_above_info(self, graph):
+        @meta_api_tool
+        async def list_things(access_token=None):
+            await make_api_request("act_1/campaigns", access_token)
+            return json.dumps({"ok": True})
+
+        logger = logging.getLogger("meta-ads-mcp")
+        level = logger.level
+        logger.setLevel(logging.WARNING)
+        try:
+            with patch.object(CallCost, "summary", side_effect=AssertionError("summary built for a dropped log")):
+                assert json.loads(await list_things(access_token="tok")) == {"ok": True}
+        finally:
+            logger.setLevel(level)
+
+    @pytest.mark.asyncio
+    async def test_cost_in_result(self, graph):
+        @meta_api_tool
+        async def list_things(access_token=None):
+            await make_api_request("act_1/campaigns", access_token)
+            return json.dumps({"data": [], "_meta": {"note": "kept"}})
+
+        with patch.object(api_module, "COST_IN_RESULT", True):
+            result = json.loads(await list_things(access_token="tok"))
+
+        assert result["_meta"]["note"] == "kept"
+        assert result["_meta"]["graph_cost"]["graph_calls"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fmt", ["compact", "table"])
+    async def test_cost_in_result_keeps_the_output_format(self, graph, fmt):
+        @meta_api_tool
+        async def list_things(access_token=None, output_format=None):
+            await make_api_request("act_1/campaigns", access_token)
+            return json.dumps({"data": [{"id": "1", "name": "A"}, {"id": "2", "name": "B"}]}, indent=2)
+
+        with patch.object(api_module, "COST_IN_RESULT", True):
+            text = await list_things(access_token="tok", output_format=fmt)
+
+        assert "\n" not in text
+        result = json.loads(text)
+        assert result["_meta"]["graph_cost"]["graph_calls"] == 1
+        if fmt == "table":
+            assert result["columns"] == ["id", "name"]
+
+    def test_attach_cost_leaves_non_objects_alone(self):
+        cost = CallCost("t")
+        assert attach_cost("plain text", cost) == "plain text"
+        assert attach_cost("[1, 2]", cost) == "[1, 2]"
+
+    def test_attach_cost_encodes_text_in_the_current_format(self):
+        with output_format("compact"):
+            text = attach_cost('{\n  "a": 1\n}', CallCost("t"))
+        assert "\n" not in text
+        assert json.loads(text)["_meta"]["graph_cost"]["graph_calls"] == 0
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Tests for cassette record/replay of Graph API traffic.
+
+Covers recording a session (tokens scrubbed from requests and from paging
+links in responses, only usage headers kept), replaying it offline with any
+token, repeating the last response once recorded ones run out, misses as
+Graph errors, replay timing and META_ADS_CASSETTE* configuration.
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core import cassette as cassette_module
+from meta_ads_mcp.core.api import make_api_request
+from meta_ads_mcp.core.cache import response_cache
+from meta_ads_mcp.core.cassette import RECORD, REPLAY, Cassette
+
+
+def _offline(request):
+    raise AssertionError(f"Replay sent a request to the network: {request.url}")
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay():
+    with patch.object(api_module.retry_policy, "base_delay", 0.0):
+        yield
+
+
+async def _session():
+    """A small tool-like sequence: a page of campaigns, one object and a write."""
+    campaigns = await make_api_request("act_1/campaigns", "secret-token", {"fields": "id,name", "limit": 2})
+    campaign = await make_api_request("120200", "secret-token", {"fields": "id,name"})
+    update = await make_api_request("120200", "secret-token", {"status": "PAUSED"}, method="POST")
+    return campaigns, campaign, update
+
+
+class TestRecordReplay:
+
+    @pytest.mark.asyncio
+    async def test_replay_reproduces_the_session_offline(self, tmp_path, monkeypatch, mock_graph):
+        monkeypatch.setenv("META_APP_SECRET", "app-secret")
+        path = str(tmp_path / "session.jsonl")
+
+        def handler(request):
+            if request.method == "POST":
+                return httpx.Response(200, json={"success": True})
+            if request.url.path.endswith("/campaigns"):
+                return httpx.Response(200, json={"data": [{"id": "120200", "name": "Launch"}]},
+                                      headers={"x-app-usage": json.dumps({"call_count": 12}), "x-other": "dropped"})
+            return httpx.Response(200, json={"id": "120200", "name": "Launch"})
+
+        recorder = Cassette(path, RECORD)
+        with mock_graph(handler), patch.object(api_module, "cassette", recorder):
+            recorded = await _session()
+        recorder.close()
+        assert recorder.recorded == 3
+
+        text = (tmp_path / "session.jsonl").read_text()
+        assert "secret-token" not in text
+        assert "appsecret_proof=REDACTED" in text
+        first = recorder.interactions()[0]
+        assert first["request"].startswith("GET /v24.0/act_1/campaigns?access_token=REDACTED")
+        assert first["headers"] == {"content-type": "application/json",
+                                    "x-app-usage": json.dumps({"call_count": 12})}
+        assert first["elapsed"] >= 0
+
+        response_cache.clear()
+        player = Cassette(path, REPLAY)
+        with mock_graph(_offline), patch.object(api_module, "cassette", player):
+            replayed = await _session()
+        assert replayed == recorded
+        assert (player.replayed, player.misses) == (3, 0)
+
+    @pytest.mark.asyncio
+    async def test_retries_replay_in_recorded_order(self, tmp_path, mock_graph):
+        path = str(tmp_path / "flaky.jsonl.gz")
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(503, json={"error": {"message": "Service unavailable", "code": 2}})
+            return httpx.Response(200, json={"data": []})
+
+        recorder = Cassette(path, RECORD)
+        with mock_graph(handler), patch.object(api_module, "cassette", recorder):
+            assert await make_api_request("act_1/ads", "tok") == {"data": []}
+        recorder.close()
+        assert [i["status"] for i in recorder.interactions()] == [503, 200]
+
+        response_cache.clear()
+        player = Cassette(path, REPLAY)
+        with mock_graph(_offline), patch.object(api_module, "cassette", player):
+            assert await make_api_request("act_1/ads", "other-token") == {"data": []}
+            response_cache.clear()
+            # Recorded responses ran out: the last one is repeated
+            assert await make_api_request("act_1/ads", "other-token") == {"data": []}
+        assert player.replayed == 3
+
+    @pytest.mark.asyncio
+    async def test_paging_links_are_scrubbed(self, tmp_path, mock_graph):
+        path = tmp_path / "paged.jsonl"
+        link = "https://graph.facebook.com/v24.0/act_1/ads?access_token=secret-token&appsecret_proof=proof123"
+
+        def handler(request):
+            return httpx.Response(200, json={"data": [{"id": "1"}], "paging": {
+                "cursors": {"after": "QVFI"}, "next": f"{link}&limit=1&after=QVFI",
+                "previous": f"{link}&limit=1&before=QVFH"}})
+
+        recorder = Cassette(str(path), RECORD)
+        with mock_graph(handler), patch.object(api_module, "cassette", recorder):
+            await make_api_request("act_1/ads", "secret-token", {"limit": 1})
+        recorder.close()
+
+        text = path.read_text()
+        assert "secret-token" not in text
+        assert "proof123" not in text
+        paging = json.loads(recorder.interactions()[0]["body"])["paging"]
+        assert paging["next"] == ("https://graph.facebook.com/v24.0/act_1/ads?access_token=REDACTED"
+                                  "&appsecret_proof=REDACTED&limit=1&after=QVFI")
+        assert paging["cursors"] == {"after": "QVFI"}
+
+    @pytest.mark.asyncio
+    async def test_unrecorded_request_is_a_graph_error(self, tmp_path, mock_graph):
+        player = Cassette(str(tmp_path / "empty.jsonl"), REPLAY)
+        with mock_graph(_offline), patch.object(api_module, "cassette", player):
+            result = await make_api_request("act_1/adsets", "tok")
+        assert result["error"]["details"]["error"]["type"] == "CassetteMiss"
+        assert player.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_original_timing(self, tmp_path):
+        path = tmp_path / "slow.jsonl"
+        request = httpx.Request("GET", "https://graph.facebook.com/v24.0/act_1?access_token=x")
+        path.write_text(json.dumps({"request": cassette_module.interaction_key(request), "status": 200,
+                                    "headers": {}, "elapsed": 1.5, "body": "{}"}) + "\n")
+        sleep = AsyncMock()
+        with patch.object(cassette_module.asyncio, "sleep", sleep):
+            response = await Cassette(str(path), REPLAY, timing=0.5).replay(request)
+        assert response.status_code == 200
+        sleep.assert_awaited_once_with(0.75)
+
+
+class TestConfiguration:
+
+    def test_key_ignores_token_and_param_order(self):
+        a = httpx.Request("GET", "https://graph.facebook.com/v24.0/act_1/ads?limit=5&access_token=one&fields=id")
+        b = httpx.Request("GET", "http://127.0.0.1:8765/v24.0/act_1/ads?fields=id&access_token=two&limit=5")
+        assert cassette_module.interaction_key(a) == cassette_module.interaction_key(b)
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        assert not Cassette.from_env().enabled
+        monkeypatch.setenv("META_ADS_CASSETTE", str(tmp_path / "c.jsonl"))
+        monkeypatch.setenv("META_ADS_CASSETTE_MODE", "bogus")
+        monkeypatch.setenv("META_ADS_CASSETTE_TIMING", "1")
+        cassette = Cassette.from_env()
+        assert cassette.enabled
+        assert (cassette.mode, cassette.timing) == (REPLAY, 1.0)
+        with pytest.raises(ValueError):
+            Cassette(None, "bogus")
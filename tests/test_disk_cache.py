@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent SQLite cache of slow-changing Graph metadata.
+
+Covers which endpoints are kept on disk (targeting catalogs, geo lookups,
+account currency/timezone, page lists), expiry, size limits, per-token
+isolation, and a new process being served from the database with
+META_ADS_DISK_CACHE=1.
+"""
+
+import os
+import sqlite3
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.api import make_api_request
+from meta_ads_mcp.core.cache import response_cache
+from meta_ads_mcp.core.disk_cache import DiskCache, namespace_for
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def disk(tmp_path, clock):
+    cache = DiskCache(path=tmp_path / "graph_cache.sqlite3", clock=clock)
+    yield cache
+    cache.close()
+
+
+INTERESTS = {"type": "adinterest", "q": "golf", "limit": 25}
+
+
+class TestNamespaces:
+
+    @pytest.mark.parametrize("endpoint,params,expected", [
+        ("search", {"type": "adinterest", "q": "golf"}, "targeting"),
+        ("search", {"type": "adTargetingCategory", "class": "behaviors"}, "targeting"),
+        ("search", {"type": "adgeolocation", "q": "Paris"}, "geo"),
+        ("act_123", {"fields": "currency,timezone_name"}, "account"),
+        ("me/accounts", {"fields": "id,name"}, "pages"),
+        ("act_123/client_pages", {"fields": "id,name"}, "pages"),
+    ])
+    def test_slow_changing_endpoints(self, endpoint, params, expected):
+        assert namespace_for(endpoint, params) == expected
+
+    @pytest.mark.parametrize("endpoint,params", [
+        ("act_123", {"fields": "name,amount_spent,balance"}),
+        ("act_123", {}),
+        ("act_123/insights", {"fields": "spend"}),
+        ("act_123/campaigns", {"fields": "id"}),
+    ])
+    def test_volatile_endpoints_are_not_persisted(self, endpoint, params):
+        assert namespace_for(endpoint, params) is None
+
+
+class TestDiskCache:
+
+    def test_round_trip_survives_reopen(self, tmp_path, clock):
+        path = tmp_path / "graph_cache.sqlite3"
+        first = DiskCache(path=path, clock=clock)
+        first.put("search", "tok", INTERESTS, {"data": [{"id": "6003", "name": "Golf"}]})
+        first.close()
+
+        second = DiskCache(path=path, clock=clock)
+        assert second.get("search", "tok", INTERESTS) == {"data": [{"id": "6003", "name": "Golf"}]}
+        second.close()
+
+    def test_uses_wal_and_compresses_values(self, disk):
+        disk.put("search", "tok", INTERESTS, {"data": [{"name": "Golf " * 200}]})
+        conn = sqlite3.connect(str(disk.path))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        size, = conn.execute("SELECT size FROM entries").fetchone()
+        conn.close()
+        assert size < 200
+
+    def test_does_not_store_tokens_or_urls(self, disk):
+        disk.put("search", "secret-token", INTERESTS, {"data": []})
+        conn = sqlite3.connect(str(disk.path))
+        row = conn.execute("SELECT key, object_id FROM entries").fetchone()
+        conn.close()
+        assert "secret-token" not in "".join(row)
+
+    def test_namespace_ttls(self, disk, clock):
+        disk.put("search", "tok", INTERESTS, {"data": []})
+        disk.put("search", "tok", {"type": "adgeolocation", "q": "Paris"}, {"data": []})
+        clock.now += 2 * 24 * 3600
+        assert disk.get("search", "tok", INTERESTS) is None
+        assert disk.get("search", "tok", {"type": "adgeolocation", "q": "Paris"}) is not None
+
+    def test_max_age(self, disk, clock):
+        disk.put("search", "tok", INTERESTS, {"data": []})
+        clock.now += 600
+        assert disk.get("search", "tok", INTERESTS, max_age=0) is None
+        assert disk.get("search", "tok", INTERESTS, max_age=300) is None
+        assert disk.get("search", "tok", INTERESTS, max_age=3600) is not None
+
+    def test_token_is_part_of_the_key(self, disk):
+        disk.put("search", "tok-a", INTERESTS, {"data": []})
+        assert disk.get("search", "tok-b", INTERESTS) is None
+
+    def test_errors_and_volatile_data_are_not_stored(self, disk):
+        disk.put("search", "tok", INTERESTS, {"error": {"message": "HTTP Error: 500"}})
+        disk.put("act_1/insights", "tok", {"fields": "spend"}, {"data": []})
+        assert disk.get("search", "tok", INTERESTS) is None
+        conn = sqlite3.connect(str(disk.path))
+        assert conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 0
+        conn.close()
+
+    def test_size_cap_evicts_least_recently_read(self, tmp_path, clock):
+        cache = DiskCache(path=tmp_path / "capped.sqlite3", max_bytes=1500, clock=clock)
+        blobs = {q: {"data": [{"blob": os.urandom(600).hex()}]} for q in ("a", "b", "c")}
+        for q in ("a", "b"):
+            clock.now += 1
+            cache.put("search", "tok", {"type": "adinterest", "q": q}, blobs[q])
+        clock.now += 1
+        cache.get("search", "tok", {"type": "adinterest", "q": "a"})
+        clock.now += 1
+        cache.put("search", "tok", {"type": "adinterest", "q": "c"}, blobs["c"])
+
+        assert cache.get("search", "tok", {"type": "adinterest", "q": "b"}) is None
+        assert cache.get("search", "tok", {"type": "adinterest", "q": "a"}) is not None
+        assert cache.get("search", "tok", {"type": "adinterest", "q": "c"}) is not None
+        cache.close()
+
+    def test_write_invalidates_object(self, disk):
+        disk.put("act_1", "tok", {"fields": "currency"}, {"currency": "USD", "id": "act_1"})
+        disk.invalidate_for_write("act_1")
+        assert disk.get("act_1", "tok", {"fields": "currency"}) is None
+
+    def test_sqlite_failure_disables_cache(self, disk):
+        disk.put("search", "tok", INTERESTS, {"data": []})
+        disk._conn.close()
+        assert disk.get("search", "tok", INTERESTS) is None
+        assert disk.enabled is False
+
+
+class TestMakeApiRequestWithDiskCache:
+
+    @pytest.mark.asyncio
+    async def test_cold_process_is_served_from_disk(self, disk, mock_graph):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"data": [{"id": "6003", "name": "Golf"}]})
+
+        with patch.object(api_module, "disk_cache", disk), mock_graph(handler):
+            first = await make_api_request("search", "tok", INTERESTS)
+            # Simulate a fresh process: the in-memory cache is empty.
+            response_cache.clear()
+            second = await make_api_request("search", "tok", INTERESTS)
+
+        assert first == second
+        assert len(calls) == 1
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for automatic edge pagination.
+
+Covers iterate_edge following paging cursors and offset-style next links,
+and max_items / fetch_all on the list tools (get_campaigns, get_adsets,
+get_ads, get_ad_accounts, get_insights) collecting many pages in one call.
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.api import EdgePageError, collect_edge, iterate_edge
+
+
+@pytest.fixture
+def graph(mock_graph):
+    """Fake cursor-paginated edge holding `state["total"]` items."""
+    state = {"total": 250, "calls": [], "fail_after": None}
+
+    def handler(request):
+        state["calls"].append(request)
+        params = request.url.params
+        start = int(params.get("after") or 0)
+        if state["fail_after"] is not None and start >= state["fail_after"]:
+            return httpx.Response(500, json={"error": {"message": "Please reduce the amount of data", "code": 1}})
+        limit = int(params.get("limit") or 25)
+        end = min(start + limit, state["total"])
+        body = {"data": [{"id": str(i)} for i in range(start, end)],
+                "summary": {"total_count": state["total"]}}
+        if end > start:
+            body["paging"] = {"cursors": {"before": str(start), "after": str(end)}}
+            if end < state["total"]:
+                body["paging"]["next"] = f"https://graph.facebook.com/v24.0/act_1/ads?after={end}&limit={limit}"
+        return httpx.Response(200, json=body)
+
+    with mock_graph(handler), \
+            patch.object(api_module.retry_policy, "enabled", False):
+        yield state
+
+
+class TestIterateEdge:
+
+    @pytest.mark.asyncio
+    async def test_follows_cursors_to_the_end(self, graph):
+        ids = [item["id"] async for item in iterate_edge("act_1/ads", "tok", {"fields": "id"})]
+        assert ids == [str(i) for i in range(250)]
+        assert [c.url.params.get("after") for c in graph["calls"]] == [None, "100", "200"]
+
+    @pytest.mark.asyncio
+    async def test_max_items_never_cuts_a_page(self, graph):
+        ids = [item["id"] async for item in iterate_edge("act_1/ads", "tok", {"fields": "id"}, max_items=130)]
+        assert len(ids) == 130
+        # The last request only asks for what is still needed.
+        assert [c.url.params["limit"] for c in graph["calls"]] == ["100", "30"]
+
+    @pytest.mark.asyncio
+    async def test_page_size_defaults_to_larger_of_limit_and_setting(self, graph):
+        [item async for item in iterate_edge("act_1/ads", "tok", {"limit": 200})]
+        assert [c.url.params["limit"] for c in graph["calls"]] == ["200", "200"]
+
+    @pytest.mark.asyncio
+    async def test_error_page_raises_with_resume_cursor(self, graph):
+        graph["fail_after"] = 100
+        seen = []
+        with pytest.raises(EdgePageError) as excinfo:
+            async for item in iterate_edge("act_1/ads", "tok", {"fields": "id"}):
+                seen.append(item)
+        assert len(seen) == 100
+        assert excinfo.value.params["after"] == "100"
+
+    @pytest.mark.asyncio
+    async def test_offset_paginated_edges(self, mock_graph):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            offset = int(request.url.params.get("offset") or 0)
+            body = {"data": [{"name": f"r{offset}"}]}
+            if offset < 2:
+                body["paging"] = {"next": f"https://graph.facebook.com/v24.0/search?offset={offset + 1}&limit=1"}
+            return httpx.Response(200, json=body)
+
+        with mock_graph(handler):
+            names = [item["name"] async for item in iterate_edge("search", "tok", {"type": "adinterest"})]
+        assert names == ["r0", "r1", "r2"]
+
+
+class TestCollectEdge:
+
+    @pytest.mark.asyncio
+    async def test_returns_graph_shaped_page(self, graph):
+        result = await collect_edge("act_1/ads", "tok", {"fields": "id"}, max_items=150)
+        assert len(result["data"]) == 150
+        assert result["paging"] == {"cursors": {"after": "150"}}
+        assert result["summary"] == {"total_count": 250}
+
+    @pytest.mark.asyncio
+    async def test_complete_edge_has_no_paging(self, graph):
+        result = await collect_edge("act_1/ads", "tok", {"fields": "id"})
+        assert len(result["data"]) == 250
+        assert "paging" not in result
+
+    @pytest.mark.asyncio
+    async def test_max_items_is_capped(self, graph):
+        graph["total"] = 10_000
+        with patch.object(api_module, "GRAPH_EDGE_MAX_ITEMS", 300):
+            result = await collect_edge("act_1/ads", "tok", {"fields": "id"}, max_items=1_000_000)
+        assert len(result["data"]) == 300
+
+    @pytest.mark.asyncio
+    async def test_first_page_error_is_returned_as_is(self, graph):
+        graph["fail_after"] = 0
+        result = await collect_edge("act_1/ads", "tok", {"fields": "id"})
+        assert "error" in result
+        assert "data" not in result
+
+    @pytest.mark.asyncio
+    async def test_later_error_keeps_collected_items(self, graph):
+        graph["fail_after"] = 200
+        result = await collect_edge("act_1/ads", "tok", {"fields": "id"})
+        assert len(result["data"]) == 200
+        assert result["paging"] == {"cursors": {"after": "200"}}
+        assert "error" not in result
+        assert result["pagination_error"]["message"] == "HTTP Error: 500"
+
+
+class TestListTools:
+
+    @pytest.mark.asyncio
+    async def test_default_call_is_still_one_page(self, graph):
+        from meta_ads_mcp.core.ads import get_ads
+
+        result = json.loads(await get_ads(account_id="act_1", access_token="tok"))
+        assert len(result["data"]) == 10
+        assert len(graph["calls"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_all(self, graph):
+        from meta_ads_mcp.core.campaigns import get_campaigns
+
+        result = json.loads(await get_campaigns(account_id="act_1", access_token="tok", fetch_all=True))
+        assert len(result["data"]) == 250
+        assert len(graph["calls"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_max_items_on_insights_and_accounts(self, graph):
+        from meta_ads_mcp.core.accounts import get_ad_accounts
+        from meta_ads_mcp.core.insights import get_insights
+
+        rows = json.loads(await get_insights(object_id="act_1", access_token="tok", max_items=120))
+        assert len(rows["data"]) == 120
+        accounts = json.loads(await get_ad_accounts(access_token="tok", max_items=5))
+        assert len(accounts["data"]) == 5
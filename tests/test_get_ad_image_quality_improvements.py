@@ -38,7 +38,7 @@ class TestGetAdImageQualityImprovements:
         }
         
         # Mock get_ad_creatives response with both URLs
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -57,7 +57,7 @@ class TestGetAdImageQualityImprovements:
                     }
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -68,7 +68,7 @@ class TestGetAdImageQualityImprovements:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -102,7 +102,7 @@ class TestGetAdImageQualityImprovements:
         }
         
         # Mock get_ad_creatives response without image_urls_for_viewing
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -117,7 +117,7 @@ class TestGetAdImageQualityImprovements:
                     }
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -128,7 +128,7 @@ class TestGetAdImageQualityImprovements:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -162,7 +162,7 @@ class TestGetAdImageQualityImprovements:
         }
         
         # Mock get_ad_creatives response without image_url
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -176,7 +176,7 @@ class TestGetAdImageQualityImprovements:
                     }
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -187,7 +187,7 @@ class TestGetAdImageQualityImprovements:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -221,7 +221,7 @@ class TestGetAdImageQualityImprovements:
         }
         
         # Mock get_ad_creatives response with only thumbnail_url
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -230,7 +230,7 @@ class TestGetAdImageQualityImprovements:
                     "thumbnail_url": "https://example.com/thumbnail_only.jpg"  # Only option
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -241,7 +241,7 @@ class TestGetAdImageQualityImprovements:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -346,7 +346,7 @@ class TestGetAdImageQualityImprovements:
         }
         
         # Mock get_ad_creatives response based on real data
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "606995022142818",
@@ -360,7 +360,7 @@ class TestGetAdImageQualityImprovements:
                     ]
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -371,7 +371,7 @@ class TestGetAdImageQualityImprovements:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -99,7 +99,7 @@ class TestGetAdImageRegressionFix:
         }
         
         # Mock get_ad_creatives response (wrapped format that caused the original bug)
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": json.dumps({
                 "data": [
                     {
@@ -113,7 +113,7 @@ class TestGetAdImageRegressionFix:
                     }
                 ]
             })
-        })
+        }
         
         mock_image_data = {
             "data": [{
@@ -133,7 +133,7 @@ class TestGetAdImageRegressionFix:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -247,10 +247,10 @@ class TestGetAdImageRegressionFix:
         }
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives:
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives:
             
             mock_api.side_effect = [mock_ad_data, mock_creative_details]
-            mock_get_creatives.return_value = json.dumps({"data": json.dumps({"data": []})})
+            mock_get_creatives.return_value = {"data": json.dumps({"data": []})}
             
             # Call get_ad_image - it should reach the fallback path
             result = await get_ad_image(access_token="test_token", ad_id="test_ad_id")
@@ -276,7 +276,7 @@ class TestGetAdImageRegressionFix:
         }
         
         # Mock get_ad_creatives response with direct URLs
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -289,7 +289,7 @@ class TestGetAdImageRegressionFix:
                     ]
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -300,7 +300,7 @@ class TestGetAdImageRegressionFix:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -335,7 +335,7 @@ class TestGetAdImageRegressionFix:
         }
         
         # Mock get_ad_creatives response with only thumbnail_url
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -345,7 +345,7 @@ class TestGetAdImageRegressionFix:
                     # No image_urls_for_viewing
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -356,7 +356,7 @@ class TestGetAdImageRegressionFix:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
@@ -390,7 +390,7 @@ class TestGetAdImageRegressionFix:
         }
         
         # Mock get_ad_creatives response without URLs
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789", 
@@ -399,10 +399,10 @@ class TestGetAdImageRegressionFix:
                     # No thumbnail_url or image_urls_for_viewing
                 }
             ]
-        })
+        }
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives:
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives:
             
             mock_api.side_effect = [mock_ad_data, mock_creative_details]
             mock_get_creatives.return_value = mock_get_ad_creatives_response
@@ -428,7 +428,7 @@ class TestGetAdImageRegressionFix:
             "name": "Download Fail Creative"
         }
         
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -436,10 +436,10 @@ class TestGetAdImageRegressionFix:
                     "image_urls_for_viewing": ["https://example.com/broken_image.jpg"]
                 }
             ]
-        })
+        }
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download:
             
             mock_api.side_effect = [mock_ad_data, mock_creative_details]
@@ -468,7 +468,7 @@ class TestGetAdImageRegressionFix:
         }
         
         # Mock get_ad_creatives response with both URLs
-        mock_get_ad_creatives_response = json.dumps({
+        mock_get_ad_creatives_response = {
             "data": [
                 {
                     "id": "creative_123456789",
@@ -487,7 +487,7 @@ class TestGetAdImageRegressionFix:
                     }
                 }
             ]
-        })
+        }
         
         # Mock PIL Image processing
         mock_pil_image = MagicMock()
@@ -498,7 +498,7 @@ class TestGetAdImageRegressionFix:
         mock_byte_stream.getvalue.return_value = b"fake_jpeg_data"
         
         with patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api, \
-             patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+             patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.download_image', new_callable=AsyncMock) as mock_download, \
              patch('meta_ads_mcp.core.ads.PILImage.open') as mock_pil_open, \
              patch('meta_ads_mcp.core.ads.io.BytesIO') as mock_bytesio:
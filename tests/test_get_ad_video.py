@@ -41,10 +41,10 @@ class TestGetAdVideo:
             }]
         }
 
-        with patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+        with patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api:
 
-            mock_get_creatives.return_value = json.dumps(mock_creatives)
+            mock_get_creatives.return_value = mock_creatives
             mock_api.side_effect = [mock_ad_data, mock_advideos_response]
 
             result = await get_ad_video(access_token="test_token", ad_id="ad_123")
@@ -82,10 +82,10 @@ class TestGetAdVideo:
             "length": 15.0,
         }
 
-        with patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+        with patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api:
 
-            mock_get_creatives.return_value = json.dumps(mock_creatives)
+            mock_get_creatives.return_value = mock_creatives
             # 1) account_id lookup, 2) advideos edge (empty), 3) direct node fallback
             mock_api.side_effect = [mock_ad_data, mock_advideos_empty, mock_direct_video]
 
@@ -133,8 +133,8 @@ class TestGetAdVideo:
             }]
         }
 
-        with patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives:
-            mock_get_creatives.return_value = json.dumps(mock_creatives)
+        with patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives:
+            mock_get_creatives.return_value = mock_creatives
 
             result = await get_ad_video(access_token="test_token", ad_id="ad_789")
             result_str = result if isinstance(result, str) else json.dumps(result)
@@ -262,10 +262,10 @@ class TestGetAdVideo:
             "length": 20.0,
         }
 
-        with patch('meta_ads_mcp.core.ads.get_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
+        with patch('meta_ads_mcp.core.ads._fetch_ad_creatives', new_callable=AsyncMock) as mock_get_creatives, \
              patch('meta_ads_mcp.core.ads.make_api_request', new_callable=AsyncMock) as mock_api:
 
-            mock_get_creatives.return_value = json.dumps(mock_creatives)
+            mock_get_creatives.return_value = mock_creatives
             # 1) account_id lookup fails (no account_id key), 2) direct fallback
             mock_api.side_effect = [mock_ad_data_error, mock_direct_video]
 
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared, pooled Graph API client.
+
+Covers make_api_request reusing one process-wide httpx.AsyncClient across
+calls, its pool and timeout settings, and closing it when the server shuts
+down.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.api import (
+    aclose_graph_client,
+    get_graph_client,
+    make_api_request,
+)
+from meta_ads_mcp.core.server import install_graph_client_shutdown
+
+
+def _json_transport(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"id": "123"})
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture(autouse=True)
+async def reset_shared_client():
+    await aclose_graph_client()
+    yield
+    await aclose_graph_client()
+
+
+class TestSharedClient:
+
+    @pytest.mark.asyncio
+    async def test_same_client_is_reused_within_a_loop(self):
+        first = get_graph_client()
+        second = get_graph_client()
+        assert first is second
+        assert not first.is_closed
+
+    @pytest.mark.asyncio
+    async def test_client_is_recreated_after_close(self):
+        first = get_graph_client()
+        await aclose_graph_client()
+        assert first.is_closed
+        second = get_graph_client()
+        assert second is not first
+        assert not second.is_closed
+
+    @pytest.mark.asyncio
+    async def test_pool_limits_come_from_settings(self):
+        with patch.object(api_module, "GRAPH_HTTP_MAX_CONNECTIONS", 7), \
+                patch.object(api_module, "GRAPH_HTTP_MAX_KEEPALIVE_CONNECTIONS", 3), \
+                patch.object(api_module, "httpx") as mock_httpx:
+            mock_httpx.AsyncClient = MagicMock(return_value=MagicMock(is_closed=False))
+            get_graph_client()
+
+        limits_kwargs = mock_httpx.Limits.call_args.kwargs
+        assert limits_kwargs["max_connections"] == 7
+        assert limits_kwargs["max_keepalive_connections"] == 3
+
+    def test_client_is_recreated_for_a_new_event_loop(self):
+        async def grab():
+            return get_graph_client()
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_make_api_request_reuses_one_client_across_calls(self):
+        calls = []
+        created = []
+        real_async_client = httpx.AsyncClient
+
+        def factory(**kwargs):
+            client = real_async_client(transport=_json_transport(calls), **kwargs)
+            created.append(client)
+            return client
+
+        with patch.object(api_module.httpx, "AsyncClient", side_effect=factory):
+            for _ in range(3):
+                result = await make_api_request("123", "tok", {"fields": "id"}, max_age=0)
+                assert result == {"id": "123"}
+
+        assert len(calls) == 3
+        assert len(created) == 1
+
+
+class TestShutdownHook:
+
+    @pytest.mark.asyncio
+    async def test_transport_runners_close_the_client(self):
+        server = MagicMock()
+        server.run_stdio_async = AsyncMock()
+        server.run_streamable_http_async = AsyncMock()
+
+        install_graph_client_shutdown(server)
+
+        client = get_graph_client()
+        await server.run_stdio_async()
+        assert client.is_closed
+
+        client = get_graph_client()
+        await server.run_streamable_http_async()
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_client_closed_even_when_transport_fails(self):
+        server = MagicMock()
+        server.run_stdio_async = AsyncMock(side_effect=RuntimeError("boom"))
+        server.run_streamable_http_async = AsyncMock()
+
+        install_graph_client_shutdown(server)
+
+        client = get_graph_client()
+        with pytest.raises(RuntimeError):
+            await server.run_stdio_async()
+        assert client.is_closed
+
+
+class TestHttp2Option:
+
+    @pytest.fixture(autouse=True)
+    def restore_http2_setting(self):
+        original = api_module.GRAPH_HTTP2
+        yield
+        api_module.GRAPH_HTTP2 = original
+
+    def test_falls_back_to_http1_without_h2_package(self):
+        with patch.object(api_module, "_http2_available", return_value=False):
+            assert api_module.set_graph_http2(True) is False
+        assert api_module.GRAPH_HTTP2 is False
+
+    def test_enabled_when_h2_installed(self):
+        with patch.object(api_module, "_http2_available", return_value=True):
+            assert api_module.set_graph_http2(True) is True
+        assert api_module.GRAPH_HTTP2 is True
+
+    @pytest.mark.asyncio
+    async def test_client_rebuilt_when_protocol_setting_changes(self):
+        with patch.object(api_module, "_http2_available", return_value=True), \
+                patch.object(api_module, "httpx") as mock_httpx:
+            mock_httpx.AsyncClient = MagicMock(side_effect=lambda **kw: MagicMock(is_closed=False))
+            api_module.set_graph_http2(False)
+            http1_client = get_graph_client()
+            api_module.set_graph_http2(True)
+            http2_client = get_graph_client()
+
+        assert http1_client is not http2_client
+        assert mock_httpx.AsyncClient.call_args_list[-1].kwargs["http2"] is True
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Tests for the local Graph API emulator.
+
+GraphEmulator answers Graph and Pipeboard token requests from seeded
+synthetic data. These tests drive the real request path against it through
+httpx's ASGI transport: objects and fields, edges and paging, insights,
+?ids= lookups, batches, throttling and usage headers, and the Pipeboard
+token endpoint.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.api import iterate_edge, make_api_request, make_batch_request
+from meta_ads_mcp.core.graph_emulator import EmulatorData, Fault, GraphEmulator
+
+TOKEN = "emulator-token"
+
+
+@pytest.fixture
+def emulator(mock_graph):
+    emulator = GraphEmulator(seed=3)
+    with mock_graph(app=emulator), \
+            patch.object(api_module, "META_GRAPH_API_BASE", "http://graph.emulator/v24.0"), \
+            patch.object(api_module.retry_policy, "base_delay", 0.0):
+        yield emulator
+
+
+def _first_account(emulator):
+    return emulator.data.accounts()[0]
+
+
+class TestObjects:
+
+    @pytest.mark.asyncio
+    async def test_ad_accounts_with_fields(self, emulator):
+        result = await make_api_request("me/adaccounts", TOKEN, {"fields": "id,name,currency"})
+        assert [account["id"] for account in result["data"]] == emulator.data.accounts()
+        assert result["data"][0] == {"name": "Emulator Account 1", "currency": "USD",
+                                     "id": _first_account(emulator)}
+
+    @pytest.mark.asyncio
+    async def test_nested_fields_expand_referenced_objects(self, emulator):
+        ad_id = emulator.data.edges[(_first_account(emulator), "ads")][0]
+        result = await make_api_request(ad_id, TOKEN, {"fields": "name,creative{id,title}"})
+        assert result["creative"]["title"].startswith("Headline")
+        assert set(result) == {"name", "creative", "id"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_an_ids_request(self, emulator):
+        ad_ids = emulator.data.edges[(_first_account(emulator), "ads")][:3]
+        results = await asyncio.gather(*(make_api_request(ad_id, TOKEN, {"fields": "id,name"}) for ad_id in ad_ids))
+        assert [result["id"] for result in results] == ad_ids
+        assert emulator.stats["by_family"]["root"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_object(self, emulator):
+        result = await make_api_request("999999", TOKEN, {"fields": "id"})
+        assert result["error"]["details"]["error"]["code"] == 100
+
+    @pytest.mark.asyncio
+    async def test_create_update_and_filter(self, emulator):
+        account_id = _first_account(emulator)
+        created = await make_api_request(f"{account_id}/campaigns", TOKEN,
+                                         {"name": "Launch", "objective": "OUTCOME_SALES", "status": "PAUSED"},
+                                         method="POST")
+        assert await make_api_request(created["id"], TOKEN, {"status": "ACTIVE"}, method="POST") == {"success": True}
+
+        active = await make_api_request(f"{account_id}/campaigns", TOKEN,
+                                        {"fields": "id,status", "effective_status": ["ACTIVE"],
+                                         "filtering": [{"field": "name", "operator": "CONTAIN", "value": "launch"}]})
+        assert active["data"] == [{"status": "ACTIVE", "id": created["id"]}]
+
+
+class TestPaging:
+
+    @pytest.mark.asyncio
+    async def test_cursors_are_followed_to_the_end(self, emulator):
+        account_id = _first_account(emulator)
+        ads = [ad async for ad in iterate_edge(f"{account_id}/ads", TOKEN, {"fields": "id"}, page_size=5)]
+        assert [ad["id"] for ad in ads] == emulator.data.edges[(account_id, "ads")]
+        assert emulator.stats["graph_calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_next_link(self, emulator):
+        page = await make_api_request(f"{_first_account(emulator)}/campaigns", TOKEN, {"limit": 50})
+        assert "next" not in page["paging"]
+        assert page["paging"]["cursors"]["after"]
+
+
+class TestInsights:
+
+    @pytest.mark.asyncio
+    async def test_levels_add_up(self, emulator):
+        account_id = _first_account(emulator)
+        params = {"fields": "impressions,spend", "time_range": {"since": "2026-01-01", "until": "2026-01-07"}}
+        (account_row,) = (await make_api_request(f"{account_id}/insights", TOKEN, params))["data"]
+        ads = await make_api_request(f"{account_id}/insights", TOKEN, {**params, "level": "ad", "limit": 100})
+        assert sum(int(row["impressions"]) for row in ads["data"]) == pytest.approx(
+            int(account_row["impressions"]), abs=len(ads["data"]))
+        assert account_row["date_start"] == "2026-01-01"
+        assert account_row["date_stop"] == "2026-01-07"
+
+    @pytest.mark.asyncio
+    async def test_daily_rows_with_breakdowns(self, emulator):
+        campaign_id = emulator.data.edges[(_first_account(emulator), "campaigns")][0]
+        result = await make_api_request(f"{campaign_id}/insights", TOKEN, {
+            "fields": "campaign_name,impressions,ctr,actions",
+            "time_range": {"since": "2026-01-01", "until": "2026-01-03"},
+            "time_increment": 1, "breakdowns": "gender", "limit": 100,
+        })
+        rows = result["data"]
+        assert len(rows) == 3 * 3
+        assert {row["gender"] for row in rows} == {"female", "male", "unknown"}
+        assert rows[0]["campaign_name"] == emulator.data.objects[campaign_id]["name"]
+        actions = {action["action_type"]: action["value"] for action in rows[0]["actions"]}
+        assert {"link_click", "landing_page_view", "post_engagement"} <= set(actions)
+        if "purchase" in actions:
+            # Conversions repeat under Meta's roll-up action types
+            assert actions["omni_purchase"] == actions["offsite_conversion.fb_pixel_purchase"] == actions["purchase"]
+
+    def test_same_seed_same_metrics(self):
+        first, second = EmulatorData(seed=9), EmulatorData(seed=9)
+        ad_id = first.edges[(first.accounts()[0], "ads")][0]
+        day = first.today
+        assert first.ad_day(ad_id, day) == second.ad_day(ad_id, day)
+        assert EmulatorData(seed=10).ad_day(ad_id, day) != first.ad_day(ad_id, day)
+
+
+class TestScale:
+
+    def test_scaled_account_has_exactly_the_requested_ads(self):
+        data = EmulatorData.scaled(1234, seed=4)
+        (account_id,) = data.accounts()
+        assert len(data.edges[(account_id, "ads")]) == 1234
+        assert len(data.edges[(account_id, "adsets")]) == 124
+        assert len(data.edges[(account_id, "campaigns")]) == 13
+        assert data.objects[data.edges[(account_id, "ads")][-1]]["name"] == "Ad 1234"
+
+    def test_pages_follow_cursors(self):
+        emulator = GraphEmulator(EmulatorData.scaled(120, seed=4))
+        account_id = emulator.data.accounts()[0]
+        pages = emulator.pages(f"{account_id}/insights", {
+            "level": "ad", "fields": "ad_id,impressions,actions", "time_increment": 1,
+            "time_range": {"since": "2026-01-01", "until": "2026-01-05"}, "limit": 250,
+        })
+        assert [len(page["data"]) for page in pages] == [250, 250, 100]
+        assert pages[0]["paging"]["next"].startswith("https://graph.facebook.com/v")
+        assert "next" not in pages[-1]["paging"]
+        assert len({(row["ad_id"], row["date_start"]) for page in pages for row in page["data"]}) == 600
+        assert emulator.stats["graph_calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_insights_pages_are_computed_once(self, emulator):
+        account_id = _first_account(emulator)
+        params = {"level": "ad", "fields": "ad_id,spend", "time_increment": 1, "date_preset": "last_7d"}
+        with patch.object(emulator, "insights", wraps=emulator.insights) as insights:
+            rows = [row async for row in iterate_edge(f"{account_id}/insights", TOKEN, params, page_size=20)]
+        assert len(rows) == 12 * 7
+        assert insights.call_count == 1
+
+
+class TestBatch:
+
+    @pytest.mark.asyncio
+    async def test_sub_requests_are_answered_in_order(self, emulator):
+        account_id = _first_account(emulator)
+        results = await make_batch_request([
+            {"method": "GET", "relative_url": f"{account_id}?fields=name"},
+            {"method": "GET", "endpoint": f"{account_id}/campaigns", "params": {"fields": "id", "limit": 1}},
+            {"method": "GET", "relative_url": "999999"},
+        ], TOKEN)
+        assert results[0] == {"name": "Emulator Account 1", "id": account_id}
+        assert len(results[1]["data"]) == 1
+        assert results[2]["error"]["details"]["error"]["code"] == 100
+        assert emulator.stats["batches"] == 1
+        assert emulator.stats["graph_calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limit(self):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=GraphEmulator()),
+                                     base_url="http://graph") as client:
+            response = await client.post("/v24.0/", data={
+                "access_token": TOKEN,
+                "batch": json.dumps([{"method": "GET", "relative_url": "me"}] * 51),
+            })
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == 1
+
+
+class TestFaultsAndLimits:
+
+    @pytest.mark.asyncio
+    async def test_transient_fault_is_retried(self, emulator):
+        fault = emulator.inject(path=r"/campaigns$", times=1)
+        result = await make_api_request(f"{_first_account(emulator)}/campaigns", TOKEN, {"fields": "id"})
+        assert "error" not in result
+        assert fault.hits == 1
+        assert emulator.stats["faults"] == 1
+        assert emulator.stats["graph_calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_usage_headers_drive_the_rate_limiter(self, emulator):
+        emulator.account_call_limit = 3
+        account_id = _first_account(emulator)
+        for edge in ("campaigns", "adsets", "ads"):
+            assert "error" not in await make_api_request(f"{account_id}/{edge}", TOKEN)
+
+        blocked = await make_api_request(f"{account_id}/adcreatives", TOKEN)
+        assert blocked["error"]["is_rate_limited"] is True
+        assert emulator.stats["graph_calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_throttling_error_past_the_limit(self):
+        emulator = GraphEmulator(account_call_limit=1)
+        account_id = emulator.data.accounts()[0]
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=emulator),
+                                     base_url="http://graph/v24.0") as client:
+            await client.get(f"/{account_id}/ads", params={"access_token": TOKEN})
+            response = await client.get(f"/{account_id}/ads", params={"access_token": TOKEN})
+        assert response.json()["error"]["code"] == 80004
+        usage = json.loads(response.headers["x-business-use-case-usage"])
+        assert usage[account_id[len("act_"):]][0]["call_count"] == 100
+        assert emulator.stats["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_token(self, emulator):
+        result = await make_api_request("me/adaccounts", "", {})
+        assert result["error"]["message"] == "Authentication Required"
+        assert emulator.stats["requests"] == 0
+
+
+class TestHttpEndpoints:
+
+    @pytest.mark.asyncio
+    async def test_pipeboard_token_and_control_endpoints(self):
+        emulator = GraphEmulator()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=emulator),
+                                     base_url="http://emulator") as client:
+            token = (await client.get("/api/meta/token", params={"api_token": "pb"})).json()
+            assert token["access_token"] == "emulator-token"
+            assert (await client.get("/api/meta/token")).status_code == 401
+
+            added = await client.post("/_emulator/faults", json={"path": "insights", "status": 503, "times": 2})
+            assert added.json()["hits"] == 0
+            assert (await client.post("/_emulator/faults", json={"bogus": 1})).status_code == 400
+            stats = (await client.get("/_emulator/stats")).json()
+            assert stats["requests"] == 2
+            assert stats["faults_configured"][0]["status"] == 503
+            assert stats["objects"]["ad"] == 24
+
+            await client.post("/_emulator/reset")
+            assert emulator.faults == []
+            assert emulator.stats["requests"] == 0
+
+    def test_fault_from_dict(self):
+        fault = Fault.from_dict({"method": "post", "status": None, "latency": 0.5})
+        assert fault.method == "POST"
+        assert fault.to_dict()["latency"] == 0.5
+
+    def test_base_urls_come_from_the_environment(self):
+        env = dict(os.environ, META_GRAPH_API_BASE="http://127.0.0.1:8765/v24.0/",
+                   PIPEBOARD_API_BASE="http://127.0.0.1:8765/api")
+        output = subprocess.run(
+            [sys.executable, "-c",
+             "from meta_ads_mcp.core import api, pipeboard_auth;"
+             "print(api.META_GRAPH_API_BASE); print(pipeboard_auth.PIPEBOARD_API_BASE)"],
+            env=env, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        assert output[-2:] == ["http://127.0.0.1:8765/v24.0", "http://127.0.0.1:8765/api"]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the ?ids= batching loader under make_api_request.
+
+Covers merging concurrent single-object GETs with the same fields into one
+GET /?ids=a,b,c request, splitting the response back to each caller, and
+per-object errors for IDs missing from the response.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from meta_ads_mcp.core.api import make_api_request
+from meta_ads_mcp.core.loader import IdBatchLoader
+
+
+@pytest.fixture
+def graph(mock_graph):
+    """Fake Graph API answering single-object and ?ids= lookups."""
+    calls = []
+    missing = set()
+
+    def handler(request):
+        calls.append(request)
+        fields = request.url.params.get("fields")
+        ids = request.url.params.get("ids")
+        if ids:
+            ids = ids.split(",")
+            if any(i in missing for i in ids):
+                return httpx.Response(404, json={"error": {"message": "Some of the aliases you requested do not exist",
+                                                           "code": 803}})
+            return httpx.Response(200, json={i: {"id": i, "fields": fields} for i in ids})
+        object_id = request.url.path.rsplit("/", 1)[-1]
+        if object_id in missing:
+            return httpx.Response(400, json={"error": {"message": "Unsupported get request", "code": 100}})
+        return httpx.Response(200, json={"id": object_id, "fields": fields})
+
+    with mock_graph(handler):
+        yield calls, missing
+
+
+class TestAccepts:
+
+    @pytest.mark.parametrize("endpoint,params", [
+        ("120201", {"fields": "id,name"}),
+        ("act_123", {"fields": "name"}),
+        ("120201", None),
+    ])
+    def test_single_object_lookups(self, endpoint, params):
+        assert IdBatchLoader(fetch=None).accepts(endpoint, params)
+
+    @pytest.mark.parametrize("endpoint,params", [
+        ("120201/insights", {"fields": "spend"}),
+        ("me", {"fields": "id"}),
+        ("120201", {"fields": "id", "limit": 5}),
+    ])
+    def test_other_requests_pass_through(self, endpoint, params):
+        assert not IdBatchLoader(fetch=None).accepts(endpoint, params)
+
+    def test_disabled(self):
+        assert not IdBatchLoader(fetch=None, enabled=False).accepts("120201", {"fields": "id"})
+
+
+class TestMakeApiRequestBatching:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_become_one_ids_request(self, graph):
+        calls, _ = graph
+        ids = [str(120200 + i) for i in range(30)]
+        results = await asyncio.gather(*(make_api_request(i, "tok", {"fields": "id,name"}) for i in ids))
+
+        assert len(calls) == 1
+        assert calls[0].url.path.endswith("/v24.0/")
+        assert calls[0].url.params["ids"].split(",") == ids
+        assert [r["id"] for r in results] == ids
+        assert all(r["fields"] == "id,name" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_lone_lookup_is_sent_unchanged(self, graph):
+        calls, _ = graph
+        result = await make_api_request("120201", "tok", {"fields": "id"})
+
+        assert result == {"id": "120201", "fields": "id"}
+        assert len(calls) == 1
+        assert "ids" not in calls[0].url.params
+        assert calls[0].url.path.endswith("/120201")
+
+    @pytest.mark.asyncio
+    async def test_different_fields_are_batched_separately(self, graph):
+        calls, _ = graph
+        await asyncio.gather(
+            make_api_request("1", "tok", {"fields": "id"}),
+            make_api_request("2", "tok", {"fields": "id"}),
+            make_api_request("3", "tok", {"fields": "name"}),
+            make_api_request("4", "tok", {"fields": "name"}),
+        )
+        assert sorted(c.url.params["ids"] for c in calls) == ["1,2", "3,4"]
+
+    @pytest.mark.asyncio
+    async def test_bad_id_does_not_fail_other_callers(self, graph):
+        calls, missing = graph
+        missing.add("999")
+        good, bad = await asyncio.gather(
+            make_api_request("1", "tok", {"fields": "id"}),
+            make_api_request("999", "tok", {"fields": "id"}),
+        )
+
+        assert good == {"id": "1", "fields": "id"}
+        assert bad["error"]["details"]["error"]["code"] == 100
+        # One combined attempt, then each ID on its own.
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_large_fan_out_is_split_at_50(self, graph):
+        calls, _ = graph
+        ids = [str(1000 + i) for i in range(120)]
+        results = await asyncio.gather(*(make_api_request(i, "tok", {"fields": "id"}) for i in ids))
+
+        assert sorted(len(c.url.params["ids"].split(",")) for c in calls) == [20, 50, 50]
+        assert [r["id"] for r in results] == ids
+
+    @pytest.mark.asyncio
+    async def test_tokens_are_never_mixed(self, graph):
+        calls, _ = graph
+        await asyncio.gather(
+            make_api_request("1", "tok-a", {"fields": "id"}),
+            make_api_request("2", "tok-b", {"fields": "id"}),
+        )
+        tokens = sorted(c.url.params["access_token"] for c in calls)
+        assert tokens == ["tok-a", "tok-b"]
+
+
+class TestLoaderUnit:
+
+    @pytest.mark.asyncio
+    async def test_missing_ids_are_fetched_individually(self):
+        requests = []
+
+        async def fetch(endpoint, token, params, retry):
+            requests.append((endpoint, dict(params)))
+            if endpoint == "":
+                return {"1": {"id": "1"}}
+            return {"id": endpoint, "single": True}
+
+        loader = IdBatchLoader(fetch, window=0.001)
+        first, second = await asyncio.gather(loader.load("1", "tok", {"fields": "id"}),
+                                             loader.load("2", "tok", {"fields": "id"}))
+        assert first == {"id": "1"}
+        assert second == {"id": "2", "single": True}
+        assert requests[0] == ("", {"fields": "id", "ids": "1,2"})
+
+    @pytest.mark.asyncio
+    async def test_fetch_exception_reaches_every_caller(self):
+        async def fetch(endpoint, token, params, retry):
+            raise RuntimeError("network down")
+
+        loader = IdBatchLoader(fetch, window=0.001)
+        results = await asyncio.gather(loader.load("1", "tok"), loader.load("2", "tok"), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_get_independent_results(self):
+        async def fetch(endpoint, token, params, retry):
+            return {"id": endpoint, "nested": {"n": 1}}
+
+        loader = IdBatchLoader(fetch, window=0.001)
+        first, second = await asyncio.gather(loader.load("1", "tok"), loader.load("1", "tok"))
+        first["nested"]["n"] = 2
+        assert second["nested"]["n"] == 1
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for the streamable-http load generator.
+
+Covers the bundled scenario files, tool-call argument placeholders, response
+classification, percentiles, the event-loop lag read from /metrics, and a
+staged run against a mocked MCP server and Graph backend.
+"""
+
+import asyncio
+import json
+import random
+
+import httpx
+import pytest
+
+from meta_ads_mcp.core.load_test import (
+    LoadTester, Scenario, ToolCall, available_scenarios, classify, compare, lag_between,
+    parse_lag_histogram, percentile, report,
+)
+from meta_ads_mcp.core.metrics import MetricsRegistry, monitor_event_loop_lag
+
+TARGETS = {"account_id": ["act_1", "act_2"], "campaign_id": ["120200"], "ad_id": ["120300", "120301"]}
+
+
+def _mcp_server(lag_registry):
+    """A stand-in server: Graph listings for discovery, tools/call and /metrics."""
+    requests = []
+
+    def handler(request):
+        if request.url.path == "/metrics":
+            if request.headers.get("authorization") != "Bearer scrape":
+                return httpx.Response(401)
+            lag_registry.event_loop_lag.observe(value=0.002)
+            return httpx.Response(200, text=lag_registry.render())
+        if request.url.path.startswith("/v24.0/"):
+            if request.url.path.endswith("/me/adaccounts"):
+                return httpx.Response(200, json={"data": [{"id": "act_1"}]})
+            edge = request.url.path.rsplit("/", 1)[1]
+            return httpx.Response(200, json={"data": [{"id": f"{edge}-1"}, {"id": f"{edge}-2"}]})
+        body = json.loads(request.content)
+        requests.append((request.headers["authorization"], body))
+        name = body["params"]["name"]
+        if name == "broken_tool":
+            text = json.dumps({"error": {"message": "HTTP Error: 500"}})
+        else:
+            text = json.dumps({"data": [body["params"]["arguments"]]})
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"],
+                                         "result": {"content": [{"type": "text", "text": text}]}})
+
+    return httpx.MockTransport(handler), requests
+
+
+class TestScenarios:
+
+    def test_bundled_scenarios_load(self):
+        assert available_scenarios() == ["creative-heavy", "insights-heavy", "read-heavy"]
+        for name in available_scenarios():
+            scenario = Scenario.load(name)
+            assert scenario.name == name
+            assert scenario.description
+            concurrency = [stage[0] for stage in scenario.stages]
+            assert concurrency == sorted(concurrency) and len(concurrency) > 2
+
+    def test_invalid_scenarios(self, tmp_path):
+        with pytest.raises(ValueError, match="No scenario"):
+            Scenario.load("write-heavy")
+        with pytest.raises(ValueError, match="Invalid scenario"):
+            Scenario.from_dict({"calls": [{"arguments": {}}], "stages": []}, "broken")
+        with pytest.raises(ValueError, match="unknown emulator settings"):
+            Scenario.from_dict({"calls": [{"tool": "get_ads"}], "stages": [{"concurrency": 1, "duration": 1}],
+                                "emulator": {"latencyy": 1}})
+        path = tmp_path / "custom.json"
+        path.write_text(json.dumps({"calls": [{"tool": "get_ads"}], "stages": [{"concurrency": 2, "duration": 5}]}))
+        assert Scenario.load(str(path)).name == "custom"
+
+    def test_placeholders_use_one_object_per_kind(self):
+        call = ToolCall("get_insights", {"object_id": "{account_id}", "filters": ["{account_id}", "{ad_id}"],
+                                         "time_range": {"since": "2026-01-01"}, "limit": 5})
+        arguments = call.render(TARGETS, random.Random(1))
+        assert arguments["object_id"] in TARGETS["account_id"]
+        assert arguments["filters"][0] == arguments["object_id"]
+        assert arguments["filters"][1] in TARGETS["ad_id"]
+        assert arguments["limit"] == 5
+        with pytest.raises(ValueError, match="creative_id"):
+            ToolCall("get_creative_details", {"creative_id": "{creative_id}"}).render(TARGETS, random.Random(1))
+
+
+class TestMeasurements:
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        assert [percentile(values, q) for q in (50, 95, 99, 100)] == [50.0, 95.0, 99.0, 100.0]
+        assert percentile([0.3], 99) == 0.3
+        assert percentile([], 50) == 0.0
+
+    def test_lag_between_scrapes(self):
+        registry = MetricsRegistry()
+        for _ in range(99):
+            registry.event_loop_lag.observe(value=0.002)
+        before = parse_lag_histogram(registry.render())
+        for _ in range(98):
+            registry.event_loop_lag.observe(value=0.003)
+        registry.event_loop_lag.observe(value=0.3)
+        registry.event_loop_lag.observe(value=0.3)
+        lag = lag_between(before, parse_lag_histogram(registry.render()))
+        assert lag["samples"] == 100
+        assert lag["mean"] == pytest.approx((98 * 0.003 + 0.6) / 100, abs=1e-4)
+        assert lag["p99"] == 0.5
+        assert lag_between(None, None) is None
+
+    def test_classify(self):
+        def rpc(message, content_type="application/json"):
+            text = json.dumps(message)
+            if content_type == "text/event-stream":
+                text = f"event: message\ndata: {text}\n\n"
+            return httpx.Response(200, text=text, headers={"content-type": content_type})
+
+        ok = {"result": {"content": [{"type": "text", "text": '{\n  "data": []\n}'}]}}
+        assert classify(rpc(ok)) == "ok"
+        assert classify(rpc(ok, "text/event-stream")) == "ok"
+        assert classify(rpc({"result": {"content": [{"type": "text", "text": '{\n  "error": {}}'}]}})) == "tool_error"
+        assert classify(rpc({"result": {"isError": True, "content": []}})) == "tool_error"
+        assert classify(rpc({"error": {"code": -32602}})) == "rpc_error"
+        assert classify(httpx.Response(401)) == "http_401"
+        with pytest.raises(ValueError):
+            classify(httpx.Response(200, text="<html>"))
+
+    @pytest.mark.asyncio
+    async def test_event_loop_lag_monitor(self):
+        registry = MetricsRegistry()
+        monitor = asyncio.create_task(monitor_event_loop_lag(registry, interval=0.01))
+        await asyncio.sleep(0.05)
+        monitor.cancel()
+        assert registry.event_loop_lag.count() >= 2
+        assert "meta_ads_event_loop_lag_seconds_bucket" in registry.render()
+
+
+class TestLoadTester:
+
+    @pytest.mark.asyncio
+    async def test_stages_against_a_mocked_server(self):
+        transport, requests = _mcp_server(MetricsRegistry())
+        scenario = Scenario.from_dict({
+            "name": "mixed",
+            "stages": [{"concurrency": 1, "duration": 0.05}, {"concurrency": 4, "duration": 0.05}],
+            "calls": [{"tool": "get_ads", "weight": 3, "arguments": {"account_id": "{account_id}"}},
+                      {"tool": "broken_tool", "weight": 1, "arguments": {"ad_id": "{ad_id}"}}],
+        })
+        tester = LoadTester("http://mcp.test", scenario, token="tok", graph_url="http://mcp.test/v24.0",
+                            transport=transport, metrics_token="scrape")
+        results = await tester.run()
+
+        assert tester.targets["account_id"] == ["act_1"]
+        assert tester.targets["ad_id"] == ["ads-1", "ads-2"]
+        assert [result.concurrency for result in results] == [1, 4]
+        for result in results:
+            assert result.requests == len(result.latencies) > 0
+            assert set(result.outcomes) <= {"ok", "tool_error"}
+            assert result.errors == result.by_tool["broken_tool"]
+            assert result.throughput > 0
+            assert result.server_lag["samples"] == 1
+        authorization, body = requests[0]
+        assert authorization == "Bearer tok"
+        assert body["method"] == "tools/call"
+
+        current = report(scenario, "http://mcp.test", results)
+        assert current["stages"][1]["concurrency"] == 4
+        assert set(current["stages"][0]["latency"]) == {"p50", "p95", "p99"}
+        assert "1 " in compare(current, current).splitlines()[2]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_counts_transport_errors(self):
+        def refuse(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        scenario = Scenario.from_dict({"calls": [{"tool": "get_ad_accounts"}],
+                                       "stages": [{"concurrency": 2, "duration": 0.02}]}, "down")
+        (result,) = await LoadTester("http://mcp.test", scenario, transport=httpx.MockTransport(refuse)).run()
+        assert result.outcomes["transport_error"] == result.requests > 0
+        assert result.error_rate == 1.0
+        assert result.server_lag is None
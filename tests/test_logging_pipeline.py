@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the non-blocking logging pipeline.
+
+Covers records going through a QueueHandler/QueueListener to a rotating
+file, the level set by META_ADS_LOG_LEVEL (and not changed by importing the
+package), and size-bounded, lazily rendered LogPreview payloads.
+"""
+
+import base64
+import logging
+import os
+import subprocess
+import sys
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+import pytest
+
+from meta_ads_mcp.core import utils as utils_module
+from meta_ads_mcp.core.api import meta_api_tool
+from meta_ads_mcp.core.utils import LogPreview, get_log_level, setup_logging
+
+
+class TestLogPreview:
+
+    def test_long_values_are_cut(self):
+        payload = base64.b64encode(b"\x00" * 30000).decode()
+        text = str(LogPreview({"bytes": payload, "name": "hero.png"}, limit=50))
+        assert len(text) < 150
+        assert "<40000 chars>" in text
+        assert "'name': 'hero.png'" in text
+
+    def test_nested_and_bytes_values(self):
+        text = str(LogPreview({"a": [{"b": b"x" * 500}], "t": ("y" * 10,)}, limit=20))
+        assert "<500 bytes>" in text
+        assert "('yyyyyyyyyy',)" in text
+
+    def test_total_length_is_bounded(self):
+        text = str(LogPreview(list(range(10000)), limit=10))
+        assert len(text) < 150
+        assert text.endswith("chars>")
+
+    def test_rendering_is_lazy(self, caplog):
+        class Expensive:
+            rendered = 0
+
+            def __repr__(self):
+                Expensive.rendered += 1
+                return "expensive"
+
+        logger = logging.getLogger("meta-ads-mcp")
+        with caplog.at_level(logging.INFO, logger="meta-ads-mcp"):
+            logger.debug("payload %s", LogPreview(Expensive()))
+        assert Expensive.rendered == 0
+
+
+class TestLogLevel:
+
+    @pytest.mark.parametrize("raw,level", [
+        ("", logging.INFO),
+        ("debug", logging.DEBUG),
+        ("WARNING", logging.WARNING),
+        ("nonsense", logging.INFO),
+    ])
+    def test_env_var(self, monkeypatch, raw, level):
+        monkeypatch.setenv("META_ADS_LOG_LEVEL", raw)
+        assert get_log_level() == level
+
+
+class TestQueuePipeline:
+
+    def test_records_go_through_a_queue_to_a_rotating_file(self):
+        queue_handlers = [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+        assert len(queue_handlers) == 1
+        listener = utils_module._log_listener
+        assert listener is not None
+        assert any(isinstance(h, RotatingFileHandler) for h in listener.handlers)
+
+    def test_setup_is_idempotent(self, monkeypatch):
+        root = logging.getLogger()
+        previous_level = root.level
+        monkeypatch.setenv("META_ADS_LOG_LEVEL", "WARNING")
+        try:
+            setup_logging()
+            assert sum(isinstance(h, QueueHandler) for h in root.handlers) == 1
+            assert logging.getLogger("meta-ads-mcp").level == logging.WARNING
+        finally:
+            root.setLevel(previous_level)
+            logging.getLogger("meta-ads-mcp").setLevel(previous_level)
+
+    def test_level_holds_after_importing_the_package(self, tmp_path):
+        # No module may raise the shared logger's level after setup_logging()
+        script = ("import logging, meta_ads_mcp; "
+                  "print(logging.getLogger('meta-ads-mcp').isEnabledFor(logging.DEBUG))")
+        env = dict(os.environ, META_ADS_LOG_LEVEL="WARNING", HOME=str(tmp_path), APPDATA=str(tmp_path))
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "False"
+
+    @pytest.mark.asyncio
+    async def test_tool_kwargs_are_previewed(self, caplog):
+        @meta_api_tool
+        async def upload_something(file=None, access_token=None):
+            return "{}"
+
+        payload = "data:image/png;base64," + "A" * 50000
+        with caplog.at_level(logging.DEBUG, logger="meta-ads-mcp"):
+            await upload_something(file=payload, access_token="secret-token")
+
+        kwargs_lines = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Kwargs: ")]
+        assert len(kwargs_lines) == 1
+        assert len(kwargs_lines[0]) < 1000
+        assert "secret-token" not in kwargs_lines[0]
+        assert "<50022 chars>" in kwargs_lines[0]
@@ -30,13 +30,12 @@ def _mock_response():
 
 @pytest.fixture
 def mock_httpx_client():
-    """Patch httpx.AsyncClient so no network I/O happens."""
+    """Patch the shared httpx.AsyncClient so no network I/O happens."""
     with patch("meta_ads_mcp.core.api.httpx.AsyncClient") as mock_client_cls:
         client = MagicMock()
         client.get = AsyncMock(return_value=_mock_response())
         client.post = AsyncMock(return_value=_mock_response())
-        mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=client)
-        mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
+        mock_client_cls.return_value = client
         yield client
 
 
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus /metrics endpoint of the streamable-http transport.
+
+Covers endpoint families, the text exposition format, what tool calls and
+Graph requests record (latency, counts by status, rate-limit usage,
+in-flight gauges, cache hit ratio), and the route: served only with
+META_ADS_METRICS_TOKEN and never reaching the MCP auth path.
+"""
+
+import json
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from meta_ads_mcp.core.api import make_api_request, meta_api_tool
+from meta_ads_mcp.core.http_auth_integration import AuthInjectionMiddleware, setup_metrics_route
+from meta_ads_mcp.core.metrics import MetricsRegistry, endpoint_family, metrics
+
+
+class TestEndpointFamily:
+
+    @pytest.mark.parametrize("endpoint,family", [
+        ("act_123/insights", "act/insights"),
+        ("act_123", "act"),
+        ("120200123/ads", "node/ads"),
+        ("120200123", "node"),
+        ("me/adaccounts", "me/adaccounts"),
+        ("search", "search"),
+        ("", "root"),
+        ("act_1/campaigns/extra/deep", "act/campaigns"),
+    ])
+    def test_ids_are_collapsed(self, endpoint, family):
+        assert endpoint_family(endpoint) == family
+
+
+class TestRegistry:
+
+    def test_exposition_format(self):
+        registry = MetricsRegistry()
+        registry.observe_tool_call("get_ads", 0.3, "ok")
+        registry.observe_graph_request("GET", "act_1/ads", 200, 0.07)
+        registry.observe_graph_request("GET", "act_1/ads", None, 0.5, retry=True)
+        text = registry.render()
+
+        assert "# TYPE meta_ads_tool_duration_seconds histogram" in text
+        assert 'meta_ads_tool_duration_seconds_bucket{tool="get_ads",le="0.25"} 0' in text
+        assert 'meta_ads_tool_duration_seconds_bucket{tool="get_ads",le="0.5"} 1' in text
+        assert 'meta_ads_tool_duration_seconds_bucket{tool="get_ads",le="+Inf"} 1' in text
+        assert 'meta_ads_tool_duration_seconds_count{tool="get_ads"} 1' in text
+        assert 'meta_ads_tool_calls_total{tool="get_ads",outcome="ok"} 1' in text
+        assert 'meta_ads_graph_requests_total{family="act/ads",method="GET",status="200"} 1' in text
+        assert 'meta_ads_graph_requests_total{family="act/ads",method="GET",status="error"} 1' in text
+        assert 'meta_ads_graph_retries_total{family="act/ads"} 1' in text
+        assert text.endswith("\n")
+
+    def test_rate_limit_usage_gauges(self):
+        registry = MetricsRegistry()
+        registry.observe_usage({
+            "app_usage": {"call_count": 28, "total_time": 25, "total_cputime": 20},
+            "ad_account_usage": {"acc_id_util_pct": 9.67},
+            "business_use_case_usage": {
+                "1": [{"type": "ads_management", "call_count": 40}],
+                "2": [{"type": "ads_management", "call_count": 95}, {"type": "ads_insights", "call_count": 3}],
+            },
+        })
+        text = registry.render()
+        assert 'meta_ads_rate_limit_usage_percent{source="app",type="app",metric="call_count"} 28' in text
+        assert 'meta_ads_rate_limit_usage_percent{source="ad_account",type="ad_account",metric="acc_id_util_pct"} 9.67' in text
+        assert ('meta_ads_rate_limit_usage_percent{source="business_use_case",type="ads_management",'
+                'metric="call_count"} 95') in text
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.observe_tool_call('we"ird\\tool', 0.1, "ok")
+        assert 'tool="we\\"ird\\\\tool"' in registry.render()
+
+
+@pytest.fixture
+def graph(mock_graph):
+    def handler(request):
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(400, json={"error": {"message": "Unsupported get request", "code": 100}})
+        return httpx.Response(200, json={"data": []},
+                              headers={"x-app-usage": json.dumps({"call_count": 42})})
+
+    with mock_graph(handler):
+        yield
+
+
+class TestInstrumentation:
+
+    @pytest.mark.asyncio
+    async def test_graph_requests_and_tool_calls_are_recorded(self, graph):
+        @meta_api_tool
+        async def metrics_probe_tool(access_token=None):
+            await make_api_request("act_9/campaigns", access_token)
+            result = await make_api_request("120200/missing", access_token)
+            return json.dumps(result)
+
+        ok_before = metrics.graph_requests.value("act/campaigns", "GET", "200")
+        bad_before = metrics.graph_requests.value("node/missing", "GET", "400")
+        await metrics_probe_tool(access_token="tok")
+
+        assert metrics.graph_requests.value("act/campaigns", "GET", "200") == ok_before + 1
+        assert metrics.graph_requests.value("node/missing", "GET", "400") == bad_before + 1
+        assert metrics.tool_calls.value("metrics_probe_tool", "error") == 1
+        assert metrics.tool_duration.count("metrics_probe_tool") == 1
+        assert metrics.rate_limit_usage.value("app", "app", "call_count") == 42
+        assert metrics.tools_in_flight.value() == 0
+        assert metrics.graph_in_flight.value() == 0
+
+    def test_cache_hit_ratio_is_collected_at_scrape_time(self):
+        from meta_ads_mcp.core.cache import response_cache
+
+        response_cache.put("act_1", "tok", None, {"id": "act_1"})
+        response_cache.get("act_1", "tok", None)
+        response_cache.get("act_2", "tok", None)
+        text = metrics.render()
+        assert "meta_ads_cache_hit_ratio 0.5" in text
+
+
+def _build_app():
+    async def downstream(request):
+        return JSONResponse({"reached_handler": True})
+
+    app = Starlette(routes=[Route("/mcp", downstream, methods=["POST", "GET"])])
+    setup_metrics_route(app)
+    app.add_middleware(AuthInjectionMiddleware)
+    return app
+
+
+SCRAPE = {"Authorization": "Bearer scrape-secret"}
+
+
+class TestMetricsRoute:
+
+    @pytest.fixture(autouse=True)
+    def metrics_token(self, monkeypatch):
+        monkeypatch.setenv("META_ADS_METRICS_TOKEN", "scrape-secret")
+
+    def test_scrape_needs_no_meta_token(self):
+        client = TestClient(_build_app())
+        resp = client.get("/metrics", headers=SCRAPE)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert "# TYPE meta_ads_graph_requests_total counter" in resp.text
+        assert "# TYPE meta_ads_cache_hits_total counter" in resp.text
+
+    def test_mcp_route_still_requires_auth(self):
+        client = TestClient(_build_app())
+        assert client.post("/mcp", json={}).status_code == 401
+
+    def test_scrape_token_is_required(self):
+        client = TestClient(_build_app())
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    def test_not_served_without_a_token(self, monkeypatch):
+        monkeypatch.delenv("META_ADS_METRICS_TOKEN")
+        app = _build_app()
+        assert not any(getattr(r, "path", None) == "/metrics" for r in app.router.routes)
+        # Falls through to the normal auth check instead of bypassing it
+        assert TestClient(app).get("/metrics").status_code == 401
+
+    def test_route_is_added_once(self):
+        app = _build_app()
+        setup_metrics_route(app)
+        assert sum(getattr(r, "path", None) == "/metrics" for r in app.router.routes) == 1
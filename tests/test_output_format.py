@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact output format and the pluggable JSON serializer.
+
+Covers META_ADS_OUTPUT_FORMAT and the per-call output_format argument,
+rejection of unknown formats, the orjson and standard library backends
+producing the same data, and Graph responses being decoded by the
+serializer.
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import serialization
+from meta_ads_mcp.core.api import make_api_request, meta_api_tool
+from meta_ads_mcp.core.serialization import COMPACT, PRETTY, current_output_format, dumps, loads, output_format
+
+ROWS = {"data": [{"campaign_name": "Été", "spend": "12.50", "actions": [{"action_type": "link_click", "value": "3"}]}] * 20}
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def serializer(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        yield
+    else:
+        with patch.object(serialization, "orjson", None):
+            yield
+
+
+class TestSerializer:
+
+    def test_pretty_is_indented(self, serializer):
+        text = dumps(ROWS, PRETTY)
+        assert text.startswith('{\n  "data": [')
+        assert json.loads(text) == ROWS
+
+    def test_compact_has_no_whitespace_and_is_smaller(self, serializer):
+        text = dumps(ROWS, COMPACT)
+        assert json.loads(text) == ROWS
+        assert "\n" not in text and ": " not in text
+        assert "Été" in text
+        assert len(text) < 0.8 * len(dumps(ROWS, PRETTY))
+
+    def test_unserializable_values_fall_back_to_str(self, serializer):
+        assert json.loads(dumps({"big": 2 ** 70, "obj": object}, COMPACT))["big"] == 2 ** 70
+
+    def test_loads(self, serializer):
+        assert loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+        with pytest.raises(json.JSONDecodeError):
+            loads(b"<html>")
+
+    def test_context_overrides_default(self):
+        assert current_output_format() == PRETTY
+        with output_format(COMPACT):
+            assert current_output_format() == COMPACT
+            assert "\n" not in dumps({"a": 1})
+        assert current_output_format() == PRETTY
+
+    @pytest.mark.parametrize("raw,fmt", [("", PRETTY), ("COMPACT", COMPACT), ("yaml", PRETTY)])
+    def test_env_var(self, monkeypatch, raw, fmt):
+        monkeypatch.setenv("META_ADS_OUTPUT_FORMAT", raw)
+        assert serialization._default_output_format() == fmt
+
+
+class TestMetaApiTool:
+
+    @pytest.mark.asyncio
+    async def test_per_call_compact_for_dict_results(self):
+        @meta_api_tool
+        async def rows_tool(access_token=None, output_format=None):
+            return dict(ROWS)
+
+        pretty = await rows_tool(access_token="tok")
+        compact = await rows_tool(access_token="tok", output_format="compact")
+        assert json.loads(pretty) == json.loads(compact) == ROWS
+        assert "\n" in pretty and "\n" not in compact
+
+    @pytest.mark.asyncio
+    async def test_indented_text_is_re_encoded_when_compact(self):
+        @meta_api_tool
+        async def text_tool(access_token=None, output_format=None):
+            return json.dumps(ROWS, indent=2)
+
+        result = await text_tool(access_token="tok", output_format="compact")
+        assert "\n" not in result
+        assert json.loads(result) == ROWS
+
+    @pytest.mark.asyncio
+    async def test_server_default(self):
+        @meta_api_tool
+        async def rows_tool(access_token=None):
+            return {"data": [1, 2]}
+
+        with patch.object(serialization, "DEFAULT_OUTPUT_FORMAT", COMPACT):
+            assert await rows_tool(access_token="tok") == '{"data":[1,2]}'
+
+    @pytest.mark.asyncio
+    async def test_errors_are_still_detected_in_compact_mode(self):
+        @meta_api_tool
+        async def failing_tool(access_token=None, output_format=None):
+            return json.dumps({"error": {"message": "bad", "code": 100}}, indent=2)
+
+        result = await failing_tool(access_token="tok", output_format="compact")
+        assert json.loads(result)["error"]["code"] == 100
+
+    @pytest.mark.asyncio
+    async def test_unknown_output_format_is_rejected(self):
+        calls = []
+
+        @meta_api_tool
+        async def rows_tool(access_token=None, output_format=None):
+            calls.append(output_format)
+            return dict(ROWS)
+
+        error = json.loads(await rows_tool(access_token="tok", output_format="tabel"))["error"]
+        assert error["message"] == "Invalid output_format: 'tabel'"
+        assert error["valid_values"] == ["pretty", "compact", "table"]
+        assert calls == []
+        assert json.loads(await rows_tool(access_token="tok", output_format="")) == ROWS
+
+
+@pytest.mark.asyncio
+async def test_graph_responses_are_decoded_by_the_serializer(serializer, mock_graph):
+    def handler(request):
+        return httpx.Response(200, content=json.dumps(ROWS).encode())
+
+    with mock_graph(handler):
+        assert await make_api_request("act_1/insights", "tok", max_age=0) == ROWS
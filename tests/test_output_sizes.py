@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Output-size regression tests for the read tools.
+
+Each read tool runs against fixed synthetic data from the Graph API
+emulator, and the serialized size of its result, in bytes and in estimated
+tokens, is compared with tests/output_sizes.json. A tool fails when either
+grows more than META_ADS_SIZE_THRESHOLD times its recorded size (default
+1.10). Shrinking passes; refresh the record after an intended change with:
+
+    META_ADS_SIZE_SAVE=1 python -m pytest tests/test_output_sizes.py
+"""
+
+import datetime
+import json
+import math
+import os
+import re
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import accounts, ads, adsets, campaigns, insights
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.cache import response_cache
+from meta_ads_mcp.core.graph_emulator import EmulatorData, GraphEmulator
+from meta_ads_mcp.core.serialization import PRETTY, output_format
+
+TOKEN = "emulator-token"
+SIZES_FILE = Path(__file__).with_name("output_sizes.json")
+THRESHOLD = float(os.environ.get("META_ADS_SIZE_THRESHOLD", "1.10"))
+SAVE = os.environ.get("META_ADS_SIZE_SAVE", "").lower() in ("1", "true", "yes")
+TIME_RANGE = {"since": "2026-03-25", "until": "2026-03-31"}
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+|\s+|[^\sA-Za-z0-9_]")
+
+# Tool, arguments; "{account_id}" and the like name the first object of that kind in the fixture data
+CASES = {
+    "get_ad_accounts": (accounts.get_ad_accounts, {}),
+    "get_account_info": (accounts.get_account_info, {"account_id": "{account_id}"}),
+    "get_campaigns": (campaigns.get_campaigns, {"account_id": "{account_id}"}),
+    "get_campaign_details": (campaigns.get_campaign_details, {"campaign_id": "{campaign_id}"}),
+    "get_adsets": (adsets.get_adsets, {"account_id": "{account_id}"}),
+    "get_adset_details": (adsets.get_adset_details, {"adset_id": "{adset_id}"}),
+    "get_ads": (ads.get_ads, {"account_id": "{account_id}"}),
+    "get_ad_details": (ads.get_ad_details, {"ad_id": "{ad_id}"}),
+    "get_ad_creatives": (ads.get_ad_creatives, {"ad_id": "{ad_id}"}),
+    "get_creative_details": (ads.get_creative_details, {"creative_id": "{creative_id}"}),
+    "get_insights": (insights.get_insights, {"object_id": "{account_id}", "time_range": TIME_RANGE,
+                                             "level": "ad"}),
+    "get_insights[compact]": (insights.get_insights, {"object_id": "{account_id}", "time_range": TIME_RANGE,
+                                                      "level": "ad", "compact": True}),
+    "get_insights[table]": (insights.get_insights, {"object_id": "{account_id}", "time_range": TIME_RANGE,
+                                                    "level": "ad", "compact": True, "output_format": "table"}),
+}
+
+_measured = {}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE token count: a word run is one token per 4 characters, other characters one each.
+
+    Real tokenizers differ, but the estimate moves with them: padding, key
+    names and numbers all count, which a byte count alone would blur.
+    """
+    return sum(math.ceil(len(piece) / 4) if not piece[0].isspace() and (piece[0].isalnum() or piece[0] == "_")
+               else 1 for piece in _TOKEN_PATTERN.findall(text))
+
+
+def _load_sizes():
+    if SIZES_FILE.exists():
+        return json.loads(SIZES_FILE.read_text())["tools"]
+    return {}
+
+
+@pytest.fixture(scope="module")
+def recorded():
+    sizes = _load_sizes()
+    yield sizes
+    if SAVE and _measured:
+        sizes.update(_measured)
+        SIZES_FILE.write_text(json.dumps({"tools": dict(sorted(sizes.items()))}, indent=2) + "\n")
+
+
+@pytest.fixture
+def emulator(mock_graph):
+    emulator = GraphEmulator(EmulatorData(seed=25, accounts=2, campaigns_per_account=3, adsets_per_campaign=2,
+                                          ads_per_adset=3, today=datetime.date(2026, 3, 31)))
+    response_cache.clear()
+    with mock_graph(app=emulator), \
+            patch.object(api_module, "META_GRAPH_API_BASE", "http://graph.emulator/v24.0"), \
+            patch.object(api_module.retry_policy, "base_delay", 0.0), \
+            output_format(PRETTY):
+        yield emulator
+    response_cache.clear()
+
+
+def _arguments(emulator, arguments):
+    account_id = emulator.data.accounts()[0]
+    objects = {"{account_id}": account_id}
+    for kind, edge in (("campaign_id", "campaigns"), ("adset_id", "adsets"), ("ad_id", "ads"),
+                       ("creative_id", "adcreatives")):
+        objects[f"{{{kind}}}"] = emulator.data.edges[(account_id, edge)][0]
+    return {key: objects.get(value, value) if isinstance(value, str) else value
+            for key, value in arguments.items()}
+
+
+async def _measure(emulator, name):
+    tool, arguments = CASES[name]
+    result = await tool(access_token=TOKEN, **_arguments(emulator, arguments))
+    assert "error" not in json.loads(result), result[:500]
+    size = {"bytes": len(result.encode()), "tokens": estimate_tokens(result)}
+    _measured[name] = size
+    return size
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens('{"spend": "12.5"}') == 13
+    assert estimate_tokens("impressions") == 3
+    assert estimate_tokens('{\n  "a": 1\n}') == estimate_tokens('{"a":1}') + 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", list(CASES))
+async def test_output_size(emulator, recorded, name):
+    size = await _measure(emulator, name)
+    if SAVE:
+        return
+    if name not in recorded:
+        pytest.fail(f"No recorded size for {name}; run with META_ADS_SIZE_SAVE=1 to record it")
+    for unit in ("bytes", "tokens"):
+        ratio = size[unit] / recorded[name][unit]
+        assert ratio <= THRESHOLD, (
+            f"{name} output grew to {size[unit]} {unit} from {recorded[name][unit]} ({ratio:.2f}x, "
+            f"threshold {THRESHOLD:.2f}x); refresh tests/output_sizes.json with META_ADS_SIZE_SAVE=1 "
+            f"if this is intended")
+
+
+@pytest.mark.asyncio
+async def test_compact_insights_are_smaller(emulator):
+    full = await _measure(emulator, "get_insights")
+    compact = await _measure(emulator, "get_insights[compact]")
+    table = await _measure(emulator, "get_insights[table]")
+    assert compact["tokens"] < full["tokens"]
+    assert table["tokens"] < compact["tokens"]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, non-blocking Pipeboard token provider.
+
+Covers aget_access_token serving a cached token, refreshing it in a worker
+thread before it expires, sharing one refresh between concurrent callers,
+falling back to the last good token while Pipeboard is unreachable, and
+parsing the expiry timestamps Pipeboard returns.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+from meta_ads_mcp.core import pipeboard_auth
+from meta_ads_mcp.core.pipeboard_auth import PipeboardAuthManager, TokenInfo
+
+TOKEN_A = "EAAB" + "a" * 40
+TOKEN_B = "EAAB" + "b" * 40
+
+
+def _expires_in(seconds):
+    return datetime.fromtimestamp(time.time() + seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _response(status=200, token=TOKEN_A, expires_in=3600):
+    response = MagicMock()
+    response.status_code = status
+    response.text = ""
+    response.json.return_value = {"access_token": token, "expires_at": _expires_in(expires_in)}
+    if status != 200:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    return response
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setenv("PIPEBOARD_API_TOKEN", "pk_test")
+    return PipeboardAuthManager()
+
+
+@pytest.fixture
+def pipeboard():
+    """Patch requests.get in pipeboard_auth; returns the mock."""
+    with patch.object(pipeboard_auth.requests, "get") as mock_get:
+        mock_get.return_value = _response()
+        yield mock_get
+
+
+class TestTokenInfo:
+
+    def test_expiry_timestamp(self):
+        midnight_utc = datetime(2030, 1, 1, tzinfo=timezone.utc).timestamp()
+        assert TokenInfo(TOKEN_A, expires_at="2030-01-01T00:00:00.000Z").expiry_timestamp() == midnight_utc
+        assert TokenInfo(TOKEN_A, expires_at="2030-01-01T00:00:00").expiry_timestamp() == midnight_utc
+        assert TokenInfo(TOKEN_A).expiry_timestamp() is None
+        assert TokenInfo(TOKEN_A, expires_at="soon").expiry_timestamp() is None
+
+    @pytest.mark.parametrize("expires_at,offset_hours", [
+        ("2030-01-01T12:00:00Z", 0),
+        ("2030-01-01T12:00:00.250+02:00", 2),
+        ("2030-01-01T12:00:00-05:00", -5),
+        # Fractions other than 3 or 6 digits, which Python 3.10's fromisoformat rejects
+        ("2030-01-01T12:00:00.25Z", 0),
+        ("2030-01-01T12:00:00.2500000+02:00", 2),
+    ])
+    def test_expiry_timestamp_offsets(self, expires_at, offset_hours):
+        noon_utc = datetime(2030, 1, 1, 12, tzinfo=timezone.utc).timestamp()
+        expected = noon_utc - offset_hours * 3600 + (0.25 if ".25" in expires_at else 0)
+        assert TokenInfo(TOKEN_A, expires_at=expires_at).expiry_timestamp() == expected
+
+    def test_negative_offset_expiry_is_expired(self):
+        past = datetime.fromtimestamp(time.time() - 120, timezone(timedelta(hours=-5)))
+        token = TokenInfo(TOKEN_A, expires_at=past.isoformat(timespec="seconds"))
+        assert token.expiry_timestamp() is not None
+        assert token.is_expired()
+
+
+class TestAsyncTokenProvider:
+
+    @pytest.mark.asyncio
+    async def test_token_is_cached(self, manager, pipeboard):
+        assert await manager.aget_access_token() == TOKEN_A
+        assert await manager.aget_access_token() == TOKEN_A
+        assert pipeboard.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fetch_does_not_block_the_event_loop(self, manager, pipeboard):
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(5)
+            return _response()
+
+        pipeboard.side_effect = slow_get
+        fetch = asyncio.ensure_future(manager.aget_access_token())
+        await asyncio.sleep(0.01)
+        # The loop is still running other work while Pipeboard answers.
+        assert not fetch.done()
+        release.set()
+        assert await fetch == TOKEN_A
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_request(self, manager, pipeboard):
+        def slow_get(*args, **kwargs):
+            time.sleep(0.05)
+            return _response()
+
+        pipeboard.side_effect = slow_get
+        tokens = await asyncio.gather(*(manager.aget_access_token() for _ in range(20)))
+        assert set(tokens) == {TOKEN_A}
+        assert pipeboard.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_token_is_served_while_refreshing(self, manager, pipeboard):
+        await manager.aget_access_token()
+        pipeboard.return_value = _response(token=TOKEN_B)
+        manager._fetched_at -= pipeboard_auth.PIPEBOARD_TOKEN_TTL + 1
+
+        assert await manager.aget_access_token() == TOKEN_A
+        await manager._refresh_task
+        assert await manager.aget_access_token() == TOKEN_B
+        assert pipeboard.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_token_close_to_expiry_is_refreshed_before_use(self, manager, pipeboard):
+        pipeboard.return_value = _response(expires_in=30)
+        await manager.aget_access_token()
+        pipeboard.return_value = _response(token=TOKEN_B)
+        assert await manager.aget_access_token() == TOKEN_B
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("failure", [
+        requests.exceptions.Timeout(),
+        requests.exceptions.ConnectionError(),
+        _response(status=503),
+    ])
+    async def test_transient_failure_falls_back_to_last_good_token(self, manager, pipeboard, failure):
+        await manager.aget_access_token()
+        if isinstance(failure, Exception):
+            pipeboard.side_effect = failure
+        else:
+            pipeboard.return_value = failure
+        assert await manager.aget_access_token(force_refresh=True) == TOKEN_A
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_not_reused(self, manager, pipeboard):
+        await manager.aget_access_token()
+        pipeboard.return_value = _response(status=404)
+        assert await manager.aget_access_token(force_refresh=True) is None
+        assert manager.token_info is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_a_new_fetch(self, manager, pipeboard):
+        await manager.aget_access_token()
+        with patch.object(manager, "_get_token_cache_path", return_value=MagicMock()):
+            manager.invalidate_token()
+        pipeboard.return_value = _response(token=TOKEN_B)
+        assert await manager.aget_access_token() == TOKEN_B
+
+    @pytest.mark.asyncio
+    async def test_no_api_token(self, monkeypatch, pipeboard):
+        monkeypatch.delenv("PIPEBOARD_API_TOKEN", raising=False)
+        assert await PipeboardAuthManager().aget_access_token() is None
+        pipeboard.assert_not_called()
+
+
+class TestSyncTokenProvider:
+
+    def test_sync_path_uses_the_same_cache(self, manager, pipeboard):
+        assert manager.get_access_token() == TOKEN_A
+        assert manager.get_access_token() == TOKEN_A
+        assert manager.get_access_token(force_refresh=True) == TOKEN_A
+        assert pipeboard.call_count == 2
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tests for the adaptive rate limiter fed by Meta's usage headers.
+
+Covers scopes (app, ad account, access token), pacing as reported usage
+climbs, blocking a scope when Meta reports it throttled or a throttling
+error arrives, failing fast past max_wait, and the limiter's wiring into
+make_api_request.
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from meta_ads_mcp.core import rate_limiter as rate_limiter_module
+from meta_ads_mcp.core.api import make_api_request
+from meta_ads_mcp.core.rate_limiter import (
+    AdaptiveRateLimiter,
+    is_throttle_error_code,
+    rate_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return AdaptiveRateLimiter(max_rps=10.0, min_rps=0.5, soft_threshold=75.0,
+                               max_wait=20.0, cooldown=60.0, clock=clock)
+
+
+@pytest.fixture
+def no_sleep():
+    with patch.object(rate_limiter_module.asyncio, "sleep", new=AsyncMock()) as mock_sleep:
+        yield mock_sleep
+
+
+class TestScopes:
+
+    def test_account_endpoint_adds_account_scope(self):
+        assert AdaptiveRateLimiter.scopes_for_endpoint("act_123/insights") == ["app", "act_123"]
+
+    def test_object_endpoint_uses_app_scope_only(self):
+        assert AdaptiveRateLimiter.scopes_for_endpoint("120200000000/adcreatives") == ["app"]
+
+    @pytest.mark.parametrize("code", [4, 17, 32, 613, 80000, 80004, 80014])
+    def test_throttle_codes(self, code):
+        assert is_throttle_error_code(code)
+
+    @pytest.mark.parametrize("code", [None, 100, 190, 368, "4"])
+    def test_non_throttle_codes(self, code):
+        assert not is_throttle_error_code(code)
+
+
+class TestPacing:
+
+    @pytest.mark.asyncio
+    async def test_low_usage_is_not_paced(self, limiter, no_sleep):
+        limiter.observe({"app_usage": {"call_count": 40, "total_time": 10, "total_cputime": 5}}, "me")
+        for _ in range(50):
+            assert await limiter.acquire(["app"]) is None
+        no_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_high_usage_paces_requests(self, limiter, clock, no_sleep):
+        # 95% of a 75..100 band leaves 20% headroom -> 2 req/s.
+        limiter.observe({"app_usage": {"call_count": 95}}, "me")
+        for _ in range(2):
+            assert await limiter.acquire(["app"]) is None
+        no_sleep.assert_not_called()
+
+        assert await limiter.acquire(["app"]) is None
+        waited = no_sleep.call_args.args[0]
+        assert waited == pytest.approx(0.5)
+
+    def test_higher_usage_means_slower_rate(self, limiter, clock):
+        limiter.observe({"app_usage": {"call_count": 80}}, "me")
+        state = limiter._scopes["app"]
+        rate_at_80 = limiter._rate(state, clock.now)
+        limiter.observe({"app_usage": {"call_count": 98}}, "me")
+        rate_at_98 = limiter._rate(state, clock.now)
+        assert rate_at_98 < rate_at_80
+        assert rate_at_98 >= limiter.min_rps
+
+    def test_stale_usage_stops_pacing(self, limiter, clock):
+        limiter.observe({"app_usage": {"call_count": 99}}, "me")
+        clock.now += limiter.usage_ttl + 1
+        assert limiter._rate(limiter._scopes["app"], clock.now) is None
+
+
+class TestBlocking:
+
+    @pytest.mark.asyncio
+    async def test_buc_regain_time_blocks_account(self, limiter, clock):
+        usage = {"business_use_case_usage": {"123": [{
+            "type": "ads_management", "call_count": 100, "total_time": 40,
+            "total_cputime": 30, "estimated_time_to_regain_access": 5,
+        }]}}
+        limiter.observe(usage, "act_123/ads")
+
+        retry_after = await limiter.acquire(["app", "act_123"])
+        assert retry_after == pytest.approx(300.0)
+        # Other accounts are unaffected.
+        assert await limiter.acquire(["app", "act_999"]) is None
+
+    @pytest.mark.asyncio
+    async def test_block_expires(self, limiter, clock, no_sleep):
+        limiter.observe({"ad_account_usage": {"acc_id_util_pct": 100, "reset_time_duration": 30}}, "act_5/ads")
+        assert await limiter.acquire(["app", "act_5"]) is not None
+        clock.now += 31
+        assert await limiter.acquire(["app", "act_5"]) is None
+
+    @pytest.mark.asyncio
+    async def test_short_block_is_waited_out(self, limiter, clock, no_sleep):
+        limiter.observe({"ad_account_usage": {"acc_id_util_pct": 100, "reset_time_duration": 3}}, "act_5/ads")
+        assert await limiter.acquire(["app", "act_5"]) is None
+        assert no_sleep.call_args.args[0] == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_app_throttle_error_pauses_app_scope(self, limiter):
+        limiter.observe({}, "120200000/insights", error_code=4)
+        assert await limiter.acquire(["app"]) == pytest.approx(60.0)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code", [17, 32])
+    async def test_user_throttle_error_pauses_only_that_token(self, limiter, code):
+        limiter.observe({}, "act_77/insights", error_code=code, access_token="token-a")
+        assert await limiter.acquire(limiter.scopes_for_endpoint("act_77/ads", "token-a")) == pytest.approx(60.0)
+        assert await limiter.acquire(limiter.scopes_for_endpoint("act_77/ads", "token-b")) is None
+        assert await limiter.acquire(["app", "act_77"]) is None
+
+    def test_token_scope_does_not_hold_the_token(self):
+        scopes = AdaptiveRateLimiter.scopes_for_endpoint("me/adaccounts", "EAAB-secret")
+        assert scopes[0] == "app" and scopes[1].startswith("user:")
+        assert "EAAB-secret" not in scopes[1]
+
+    @pytest.mark.asyncio
+    async def test_account_throttle_error_pauses_account_scope(self, limiter):
+        limiter.observe({}, "act_77/insights", error_code=80004)
+        assert await limiter.acquire(["app", "act_77"]) == pytest.approx(60.0)
+        assert await limiter.acquire(["app"]) is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_limiter_never_waits(self, clock):
+        limiter = AdaptiveRateLimiter(enabled=False, clock=clock)
+        limiter.observe({}, "act_1/ads", error_code=4)
+        assert await limiter.acquire(["app", "act_1"]) is None
+
+
+class TestMakeApiRequestIntegration:
+
+    @pytest.mark.asyncio
+    async def test_throttled_account_is_not_called_again(self, mock_graph):
+        calls = []
+        buc = {"123": [{"type": "ads_management", "call_count": 100,
+                        "estimated_time_to_regain_access": 30}]}
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(
+                200,
+                json={"data": []},
+                headers={"x-business-use-case-usage": json.dumps(buc)},
+            )
+
+        with mock_graph(handler):
+            first = await make_api_request("act_123/ads", "tok", {"fields": "id"})
+            second = await make_api_request("act_123/ads", "tok", {"fields": "id"}, max_age=0)
+
+        assert first == {"data": []}
+        assert len(calls) == 1
+        assert second["error"]["is_rate_limited"] is True
+        assert second["error"]["retry_after_seconds"] == pytest.approx(1800, abs=1)
+        assert "tok" not in json.dumps(second)
+
+    @pytest.mark.asyncio
+    async def test_code_4_error_feeds_limiter(self, mock_graph):
+        def handler(request):
+            return httpx.Response(400, json={"error": {"message": "Application request limit reached",
+                                                       "code": 4, "error_subcode": 1504022}})
+
+        with mock_graph(handler):
+            await make_api_request("me/adaccounts", "tok", retry=False)
+
+        assert rate_limiter.retry_after(["app"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_code_17_on_one_token_does_not_block_another(self, mock_graph):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.params["access_token"])
+            if request.url.params["access_token"] == "tok-a":
+                return httpx.Response(400, json={"error": {"message": "User request limit reached", "code": 17}})
+            return httpx.Response(200, json={"data": []})
+
+        with mock_graph(handler):
+            await make_api_request("me/adaccounts", "tok-a", retry=False)
+            blocked = await make_api_request("me/adaccounts", "tok-a", retry=False, max_age=0)
+            other = await make_api_request("me/adaccounts", "tok-b", retry=False)
+
+        assert blocked["error"]["is_rate_limited"] is True
+        assert other == {"data": []}
+        assert calls == ["tok-a", "tok-b"]
+        assert rate_limiter.retry_after(["app"]) == 0
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Tests for the TTL + LRU cache of read-only Graph responses.
+
+Covers caching GETs per endpoint, params and token, expiry and size limits,
+invalidation by writes to the objects they touch, and the max_age argument
+that read tools accept to bypass or bound the cache.
+"""
+
+import importlib
+import inspect
+import json
+
+import httpx
+import pytest
+
+from meta_ads_mcp.core.api import make_api_request
+from meta_ads_mcp.core.cache import ResponseCache, cache_max_age
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ResponseCache(clock=clock)
+
+
+def _not_found(code=100, subcode=33, status=400):
+    return {"error": {"message": f"HTTP Error: {status}",
+                      "details": {"error": {"message": "Object does not exist", "code": code, "error_subcode": subcode}},
+                      "full_response": {"status_code": status}}}
+
+
+class TestResponseCache:
+
+    def test_hit_returns_an_independent_copy(self, cache):
+        cache.put("act_1/campaigns", "tok", {"limit": 10}, {"data": [{"id": "c1"}]})
+        first = cache.get("act_1/campaigns", "tok", {"limit": 10})
+        first["data"].append({"id": "mutated"})
+        assert cache.get("act_1/campaigns", "tok", {"limit": 10}) == {"data": [{"id": "c1"}]}
+
+    def test_key_includes_params_and_token(self, cache):
+        cache.put("act_1/campaigns", "tok", {"limit": 10}, {"data": []})
+        assert cache.get("act_1/campaigns", "tok", {"limit": 10}) is not None
+        assert cache.get("act_1/campaigns", "tok", {"limit": 20}) is None
+        assert cache.get("act_1/campaigns", "other-tok", {"limit": 10}) is None
+
+    def test_per_endpoint_ttls(self, cache):
+        assert cache.ttl_for("search") == 3600.0
+        assert cache.ttl_for("me/adaccounts") == 300.0
+        assert cache.ttl_for("act_123") == 300.0
+        assert cache.ttl_for("act_123/insights") == 60.0
+        assert cache.ttl_for("120200/ads") == cache.default_ttl
+
+    def test_entries_expire(self, cache, clock):
+        cache.put("act_1/insights", "tok", None, {"data": []})
+        clock.now += 59
+        assert cache.get("act_1/insights", "tok", None) is not None
+        clock.now += 2
+        assert cache.get("act_1/insights", "tok", None) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_max_age(self, cache, clock):
+        cache.put("search", "tok", {"q": "golf"}, {"data": []})
+        clock.now += 120
+        assert cache.get("search", "tok", {"q": "golf"}, max_age=0) is None
+        assert cache.get("search", "tok", {"q": "golf"}, max_age=60) is None
+        assert cache.get("search", "tok", {"q": "golf"}, max_age=300) is not None
+
+    def test_lru_eviction_by_count(self, clock):
+        cache = ResponseCache(max_entries=2, clock=clock)
+        cache.put("1", "tok", None, {"id": "1"})
+        cache.put("2", "tok", None, {"id": "2"})
+        cache.get("1", "tok", None)  # 1 becomes most recently used
+        cache.put("3", "tok", None, {"id": "3"})
+        assert cache.get("2", "tok", None) is None
+        assert cache.get("1", "tok", None) is not None
+        assert cache.get("3", "tok", None) is not None
+
+    def test_lru_eviction_by_size(self, clock):
+        cache = ResponseCache(max_bytes=100, clock=clock)
+        cache.put("1", "tok", None, {"blob": "x" * 60})
+        cache.put("2", "tok", None, {"blob": "y" * 60})
+        assert cache.get("1", "tok", None) is None
+        assert cache.stats()["bytes"] <= 100
+
+    def test_negative_caching(self, cache, clock):
+        cache.put("999", "tok", None, _not_found())
+        assert cache.get("999", "tok", None)["error"]["message"] == "HTTP Error: 400"
+        clock.now += cache.negative_ttl + 1
+        assert cache.get("999", "tok", None) is None
+
+    @pytest.mark.parametrize("error", [
+        {"error": {"message": "HTTP Error: 500", "full_response": {"status_code": 500}}},
+        {"error": {"message": "HTTP Error: 400", "details": {"error": {"code": 17}}}},
+        {"error": {"message": "Meta API rate limit protection", "is_rate_limited": True}},
+    ])
+    def test_transient_errors_are_not_cached(self, cache, error):
+        cache.put("123", "tok", None, error)
+        assert cache.get("123", "tok", None) is None
+
+    def test_write_to_object_invalidates_it_and_listings_containing_it(self, cache):
+        cache.put("42", "tok", {"fields": "id,status"}, {"id": "42", "status": "ACTIVE"})
+        cache.put("act_1/ads", "tok", None, {"data": [{"id": "41"}, {"id": "42"}]})
+        cache.put("act_1/ads", "tok", {"limit": 5}, {"data": [{"id": "40"}]})
+
+        assert cache.invalidate_for_write("42", {"status": "PAUSED"}) == 2
+        assert cache.get("42", "tok", {"fields": "id,status"}) is None
+        assert cache.get("act_1/ads", "tok", None) is None
+        assert cache.get("act_1/ads", "tok", {"limit": 5}) is not None
+
+    def test_create_under_parent_invalidates_parent_listings(self, cache):
+        cache.put("act_1/campaigns", "tok", None, {"data": []})
+        cache.put("c9/adsets", "tok", None, {"data": []})
+        cache.put("act_2/campaigns", "tok", None, {"data": []})
+
+        cache.invalidate_for_write("act_1/adsets", {"campaign_id": "c9", "name": "New"})
+        assert cache.get("act_1/campaigns", "tok", None) is None
+        assert cache.get("c9/adsets", "tok", None) is None
+        assert cache.get("act_2/campaigns", "tok", None) is not None
+
+    def test_disabled_cache_stores_nothing(self, clock):
+        cache = ResponseCache(enabled=False, clock=clock)
+        cache.put("1", "tok", None, {"id": "1"})
+        assert cache.get("1", "tok", None) is None
+
+
+@pytest.fixture
+def graph(mock_graph):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.method == "POST":
+            return httpx.Response(200, json={"success": True})
+        return httpx.Response(200, json={"data": [{"id": "act_1", "name": "Main", "currency": "USD",
+                                                   "amount_spent": "1000"}]})
+
+    with mock_graph(handler):
+        yield calls
+
+
+class TestMakeApiRequestCaching:
+
+    @pytest.mark.asyncio
+    async def test_repeat_get_is_served_from_cache(self, graph):
+        first = await make_api_request("me/adaccounts", "tok", {"limit": 5})
+        second = await make_api_request("me/adaccounts", "tok", {"limit": 5})
+        assert first == second
+        assert len(graph) == 1
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_cached_reads(self, graph):
+        await make_api_request("act_1/campaigns", "tok", {"limit": 5})
+        await make_api_request("act_1/campaigns", "tok", {"name": "New", "objective": "OUTCOME_SALES"},
+                               method="POST")
+        await make_api_request("act_1/campaigns", "tok", {"limit": 5})
+        assert [c.method for c in graph] == ["GET", "POST", "GET"]
+
+    @pytest.mark.asyncio
+    async def test_max_age_zero_bypasses_cache(self, graph):
+        await make_api_request("me/adaccounts", "tok")
+        await make_api_request("me/adaccounts", "tok", max_age=0)
+        assert len(graph) == 2
+
+    @pytest.mark.asyncio
+    async def test_tool_level_max_age(self, graph):
+        await make_api_request("me/adaccounts", "tok")
+        with cache_max_age(0):
+            await make_api_request("me/adaccounts", "tok")
+        assert len(graph) == 2
+
+    @pytest.mark.asyncio
+    async def test_read_tool_accepts_max_age(self, graph):
+        from meta_ads_mcp.core.accounts import get_ad_accounts
+
+        first = json.loads(await get_ad_accounts(access_token="tok"))
+        second = json.loads(await get_ad_accounts(access_token="tok"))
+        assert len(graph) == 1
+        # The tool normalizes amounts in place; the cached copy must not be normalized twice.
+        assert first == second
+        assert first["data"][0]["amount_spent"] == "10.00"
+
+        await get_ad_accounts(access_token="tok", max_age=0)
+        assert len(graph) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("tool,arguments", [
+        ("campaigns.get_campaign_details", {"campaign_id": "120"}),
+        ("adsets.get_adsets", {"account_id": "act_1"}),
+        ("adsets.get_adset_details", {"adset_id": "121"}),
+        ("ads.get_ads", {"account_id": "act_1"}),
+        ("ads.get_ad_details", {"ad_id": "122"}),
+        ("ads.get_account_pages", {"account_id": "act_1"}),
+    ])
+    async def test_read_tools_force_a_fresh_read(self, graph, tool, arguments):
+        module_name, name = tool.split(".")
+        func = getattr(importlib.import_module(f"meta_ads_mcp.core.{module_name}"), name)
+
+        await func(access_token="tok", **arguments)
+        calls = len(graph)
+        await func(access_token="tok", **arguments)
+        assert len(graph) == calls
+        await func(access_token="tok", max_age=0, **arguments)
+        assert len(graph) > calls
+
+    def test_every_cached_read_tool_takes_max_age(self):
+        from meta_ads_mcp.core import accounts, ads, adsets, campaigns, insights, targeting
+
+        tools = [accounts.get_ad_accounts, accounts.get_account_info, campaigns.get_campaigns,
+                 campaigns.get_campaign_details, adsets.get_adsets, adsets.get_adset_details, ads.get_ads,
+                 ads.get_ad_details, ads.get_creative_details, ads.get_ad_creatives, ads.get_ad_image,
+                 ads.get_image_by_hash, ads.get_ad_video, ads.search_pages_by_name, ads.get_account_pages,
+                 insights.get_insights, targeting.search_interests, targeting.get_interest_suggestions,
+                 targeting.estimate_audience_size, targeting.search_behaviors, targeting.search_demographics,
+                 targeting.search_geo_locations]
+        assert [tool.__name__ for tool in tools if "max_age" not in inspect.signature(tool).parameters] == []
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for storing large tool results as resources and slicing them.
+
+With META_ADS_SPILL_CHARS set (it is off by default), results whose JSON is
+above it are kept server-side under meta-ads://results/{id} and the tool
+returns a summary (row count, column schema, preview rows). Covers the
+summary, get_result_slice paging, projection and filters, the resource
+read, per-token access and store eviction.
+"""
+
+import json
+import os
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import resources
+from meta_ads_mcp.core.insights import get_insights
+from meta_ads_mcp.core.resources import ResultStore, get_result_resource, result_store
+from meta_ads_mcp.core.stored_results import get_result_slice
+
+TOKEN = "EAAB" + "x" * 40
+
+
+def _row(i):
+    return {
+        "campaign_name": f"Campaign {i % 3}",
+        "spend": f"{i}.00",
+        "actions": [{"action_type": "purchase", "value": str(i)}],
+    }
+
+
+@pytest.fixture
+def graph(mock_graph):
+    requests = []
+    rows = [_row(i) for i in range(300)]
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": rows, "paging": {"cursors": {"after": "abc"}}})
+
+    with mock_graph(handler), \
+            patch.object(resources, "SPILL_CHARS", 5000):
+        yield requests
+    result_store.clear()
+
+
+async def _spilled_summary():
+    return json.loads(await get_insights(object_id="act_1", access_token=TOKEN, limit=300))
+
+
+class TestSpill:
+
+    @pytest.mark.asyncio
+    async def test_large_result_is_summarized(self, graph):
+        summary = await _spilled_summary()
+
+        assert "data" not in summary
+        assert summary["row_count"] == 300
+        assert summary["resource_uri"] == f"meta-ads://results/{summary['result_id']}"
+        assert summary["columns"] == {"campaign_name": "string", "spend": "string", "actions.purchase": "string"}
+        assert len(summary["preview"]) == 5
+        assert summary["paging"] == {"cursors": {"after": "abc"}}
+        assert "get_result_slice" in summary["note"]
+
+    @pytest.mark.asyncio
+    async def test_small_results_are_inline(self, graph):
+        with patch.object(resources, "SPILL_CHARS", 10_000_000):
+            result = json.loads(await get_insights(object_id="act_1", access_token=TOKEN, limit=300))
+        assert len(result["data"]) == 300
+
+    @pytest.mark.skipif(bool(os.environ.get("META_ADS_SPILL_CHARS")), reason="META_ADS_SPILL_CHARS is set")
+    def test_spilling_is_off_by_default(self):
+        assert resources.SPILL_CHARS == 0
+        result = {"data": [_row(i) for i in range(300)]}
+        assert resources.spill_result("get_insights", TOKEN, result, json.dumps(result)) is None
+
+    @pytest.mark.asyncio
+    async def test_slice_pages_without_calling_meta(self, graph):
+        summary = await _spilled_summary()
+        calls = len(graph)
+
+        page = json.loads(await get_result_slice(result_id=summary["result_id"], offset=290, limit=20,
+                                                 access_token=TOKEN))
+        assert [row["spend"] for row in page["data"]] == [f"{i}.00" for i in range(290, 300)]
+        assert "next_offset" not in page
+        first = json.loads(await get_result_slice(result_id=summary["result_id"], limit=10, access_token=TOKEN))
+        assert first["next_offset"] == 10
+        assert len(graph) == calls
+
+    @pytest.mark.asyncio
+    async def test_slice_columns_and_filters(self, graph):
+        summary = await _spilled_summary()
+
+        page = json.loads(await get_result_slice(
+            result_id=summary["result_id"], columns=["spend", "actions.purchase"],
+            filters={"campaign_name": "Campaign 1"}, limit=2, access_token=TOKEN))
+        assert page["matched_rows"] == 100
+        assert page["data"] == [{"spend": "1.00", "actions.purchase": "1"}, {"spend": "4.00", "actions.purchase": "4"}]
+
+    @pytest.mark.asyncio
+    async def test_slices_are_never_spilled(self, graph):
+        summary = await _spilled_summary()
+        page = json.loads(await get_result_slice(result_id=summary["result_id"], limit=300, access_token=TOKEN))
+        assert len(page["data"]) == 300
+
+    @pytest.mark.asyncio
+    async def test_other_tokens_cannot_read_the_result(self, graph):
+        summary = await _spilled_summary()
+        other = json.loads(await get_result_slice(result_id=summary["result_id"], access_token="EAAB" + "y" * 40))
+        assert "not found" in other["error"]
+
+    @pytest.mark.asyncio
+    async def test_resource_returns_full_result(self, graph):
+        summary = await _spilled_summary()
+        with patch("meta_ads_mcp.core.auth.get_current_access_token", return_value=TOKEN):
+            full = json.loads(await get_result_resource(summary["result_id"]))
+        assert len(full["data"]) == 300
+
+
+class TestResultStore:
+
+    def test_size_budget_evicts_oldest(self):
+        store = ResultStore(max_chars=100, ttl=3600)
+        first = store.put("t", TOKEN, {"data": []}, 60)
+        second = store.put("t", TOKEN, {"data": []}, 60)
+        assert store.get(first.result_id, TOKEN) is None
+        assert store.get(second.result_id, TOKEN) is not None
+
+    def test_newest_result_is_kept_even_if_oversized(self):
+        store = ResultStore(max_chars=10, ttl=3600)
+        stored = store.put("t", TOKEN, {"data": []}, 1000)
+        assert store.get(stored.result_id, TOKEN) is stored
+
+    def test_expired_results_are_dropped(self):
+        store = ResultStore(ttl=0)
+        stored = store.put("t", TOKEN, {"data": []}, 10)
+        stored.created_at -= 1
+        assert store.get(stored.result_id, TOKEN) is None
+        assert len(store) == 0
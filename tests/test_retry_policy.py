@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Tests for retrying throttled and transient Graph API failures.
+
+Covers which failures are retried, jittered exponential backoff, waiting out
+Meta's regain-access estimate when it is short and returning at once when it
+is not, retrying only GETs unless the caller opts in, and the retry log
+lines.
+"""
+
+import json
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.api import make_api_request
+from meta_ads_mcp.core.rate_limiter import AdaptiveRateLimiter
+from meta_ads_mcp.core.retry import (
+    RetryPolicy,
+    is_retryable_failure,
+    is_transient_exception,
+    regain_access_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRetryPolicy:
+
+    def test_backoff_grows_exponentially_with_full_jitter(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=60.0, rng=lambda: 1.0)
+        assert [policy.backoff(n) for n in (1, 2, 3, 4)] == [0.5, 1.0, 2.0, 4.0]
+        policy = RetryPolicy(base_delay=0.5, max_delay=60.0, rng=lambda: 0.25)
+        assert policy.backoff(3) == pytest.approx(0.5)
+
+    def test_backoff_is_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0, rng=lambda: 1.0)
+        assert policy.backoff(10) == 5.0
+
+    def test_attempts_are_bounded(self):
+        policy = RetryPolicy(max_attempts=3, rng=lambda: 0.5)
+        assert policy.delay_for(1) is not None
+        assert policy.delay_for(2) is not None
+        assert policy.delay_for(3) is None
+
+    def test_regain_hint_is_waited_out_with_jitter(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=60.0, rng=lambda: 1.0)
+        assert policy.delay_for(1, regain_after=30.0) == pytest.approx(30.5)
+
+    def test_long_regain_hint_is_not_waited_for(self):
+        policy = RetryPolicy(max_delay=60.0)
+        assert policy.delay_for(1, regain_after=300.0) is None
+
+    def test_only_gets_retried_by_default(self):
+        policy = RetryPolicy()
+        assert policy.allows("GET")
+        assert not policy.allows("POST")
+        assert policy.allows("POST", override=True)
+        assert not policy.allows("GET", override=False)
+        assert not RetryPolicy(enabled=False).allows("GET", override=True)
+
+    @pytest.mark.parametrize("status,code", [(503, None), (500, 1), (400, 2), (400, 4), (400, 17), (400, 80004)])
+    def test_retryable_failures(self, status, code):
+        assert is_retryable_failure(status, code)
+
+    @pytest.mark.parametrize("status,code", [(400, 100), (400, 190), (403, 10), (404, None)])
+    def test_permanent_failures(self, status, code):
+        assert not is_retryable_failure(status, code)
+
+    def test_transient_exceptions(self):
+        request = httpx.Request("GET", "https://graph.facebook.com/v24.0/me")
+        assert is_transient_exception(httpx.ConnectError("refused", request=request))
+        assert is_transient_exception(httpx.ReadTimeout("slow", request=request))
+        assert not is_transient_exception(ValueError("bad"))
+
+    def test_regain_access_seconds(self):
+        usage = {
+            "business_use_case_usage": {"123": [{"type": "ads_insights", "estimated_time_to_regain_access": 2}]},
+            "ad_account_usage": {"acc_id_util_pct": 100, "reset_time_duration": 45},
+        }
+        assert regain_access_seconds(usage) == 120.0
+        assert regain_access_seconds({}) == 0.0
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def retry_env(clock):
+    """Fake-clock limiter plus an asyncio.sleep that advances it."""
+    limiter = AdaptiveRateLimiter(max_wait=20.0, cooldown=60.0, clock=clock)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.5, rng=lambda: 0.5)
+
+    async def fake_sleep(seconds):
+        clock.now += seconds
+
+    sleep = AsyncMock(side_effect=fake_sleep)
+    with patch.object(api_module, "rate_limiter", limiter), \
+            patch.object(api_module, "retry_policy", policy), \
+            patch.object(api_module.asyncio, "sleep", sleep):
+        yield sleep
+
+
+@pytest.fixture
+def serve(mock_graph):
+    """serve(responses, calls) patches the Graph client to answer with `responses` in order."""
+    def install(responses, calls):
+        def handler(request):
+            calls.append(request)
+            item = responses[min(len(calls), len(responses)) - 1]
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        return mock_graph(handler)
+
+    return install
+
+
+def _graph_error(status, code, headers=None):
+    return httpx.Response(status, json={"error": {"message": "boom", "code": code}}, headers=headers or {})
+
+
+class TestMakeApiRequestRetries:
+
+    @pytest.mark.asyncio
+    async def test_5xx_is_retried_until_success(self, retry_env, serve):
+        calls = []
+        with serve([httpx.Response(503, text="unavailable"), httpx.Response(200, json={"id": "1"})], calls):
+            result = await make_api_request("123", "tok", {"fields": "id"})
+
+        assert result == {"id": "1"}
+        assert len(calls) == 2
+        retry_env.assert_awaited_once()
+        assert retry_env.call_args.args[0] == pytest.approx(0.25)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, retry_env, serve):
+        calls = []
+        with serve([_graph_error(500, 2)], calls):
+            result = await make_api_request("123", "tok")
+
+        assert len(calls) == 3
+        assert result["error"]["message"] == "HTTP Error: 500"
+
+    @pytest.mark.asyncio
+    async def test_throttle_without_short_hint_fails_fast(self, retry_env, serve):
+        # Only the limiter's 60s cooldown to wait for: return instead of holding the call
+        calls = []
+        with serve([_graph_error(400, 17), httpx.Response(200, json={"id": "1"})], calls):
+            result = await make_api_request("123", "tok")
+
+        assert len(calls) == 1
+        assert result["error"]["details"]["error"]["code"] == 17
+        retry_env.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_throttle_with_short_hint_is_retried(self, retry_env, serve, clock):
+        # The scope is paused for Meta's 5s estimate, not the 60s cooldown
+        usage = {"acc_id_util_pct": 100, "reset_time_duration": 5}
+        calls, start = [], clock.now
+        with serve([_graph_error(400, 80004, {"x-ad-account-usage": json.dumps(usage)}),
+                     httpx.Response(200, json={"data": []})], calls):
+            result = await make_api_request("act_123/ads", "tok")
+
+        assert result == {"data": []}
+        assert len(calls) == 2
+        assert clock.now - start == pytest.approx(5.25)
+
+    @pytest.mark.asyncio
+    async def test_user_throttle_with_short_regain_estimate_is_retried(self, retry_env, serve):
+        buc = {"123": [{"type": "ads_management", "call_count": 100, "estimated_time_to_regain_access": 0.1}]}
+        calls = []
+        with serve([_graph_error(400, 17, {"x-business-use-case-usage": json.dumps(buc)}),
+                     httpx.Response(200, json={"id": "1"})], calls):
+            result = await make_api_request("act_123", "tok")
+
+        assert result == {"id": "1"}
+        assert len(calls) == 2
+
+    def test_default_max_delay_is_below_the_limiter_cooldown(self):
+        assert RetryPolicy().max_delay < AdaptiveRateLimiter().cooldown
+        assert RetryPolicy().delay_for(1, regain_after=AdaptiveRateLimiter().cooldown) is None
+
+    @pytest.mark.asyncio
+    async def test_long_throttle_is_returned_immediately(self, retry_env, serve):
+        buc = {"123": [{"type": "ads_insights", "call_count": 100, "estimated_time_to_regain_access": 10}]}
+        calls = []
+        with serve([_graph_error(400, 80000, {"x-business-use-case-usage": json.dumps(buc)})], calls):
+            result = await make_api_request("act_123/insights", "tok")
+
+        assert len(calls) == 1
+        assert result["error"]["details"]["error"]["code"] == 80000
+        retry_env.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_transport_error_is_retried(self, retry_env, serve):
+        calls = []
+        request = httpx.Request("GET", "https://graph.facebook.com/v24.0/123")
+        with serve([httpx.ConnectError("reset", request=request), httpx.Response(200, json={"id": "1"})], calls):
+            result = await make_api_request("123", "tok")
+
+        assert result == {"id": "1"}
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_is_not_retried(self, retry_env, serve):
+        calls = []
+        with serve([_graph_error(400, 100)], calls):
+            result = await make_api_request("123", "tok")
+
+        assert len(calls) == 1
+        assert "error" in result
+        retry_env.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried_by_default(self, retry_env, serve):
+        calls = []
+        with serve([httpx.Response(503, text="unavailable"), httpx.Response(200, json={"id": "1"})], calls):
+            result = await make_api_request("act_1/campaigns", "tok", {"name": "x"}, method="POST")
+
+        assert len(calls) == 1
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_post_retried_when_caller_opts_in(self, retry_env, serve):
+        calls = []
+        with serve([httpx.Response(503, text="unavailable"), httpx.Response(200, json={"success": True})], calls):
+            result = await make_api_request("123", "tok", {"status": "PAUSED"}, method="POST", retry=True)
+
+        assert result == {"success": True}
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_count_is_logged(self, retry_env, serve):
+        calls = []
+        with serve([httpx.Response(502, text="bad gateway"), httpx.Response(200, json={"id": "1"})], calls), \
+                patch.object(api_module, "logger") as mock_logger:
+            await make_api_request("123", "tok")
+
+        messages = [c.args[0] for c in mock_logger.info.call_args_list]
+        assert any("after 1 retries (succeeded)" in m for m in messages)
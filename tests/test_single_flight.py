@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight deduplication of concurrent identical Graph GETs.
+
+Covers identical in-flight GETs sharing one network call, different tokens,
+params or methods staying separate, and errors reaching every waiter.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.api import make_api_request
+
+
+@pytest.fixture
+def graph(request, mock_graph):
+    """Slow fake Graph endpoint that records every request it receives."""
+    calls = []
+
+    async def handler(req):
+        calls.append(req)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"id": req.url.path.rsplit("/", 1)[-1], "account_id": "act_1"})
+
+    with mock_graph(handler):
+        yield calls
+
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_call(self, graph):
+        results = await asyncio.gather(*(
+            make_api_request("123", "tok", {"fields": "account_id"}) for _ in range(3)
+        ))
+
+        assert len(graph) == 1
+        assert results[0] == results[1] == results[2] == {"id": "123", "account_id": "act_1"}
+
+    @pytest.mark.asyncio
+    async def test_shared_results_are_independent_copies(self, graph):
+        first, second = await asyncio.gather(
+            make_api_request("123", "tok", {"fields": "account_id"}),
+            make_api_request("123", "tok", {"fields": "account_id"}),
+        )
+        first["mutated"] = True
+        assert "mutated" not in second
+
+    @pytest.mark.asyncio
+    async def test_param_order_does_not_matter(self, graph):
+        await asyncio.gather(
+            make_api_request("123", "tok", {"fields": "id", "limit": 5}),
+            make_api_request("123", "tok", {"limit": 5, "fields": "id"}),
+        )
+        assert len(graph) == 1
+
+    @pytest.mark.asyncio
+    async def test_different_tokens_are_not_shared(self, graph):
+        await asyncio.gather(
+            make_api_request("123", "tok-a", {"fields": "id"}),
+            make_api_request("123", "tok-b", {"fields": "id"}),
+        )
+        assert len(graph) == 2
+
+    @pytest.mark.asyncio
+    async def test_different_params_are_not_shared(self, graph):
+        await asyncio.gather(
+            make_api_request("123", "tok", {"fields": "id"}),
+            make_api_request("123", "tok", {"fields": "name"}),
+        )
+        assert len(graph) == 2
+
+    @pytest.mark.asyncio
+    async def test_completed_requests_are_not_reused(self, graph):
+        await make_api_request("123", "tok", {"fields": "id"}, max_age=0)
+        await make_api_request("123", "tok", {"fields": "id"}, max_age=0)
+        assert len(graph) == 2
+        assert api_module._inflight_gets == {}
+
+    @pytest.mark.asyncio
+    async def test_writes_are_never_coalesced(self, graph):
+        await asyncio.gather(
+            make_api_request("123", "tok", {"status": "PAUSED"}, method="POST"),
+            make_api_request("123", "tok", {"status": "PAUSED"}, method="POST"),
+        )
+        assert len(graph) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_request(self, graph):
+        first = asyncio.ensure_future(make_api_request("123", "tok", {"fields": "id"}))
+        second = asyncio.ensure_future(make_api_request("123", "tok", {"fields": "id"}))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert (await second)["id"] == "123"
+        assert len(graph) == 1
+
+    @pytest.mark.asyncio
+    async def test_can_be_disabled(self, graph):
+        with patch.object(api_module, "GRAPH_SINGLE_FLIGHT", False), \
+                patch.object(api_module.id_loader, "enabled", False):
+            await asyncio.gather(
+                make_api_request("123", "tok", {"fields": "id"}),
+                make_api_request("123", "tok", {"fields": "id"}),
+            )
+        assert len(graph) == 2
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for output_format="table" on list and insights tools.
+
+Covers flattening rows into columns plus one array of values per row,
+pivoting actions/action_values into a column per action type, dropping empty
+fields, and the size of table output compared with pretty JSON.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from meta_ads_mcp.core.insights import get_insights
+from meta_ads_mcp.core.serialization import flatten_row, to_table
+
+
+def _insights_row(i):
+    return {
+        "campaign_id": f"12020{i}",
+        "campaign_name": f"Campaign {i}",
+        "spend": f"{i}.50",
+        "impressions": str(1000 * i),
+        "ctr": "",
+        "date_start": "2026-09-01",
+        "date_stop": "2026-09-30",
+        "actions": [
+            {"action_type": "link_click", "value": str(10 * i)},
+            {"action_type": "purchase", "value": str(i), "7d_click": str(i)},
+        ],
+        "action_values": [{"action_type": "purchase", "value": f"{20 * i}.00"}],
+    }
+
+
+class TestFlatten:
+
+    def test_actions_are_pivoted_and_empty_fields_dropped(self):
+        flat = flatten_row(_insights_row(2))
+        assert flat["actions.link_click"] == "20"
+        assert flat["actions.purchase"] == "2"
+        assert flat["actions.purchase.7d_click"] == "2"
+        assert flat["action_values.purchase"] == "40.00"
+        assert "ctr" not in flat
+        assert "actions" not in flat
+
+    def test_nested_objects_become_dotted_columns(self):
+        flat = flatten_row({"id": "1", "targeting": {"age_min": 18, "geo_locations": {"countries": ["US"]}},
+                            "bid_amount": None})
+        assert flat == {"id": "1", "targeting.age_min": 18, "targeting.geo_locations.countries": ["US"]}
+
+    def test_table_shape(self):
+        rows = [{"id": "1", "name": "a"}, {"id": "2", "status": "PAUSED"}]
+        table = to_table({"data": rows, "paging": {"cursors": {"after": "x"}}})
+        assert table["columns"] == ["id", "name", "status"]
+        assert table["rows"] == [["1", "a", None], ["2", None, "PAUSED"]]
+        assert table["row_count"] == 2
+        assert table["paging"] == {"cursors": {"after": "x"}}
+
+
+@pytest.fixture
+def graph(mock_graph):
+    rows = [_insights_row(i) for i in range(1, 201)]
+
+    def handler(request):
+        if "/insights" in request.url.path:
+            return httpx.Response(200, json={"data": rows})
+        return httpx.Response(400, json={"error": {"message": "Invalid parameter", "code": 100}})
+
+    with mock_graph(handler):
+        yield rows
+
+
+class TestInsightsTool:
+
+    @pytest.mark.asyncio
+    async def test_table_is_much_smaller(self, graph):
+        pretty = await get_insights(object_id="act_1", access_token="tok", limit=200)
+        table_text = await get_insights(object_id="act_1", access_token="tok", limit=200, output_format="table")
+        table = json.loads(table_text)
+
+        assert table["row_count"] == 200
+        assert len(table["rows"]) == 200
+        assert "ctr" not in table["columns"]
+        row = dict(zip(table["columns"], table["rows"][4]))
+        assert row["campaign_name"] == "Campaign 5"
+        assert row["actions.link_click"] == "50"
+        assert len(table_text) * 3 < len(pretty)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_tabulated(self, graph):
+        result = json.loads(await get_insights(object_id="act_1", access_token="tok", level="bad",
+                                               time_range={"since": "2026-01-01"}, output_format="table"))
+        assert "error" in result
+        assert "columns" not in result
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for serializing tool results once, at the MCP boundary.
+
+Covers meta_api_tool checking dict results for errors and serializing them
+once in the call's output format, passing JSON text without an "error" key
+through undecoded, its own error responses, the text return type it
+declares to MCP, and get_ad_image/get_ad_video using the dict-returning
+_fetch_ad_creatives core.
+"""
+
+import inspect
+import json
+from typing import Any, Dict, Union
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core.ads import get_ad_creatives, get_ad_details, get_ad_video
+from meta_ads_mcp.core.api import meta_api_tool
+from meta_ads_mcp.core.metrics import metrics
+
+
+class TestMetaApiToolResults:
+
+    @pytest.mark.asyncio
+    async def test_dict_result_is_serialized_once(self):
+        @meta_api_tool
+        async def dict_tool(access_token=None):
+            return {"data": [{"id": "1", "name": "é"}]}
+
+        with patch.object(api_module.json, "loads", side_effect=AssertionError("decoded")):
+            result = await dict_tool(access_token="tok")
+
+        assert json.loads(result) == {"data": [{"id": "1", "name": "é"}]}
+        assert result.startswith('{\n  "data"')
+
+    @pytest.mark.asyncio
+    async def test_json_text_without_error_is_not_decoded(self):
+        payload = json.dumps({"data": [{"id": str(i)} for i in range(100)]}, indent=2)
+
+        @meta_api_tool
+        async def text_tool(access_token=None):
+            return payload
+
+        with patch.object(api_module.json, "loads", side_effect=AssertionError("decoded")):
+            assert await text_tool(access_token="tok") is payload
+
+    @pytest.mark.asyncio
+    async def test_dict_errors_are_detected(self):
+        @meta_api_tool
+        async def failing_dict_tool(access_token=None):
+            return {"error": {"message": "Invalid parameter", "code": 100}}
+
+        result = json.loads(await failing_dict_tool(access_token="tok"))
+        assert result["error"]["code"] == 100
+        assert metrics.tool_calls.value("failing_dict_tool", "error") == 1
+
+    @pytest.mark.asyncio
+    async def test_dict_app_id_error_is_replaced(self):
+        @meta_api_tool
+        async def app_id_tool(access_token=None):
+            return {"error": "Graph error", "details": {"error": {"code": 200, "message": "Provide valid app ID"}}}
+
+        result = json.loads(await app_id_tool(access_token="tok"))
+        assert result["error"]["message"] == "Meta API Configuration Issue"
+
+    @pytest.mark.asyncio
+    async def test_non_json_text_is_still_wrapped(self):
+        @meta_api_tool
+        async def plain_tool(access_token=None):
+            return "Error: something went wrong"
+
+        assert json.loads(await plain_tool(access_token="tok")) == {"data": "Error: something went wrong"}
+
+    @pytest.mark.asyncio
+    async def test_cost_is_attached_to_dict_results(self):
+        @meta_api_tool
+        async def costed_tool(access_token=None):
+            return {"data": []}
+
+        with patch.object(api_module, "COST_IN_RESULT", True):
+            result = json.loads(await costed_tool(access_token="tok"))
+        assert result["_meta"]["graph_cost"]["graph_calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_error_paths_use_the_output_format(self):
+        @meta_api_tool
+        async def raising_tool(access_token=None, output_format=None):
+            raise ValueError("boom")
+
+        @meta_api_tool
+        async def plain_tool(access_token=None, output_format=None):
+            return "not json"
+
+        assert await raising_tool(access_token="tok", output_format="compact") == '{"error":"boom"}'
+        assert await plain_tool(access_token="tok", output_format="compact") == '{"data":"not json"}'
+        with patch.object(api_module.auth, "get_current_access_token", AsyncMock(return_value=None)):
+            missing_token = await raising_tool(output_format="compact")
+        assert "\n" not in missing_token
+        assert "error" in json.loads(missing_token)
+
+    def test_wrapped_tools_are_declared_as_text(self):
+        @meta_api_tool
+        async def dict_tool(access_token=None) -> Dict[str, Any]:
+            return {}
+
+        @meta_api_tool
+        async def mixed_tool(access_token=None) -> Union[str, Dict[str, Any]]:
+            return {}
+
+        assert inspect.signature(dict_tool).return_annotation is str
+        assert inspect.signature(mixed_tool).return_annotation is str
+        assert inspect.signature(get_ad_details).return_annotation is str
+        assert list(inspect.signature(get_ad_details).parameters) == ["ad_id", "access_token", "max_age"]
+
+
+class TestAdCreativesCore:
+
+    @pytest.mark.asyncio
+    async def test_get_ad_creatives_output_is_unchanged(self):
+        creatives = {"data": [{"id": "c1", "image_url": "https://example.com/a.jpg"}]}
+        with patch("meta_ads_mcp.core.ads.make_api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.return_value = creatives
+            result = await get_ad_creatives(ad_id="ad_1", access_token="tok")
+
+        data = json.loads(result)
+        assert data["data"][0]["id"] == "c1"
+        assert data["data"][0]["image_urls_for_viewing"] == ["https://example.com/a.jpg"]
+
+    @pytest.mark.asyncio
+    async def test_get_ad_video_does_not_go_through_the_tool(self):
+        creatives = {"data": [{"object_story_spec": {"video_data": {"video_id": "v1"}}}]}
+        video = {"id": "v1", "source": "https://video.example.com/v1.mp4"}
+        with patch("meta_ads_mcp.core.ads.get_ad_creatives", side_effect=AssertionError("tool called")), \
+                patch("meta_ads_mcp.core.ads.make_api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.side_effect = [creatives, {"data": [video]}]
+            result = json.loads(await get_ad_video(ad_id="ad_1", account_id="act_9", access_token="tok"))
+
+        assert result["video_id"] == "v1"
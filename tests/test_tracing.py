@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for tracing spans.
+
+Covers the span tree of a tool call: one span per meta_api_tool call, a
+child per Graph request and one per HTTP attempt below it, spans for image
+download and JPEG conversion, and the exporters.
+"""
+
+import io
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+from PIL import Image as PILImage
+
+from meta_ads_mcp.core import api as api_module
+from meta_ads_mcp.core import utils as utils_module
+from meta_ads_mcp.core.ads import _image_bytes_to_jpeg
+from meta_ads_mcp.core.api import make_api_request, meta_api_tool
+from meta_ads_mcp.core.tracing import InMemoryExporter, JsonLinesExporter, Tracer, tracer
+
+
+@pytest.fixture
+def spans():
+    exporter = InMemoryExporter()
+    previous = tracer.set_exporter(exporter)
+    try:
+        yield exporter.spans
+    finally:
+        tracer.set_exporter(previous)
+
+
+@pytest.fixture
+def graph(mock_graph):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.url.path.endswith("/flaky") and len(calls) == 1:
+            return httpx.Response(503, json={"error": {"message": "Service unavailable", "code": 2}})
+        return httpx.Response(200, json={"data": [{"id": "1"}]},
+                              headers={"x-app-usage": json.dumps({"call_count": 7})})
+
+    with mock_graph(handler), \
+            patch.object(api_module.retry_policy, "base_delay", 0.0):
+        yield calls
+
+
+def _by_name(spans, name):
+    return [span for span in spans if span.name == name]
+
+
+class TestGraphSpans:
+
+    @pytest.mark.asyncio
+    async def test_tool_graph_and_http_spans_are_nested(self, graph, spans):
+        @meta_api_tool
+        async def traced_tool(access_token=None):
+            return json.dumps(await make_api_request("act_1/campaigns", access_token, {"limit": 1}))
+
+        await traced_tool(access_token="tok")
+
+        (tool,) = _by_name(spans, "tool traced_tool")
+        (request,) = _by_name(spans, "graph GET act/campaigns")
+        (attempt,) = _by_name(spans, "http GET")
+        assert request.parent_span_id == tool.span_id
+        assert attempt.parent_span_id == request.span_id
+        assert tool.parent_span_id is None
+        assert tool.trace_id == request.trace_id == attempt.trace_id
+        assert request.attributes["graph.endpoint"] == "act_1/campaigns"
+        assert attempt.attributes["http.status_code"] == 200
+        assert attempt.attributes["http.response.body.size"] > 0
+        assert json.loads(attempt.attributes["meta_ads.rate_limit_usage"])["app_usage"]["call_count"] == 7
+        assert attempt.end_ns >= attempt.start_ns
+
+    @pytest.mark.asyncio
+    async def test_each_retry_gets_its_own_span(self, graph, spans):
+        await make_api_request("act_1/flaky", "tok")
+
+        attempts = _by_name(spans, "http GET")
+        assert [span.attributes["meta_ads.attempt"] for span in attempts] == [1, 2]
+        assert attempts[0].status == "ERROR"
+        assert attempts[0].attributes["http.status_code"] == 503
+        assert attempts[1].status == "UNSET"
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_is_marked(self, graph, spans):
+        await make_api_request("act_1/ads", "tok")
+        await make_api_request("act_1/ads", "tok")
+
+        requests = _by_name(spans, "graph GET act/ads")
+        assert len(requests) == 2
+        assert "meta_ads.cache_hit" not in requests[0].attributes
+        assert requests[1].attributes["meta_ads.cache_hit"] is True
+        assert len(_by_name(spans, "http GET")) == 1
+
+    @pytest.mark.asyncio
+    async def test_exception_marks_span_as_error(self, spans):
+        with pytest.raises(RuntimeError):
+            with tracer.span("outer"):
+                raise RuntimeError("boom")
+        assert spans[0].status == "ERROR"
+        assert "boom" in spans[0].status_message
+
+    @pytest.mark.asyncio
+    async def test_disabled_tracer_records_nothing(self, graph):
+        previous = tracer.set_exporter(None)
+        try:
+            assert not tracer.enabled
+            assert await make_api_request("act_1/pixels", "tok") == {"data": [{"id": "1"}]}
+            with tracer.span("ignored") as span:
+                span.set_attribute("a", 1)
+                span.set_error("ignored")
+        finally:
+            tracer.set_exporter(previous)
+        assert not hasattr(span, "attributes")
+
+
+class TestImageSpans:
+
+    @pytest.mark.asyncio
+    async def test_download_span(self, spans):
+        async def fake_download(url):
+            return b"\x89PNG" + b"0" * 100
+
+        with patch.object(utils_module, "_download_image", side_effect=fake_download):
+            content = await utils_module.download_image("https://scontent.example.com/a.png")
+
+        (span,) = _by_name(spans, "download_image")
+        assert span.attributes["url.host"] == "scontent.example.com"
+        assert span.attributes["http.response.body.size"] == len(content)
+
+    @pytest.mark.asyncio
+    async def test_failed_download_is_an_error(self, spans):
+        async def fake_download(url):
+            return None
+
+        with patch.object(utils_module, "_download_image", side_effect=fake_download):
+            assert await utils_module.download_image("https://scontent.example.com/a.png") is None
+        assert _by_name(spans, "download_image")[0].status == "ERROR"
+
+    def test_jpeg_conversion_span(self, spans):
+        png = io.BytesIO()
+        PILImage.new("RGBA", (12, 8)).save(png, format="PNG")
+
+        jpeg = _image_bytes_to_jpeg(png.getvalue())
+
+        assert jpeg[:2] == b"\xff\xd8"
+        (span,) = _by_name(spans, "image.to_jpeg")
+        assert span.attributes["image.format"] == "PNG"
+        assert (span.attributes["image.width"], span.attributes["image.height"]) == (12, 8)
+        assert span.attributes["image.bytes_out"] == len(jpeg)
+
+
+class TestJsonLinesExporter:
+
+    def test_spans_are_written_one_per_line(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        local = Tracer(exporter=JsonLinesExporter(str(path)))
+        with local.span("parent", {"k": "v"}):
+            with local.span("child"):
+                pass
+        local.exporter.close()
+
+        child, parent = [json.loads(line) for line in path.read_text().splitlines()]
+        assert parent["name"] == "parent"
+        assert parent["attributes"] == {"k": "v"}
+        assert child["parentSpanId"] == parent["spanId"]
+        assert child["traceId"] == parent["traceId"]
+        assert "parentSpanId" not in parent
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("META_ADS_TRACE_FILE", str(tmp_path / "t.jsonl"))
+        assert isinstance(Tracer.from_env().exporter, JsonLinesExporter)
+        monkeypatch.delenv("META_ADS_TRACE_FILE")
+        assert not Tracer.from_env().enabled